@@ -22,19 +22,42 @@ import os
 import sys
 import json
 import re
+import time
+import argparse
 import logging
 import shutil
 import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, List, Tuple, Optional
 
+from irsanai_tuning import load_tuning_hints, DEFAULT_TUNING
+from irsanai_fileio import PreviewExtractor
+from irsanai_classify import UNREADABLE_CLASSIFICATION
+from irsanai_gitignore import load_gitignore
+from irsanai_backup_store import BackupStore, BACKUP_DIR
+from irsanai_instrumentation import (
+    Instrumentation, profile_call, STAGE_WALK, STAGE_IGNORE, STAGE_HASHING, STAGE_PREVIEW, STAGE_RULES,
+    STAGE_SERIALIZATION, COUNTER_FILES, COUNTER_BYTES_READ, COUNTER_REGEX, COUNTER_SYSCALLS
+)
+
 # ======================
 # KONFIGURATION
 # ======================
 VERSION = "1.0"
 OPTIMIZATION_REPORT_FILE = "IrsanAI_github_optimization_report.json"
 LOG_FILE = "IrsanAI_github_optimizer.log"
+# Performance-Parameter aus dem "tuning"-Abschnitt von IrsanAI_env_report.json; main() lädt sie,
+# bis dahin (z.B. beim bloßen Import) gelten die Standardwerte
+TUNING: Dict[str, Any] = dict(DEFAULT_TUNING)
+# Stufenzeiten und Zähler dieses Laufs (Abschnitt "performance" im Report)
+INSTRUMENTATION = Instrumentation("github_repo_preparer", VERSION)
 ANONYMIZATION_SALT = "irsanai_optimizer_salt_2023"
+TRASH_DIR_PREFIX = ".irsanai_trash_"  # Papierkorb des Aktionsplans (nur während der Ausführung vorhanden)
+PARALLEL_DELETE_MIN_INODES = 1000  # ab dieser Baumgröße wird parallel gelöscht
+BACKUP_LABEL = "github_optimizer"  # Snapshots gelöschter und ersetzter Dateien im Backup-Speicher
+BACKUP_KEEP_SNAPSHOTS = 10
 
 # ======================
 # LOGGING SETUP
@@ -76,6 +99,7 @@ def mask_personal_data(path: str) -> str:
     return path
 
 
+@INSTRUMENTATION.timed(STAGE_HASHING)
 def anonymize_path(path: str) -> str:
     """Anonymisiert einen Pfad durch Hashing mit Salt"""
     combined = f"{path}{ANONYMIZATION_SALT}".encode('utf-8')
@@ -85,8 +109,13 @@ def anonymize_path(path: str) -> str:
 # ======================
 # UMGEBUNGSANALYSE
 # ======================
-def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
-    """Analysiert die Projektstruktur und erstellt einen Report"""
+def analyze_project_structure(root_dir: str, respect_gitignore: bool = False) -> Dict[str, Any]:
+    """Analysiert die Projektstruktur und erstellt einen Report
+
+    Args:
+        root_dir: Projektwurzel
+        respect_gitignore: von .gitignore erfasste Pfade zusätzlich als ignoriert zählen
+    """
     log_and_print(f"[ANALYZE] Analysiere Projektstruktur: {root_dir}")
 
     # Maskiere den Projekt-Root für den Report
@@ -182,6 +211,14 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
         r'^lrp-protocol\/.*'
     ]
 
+    # Einträge, die .gitignore abdecken muss (in .gitignore-Schreibweise)
+    REQUIRED_GITIGNORE_ENTRIES = [
+        "*.pyc", "__pycache__/", ".idea/", ".venv/",
+        "*.log", "*.tmp", "*.bak", "*.backup", "*.old", ".DS_Store"
+    ]
+    # .gitignore einmal je Lauf einlesen (rule_005 und --respect-gitignore)
+    gitignore_rules = load_gitignore(root_dir)
+
     # IrsanAI-spezifische Regeln für die Bewertung
     IRSANAI_RULES = [
         {
@@ -201,13 +238,9 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             "name": "Korrekte .gitignore",
             "description": ".gitignore sollte kritische Einträge enthalten",
             "pattern": r'^\.gitignore$',
+            # Geprüft wird die Wirkung des einmal eingelesenen Regelsatzes (Kommentare zählen nicht)
             "check_func": lambda path, is_dir, content: not is_dir and (
-                    content is None or all(
-                pattern in content for pattern in [
-                    "*.pyc", "__pycache__", ".idea", ".venv",
-                    "*.log", "*.tmp", "*.bak", "*.backup", "*.old", ".DS_Store"
-                ]
-            )
+                    gitignore_rules is None or not gitignore_rules.missing(REQUIRED_GITIGNORE_ENTRIES)
             ),
             "severity": "error",
             "recommendation": "Erweitere .gitignore mit kritischen Einträgen"
@@ -217,18 +250,35 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             "name": "Keine IDE-spezifischen Dateien",
             "description": "Keine IDE-spezifischen Dateien im Repository",
             "pattern": r'.*',
-            "check_func": lambda path, is_dir, content: not any(
-                re.match(pattern, path) for pattern in IGNORE_PATTERNS
-            ),
+            "check_func": lambda path, is_dir, content: not is_ignored(path),
             "severity": "error",
             "recommendation": "Entferne IDE-spezifische Dateien"
         }
     ]
 
+    @INSTRUMENTATION.timed(STAGE_IGNORE)
+    def is_ignored(rel_path: str) -> bool:
+        """Prüft einen relativen Pfad gegen IGNORE_PATTERNS"""
+        for evaluated, pattern in enumerate(IGNORE_PATTERNS, 1):
+            if re.match(pattern, rel_path):
+                INSTRUMENTATION.count(COUNTER_REGEX, evaluated)
+                return True
+        INSTRUMENTATION.count(COUNTER_REGEX, len(IGNORE_PATTERNS))
+        return False
+
+    def is_excluded(rel_path: str, is_dir: bool) -> bool:
+        """Ausschluss im Durchlauf: IGNORE_PATTERNS, mit respect_gitignore zusätzlich .gitignore"""
+        if is_ignored(rel_path):
+            return True
+        return bool(respect_gitignore and gitignore_rules and gitignore_rules.match(rel_path, is_dir))
+
     directory_structure = {}
     file_analysis = {}
+    preview_extractor = PreviewExtractor(TUNING["preview_bytes"])
 
+    walk_started = time.perf_counter()
     for dirpath, dirnames, filenames in os.walk(root_dir):
+        INSTRUMENTATION.count(COUNTER_SYSCALLS)  # ein scandir() je Verzeichnis
         # Berechne relativen Pfad für die Struktur
         rel_path = os.path.relpath(dirpath, root_dir)
         if rel_path == ".":
@@ -240,11 +290,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             rel_dir_path = os.path.join(rel_path, dirname) if rel_path else dirname
 
             # Prüfe auf Ignorierung
-            ignore = False
-            for pattern in IGNORE_PATTERNS:
-                if re.match(pattern, rel_dir_path):
-                    ignore = True
-                    break
+            ignore = is_excluded(rel_dir_path, True)
 
             if not ignore:
                 # Füge zum Verzeichnisbaum hinzu
@@ -263,11 +309,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             rel_file_path = os.path.join(rel_path, filename) if rel_path else filename
 
             # Prüfe auf Ignorierung
-            ignore = False
-            for pattern in IGNORE_PATTERNS:
-                if re.match(pattern, rel_file_path):
-                    ignore = True
-                    break
+            ignore = is_excluded(rel_file_path, False)
 
             if not ignore:
                 # Zähle Dateitypen
@@ -278,29 +320,34 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 # Analysiere Dateiinhalt
                 try:
                     file_size = os.path.getsize(full_path)
+                    INSTRUMENTATION.count(COUNTER_SYSCALLS)
                     anonymized_id = anonymize_path(full_path)
 
-                    # Nur kleine Dateien analysieren, um Performance zu gewährleisten
-                    content_preview = ""
-                    if file_size < 10000:  # Nur Dateien < 10KB
-                        try:
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read(500)  # Nur die ersten 500 Zeichen
-                                content_preview = content.replace('\n', ' ').strip()
-                                if len(content) > 500:
-                                    content_preview += "..."
-                        except:
-                            pass
+                    # Preview und Klassifikation aus denselben Kopfbytes: konstante Kosten je Datei
+                    preview_started = time.perf_counter()
+                    try:
+                        content_preview, head_bytes, classification = preview_extractor.extract(full_path, file_size)
+                        # open, read und close
+                        INSTRUMENTATION.count_many({COUNTER_BYTES_READ: head_bytes,
+                                                    COUNTER_SYSCALLS: 3 if head_bytes else 0})
+                    except OSError:
+                        content_preview, classification = "", UNREADABLE_CLASSIFICATION
+                    INSTRUMENTATION.add_time(STAGE_PREVIEW, time.perf_counter() - preview_started)
 
                     file_analysis[rel_file_path] = {
                         "type": "Unbekannt",
                         "size": file_size,
                         "anonymized_id": anonymized_id,
-                        "content_preview": content_preview
+                        "content_preview": content_preview,
+                        "is_binary": classification["is_binary"],
+                        "encoding": classification["encoding"],
+                        "mime_family": classification["mime_family"]
                     }
 
-                    # Bestimme Dateityp basierend auf Inhalt
-                    if filename.endswith('.py'):
+                    # Bestimme Dateityp basierend auf Inhalt (Binärdateien nach erkanntem Format)
+                    if classification["is_binary"]:
+                        file_analysis[rel_file_path]["type"] = f"Binär ({classification['format']})"
+                    elif filename.endswith('.py'):
                         file_analysis[rel_file_path]["type"] = "Python"
                     elif filename.endswith('.md'):
                         file_analysis[rel_file_path]["type"] = "Markdown"
@@ -310,7 +357,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                         file_analysis[rel_file_path]["type"] = "HTML"
                     elif filename.endswith('.js'):
                         file_analysis[rel_file_path]["type"] = "JavaScript"
-                    elif filename.endswith('.txt'):
+                    elif filename.endswith('.txt') or classification["format"] == "text":
                         file_analysis[rel_file_path]["type"] = "Text"
                 except Exception as e:
                     log_and_print(f"[ANALYZE] Fehler bei Dateianalyse {rel_file_path}: {str(e)}", "warning")
@@ -318,8 +365,11 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 ignored_files += 1
 
     total_directories = sum(1 for _, dirnames, _ in os.walk(root_dir) for _ in dirnames)
+    INSTRUMENTATION.add_time(STAGE_WALK, time.perf_counter() - walk_started)
+    INSTRUMENTATION.count(COUNTER_FILES, total_files)
 
     # Prüfe Regeln
+    rules_started = time.perf_counter()
     rule_violations = []
     for rule in IRSANAI_RULES:
         if re.match(rule["pattern"], ""):  # Prüfe auf Root-Verzeichnis
@@ -333,14 +383,21 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 })
         else:
             for dirpath, _, filenames in os.walk(root_dir):
+                INSTRUMENTATION.count(COUNTER_SYSCALLS)  # ein scandir() je Verzeichnis
                 for filename in filenames:
                     full_path = os.path.join(dirpath, filename)
                     rel_path = os.path.relpath(full_path, root_dir)
 
+                    INSTRUMENTATION.count(COUNTER_REGEX)
                     if re.match(rule["pattern"], rel_path):
                         try:
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
+                            # Dateiinhalt nur für Regeln lesen, die ihn auswerten; Binärdateien nie
+                            content = ""
+                            if rule.get("needs_content") and not file_analysis.get(rel_path, {}).get("is_binary"):
+                                with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                                    content = f.read()
+                                    INSTRUMENTATION.count_many({COUNTER_BYTES_READ: os.fstat(f.fileno()).st_size,
+                                                                COUNTER_SYSCALLS: 4})
                             if not rule["check_func"](rel_path, False, content):
                                 rule_violations.append({
                                     "rule_id": rule["id"],
@@ -352,6 +409,8 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                         except:
                             pass
 
+    INSTRUMENTATION.add_time(STAGE_RULES, time.perf_counter() - rules_started)
+
     # Erstelle Recommendations
     recommendations = {
         "gitignore_entries": [".idea/", "IrsanAI_github_optimizer.log"],
@@ -386,7 +445,9 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
         "suspicious_files": suspicious_files,
         "recommendations": recommendations,
         "directory_structure": directory_structure,
-        "file_analysis": file_analysis
+        "file_analysis": file_analysis,
+        # Stufenzeiten und Zähler der Analyse (Serialisierung steht im Log)
+        "performance": INSTRUMENTATION.snapshot()
     }
 
     return report
@@ -459,55 +520,329 @@ Thumbs.db
 # IrsanAI-spezifische temporäre Dateien
 IrsanAI_github_optimizer.log
 IrsanAI_scanner.log
+.IrsanAI/backups/
 """
     return content
 
 
-def apply_recommendations(report: Dict[str, Any]) -> List[str]:
-    """Wendet die Recommendations auf das Projekt an"""
-    actions = []
+def resolve_project_path(project_root: str, rel_path: str) -> str:
+    """Absoluter Pfad eines Report-Pfads unterhalb des ECHTEN (unmaskierten) Projekt-Roots
 
-    # Lösche temporäre Dateien
-    for candidate in report["recommendations"]["delete_candidates"]:
-        path = os.path.join(report["project_root"], candidate["path"])
-        if os.path.exists(path):
-            if os.path.isdir(path):
-                shutil.rmtree(path)
-                actions.append(f"Gelöscht: Verzeichnis {candidate['path']}")
-            else:
-                os.remove(path)
-                actions.append(f"Gelöscht: Datei {candidate['path']}")
+    Raises:
+        ValueError: der Pfad zeigt aus dem Projekt heraus oder auf den Root selbst
+    """
+    root = os.path.abspath(project_root)
+    path = os.path.abspath(os.path.join(root, rel_path.replace("\\", "/")))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"Pfad liegt nicht im Projekt: {rel_path}")
+    return path
 
-    # Erstelle .gitignore, falls nötig
-    gitignore_path = os.path.join(report["project_root"], ".gitignore")
-    try:
-        with open(gitignore_path, 'w') as f:
-            f.write(generate_gitignore_content(report))
 
-        if not os.path.exists(gitignore_path):
-            actions.append("Erstellt: .gitignore")
-        else:
-            actions.append("Aktualisiert: .gitignore - Vollständiger Inhalt geschrieben")
-    except Exception as e:
-        log_and_print(f"[ERROR] Fehler beim Schreiben von .gitignore: {str(e)}", "error")
+def measure_tree(path: str) -> Tuple[int, int]:
+    """Bytes und Inodes einer Datei bzw. eines Verzeichnisbaums (Symlinks werden nicht verfolgt)"""
+    stat = os.lstat(path)
+    if not os.path.isdir(path) or os.path.islink(path):
+        return stat.st_size, 1
+    total_bytes, total_inodes = 0, 1
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                total_inodes += 1
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    total_bytes += entry.stat(follow_symlinks=False).st_size
+    return total_bytes, total_inodes
+
+
+def plan_gitignore(project_root: str) -> Optional[Dict[str, Any]]:
+    """Schreibaktion für .gitignore; None, wenn die Datei bereits den gewünschten Inhalt hat"""
+    gitignore_path = os.path.join(project_root, ".gitignore")
+    content = generate_gitignore_content({"project_root": project_root, "file_types": {}})
+    try:
+        with open(gitignore_path, 'rb') as f:
+            if f.read() == content.encode('utf-8'):
+                return None
+        reason = "Aktualisiert"
+    except FileNotFoundError:
+        reason = "Erstellt"
+    return {"action": "write", "path": ".gitignore", "content": content, "reason": reason}
+
+
+def plan_recommendations(report: Dict[str, Any], project_root: str) -> List[Dict[str, Any]]:
+    """Erstellt den vollständigen Aktionsplan, ohne etwas zu verändern
+
+    Aktionen: {"action": "delete"|"move"|"write", "path", ...}; Löschungen enthalten die
+    freiwerdenden Bytes und Inodes, Verschiebungen das Ziel, Schreibaktionen den Inhalt.
+    """
+    plan: List[Dict[str, Any]] = []
+    planned_paths = set()
+
+    def add_delete(rel_path: str, reason: str) -> None:
+        rel_path = rel_path.replace("\\", "/")
+        path = resolve_project_path(project_root, rel_path)
+        if rel_path in planned_paths or not os.path.lexists(path):
+            return
+        planned_paths.add(rel_path)
+        freed_bytes, freed_inodes = measure_tree(path)
+        plan.append({"action": "delete", "path": rel_path,
+                     "kind": "dir" if os.path.isdir(path) and not os.path.islink(path) else "file",
+                     "bytes": freed_bytes, "inodes": freed_inodes, "reason": reason})
+
+    recommendations = report["recommendations"]
+
+    # Temporäre Dateien
+    for candidate in recommendations.get("delete_candidates", []):
+        add_delete(candidate["path"], candidate.get("reason", "Löschkandidat"))
+
+    # Verschiebungen und Umbenennungen
+    for candidate in recommendations.get("move_candidates", []) + recommendations.get("rename_candidates", []):
+        target = candidate.get("target") or candidate.get("new_path")
+        if not target or not os.path.lexists(resolve_project_path(project_root, candidate["path"])):
+            continue
+        resolve_project_path(project_root, target)
+        plan.append({"action": "move", "path": candidate["path"].replace("\\", "/"),
+                     "target": target.replace("\\", "/"), "reason": candidate.get("reason", "Verschieben")})
+
+    # .gitignore nur bei abweichendem Inhalt
+    gitignore_action = plan_gitignore(project_root)
+    if gitignore_action:
+        plan.append(gitignore_action)
+
+    # .IrsanAI-Struktur: alle Unterordner entfernen, nur .gitkeep und README.md behalten
+    irsanai_path = os.path.join(project_root, ".IrsanAI")
+    if os.path.isdir(irsanai_path):
+        backup_dir = os.path.basename(BACKUP_DIR)
+        for item in sorted(os.listdir(irsanai_path)):
+            # Der Backup-Speicher enthält die Sicherungen dieser Aufräumläufe und bleibt bestehen
+            if item != backup_dir and os.path.isdir(os.path.join(irsanai_path, item)):
+                add_delete(f".IrsanAI/{item}", "Unterordner in .IrsanAI/")
+
+    return plan
+
+
+def describe_action(action: Dict[str, Any], dry_run: bool = False) -> str:
+    """Lesbare Zeile für Log und Zusammenfassung"""
+    if action["action"] == "delete":
+        kind = "Verzeichnis" if action["kind"] == "dir" else "Datei"
+        text = f"{'Würde löschen' if dry_run else 'Gelöscht'}: {kind} {action['path']} " \
+               f"({action['bytes']} Bytes, {action['inodes']} Inodes)"
+    elif action["action"] == "move":
+        text = f"{'Würde verschieben' if dry_run else 'Verschoben'}: {action['path']} -> {action['target']}"
+    else:
+        text = f"{'Würde schreiben' if dry_run else action['reason']}: {action['path']}"
+    return text
+
+
+def fsync_directory(path: str) -> None:
+    """Macht Einträge eines Verzeichnisses dauerhaft (unter Windows nicht möglich und übersprungen)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def remove_tree(path: str, inodes: int = 0) -> None:
+    """Löscht endgültig; große Bäume (ab PARALLEL_DELETE_MIN_INODES) parallel über ihre Unterverzeichnisse"""
+    if not os.path.isdir(path) or os.path.islink(path):
+        os.remove(path)
+        return
+    workers = TUNING["thread_pool_size"]
+    if workers > 1 and inodes >= PARALLEL_DELETE_MIN_INODES:
+        children = [entry.path for entry in os.scandir(path) if entry.is_dir(follow_symlinks=False)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(shutil.rmtree, children))
+    shutil.rmtree(path)
+
+
+def execute_plan(plan: List[Dict[str, Any]], project_root: str, backup: bool = True) -> Dict[str, Any]:
+    """Führt den Plan als Transaktion aus
+
+    1. Löschungen (gruppiert nach Verzeichnis) und ersetzte Dateien werden per rename in ein
+       Papierkorb-Verzeichnis im Projekt verschoben - gleiches Dateisystem, also atomar
+    2. Verschiebungen per os.rename (über Dateisystemgrenzen: shutil.move)
+    3. Schreibaktionen: temporäre Datei, fsync, os.replace
+    4. mit backup: Snapshot des Papierkorbs im Backup-Speicher (.IrsanAI/backups/) unter den
+       ursprünglichen Pfaden - per Hardlink, da der Papierkorb danach ohnehin gelöscht wird
+    5. ein fsync je betroffenem Verzeichnis
+    Schlägt ein Schritt fehl (auch das Backup), werden alle bisherigen in umgekehrter Reihenfolge
+    zurückgenommen. Erst danach wird der Papierkorb endgültig gelöscht (große Bäume parallel).
+
+    Returns:
+        {"actions", "freed_bytes", "freed_inodes", "skipped", "rolled_back", "error", "backup"};
+        freed_bytes/freed_inodes abzüglich dessen, was das Backup neu belegt
+    """
+    result = {"actions": [], "freed_bytes": 0, "freed_inodes": 0, "skipped": [], "rolled_back": False,
+              "error": None, "backup": None}
+    if not plan:
+        return result
+
+    trash_dir = tempfile.mkdtemp(prefix=TRASH_DIR_PREFIX, dir=project_root)
+    # ("rename", von, nach), ("move", von, nach) über Dateisystemgrenzen bzw. ("remove", pfad, None)
+    undo: List[Tuple[str, str, Optional[str]]] = []
+    staged_inodes: Dict[str, int] = {}
+    staged_paths: Dict[str, str] = {}  # ursprünglicher Pfad -> Ort im Papierkorb
+    touched_dirs = {trash_dir}
+    order = {"delete": 0, "move": 1, "write": 2}
+    steps = sorted(plan, key=lambda a: (order[a["action"]], os.path.dirname(a["path"]), a["path"]))
 
-    # Korrigiere .IrsanAI-Struktur
-    irsanai_path = os.path.join(report["project_root"], ".IrsanAI")
-    if os.path.exists(irsanai_path) and os.path.isdir(irsanai_path):
-        # Entferne alle Unterordner, behalte nur .gitkeep und README.md
-        for item in os.listdir(irsanai_path):
-            item_path = os.path.join(irsanai_path, item)
-            if os.path.isdir(item_path):
-                shutil.rmtree(item_path)
-                actions.append(f"Gelöscht: Unterordner {os.path.join('.IrsanAI', item)}")
+    try:
+        for index, action in enumerate(steps):
+            path = resolve_project_path(project_root, action["path"])
+            if action["action"] == "delete":
+                if not os.path.lexists(path):
+                    result["skipped"].append(action["path"])
+                    continue
+                staged = os.path.join(trash_dir, str(index))
+                os.rename(path, staged)
+                undo.append(("rename", staged, path))
+                staged_inodes[staged] = action["inodes"]
+                staged_paths[action["path"]] = staged
+                touched_dirs.add(os.path.dirname(path))
+                result["freed_bytes"] += action["bytes"]
+                result["freed_inodes"] += action["inodes"]
+
+            elif action["action"] == "move":
+                target = resolve_project_path(project_root, action["target"])
+                if os.path.lexists(target):
+                    raise FileExistsError(f"Ziel existiert bereits: {action['target']}")
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                try:
+                    os.rename(path, target)
+                    undo.append(("rename", target, path))
+                except OSError:
+                    shutil.move(path, target)  # anderes Dateisystem
+                    undo.append(("move", target, path))
+                touched_dirs.update((os.path.dirname(path), os.path.dirname(target)))
 
-    return actions
+            else:
+                temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.irsanai_tmp")
+                # Nach os.replace existiert die temporäre Datei nicht mehr; die Rücknahme überspringt sie dann
+                undo.append(("remove", temp_path, None))
+                with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+                    f.write(action["content"])
+                    f.flush()
+                    os.fsync(f.fileno())
+                if os.path.lexists(path):
+                    staged = os.path.join(trash_dir, str(index))
+                    os.rename(path, staged)
+                    undo.append(("rename", staged, path))
+                    staged_paths[action["path"]] = staged
+                os.replace(temp_path, path)
+                undo.append(("remove", path, None))
+                touched_dirs.add(os.path.dirname(path))
+
+            result["actions"].append(describe_action(action))
+
+        if backup and staged_paths:
+            store = BackupStore(project_root)
+            manifest = store.snapshot(BACKUP_LABEL, staged_paths, detach=True)
+            store.gc(keep=BACKUP_KEEP_SNAPSHOTS, label=BACKUP_LABEL)
+            result["backup"] = manifest and {"snapshot": manifest["id"], "files": manifest["stats"]["files"],
+                                             "new_bytes": manifest["stats"]["new_bytes"]}
+            if manifest:
+                # Der Backup-Speicher behält die neuen Blobs (auch Hardlinks): netto frei wird nur der Rest
+                stats = manifest["stats"]
+                result["freed_bytes"] = max(0, result["freed_bytes"] - stats["new_bytes"])
+                result["freed_inodes"] = max(0, result["freed_inodes"] - stats.get("new_blobs", 0))
+
+        for directory in touched_dirs:
+            fsync_directory(directory)
+
+    except (OSError, ValueError) as e:
+        log_and_print(f"[ERROR] Aktionsplan abgebrochen, nehme Änderungen zurück: {str(e)}", "error")
+        for step, source, target in reversed(undo):
+            try:
+                if step == "remove":
+                    if os.path.lexists(source):
+                        os.remove(source)
+                elif step == "move":
+                    shutil.move(source, target)
+                else:
+                    os.rename(source, target)
+            except OSError as undo_error:
+                log_and_print(f"[ERROR] Rücknahme fehlgeschlagen für {target or source}: {str(undo_error)}",
+                              "critical")
+        result.update(actions=[], freed_bytes=0, freed_inodes=0, rolled_back=True, error=str(e), backup=None)
+        shutil.rmtree(trash_dir, ignore_errors=True)
+        return result
+
+    # Commit: Papierkorb endgültig leeren
+    for entry in os.listdir(trash_dir):
+        staged = os.path.join(trash_dir, entry)
+        remove_tree(staged, staged_inodes.get(staged, 0))
+    os.rmdir(trash_dir)
+    return result
+
+
+def apply_recommendations(plan: List[Dict[str, Any]], project_root: str, dry_run: bool = False,
+                          backup: bool = True) -> List[str]:
+    """Wendet den Aktionsplan auf das Projekt an (mit dry_run nur als Beschreibung)
+
+    Args:
+        plan: Ergebnis von plan_recommendations()
+        project_root: ECHTER, unmaskierter Projekt-Root (report["project_root"] ist maskiert)
+        dry_run: nichts verändern, nur den Plan beschreiben
+        backup: gelöschte und ersetzte Dateien vorher im Backup-Speicher sichern
+    """
+    if not plan:
+        return []
+    if dry_run:
+        freed_bytes = sum(action.get("bytes", 0) for action in plan)
+        freed_inodes = sum(action.get("inodes", 0) for action in plan)
+        log_and_print(f"[DRY-RUN] Würde {freed_bytes} Bytes und {freed_inodes} Inodes freigeben"
+                      + (" (abzüglich neuer Blobs im Backup-Speicher)" if backup else ""))
+        return [describe_action(action, dry_run=True) for action in plan]
+
+    result = execute_plan(plan, project_root, backup)
+    if result["rolled_back"]:
+        return [f"Keine Änderungen: Aktionsplan zurückgenommen ({result['error']})"]
+    for path in result["skipped"]:
+        log_and_print(f"[OPTIMIZE] Übersprungen (nicht mehr vorhanden): {path}", "warning")
+    if result["backup"]:
+        log_and_print(f"[BACKUP] Snapshot {result['backup']['snapshot']}: {result['backup']['files']} Dateien "
+                      f"(neu belegt: {result['backup']['new_bytes']} Bytes); wiederherstellen mit "
+                      f"python irsanai_backup_store.py restore {result['backup']['snapshot']}")
+    log_and_print(f"[OPTIMIZE] Freigegeben: {result['freed_bytes']} Bytes, {result['freed_inodes']} Inodes"
+                  + (" (netto, nach Backup)" if result["backup"] else ""))
+    return result["actions"]
 
 
 # ======================
 # HAUPTFUNKTION
 # ======================
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Wertet die Kommandozeilenoptionen aus"""
+    parser = argparse.ArgumentParser(description="IrsanAI GitHub Repository Optimizer")
+    parser.add_argument("--profile", default=None, metavar="PFAD",
+                        help="Lauf mit cProfile profilieren und pstats-Daten nach PFAD schreiben "
+                             "(Zusammenfassung in PFAD.txt)")
+    parser.add_argument("--respect-gitignore", action="store_true",
+                        help="Von .gitignore erfasste Pfade zusätzlich als ignoriert zählen")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nichts verändern: nur den Aktionsplan ausgeben (auch im Report unter 'action_plan')")
+    parser.add_argument("--no-backup", action="store_true",
+                        help="Gelöschte und ersetzte Dateien nicht im Backup-Speicher (.IrsanAI/backups/) sichern")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Einstiegspunkt: Optionen auswerten, Lauf ggf. unter cProfile ausführen"""
+    global TUNING
+    args = parse_arguments(argv)
+    TUNING = load_tuning_hints()
+    INSTRUMENTATION.profile_file = args.profile
+    profile_call(args.profile, run_optimizer, args.respect_gitignore, args.dry_run, not args.no_backup)
+
+
+def run_optimizer(respect_gitignore: bool = False, dry_run: bool = False, backup: bool = True):
     """Hauptausführung des Skripts"""
     log_and_print("=" * 60)
     log_and_print("IrsanAI GITHUB REPOSITORY OPTIMIZER v1.0")
@@ -518,31 +853,42 @@ def main():
 
     # KRITISCH: IMMER ZUERST .gitignore AKTUALISIEREN - VOR DER ANALYSE!
     # WICHTIG: Verwende den ECHTEN, UNMASKIERTEN Pfad für Dateioperationen
-    gitignore_path = os.path.join(real_project_root, ".gitignore")
-    try:
-        with open(gitignore_path, 'w') as f:
-            f.write(generate_gitignore_content({
-                "project_root": real_project_root,
-                "file_types": {}
-            }))
-        log_and_print(f"[FIX] .gitignore wurde vor Analyse aktualisiert")
-    except Exception as e:
-        log_and_print(f"[WARNING] .gitignore konnte nicht vor Analyse aktualisiert werden: {str(e)}", "warning")
+    # Geschrieben wird nur bei abweichendem Inhalt; der Aktionsplan nach der Analyse enthält
+    # .gitignore dann nicht noch einmal.
+    gitignore_action = plan_gitignore(real_project_root)
+    if gitignore_action is None:
+        log_and_print("[FIX] .gitignore ist bereits aktuell")
+    elif dry_run:
+        log_and_print(f"[DRY-RUN] .gitignore würde vor der Analyse geschrieben ({gitignore_action['reason']})")
+    else:
+        result = execute_plan([gitignore_action], real_project_root, backup)
+        if result["rolled_back"]:
+            log_and_print(f"[WARNING] .gitignore konnte nicht vor Analyse aktualisiert werden: {result['error']}",
+                          "warning")
+        else:
+            log_and_print(f"[FIX] .gitignore wurde vor Analyse aktualisiert")
 
     try:
         # Analysiere Projektstruktur MIT MASKIERTEM PFAD NUR FÜR DEN REPORT
         log_and_print(f"[ANALYZE] Starte Analyse des Projekts: {real_project_root}")
-        report = analyze_project_structure(real_project_root)
+        report = analyze_project_structure(real_project_root, respect_gitignore)
+
+        # Aktionsplan vollständig vorab erstellen (ohne Inhalte auch im Report)
+        plan = plan_recommendations(report, real_project_root)
+        report["action_plan"] = [{key: value for key, value in action.items() if key != "content"}
+                                 for action in plan]
 
         # Speichere Report
-        with open(OPTIMIZATION_REPORT_FILE, 'w') as f:
-            json.dump(report, f, indent=2)
+        with INSTRUMENTATION.stage(STAGE_SERIALIZATION):
+            with open(OPTIMIZATION_REPORT_FILE, 'w') as f:
+                json.dump(report, f, indent=TUNING["json_indent"])
 
         log_and_print(f"\n[REPORT] Erfolgreich! Optimierungs-Report gespeichert in: {OPTIMIZATION_REPORT_FILE}")
 
         # Wende Recommendations an
-        log_and_print("\n[OPTIMIZE] Wende Optimierungsempfehlungen an...")
-        actions = apply_recommendations(report)
+        log_and_print("\n[DRY-RUN] Geplante Optimierungen (nichts wird verändert)..." if dry_run
+                      else "\n[OPTIMIZE] Wende Optimierungsempfehlungen an...")
+        actions = apply_recommendations(plan, real_project_root, dry_run, backup)
 
         for action in actions:
             log_and_print(f"- {action}")
@@ -555,6 +901,7 @@ def main():
         log_and_print(f"Gesamtverzeichnisse: {report['total_directories']}")
         log_and_print(f"Ignorierte Dateien: {report['ignored_files']}")
         log_and_print(f"Ignorierte Verzeichnisse: {report['ignored_directories']}")
+        log_and_print(f"Laufzeit je Stufe: {INSTRUMENTATION.stage_summary()}")
 
         if report['recommendations']['rule_violations']:
             log_and_print("\nGEFUNDENE REGELVERSTÖSSE:")
@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IrsanAI_Fleet_Aggregator.py
+Version: 1.0
+Beschreibung: Gemeinsame Auswertung vieler IrsanAI_env_report.json-Dateien einer Rechnerflotte
+
+Eingaben:
+- Verzeichnisse (rekursiv, *.json sowie *.ndjson/*.jsonl mit einem Bericht pro Zeile)
+- Archive (.tar, .tar.gz, .tgz, .tar.xz, .zip) - Mitglieder werden einzeln gelesen
+- '-' für NDJSON auf stdin (z.B. direkt aus "IrsanAI_OS_HW_Detector.py --batch --output -")
+
+Arbeitsweise:
+- Berichte werden gestreamt; pro Maschine bleibt nur eine kompakte Zeile im Speicher
+- Deduplizierung über die anonymisierte Maschinenkennung (anonymized_id); bei mehreren
+  Berichten derselben Maschine gilt der neueste (timestamp)
+- Spaltenorientierte Ablage: Zahlen in array('q'), Texte dictionary-codiert
+  (eindeutige Werte + Codes), dadurch wenige Bytes pro Maschine auch bei 100k Berichten
+- Hardware-Klassen = Kombination aus CPU- und GPU-Modell, gezählt je Maschine
+- Abfragen wie "effective_memory_mb<8192" laufen direkt über die Spalten; der Index
+  lässt sich speichern (--save-index) und ohne erneutes Einlesen abfragen (--index)
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import hashlib
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterator, Tuple, Callable
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+MAX_REPORT_BYTES = 8 * 1024 * 1024  # Größere Dateien sind keine Umgebungsberichte und werden übersprungen
+REPORT_SUFFIXES = (".json",)
+LINE_SUFFIXES = (".ndjson", ".jsonl")
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".zip")
+MISSING = -1  # Platzhalter für fehlende Zahlenwerte in den Spalten
+MEMORY_BUCKETS_MB = (4096, 8192, 16384, 32768, 65536)
+DEFAULT_TOP = 10
+DEFAULT_LIST_LIMIT = 50
+PROGRESS_EVERY = 10000
+
+
+def log(message: str) -> None:
+    """Statusmeldungen gehen nach stderr, damit stdout nur das Ergebnis enthält"""
+    print(message, file=sys.stderr)
+
+
+# ======================
+# EXTRAKTION
+# ======================
+def _int_or_missing(value: Any) -> int:
+    """Zahl aus dem Bericht oder MISSING"""
+    if isinstance(value, bool) or value is None:
+        return MISSING
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _gpu_summary(gpu_info: Any) -> Tuple[str, int, int]:
+    """Modellbezeichnung (sortiert, mehrere GPUs mit ' + '), Anzahl und Summe des Grafikspeichers in MB"""
+    if not isinstance(gpu_info, list) or not gpu_info:
+        return "none", 0, MISSING
+    names = sorted(str(gpu.get('name', 'Unknown')) for gpu in gpu_info if isinstance(gpu, dict))
+    memory_bytes = sum(gpu.get('memory_total') or 0 for gpu in gpu_info
+                       if isinstance(gpu, dict) and isinstance(gpu.get('memory_total'), int))
+    return " + ".join(names) or "none", len(names), (memory_bytes // (1024 * 1024)) if memory_bytes else MISSING
+
+
+def _python_version(python_env: Dict[str, Any]) -> str:
+    """Reduziert die Python-Version auf major.minor (3.11.7 -> 3.11)"""
+    version = str(python_env.get('version', 'Unknown'))
+    parts = version.split('.')
+    return '.'.join(parts[:2]) if len(parts) >= 2 else version
+
+
+def extract_record(report: Dict[str, Any], fallback_id: str) -> Dict[str, Any]:
+    """Reduziert einen Bericht auf die Spaltenwerte der Flotten-Auswertung
+
+    Ältere Berichte ohne anonymized_id erhalten fallback_id (Hash des Inhalts) und
+    werden damit nicht dedupliziert; ohne effective_total_mb gilt total_mb. 'sections' enthält
+    die erfassten Abschnitte (report_sections, z.B. bei --sections os,cpu), None für
+    vollständige Berichte.
+    """
+    cpu = report.get('cpu_info') or {}
+    memory = report.get('memory_info') or {}
+    os_info = report.get('os_info') or {}
+    gpu_model, gpu_count, gpu_memory_mb = _gpu_summary(report.get('gpu_info'))
+    total_mb = _int_or_missing(memory.get('total_mb'))
+
+    return {
+        'machine_id': str(report.get('anonymized_id') or fallback_id),
+        'timestamp': str(report.get('timestamp', '')),
+        'sections': set(report['report_sections']) if isinstance(report.get('report_sections'), list) else None,
+        'numeric': {
+            'logical_cores': _int_or_missing(cpu.get('logical_cores')),
+            'physical_cores': _int_or_missing(cpu.get('physical_cores')),
+            'effective_cpus': _int_or_missing(cpu.get('effective_cpus', cpu.get('logical_cores'))),
+            'total_memory_mb': total_mb,
+            'effective_memory_mb': _int_or_missing(memory.get('effective_total_mb', total_mb)),
+            'available_memory_mb': _int_or_missing(memory.get('effective_available_mb',
+                                                              memory.get('available_mb'))),
+            'gpu_count': gpu_count if 'gpu_info' in report else MISSING,
+            'gpu_memory_mb': gpu_memory_mb,
+        },
+        'categories': {
+            'os': str(os_info.get('name', 'Unknown')),
+            'cpu_model': str(cpu.get('model', 'Unknown')),
+            'gpu_model': gpu_model if 'gpu_info' in report else 'Unknown',
+            'python_version': _python_version(report.get('python_env') or {}),
+            'detector_version': str(report.get('detector_version', 'Unknown')),
+        }
+    }
+
+
+NUMERIC_COLUMNS = ('logical_cores', 'physical_cores', 'effective_cpus', 'total_memory_mb',
+                   'effective_memory_mb', 'available_memory_mb', 'gpu_count', 'gpu_memory_mb')
+CATEGORY_COLUMNS = ('os', 'cpu_model', 'gpu_model', 'python_version', 'detector_version')
+
+# Abschnitt des Detektors (REPORT_SECTIONS), aus dem eine Spalte stammt; None = immer enthalten
+COLUMN_SECTIONS: Dict[str, Optional[str]] = {
+    'logical_cores': 'cpu', 'physical_cores': 'cpu', 'effective_cpus': 'cpu',
+    'total_memory_mb': 'memory', 'effective_memory_mb': 'memory', 'available_memory_mb': 'memory',
+    'gpu_count': 'gpu', 'gpu_memory_mb': 'gpu',
+    'os': 'os', 'cpu_model': 'cpu', 'gpu_model': 'gpu', 'python_version': 'python', 'detector_version': None,
+}
+
+
+# ======================
+# SPALTENSPEICHER
+# ======================
+class CategoryColumn:
+    """Dictionary-codierte Textspalte: jeder eindeutige Wert wird nur einmal gespeichert"""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes_of: Dict[str, int] = {}
+        self.codes = array('I')
+
+    def code(self, value: str) -> int:
+        code = self.codes_of.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes_of[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: str) -> None:
+        self.codes.append(self.code(value))
+
+    def set(self, row: int, value: str) -> None:
+        self.codes[row] = self.code(value)
+
+    def value(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+
+def _section_included(column: str, sections: Optional[set]) -> bool:
+    """Wurde der Abschnitt der Spalte im Bericht erfasst? (vollständige Berichte: immer)"""
+    section = COLUMN_SECTIONS[column]
+    return sections is None or section is None or section in sections
+
+
+class FleetIndex:
+    """Spaltenorientierter Index über alle Maschinen einer Flotte (eine Zeile pro Maschine)"""
+
+    def __init__(self) -> None:
+        self.machine_ids: List[str] = []
+        self.timestamps: List[str] = []
+        self.row_of: Dict[str, int] = {}
+        self.numeric: Dict[str, array] = {name: array('q') for name in NUMERIC_COLUMNS}
+        self.categories: Dict[str, CategoryColumn] = {name: CategoryColumn() for name in CATEGORY_COLUMNS}
+        self.stats = Counter()
+
+    def __len__(self) -> int:
+        return len(self.machine_ids)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Übernimmt einen Bericht; ältere Berichte bereits bekannter Maschinen werden verworfen"""
+        self.stats['reports_read'] += 1
+        machine_id = record['machine_id']
+        row = self.row_of.get(machine_id)
+
+        if row is None:
+            self.row_of[machine_id] = len(self.machine_ids)
+            self.machine_ids.append(machine_id)
+            self.timestamps.append(record['timestamp'])
+            for name in NUMERIC_COLUMNS:
+                self.numeric[name].append(record['numeric'][name])
+            for name in CATEGORY_COLUMNS:
+                self.categories[name].append(record['categories'][name])
+            return
+
+        self.stats['duplicates'] += 1
+        # ISO-Zeitstempel sind lexikografisch sortierbar
+        if record['timestamp'] <= self.timestamps[row]:
+            return
+        self.timestamps[row] = record['timestamp']
+        # Ein Teilbericht (--sections) überschreibt nur seine Abschnitte bzw. bekannte Werte
+        sections = record.get('sections')
+        for name in NUMERIC_COLUMNS:
+            value = record['numeric'][name]
+            if value != MISSING or _section_included(name, sections):
+                self.numeric[name][row] = value
+        for name in CATEGORY_COLUMNS:
+            value = record['categories'][name]
+            if value != 'Unknown' or _section_included(name, sections):
+                self.categories[name].set(row, value)
+
+    def add_payload(self, name: str, payload: bytes) -> None:
+        """Parst einen einzelnen Bericht (JSON-Bytes) und übernimmt ihn in den Index"""
+        try:
+            report = json.loads(payload)
+            if not isinstance(report, dict):
+                raise ValueError("kein JSON-Objekt")
+        except ValueError as e:
+            self.stats['invalid_reports'] += 1
+            log(f"[FLEET] Ungültiger Bericht übersprungen: {name} ({str(e)[:80]})")
+            return
+        fallback_id = "report_" + hashlib.sha256(payload).hexdigest()[:16]
+        self.add(extract_record(report, fallback_id))
+
+    # ----------------------
+    # Persistenz
+    # ----------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "aggregator_version": VERSION,
+            "machine_ids": self.machine_ids,
+            "timestamps": self.timestamps,
+            "numeric": {name: column.tolist() for name, column in self.numeric.items()},
+            "categories": {name: {"values": column.values, "codes": column.codes.tolist()}
+                           for name, column in self.categories.items()},
+            "stats": dict(self.stats)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FleetIndex":
+        index = cls()
+        index.machine_ids = list(data["machine_ids"])
+        index.timestamps = list(data["timestamps"])
+        index.row_of = {machine_id: row for row, machine_id in enumerate(index.machine_ids)}
+        for name in NUMERIC_COLUMNS:
+            index.numeric[name] = array('q', data["numeric"][name])
+        for name in CATEGORY_COLUMNS:
+            column = index.categories[name]
+            column.values = list(data["categories"][name]["values"])
+            column.codes_of = {value: code for code, value in enumerate(column.values)}
+            column.codes = array('I', data["categories"][name]["codes"])
+        index.stats.update(data.get("stats", {}))
+        return index
+
+    def save(self, path: str) -> None:
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FleetIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+# ======================
+# EINGABEQUELLEN
+# ======================
+def _is_report_name(name: str) -> bool:
+    lower = name.lower()
+    return lower.endswith(REPORT_SUFFIXES) or lower.endswith(LINE_SUFFIXES)
+
+
+def iter_tar(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Liest ein tar-Archiv im Streaming-Modus (keine Mitgliederliste im Speicher)"""
+    import tarfile
+
+    with tarfile.open(path, mode='r|*') as archive:
+        for member in archive:
+            if not member.isfile() or not _is_report_name(member.name):
+                continue
+            if member.size > MAX_REPORT_BYTES and not member.name.lower().endswith(LINE_SUFFIXES):
+                log(f"[FLEET] Zu groß, übersprungen: {path}:{member.name}")
+                continue
+            handle = archive.extractfile(member)
+            if handle is None:
+                continue
+            if member.name.lower().endswith(LINE_SUFFIXES):
+                for line_number, line in enumerate(handle, 1):
+                    if line.strip():
+                        yield f"{path}:{member.name}:{line_number}", line
+            else:
+                yield f"{path}:{member.name}", handle.read()
+
+
+def iter_zip(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Liest ein zip-Archiv Mitglied für Mitglied"""
+    import zipfile
+
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_report_name(info.filename):
+                continue
+            if info.filename.lower().endswith(LINE_SUFFIXES):
+                with archive.open(info) as handle:
+                    for line_number, line in enumerate(handle, 1):
+                        if line.strip():
+                            yield f"{path}:{info.filename}:{line_number}", line
+            elif info.file_size > MAX_REPORT_BYTES:
+                log(f"[FLEET] Zu groß, übersprungen: {path}:{info.filename}")
+            else:
+                yield f"{path}:{info.filename}", archive.read(info)
+
+
+def iter_file(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Einzelne Berichtsdatei bzw. NDJSON-Datei (zeilenweise gestreamt)"""
+    if path.lower().endswith(LINE_SUFFIXES):
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield f"{path}:{line_number}", line
+        return
+    if os.path.getsize(path) > MAX_REPORT_BYTES:
+        log(f"[FLEET] Zu groß, übersprungen: {path}")
+        return
+    with open(path, 'rb') as f:
+        yield path, f.read()
+
+
+def iter_directory(root: str) -> Iterator[Tuple[str, bytes]]:
+    """Durchläuft ein Verzeichnis rekursiv in stabiler Reihenfolge"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if filename.lower().endswith(ARCHIVE_SUFFIXES):
+                yield from iter_source(path)
+            elif _is_report_name(filename):
+                yield from iter_file(path)
+
+
+def iter_source(source: str) -> Iterator[Tuple[str, bytes]]:
+    """Liefert (Name, JSON-Bytes) für jeden Bericht einer Quelle"""
+    if source == "-":
+        for line_number, line in enumerate(sys.stdin.buffer, 1):
+            if line.strip():
+                yield f"stdin:{line_number}", line
+    elif os.path.isdir(source):
+        yield from iter_directory(source)
+    elif source.lower().endswith(".zip"):
+        yield from iter_zip(source)
+    elif source.lower().endswith(ARCHIVE_SUFFIXES):
+        yield from iter_tar(source)
+    else:
+        yield from iter_file(source)
+
+
+def build_index(sources: List[str], index: Optional[FleetIndex] = None) -> FleetIndex:
+    """Liest alle Quellen in einen (ggf. bestehenden) Index ein"""
+    index = index if index is not None else FleetIndex()
+    start = time.perf_counter()
+    payloads = 0
+    for source in sources:
+        try:
+            for name, payload in iter_source(source):
+                index.add_payload(name, payload)
+                payloads += 1
+                if payloads % PROGRESS_EVERY == 0:
+                    log(f"[FLEET] {payloads} Berichte gelesen, {len(index)} Maschinen...")
+        except (OSError, EOFError) as e:
+            index.stats['unreadable_sources'] += 1
+            log(f"[FLEET] Quelle nicht lesbar: {source} ({str(e)})")
+    log(f"[FLEET] {index.stats['reports_read']} Berichte, {len(index)} Maschinen "
+        f"in {time.perf_counter() - start:.2f}s")
+    return index
+
+
+# ======================
+# ABFRAGEN
+# ======================
+QUERY_OPERATORS = ("<=", ">=", "!=", "==", "<", ">", "=", "~")
+# "and" bzw. Komma trennen Bedingungen nur, wenn danach "feld<operator>" folgt; Werte in
+# Anführungszeichen werden übersprungen ("cpu_model~'Ryzen, Threadripper'")
+QUERY_SEPARATOR = re.compile(
+    r"\"[^\"]*\"|'[^']*'|(?P<separator>(?:\s*,\s*|\s+and\s+)(?=\s*(?:{fields})\s*(?:{operators})))".format(
+        fields="|".join(NUMERIC_COLUMNS + CATEGORY_COLUMNS),
+        operators="|".join(re.escape(operator) for operator in QUERY_OPERATORS)),
+    re.IGNORECASE)
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "~": lambda a, b: b.lower() in a.lower(),
+}
+
+
+def _split_conditions(expression: str) -> List[str]:
+    """Trennt an QUERY_SEPARATOR; "and" und Kommas innerhalb eines Werts bleiben erhalten"""
+    parts = []
+    start = 0
+    for match in QUERY_SEPARATOR.finditer(expression):
+        if match.group("separator"):
+            parts.append(expression[start:match.start()])
+            start = match.end()
+    parts.append(expression[start:])
+    return parts
+
+
+def parse_query(expression: str) -> List[Tuple[str, str, str]]:
+    """Zerlegt "feld<wert and feld2~text" (auch mit Komma verbunden) in Bedingungen"""
+    conditions = []
+    for part in _split_conditions(expression):
+        part = part.strip()
+        if not part:
+            continue
+        # Der erste Operator im Text trennt Feld und Wert (bei gleicher Position der längste,
+        # z.B. "<=" vor "<"); spätere Zeichen wie in "cpu_model~x<y" gehören zum Wert
+        found = [(part.find(operator), -len(operator), operator) for operator in QUERY_OPERATORS
+                 if part.find(operator) > 0]
+        if not found:
+            raise ValueError(f"Kein Vergleichsoperator in '{part}' ({' '.join(QUERY_OPERATORS)})")
+        position, _, operator = min(found)
+        field, value = part[:position].strip(), part[position + len(operator):].strip()
+        if field not in NUMERIC_COLUMNS and field not in CATEGORY_COLUMNS:
+            raise ValueError(f"Unbekanntes Feld '{field}' (gültig: {', '.join(NUMERIC_COLUMNS + CATEGORY_COLUMNS)})")
+        if field in NUMERIC_COLUMNS and operator == "~":
+            raise ValueError(f"Operator '~' ist nur für Textfelder erlaubt: {part}")
+        conditions.append((field, operator, value.strip('"\'')))
+    if not conditions:
+        raise ValueError("Leere Abfrage")
+    return conditions
+
+
+def run_query(index: FleetIndex, expression: str, limit: int = DEFAULT_LIST_LIMIT) -> Dict[str, Any]:
+    """Wertet eine Abfrage spaltenweise aus; Maschinen ohne Wert im Feld erfüllen keine Bedingung"""
+    rows = range(len(index))
+    for field, operator, value in parse_query(expression):
+        compare = _COMPARATORS[operator]
+        if field in NUMERIC_COLUMNS:
+            threshold = float(value)
+            column = index.numeric[field]
+            rows = [row for row in rows if column[row] != MISSING and compare(column[row], threshold)]
+        else:
+            # Vergleich nur einmal je eindeutigem Wert, danach reiner Code-Abgleich
+            column = index.categories[field]
+            matching = {code for code, text in enumerate(column.values) if compare(text, value)}
+            codes = column.codes
+            rows = [row for row in rows if codes[row] in matching]
+
+    rows = list(rows)
+    return {
+        "query": expression,
+        "matches": len(rows),
+        "machines": len(index),
+        "hardware_classes": _top_classes(index, rows, DEFAULT_TOP),
+        "machine_ids": [index.machine_ids[row] for row in rows[:limit]],
+        "truncated": len(rows) > limit
+    }
+
+
+# ======================
+# ZUSAMMENFASSUNG
+# ======================
+def _percentile(sorted_values: List[int], pct: float) -> Optional[float]:
+    """Perzentil mit linearer Interpolation über eine sortierte Liste"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return round(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower), 1)
+
+
+def summarize_numeric(column: array) -> Dict[str, Any]:
+    """Kennzahlen einer Zahlenspalte ohne fehlende Werte"""
+    values = sorted(value for value in column if value != MISSING)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": values[0],
+        "max": values[-1],
+        "mean": round(sum(values) / len(values), 1),
+        "p10": _percentile(values, 10),
+        "p50": _percentile(values, 50),
+        "p90": _percentile(values, 90)
+    }
+
+
+def memory_histogram(column: array) -> Dict[str, int]:
+    """Verteilung des Speichers auf feste Größenklassen (in GB beschriftet)"""
+    labels = []
+    lower = 0
+    for upper in MEMORY_BUCKETS_MB:
+        labels.append(f"{lower // 1024}-{upper // 1024}GB")
+        lower = upper
+    labels.append(f">={lower // 1024}GB")
+
+    counts = [0] * len(labels)
+    for value in column:
+        if value == MISSING:
+            continue
+        bucket = 0
+        while bucket < len(MEMORY_BUCKETS_MB) and value >= MEMORY_BUCKETS_MB[bucket]:
+            bucket += 1
+        counts[bucket] += 1
+    return dict(zip(labels, counts))
+
+
+def _category_counts(column: CategoryColumn, rows: Optional[List[int]], top: int) -> Dict[str, int]:
+    codes = column.codes if rows is None else (column.codes[row] for row in rows)
+    return {column.values[code]: count for code, count in Counter(codes).most_common(top)}
+
+
+def _top_classes(index: FleetIndex, rows: Optional[List[int]], top: int) -> List[Dict[str, Any]]:
+    """Hardware-Klassen (CPU- x GPU-Modell) nach Anzahl Maschinen"""
+    cpu = index.categories['cpu_model']
+    gpu = index.categories['gpu_model']
+    selected = range(len(index)) if rows is None else rows
+    classes = Counter((cpu.codes[row], gpu.codes[row]) for row in selected)
+    return [{"cpu_model": cpu.values[cpu_code], "gpu_model": gpu.values[gpu_code], "machines": count}
+            for (cpu_code, gpu_code), count in classes.most_common(top)]
+
+
+def summarize_fleet(index: FleetIndex, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """Kompakte Flotten-Zusammenfassung aus den Spalten des Index"""
+    cpu = index.categories['cpu_model']
+    gpu = index.categories['gpu_model']
+    return {
+        "aggregator_version": VERSION,
+        "machines": len(index),
+        "reports_read": index.stats['reports_read'],
+        "duplicate_reports": index.stats['duplicates'],
+        "invalid_reports": index.stats['invalid_reports'],
+        "hardware_class_count": len({(cpu.codes[row], gpu.codes[row]) for row in range(len(index))}),
+        "hardware_classes": _top_classes(index, None, top),
+        "distributions": {name: summarize_numeric(index.numeric[name]) for name in NUMERIC_COLUMNS},
+        "logical_cores_histogram": {str(cores): count for cores, count in
+                                    sorted(Counter(v for v in index.numeric['logical_cores'] if v != MISSING).items())},
+        "effective_memory_histogram": memory_histogram(index.numeric['effective_memory_mb']),
+        "categories": {name: _category_counts(column, None, top) for name, column in index.categories.items()}
+    }
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IrsanAI Flotten-Auswertung für Umgebungsberichte")
+    parser.add_argument("sources", nargs="*",
+                        help="Verzeichnisse, Berichte, NDJSON-Dateien, tar-/zip-Archive oder '-' für stdin")
+    parser.add_argument("--index", help="Gespeicherten Index laden (weitere Quellen werden ergänzt)")
+    parser.add_argument("--save-index", metavar="PFAD", help="Index für spätere Abfragen speichern")
+    parser.add_argument("--query", action="append", default=[],
+                        help="Abfrage, z.B. \"effective_memory_mb<8192\" oder \"gpu_model~RTX, logical_cores>=8\"; "
+                             "Werte mit ' and ' oder Komma vor einem weiteren Feld in Anführungszeichen")
+    parser.add_argument("--list", type=int, default=DEFAULT_LIST_LIMIT, metavar="ANZAHL",
+                        help=f"Maximale Anzahl Maschinen-IDs je Abfrage (Standard: {DEFAULT_LIST_LIMIT})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"Anzahl Einträge je Rangliste (Standard: {DEFAULT_TOP})")
+    parser.add_argument("--output", help="Ergebnis in diese Datei schreiben statt auf stdout")
+    args = parser.parse_args(argv)
+
+    if not args.sources and not args.index:
+        parser.error("Mindestens eine Quelle oder --index angeben")
+
+    index = FleetIndex.load(args.index) if args.index else None
+    if args.sources:
+        index = build_index(args.sources, index)
+    if args.save_index:
+        index.save(args.save_index)
+        log(f"[FLEET] Index gespeichert: {args.save_index}")
+
+    result: Dict[str, Any] = {"summary": summarize_fleet(index, args.top)}
+    try:
+        result["queries"] = [run_query(index, expression, args.list) for expression in args.query]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IrsanAI_HW_Benchmark.py
+Version: 1.0
+Beschreibung: Kurze, zeitlich begrenzte Mikro-Benchmarks für das performance_profile
+              des IrsanAI-Umgebungsberichts (optionaler --benchmark-Schritt von
+              IrsanAI_OS_HW_Detector.py)
+
+WICHTIGER HINWEIS:
+Alle Messungen laufen ausschließlich lokal. Es werden keine Netzwerkverbindungen
+aufgebaut, temporäre Messdateien werden nach jeder Messung wieder entfernt.
+
+Messgrößen:
+- Single-Core Python-Schleifendurchsatz
+- Skalierungseffizienz mit mehreren Prozessen
+- Speicherbandbreite (Kopie großer bytearrays)
+- SHA-256 Hashing-Durchsatz
+- Sequentielles Lesen/Schreiben und fsync-Latenz im Projektverzeichnis
+- tmpfs (/dev/shm) im Vergleich zur Festplatte
+"""
+
+import os
+import sys
+import time
+import math
+import hashlib
+import tempfile
+import statistics
+import multiprocessing
+from typing import Dict, List, Optional, Any, Callable
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+DEFAULT_TIME_BUDGET = 10.0  # Sekunden für den gesamten Benchmark-Schritt
+MIN_REPETITIONS = 3
+MAX_REPETITIONS = 10
+LOOP_ITERATIONS = 200_000
+MEMORY_BUFFER_MB = 64
+HASH_BUFFER_MB = 16
+DISK_FILE_MB = 32
+DISK_BLOCK_SIZE = 1024 * 1024
+FSYNC_PROBES = 20
+MAX_SCALING_WORKERS = 8
+TMPFS_DIR = "/dev/shm"
+
+# 97,5%-Quantile der Student-t-Verteilung für 95%-Konfidenzintervalle (Freiheitsgrade)
+T_QUANTILES_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
+    6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228
+}
+
+
+# ======================
+# STATISTIK & ZEITBUDGET
+# ======================
+class BenchmarkBudget:
+    """Verteilt ein festes Gesamt-Zeitbudget auf die einzelnen Benchmarks"""
+
+    def __init__(self, total_seconds: float):
+        self.total_seconds = total_seconds
+        self.start = time.perf_counter()
+        self.deadline = self.start + total_seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def share(self, benchmarks_left: int) -> float:
+        """Gleichmäßiger Anteil des Restbudgets für den nächsten Benchmark"""
+        return self.remaining() / max(1, benchmarks_left)
+
+
+def summarize_samples(samples: List[float], unit: str, digits: int = 2) -> Dict[str, Any]:
+    """Mittelwert, Standardabweichung und 95%-Konfidenzintervall einer Messreihe"""
+    if not samples:
+        return {"unit": unit, "samples": 0, "mean": None, "stdev": None, "ci95": None}
+
+    mean = statistics.fmean(samples)
+    if len(samples) > 1:
+        stdev = statistics.stdev(samples)
+        t_value = T_QUANTILES_95.get(len(samples) - 1, 1.96)
+        half_width = t_value * stdev / math.sqrt(len(samples))
+    else:
+        stdev = 0.0
+        half_width = float('inf')
+
+    return {
+        "unit": unit,
+        "samples": len(samples),
+        "mean": round(mean, digits),
+        "stdev": round(stdev, digits),
+        "ci95": [round(mean - half_width, digits), round(mean + half_width, digits)]
+        if math.isfinite(half_width) else None
+    }
+
+
+def repeat_within(func: Callable[[], float], time_slice: float,
+                  min_reps: int = MIN_REPETITIONS, max_reps: int = MAX_REPETITIONS) -> List[float]:
+    """Wiederholt eine Messung, bis genug Stichproben vorliegen oder das Zeitfenster erschöpft ist.
+
+    Eine weitere Wiederholung wird nur gestartet, wenn sie voraussichtlich noch in das
+    Zeitfenster passt - das Budget ist damit eine harte Obergrenze, auch wenn dadurch
+    weniger als min_reps Stichproben entstehen.
+    """
+    samples = []
+    start = time.perf_counter()
+    last_duration = 0.0
+
+    while len(samples) < max_reps:
+        elapsed = time.perf_counter() - start
+        if samples and elapsed + last_duration > time_slice:
+            break
+        if len(samples) >= min_reps and elapsed > time_slice / 2:
+            break
+        rep_start = time.perf_counter()
+        samples.append(func())
+        last_duration = time.perf_counter() - rep_start
+
+    return samples
+
+
+# ======================
+# EINZELNE BENCHMARKS
+# ======================
+def cpu_work(iterations: int) -> int:
+    """Reine Python-Rechenlast (modulweit, damit sie in Worker-Prozessen pickelbar ist)"""
+    total = 0
+    for i in range(iterations):
+        total += i & 7
+    return total
+
+
+def bench_python_loop() -> float:
+    """Schleifendurchsatz eines Kerns in Iterationen pro Sekunde"""
+    start = time.perf_counter()
+    cpu_work(LOOP_ITERATIONS)
+    return LOOP_ITERATIONS / (time.perf_counter() - start)
+
+
+def bench_multiprocess_scaling(workers: int, time_slice: float) -> Dict[str, Any]:
+    """Vergleicht die Laufzeit gleicher Arbeitspakete mit 1 und mit N Prozessen"""
+    context = multiprocessing.get_context()
+    with context.Pool(processes=workers) as pool:
+        # Aufwärmen: Prozessstart ist nicht Teil der Messung
+        pool.map(cpu_work, [1000] * workers)
+
+        def single() -> float:
+            start = time.perf_counter()
+            pool.map(cpu_work, [LOOP_ITERATIONS])
+            return time.perf_counter() - start
+
+        def parallel() -> float:
+            start = time.perf_counter()
+            pool.map(cpu_work, [LOOP_ITERATIONS] * workers, chunksize=1)
+            return time.perf_counter() - start
+
+        efficiencies = []
+        deadline = time.perf_counter() + time_slice
+        while len(efficiencies) < MAX_REPETITIONS and time.perf_counter() < deadline:
+            t_single = single()
+            t_parallel = parallel()
+            efficiencies.append(t_single / t_parallel if t_parallel > 0 else 0.0)
+            if time.perf_counter() + t_single + t_parallel > deadline:
+                break
+
+    efficiency = summarize_samples(efficiencies, "ratio", digits=3)
+    speedup = summarize_samples([e * workers for e in efficiencies], "x", digits=2)
+    return {"workers": workers, "efficiency": efficiency, "speedup": speedup}
+
+
+def bench_memory_copy(buffer: bytearray, target: bytearray) -> float:
+    """Kopierdurchsatz großer Puffer in MB/s (gemessen wird die kopierte Datenmenge)"""
+    start = time.perf_counter()
+    target[:] = buffer
+    duration = time.perf_counter() - start
+    return (len(buffer) / (1024 * 1024)) / duration
+
+
+def bench_hashing(buffer: memoryview) -> float:
+    """SHA-256-Durchsatz in MB/s"""
+    start = time.perf_counter()
+    hashlib.sha256(buffer).digest()
+    duration = time.perf_counter() - start
+    return (len(buffer) / (1024 * 1024)) / duration
+
+
+def _drop_page_cache(fd: int) -> None:
+    """Bittet den Kernel, die Seiten der Datei zu verwerfen (nur wo posix_fadvise existiert)"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def bench_sequential_io(directory: str, file_mb: int) -> Dict[str, float]:
+    """Schreibt und liest eine Testdatei sequentiell; liefert MB/s für beide Richtungen"""
+    block = os.urandom(DISK_BLOCK_SIZE)
+    blocks = max(1, file_mb * 1024 * 1024 // DISK_BLOCK_SIZE)
+    fd, path = tempfile.mkstemp(prefix=".irsanai_bench_", dir=directory)
+    try:
+        start = time.perf_counter()
+        for _ in range(blocks):
+            os.write(fd, block)
+        os.fsync(fd)
+        write_duration = time.perf_counter() - start
+
+        _drop_page_cache(fd)
+        os.lseek(fd, 0, os.SEEK_SET)
+        start = time.perf_counter()
+        while os.read(fd, DISK_BLOCK_SIZE):
+            pass
+        read_duration = time.perf_counter() - start
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+    size_mb = blocks * DISK_BLOCK_SIZE / (1024 * 1024)
+    return {"write": size_mb / write_duration, "read": size_mb / read_duration}
+
+
+def bench_fsync_latency(directory: str, time_slice: float) -> List[float]:
+    """Latenz kleiner Schreibvorgänge mit anschließendem fsync in Millisekunden"""
+    payload = b"\0" * 4096
+    latencies = []
+    fd, path = tempfile.mkstemp(prefix=".irsanai_fsync_", dir=directory)
+    try:
+        deadline = time.perf_counter() + time_slice
+        while len(latencies) < FSYNC_PROBES and time.perf_counter() < deadline:
+            start = time.perf_counter()
+            os.write(fd, payload)
+            os.fsync(fd)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        os.close(fd)
+        os.remove(path)
+    return latencies
+
+
+# ======================
+# GESAMTABLAUF
+# ======================
+def run_benchmarks(time_budget: float = DEFAULT_TIME_BUDGET,
+                   project_dir: Optional[str] = None,
+                   max_workers: Optional[int] = None,
+                   memory_limit_mb: Optional[int] = None) -> Dict[str, Any]:
+    """Führt alle Mikro-Benchmarks innerhalb des Zeitbudgets aus und liefert das performance_profile"""
+    budget = BenchmarkBudget(time_budget)
+    project_dir = project_dir or os.getcwd()
+    results: Dict[str, Any] = {}
+    skipped: List[str] = []
+
+    # Puffergrößen an den tatsächlich nutzbaren Speicher anpassen (max. 1/8 davon)
+    buffer_mb = MEMORY_BUFFER_MB
+    if memory_limit_mb:
+        buffer_mb = max(1, min(MEMORY_BUFFER_MB, memory_limit_mb // 8))
+    hash_mb = min(HASH_BUFFER_MB, buffer_mb)
+
+    workers = max(1, min(MAX_SCALING_WORKERS, max_workers or os.cpu_count() or 1))
+    use_tmpfs = os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK)
+
+    stages = ["python_loop", "memory_copy", "sha256_hashing", "disk_sequential", "disk_fsync_latency"]
+    if workers > 1:
+        stages.insert(1, "multiprocess_scaling")
+    if use_tmpfs:
+        stages.append("tmpfs_sequential")
+
+    buffer = bytearray(os.urandom(1024)) * (buffer_mb * 1024)
+    target = bytearray(len(buffer))
+
+    for index, stage in enumerate(stages):
+        time_slice = budget.share(len(stages) - index)
+        if time_slice < 0.05:
+            skipped.append(stage)
+            continue
+
+        try:
+            if stage == "python_loop":
+                results[stage] = summarize_samples(repeat_within(bench_python_loop, time_slice), "ops/s", 0)
+            elif stage == "multiprocess_scaling":
+                results[stage] = bench_multiprocess_scaling(workers, time_slice)
+            elif stage == "memory_copy":
+                samples = repeat_within(lambda: bench_memory_copy(buffer, target), time_slice)
+                results[stage] = dict(summarize_samples(samples, "MB/s"), buffer_mb=buffer_mb)
+            elif stage == "sha256_hashing":
+                view = memoryview(buffer)[:hash_mb * 1024 * 1024]
+                samples = repeat_within(lambda: bench_hashing(view), time_slice)
+                results[stage] = dict(summarize_samples(samples, "MB/s"), buffer_mb=hash_mb)
+            elif stage in ("disk_sequential", "tmpfs_sequential"):
+                directory = project_dir if stage == "disk_sequential" else TMPFS_DIR
+                prefix = stage.split('_')[0]
+                # Bei knappem Zeitfenster kleinere Testdatei, damit schon der erste Lauf hineinpasst
+                file_mb = DISK_FILE_MB if time_slice >= 2 else max(4, int(DISK_FILE_MB * time_slice / 2))
+                runs = repeat_within(lambda: bench_sequential_io(directory, file_mb), time_slice,
+                                     min_reps=2, max_reps=5)
+                # repeat_within sammelt Dicts - getrennt nach Richtung zusammenfassen
+                results[f"{prefix}_sequential_write"] = summarize_samples([r["write"] for r in runs], "MB/s")
+                results[f"{prefix}_sequential_read"] = summarize_samples([r["read"] for r in runs], "MB/s")
+            elif stage == "disk_fsync_latency":
+                results[stage] = summarize_samples(bench_fsync_latency(project_dir, time_slice), "ms", 3)
+        except Exception as e:
+            results[stage] = {"error": str(e)}
+
+    del buffer, target
+
+    disk_write = results.get("disk_sequential_write", {}).get("mean")
+    tmpfs_write = results.get("tmpfs_sequential_write", {}).get("mean")
+    if disk_write and tmpfs_write:
+        results["tmpfs_vs_disk_write_ratio"] = round(tmpfs_write / disk_write, 2)
+
+    return {
+        "benchmark_version": VERSION,
+        "time_budget_seconds": time_budget,
+        "elapsed_seconds": round(budget.elapsed(), 3),
+        "budget_exhausted": bool(skipped),
+        "skipped": skipped,
+        "confidence_level": 0.95,
+        "benchmarks": results
+    }
+
+
+if __name__ == "__main__":
+    import json
+
+    budget_arg = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TIME_BUDGET
+    print(json.dumps(run_benchmarks(budget_arg), indent=2))
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IrsanAI_HW_Sampler.py
+Version: 1.0
+Beschreibung: Kontinuierliche, ressourcenschonende Lastmessung für den IrsanAI-Umgebungsbericht
+              (--sample-Modus von IrsanAI_OS_HW_Detector.py oder eigenständig neben laufenden Jobs)
+
+WICHTIGER HINWEIS:
+Es werden ausschließlich systemweite Zähler gelesen (CPU-Auslastung, Pressure Stall
+Information, Load Average, Datenträger-I/O, Kontextwechsel). Keine Prozesslisten,
+keine Nutzerdaten, keine Netzwerkverbindungen.
+
+Messprinzip:
+- Linux: direkte Auswertung von /proc/stat, /proc/pressure/*, /proc/loadavg,
+  /proc/meminfo und /proc/diskstats (Deltas zwischen zwei Messpunkten)
+- Andere Plattformen: psutil, sofern installiert, sonst nur Load Average
+- Messpunkte landen in einem Ringpuffer fester Größe; der Bericht enthält nur
+  kompakte Kennzahlen und Perzentile sowie den Eigenverbrauch des Samplers
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+DEFAULT_INTERVAL = 1.0  # Sekunden zwischen zwei Messpunkten
+DEFAULT_DURATION = 30.0  # Sekunden Gesamtdauer (0 = bis Strg+C)
+DEFAULT_CAPACITY = 3600  # Maximale Anzahl Messpunkte im Ringpuffer
+PROCFS_ROOT = "/proc"
+SYSFS_ROOT = "/sys"
+SECTOR_SIZE = 512  # /proc/diskstats zählt immer in 512-Byte-Sektoren
+PERCENTILES = (50, 90, 95, 99)
+
+# Reihenfolge der Werte in einem Messpunkt (Tupel statt Dict spart Speicher im Ringpuffer)
+SAMPLE_FIELDS = (
+    "cpu_percent", "load_1m", "memory_available_percent",
+    "psi_cpu_some_percent", "psi_memory_some_percent", "psi_memory_full_percent",
+    "psi_io_some_percent", "psi_io_full_percent",
+    "disk_read_mb_s", "disk_write_mb_s", "disk_busy_percent", "context_switches_per_s"
+)
+
+
+# ======================
+# HILFSFUNKTIONEN
+# ======================
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Perzentil mit linearer Interpolation über eine bereits sortierte Liste"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize_series(values: List[float]) -> Dict[str, Any]:
+    """Kompakte Kennzahlen (Mittelwert, Min, Max, Perzentile) einer Messreihe"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"samples": 0}
+    ordered = sorted(values)
+    summary = {
+        "samples": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "min": round(ordered[0], 2),
+        "max": round(ordered[-1], 2)
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = round(percentile(ordered, pct), 2)
+    return summary
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# ======================
+# SAMPLER
+# ======================
+class ResourceSampler:
+    """Periodische Lastmessung mit Ringpuffer und Eigenverbrauchsmessung"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY,
+                 procfs_root: Optional[str] = None):
+        self.interval = max(0.05, interval)
+        self.procfs_root = procfs_root or PROCFS_ROOT
+        self.samples: deque = deque(maxlen=capacity)
+        self.core_samples: deque = deque(maxlen=capacity)
+        self.dropped = 0
+        self.use_procfs = sys.platform.startswith('linux') and os.path.exists(
+            os.path.join(self.procfs_root, "stat"))
+        self.psutil = None
+        if not self.use_procfs:
+            try:
+                import psutil
+                self.psutil = psutil
+            except ImportError:
+                pass
+
+        self.has_pressure = os.path.isdir(os.path.join(self.procfs_root, "pressure"))
+        self.whole_disks = self._detect_whole_disks()
+        self._previous: Optional[Dict[str, Any]] = None
+        self._sampling_cpu_seconds = 0.0
+        self._sampling_wall_seconds = 0.0
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    # ---------- Rohdaten ----------
+    def _detect_whole_disks(self) -> Optional[set]:
+        """Physische Datenträger (ohne Partitionen/loop/ram) - einmalig beim Start ermittelt
+
+        Gestapelte Geräte (dm-* für LVM/LUKS, md* für RAID) führen ihre Unterlage in
+        /sys/block/<dev>/slaves; ihr I/O ist dort bereits gezählt und würde sonst doppelt eingehen.
+        """
+        block_root = os.path.join(SYSFS_ROOT, "block")
+        try:
+            names = os.listdir(block_root)
+        except OSError:
+            return None
+        disks = set()
+        for name in names:
+            if name.startswith(('loop', 'ram', 'zram')):
+                continue
+            try:
+                if os.listdir(os.path.join(block_root, name, "slaves")):
+                    continue
+            except OSError:
+                pass
+            disks.add(name)
+        return disks
+
+    def _read_proc_stat(self) -> Tuple[List[Tuple[int, int]], int]:
+        """(busy, total)-Jiffies je Zeile 'cpu'/'cpuN' sowie Anzahl Kontextwechsel"""
+        cpus = []
+        ctxt = 0
+        for line in (_read_text(os.path.join(self.procfs_root, "stat")) or "").splitlines():
+            if line.startswith('cpu'):
+                fields = [int(v) for v in line.split()[1:]]
+                # idle + iowait gelten als untätig; guest ist bereits in user enthalten
+                idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+                total = sum(fields[:8])
+                cpus.append((total - idle, total))
+            elif line.startswith('ctxt'):
+                ctxt = int(line.split()[1])
+        return cpus, ctxt
+
+    def _read_pressure(self) -> Dict[str, int]:
+        """Kumulierte Stall-Zeiten (µs) aus /proc/pressure/{cpu,memory,io}"""
+        totals = {}
+        if not self.has_pressure:
+            return totals
+        for resource in ("cpu", "memory", "io"):
+            content = _read_text(os.path.join(self.procfs_root, "pressure", resource)) or ""
+            for line in content.splitlines():
+                kind, _, rest = line.partition(' ')
+                for item in rest.split():
+                    if item.startswith('total='):
+                        totals[f"{resource}_{kind}"] = int(item[6:])
+        return totals
+
+    def _read_diskstats(self) -> Tuple[int, int, int]:
+        """Summe gelesener/geschriebener Sektoren und I/O-Zeit (ms) über alle ganzen Datenträger"""
+        read_sectors = write_sectors = io_ms = 0
+        for line in (_read_text(os.path.join(self.procfs_root, "diskstats")) or "").splitlines():
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            name = fields[2]
+            if self.whole_disks is not None and name not in self.whole_disks:
+                continue
+            read_sectors += int(fields[5])
+            write_sectors += int(fields[9])
+            io_ms += int(fields[12])
+        return read_sectors, write_sectors, io_ms
+
+    def _read_memory_available_percent(self) -> Optional[float]:
+        total = available = None
+        for line in (_read_text(os.path.join(self.procfs_root, "meminfo")) or "").splitlines():
+            if line.startswith('MemTotal:'):
+                total = int(line.split()[1])
+            elif line.startswith('MemAvailable:'):
+                available = int(line.split()[1])
+                break
+        if total and available is not None:
+            return available * 100 / total
+        return None
+
+    def _read_raw(self) -> Dict[str, Any]:
+        raw: Dict[str, Any] = {"time": time.monotonic()}
+        try:
+            raw["load_1m"] = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            raw["load_1m"] = None
+
+        if self.use_procfs:
+            raw["cpus"], raw["ctxt"] = self._read_proc_stat()
+            raw["pressure"] = self._read_pressure()
+            raw["disk"] = self._read_diskstats()
+            raw["memory_available_percent"] = self._read_memory_available_percent()
+        elif self.psutil:
+            raw["core_percent"] = self.psutil.cpu_percent(percpu=True)
+            raw["ctxt"] = self.psutil.cpu_stats().ctx_switches
+            counters = self.psutil.disk_io_counters()
+            raw["disk"] = ((counters.read_bytes // SECTOR_SIZE, counters.write_bytes // SECTOR_SIZE,
+                            getattr(counters, 'busy_time', 0)) if counters else (0, 0, 0))
+            raw["memory_available_percent"] = 100 - self.psutil.virtual_memory().percent
+        return raw
+
+    # ---------- Messpunkte ----------
+    def sample_once(self) -> None:
+        """Erfasst einen Messpunkt (Deltas zum vorherigen Rohwert) im Ringpuffer"""
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+
+        raw = self._read_raw()
+        previous = self._previous
+        self._previous = raw
+
+        if previous is not None:
+            elapsed = max(1e-6, raw["time"] - previous["time"])
+            values: Dict[str, Optional[float]] = {field: None for field in SAMPLE_FIELDS}
+            values["load_1m"] = raw.get("load_1m")
+            values["memory_available_percent"] = raw.get("memory_available_percent")
+
+            core_percent: List[float] = []
+            if "cpus" in raw and previous.get("cpus"):
+                for (busy, total), (prev_busy, prev_total) in zip(raw["cpus"], previous["cpus"]):
+                    delta_total = total - prev_total
+                    core_percent.append((busy - prev_busy) * 100 / delta_total if delta_total > 0 else 0.0)
+                # Erste Zeile ist die Summe aller Kerne
+                values["cpu_percent"] = core_percent.pop(0) if core_percent else None
+            elif "core_percent" in raw:
+                core_percent = raw["core_percent"]
+                values["cpu_percent"] = sum(core_percent) / len(core_percent) if core_percent else None
+
+            if "ctxt" in raw and "ctxt" in previous:
+                values["context_switches_per_s"] = (raw["ctxt"] - previous["ctxt"]) / elapsed
+
+            if "disk" in raw and "disk" in previous:
+                read_delta = raw["disk"][0] - previous["disk"][0]
+                write_delta = raw["disk"][1] - previous["disk"][1]
+                busy_delta = raw["disk"][2] - previous["disk"][2]
+                values["disk_read_mb_s"] = read_delta * SECTOR_SIZE / (1024 * 1024) / elapsed
+                values["disk_write_mb_s"] = write_delta * SECTOR_SIZE / (1024 * 1024) / elapsed
+                values["disk_busy_percent"] = min(100.0, busy_delta / (elapsed * 10))
+
+            pressure, prev_pressure = raw.get("pressure", {}), previous.get("pressure", {})
+            for key, field in (("cpu_some", "psi_cpu_some_percent"), ("memory_some", "psi_memory_some_percent"),
+                               ("memory_full", "psi_memory_full_percent"), ("io_some", "psi_io_some_percent"),
+                               ("io_full", "psi_io_full_percent")):
+                if key in pressure and key in prev_pressure:
+                    values[field] = (pressure[key] - prev_pressure[key]) / (elapsed * 10000)
+
+            if len(self.samples) == self.samples.maxlen:
+                self.dropped += 1
+            self.samples.append(tuple(values[field] for field in SAMPLE_FIELDS))
+            self.core_samples.append(tuple(core_percent))
+
+        self._sampling_cpu_seconds += time.process_time() - cpu_start
+        self._sampling_wall_seconds += time.perf_counter() - wall_start
+
+    def run(self, duration: float = DEFAULT_DURATION) -> None:
+        """Misst im festen Takt (ohne Drift) für die angegebene Dauer; 0 = bis Strg+C"""
+        self._started = time.monotonic()
+        next_tick = self._started
+        end = self._started + duration if duration > 0 else None
+        try:
+            while True:
+                self.sample_once()
+                next_tick += self.interval
+                if end is not None and next_tick > end:
+                    break
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Überlast: verpasste Takte überspringen statt aufzuholen
+                    next_tick = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._finished = time.monotonic()
+
+    # ---------- Auswertung ----------
+    def summary(self) -> Dict[str, Any]:
+        """Kennzahlen und Perzentile aller Messreihen inkl. Eigenverbrauch des Samplers"""
+        columns = list(zip(*self.samples)) if self.samples else [()] * len(SAMPLE_FIELDS)
+        metrics = {field: summarize_series(list(column)) for field, column in zip(SAMPLE_FIELDS, columns)}
+
+        per_core = []
+        if self.core_samples and self.core_samples[-1]:
+            for index, column in enumerate(zip(*self.core_samples)):
+                series = summarize_series(list(column))
+                per_core.append({"core": index, "mean": series.get("mean"), "p95": series.get("p95"),
+                                 "max": series.get("max")})
+
+        wall = ((self._finished or time.monotonic()) - self._started) if self._started else 0.0
+        sample_count = len(self.samples) + self.dropped
+        return {
+            "sampler_version": VERSION,
+            "source": "procfs" if self.use_procfs else ("psutil" if self.psutil else "loadavg"),
+            "interval_seconds": self.interval,
+            "duration_seconds": round(wall, 2),
+            "samples": len(self.samples),
+            "dropped_samples": self.dropped,
+            "pressure_available": self.has_pressure,
+            "metrics": metrics,
+            "per_core_cpu_percent": per_core,
+            "self_overhead": {
+                "cpu_seconds": round(self._sampling_cpu_seconds, 4),
+                "cpu_percent_of_one_core": round(self._sampling_cpu_seconds * 100 / wall, 4) if wall else None,
+                "mean_sample_cost_ms": round(self._sampling_wall_seconds * 1000 / (sample_count + 1), 3)
+            }
+        }
+
+
+def run_sampling(interval: float = DEFAULT_INTERVAL, duration: float = DEFAULT_DURATION,
+                 capacity: int = DEFAULT_CAPACITY) -> Dict[str, Any]:
+    """Komfortfunktion: Sampler starten, laufen lassen und Zusammenfassung liefern"""
+    sampler = ResourceSampler(interval=interval, capacity=capacity)
+    sampler.run(duration)
+    return sampler.summary()
+
+
+if __name__ == "__main__":
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IrsanAI Ressourcen-Sampler")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Messdauer in Sekunden (0 = bis Strg+C)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument("--output", help="Zusammenfassung in diese Datei schreiben statt auf stdout")
+    args = parser.parse_args()
+
+    result = run_sampling(args.interval, args.duration, args.capacity)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
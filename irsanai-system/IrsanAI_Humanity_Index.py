@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IrsanAI_Humanity_Index.py
+Version: 1.0
+Beschreibung: Berechnet die Kennzahlen des IrsanAI Humanity Index aus der Scan-Historie
+              (.IrsanAI/Reports/scan_history.json) und dem LLM-Feedback
+              (.IrsanAI/Feedback/online_feedback.json)
+
+Kennzahlen (jeweils 0..1, über ein rollendes Fenster der letzten Scans):
+- human_input_quality: mittlerer Anteil bestandener Validierungen je Scan
+- ai_refinement_level: Anteil der Feedback-Runden, nach denen sich die Validierung
+  nicht verschlechtert hat (Feedback wurde umgesetzt, ohne etwas zu brechen)
+- collaboration_depth: Anteil der Scans, denen ein LLM-Feedback vorlag
+  (der Kreislauf Scan -> LLM -> Feedback -> Scan wurde tatsächlich geschlossen)
+
+Inkrementelle Auswertung:
+- Der Cache merkt sich die Byte-Position hinter dem zuletzt verarbeiteten Historien-
+  eintrag und die Bytes unmittelbar davor. Stimmen diese noch, wird nur der neue
+  Teil der Datei gelesen (O(neue Einträge)); sonst wird einmalig neu aufgebaut.
+- online_feedback.json wird nur bei geänderter Größe/Änderungszeit neu gelesen.
+"""
+
+import os
+import json
+from collections import deque
+from typing import Dict, List, Any, Tuple, Iterator
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+CACHE_VERSION = 1
+SCAN_HISTORY_FILE = ".IrsanAI/Reports/scan_history.json"
+FEEDBACK_FILE = ".IrsanAI/Feedback/online_feedback.json"
+CACHE_FILE = ".IrsanAI/Reports/humanity_index_cache.json"
+ROLLING_WINDOW = 20  # Anzahl der jüngsten Scans, die in die Kennzahlen eingehen
+ANCHOR_BYTES = 64  # Länge des Prüfausschnitts vor der gespeicherten Position
+NEUTRAL_VALUE = 0.5  # Kennzahl ohne Datengrundlage
+NO_FEEDBACK = (None, "", "N/A")
+
+
+# ======================
+# HISTORIE LESEN
+# ======================
+def iter_array_entries(text: str, position: int) -> Iterator[Tuple[Any, int]]:
+    """Liefert (Eintrag, Endposition) für die Elemente eines JSON-Arrays ab position
+
+    position zeigt hinter "[" oder hinter ein bereits gelesenes Element; ein
+    abschließendes "]" oder abgeschnittener Inhalt beendet die Iteration.
+    """
+    decoder = json.JSONDecoder()
+    length = len(text)
+    while True:
+        while position < length and text[position] in " \t\r\n,":
+            position += 1
+        if position >= length or text[position] == "]":
+            return
+        try:
+            entry, position = decoder.raw_decode(text, position)
+        except ValueError:
+            return
+        yield entry, position
+
+
+def validation_ratio(entry: Dict[str, Any]) -> float:
+    """Anteil bestandener Validierungen eines Historieneintrags"""
+    summary = entry.get("validation_summary") or {}
+    if not summary:
+        return 0.0
+    return sum(1 for value in summary.values() if value) / len(summary)
+
+
+def _read_anchor(handle, offset: int) -> str:
+    start = max(0, offset - ANCHOR_BYTES)
+    handle.seek(start)
+    return handle.read(offset - start).hex()
+
+
+# ======================
+# CACHE
+# ======================
+def _empty_cache() -> Dict[str, Any]:
+    return {
+        "cache_version": CACHE_VERSION,
+        "history_offset": 0,
+        "history_anchor": "",
+        "window": [],
+        "state": {"previous_ratio": None, "previous_feedback": None, "total_scans": 0},
+        "feedback": {}
+    }
+
+
+def _reset_history(cache: Dict[str, Any]) -> None:
+    """Verwirft den Historienstand, behält Feedback-Stand und Fenstergröße"""
+    fresh = _empty_cache()
+    fresh["feedback"] = cache.get("feedback", {})
+    fresh["window_size"] = cache.get("window_size")
+    cache.clear()
+    cache.update(fresh)
+
+
+def load_cache(cache_file: str) -> Dict[str, Any]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("cache_version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return _empty_cache()
+
+
+def save_cache(cache_file: str, cache: Dict[str, Any]) -> None:
+    try:
+        if os.path.dirname(cache_file):
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_path = f"{cache_file}.tmp{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(temp_path, cache_file)
+    except OSError:
+        pass  # Ohne Cache wird beim nächsten Lauf neu aufgebaut
+
+
+def update_from_history(cache: Dict[str, Any], history_file: str, window_size: int) -> Dict[str, Any]:
+    """Verarbeitet nur die seit dem letzten Lauf angehängten Historieneinträge
+
+    Returns:
+        Statistik des Laufs (neue Einträge, ob der Cache neu aufgebaut wurde)
+    """
+    run_info = {"new_entries": 0, "rebuilt": False}
+    try:
+        handle = open(history_file, 'rb')
+    except OSError:
+        if cache["history_offset"]:
+            _reset_history(cache)
+            run_info["rebuilt"] = True
+        return run_info
+
+    with handle:
+        file_size = os.fstat(handle.fileno()).st_size
+        offset = cache["history_offset"]
+        if offset and (offset > file_size or _read_anchor(handle, offset) != cache["history_anchor"]):
+            # Datei wurde umgeschrieben oder gekürzt: einmalig vollständig neu auswerten
+            _reset_history(cache)
+            offset = 0
+            run_info["rebuilt"] = True
+
+        handle.seek(offset)
+        raw = handle.read()
+
+    text = raw.decode('utf-8', errors='replace')
+    position = 0
+    if offset == 0:
+        position = text.find('[') + 1
+        if position == 0:
+            return run_info
+
+    window = deque(cache["window"], maxlen=window_size)
+    state = cache["state"]
+    last_end = None
+    for entry, end in iter_array_entries(text, position):
+        last_end = end
+        if not isinstance(entry, dict):
+            continue
+        ratio = validation_ratio(entry)
+        feedback = entry.get("feedback_timestamp")
+        feedback = None if feedback in NO_FEEDBACK else feedback
+        # Neue Feedback-Runde: dieser Scan ist der erste nach einem neuen LLM-Feedback
+        new_round = feedback is not None and feedback != state["previous_feedback"]
+        improved = new_round and (state["previous_ratio"] is None or ratio >= state["previous_ratio"])
+        window.append([entry.get("timestamp"), round(ratio, 4), feedback, new_round, improved])
+        state["previous_ratio"] = ratio
+        state["previous_feedback"] = feedback
+        state["total_scans"] += 1
+        run_info["new_entries"] += 1
+
+    if last_end is not None:
+        # Position in Bytes umrechnen (nur der gelesene, neue Teil wird dafür kodiert)
+        cache["history_offset"] = offset + len(text[:last_end].encode('utf-8'))
+        with open(history_file, 'rb') as handle:
+            cache["history_anchor"] = _read_anchor(handle, cache["history_offset"])
+    cache["window"] = list(window)
+    return run_info
+
+
+def update_from_feedback(cache: Dict[str, Any], feedback_file: str) -> None:
+    """Liest online_feedback.json nur, wenn sich Größe oder Änderungszeit geändert haben"""
+    try:
+        stat = os.stat(feedback_file)
+    except OSError:
+        cache["feedback"] = {}
+        return
+    known = cache.get("feedback", {})
+    if known.get("size") == stat.st_size and known.get("mtime") == stat.st_mtime:
+        return
+    info = {"size": stat.st_size, "mtime": stat.st_mtime, "timestamp": None, "recommendations": 0}
+    try:
+        with open(feedback_file, 'r', encoding='utf-8') as f:
+            feedback = json.load(f)
+        info["timestamp"] = feedback.get("metadata", {}).get("timestamp")
+        recommendations = feedback.get("recommendations", {})
+        info["recommendations"] = sum(len(value) if isinstance(value, (list, dict)) else 1
+                                      for value in recommendations.values())
+    except (OSError, ValueError, AttributeError):
+        pass
+    cache["feedback"] = info
+
+
+# ======================
+# KENNZAHLEN
+# ======================
+def compute_metrics(cache: Dict[str, Any]) -> Dict[str, float]:
+    """Kennzahlen über das rollende Fenster (ohne Daten: NEUTRAL_VALUE)"""
+    window: List[List[Any]] = cache["window"]
+    if not window:
+        return {"human_input_quality": NEUTRAL_VALUE, "ai_refinement_level": NEUTRAL_VALUE,
+                "collaboration_depth": NEUTRAL_VALUE}
+
+    rounds = [entry for entry in window if entry[3]]
+    return {
+        "human_input_quality": sum(entry[1] for entry in window) / len(window),
+        "ai_refinement_level": (sum(1 for entry in rounds if entry[4]) / len(rounds)) if rounds else NEUTRAL_VALUE,
+        "collaboration_depth": sum(1 for entry in window if entry[2] is not None) / len(window)
+    }
+
+
+def compute_humanity_metrics(history_file: str = SCAN_HISTORY_FILE, feedback_file: str = FEEDBACK_FILE,
+                             cache_file: str = CACHE_FILE, window_size: int = ROLLING_WINDOW) -> Dict[str, Any]:
+    """Aktualisiert den Cache inkrementell und liefert Kennzahlen plus Datengrundlage"""
+    cache = load_cache(cache_file)
+    if cache.get("window_size") != window_size:
+        # Anderes Fenster: die gespeicherten Fenstereinträge passen nicht mehr
+        cache = _empty_cache()
+    cache["window_size"] = window_size
+
+    run_info = update_from_history(cache, history_file, window_size)
+    update_from_feedback(cache, feedback_file)
+    save_cache(cache_file, cache)
+
+    window = cache["window"]
+    return {
+        "metrics": compute_metrics(cache),
+        "basis": {
+            "scans_total": cache["state"]["total_scans"],
+            "scans_in_window": len(window),
+            "feedback_rounds_in_window": sum(1 for entry in window if entry[3]),
+            "current_feedback_timestamp": cache["feedback"].get("timestamp"),
+            "current_feedback_recommendations": cache["feedback"].get("recommendations", 0),
+            "entries_processed": run_info["new_entries"],
+            "cache_rebuilt": run_info["rebuilt"],
+            "window_size": window_size
+        }
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(compute_humanity_metrics(), indent=2))
@@ -1,10 +1,12 @@
 # IrsanAI_Minor_Update.py
 # IrsanAI-LRP v1.2 | Unique-Key: ENC(9f8a7b6c, AES-256) | Contributor: Qwen#5
 # CHANGELOG: v1.0 - Erstellt für task_id=usr_20250828_1100_9f8a7b6c
+#            v1.1 - Anwendung über IrsanAI_Patch_Engine.py (atomar, Backup im Backup-Speicher)
 
 # PATCH-INSTRUKTIONEN (AUTOMATISCH GENERIERT)
 TARGET_FILE = "IrsanAI_project-run.py"
 BACKUP_VERSION = "v2.2.1b"
+BACKUP_KEEP_SNAPSHOTS = 5  # behaltene Patch-Snapshots im Backup-Speicher (.IrsanAI/backups/)
 
 # Sicherheitscheck vor Modifikation
 VERIFICATION_HASH = "sha256:9f8a7b6c5d4e3f2a1b0c9d8e7f6a5b4c3d2e1f0a9b8c7d6e5f4a3b2c1d0e"
@@ -15,64 +17,46 @@ PATCH_INSTRUCTIONS = [
         "search_pattern": r"def validate_environment\(\):\s+.*?# SCHUTZSCHALTER",
         "replacement": "def validate_environment():\n    # NEU: Erweiterter Sicherheitscheck\n    if not check_hardware_compatibility():\n        raise HardwareIncompatibilityError()",
         "context_lines": 5,
-        "max_occurrences": 1
+        "max_occurrences": 1,
+        "anchor": {"function": "validate_environment"}
     },
     {
         "search_pattern": r"except ValueError as e:\s+raise",
         "replacement": "except ValueError as e:\n    # IrsanAI-LRP | Feedback: Enable mit task_id=usr_20250828_1100_9f8a7b6c\n    raise",
         "context_lines": 3,
-        "max_occurrences": 1
+        "max_occurrences": 1,
+        "anchor": {"marker": "except ValueError as e:", "lines": 3}
     }
 ]
 
 
-def apply_patch():
-    """Wendet den Patch auf die Zieldatei an"""
-    import os
-    import shutil
-    import hashlib
-
-    # Backup erstellen
-    backup_path = f"{TARGET_FILE}.bak_{BACKUP_VERSION}"
-    shutil.copy2(TARGET_FILE, backup_path)
-    print(f"[PATCH] Backup erstellt: {backup_path}")
-
-    # Datei lesen
-    with open(TARGET_FILE, 'r') as f:
-        content = f.read()
-
-    # Hash-Prüfung
-    current_hash = hashlib.sha256(content.encode()).hexdigest()
-    if current_hash != VERIFICATION_HASH.split(':')[1]:
-        print(
-            f"[PATCH] FEHLER: Datei-Hash stimmt nicht überein! Erwartet: {VERIFICATION_HASH}, Gefunden: {current_hash}")
-        print("[PATCH] ABBRUCH - möglicherweise wurden bereits Änderungen vorgenommen.")
-        return False
+def build_manifest():
+    """Patch-Manifest für IrsanAI_Patch_Engine aus den Instruktionen oben"""
+    return {
+        "manifest_version": 1,
+        "label": f"minor_update_{BACKUP_VERSION}",
+        "backup_keep": BACKUP_KEEP_SNAPSHOTS,
+        "targets": [{
+            "files": [TARGET_FILE],
+            "verification_hash": VERIFICATION_HASH,
+            "patches": PATCH_INSTRUCTIONS,
+        }],
+    }
 
-    # Patch anwenden
-    modified_content = content
-    for patch in PATCH_INSTRUCTIONS:
-        import re
-        pattern = re.compile(patch["search_pattern"], re.DOTALL)
-        matches = pattern.findall(modified_content)
 
-        if matches and len(matches) <= patch["max_occurrences"]:
-            modified_content = pattern.sub(patch["replacement"], modified_content)
-            print(f"[PATCH] Erfolgreich ersetzt: {len(matches)}/{patch['max_occurrences']} Vorkommen")
-        else:
-            print(
-                f"[PATCH] FEHLER: Keine Übereinstimmung für Pattern gefunden oder zu viele Vorkommen ({len(matches)}/{patch['max_occurrences']})")
-            # Rollback zum Backup
-            shutil.copy2(backup_path, TARGET_FILE)
-            print(f"[PATCH] Rollback durchgeführt - Originalzustand wiederhergestellt")
-            return False
+def apply_patch():
+    """Wendet den Patch auf die Zieldatei an (Backup, Hash-Prüfung und Rollback in der Patch-Engine)"""
+    import os
+    import sys
 
-    # Geänderte Datei speichern
-    with open(TARGET_FILE, 'w') as f:
-        f.write(modified_content)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from IrsanAI_Patch_Engine import apply_manifest, print_summary
 
-    print(f"[PATCH] Erfolgreich angewendet! Neue Version: {TARGET_FILE}")
-    return True
+    summary = apply_manifest(build_manifest(), os.getcwd())
+    print_summary(summary)
+    if summary["committed"]:
+        print(f"[PATCH] Erfolgreich angewendet! Neue Version: {TARGET_FILE}")
+    return summary["committed"]
 
 
 if __name__ == "__main__":
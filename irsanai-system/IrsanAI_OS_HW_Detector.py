@@ -20,42 +20,81 @@ Datenschutz:
 
 import os
 import sys
-import json
-import platform
-import subprocess
-import hashlib
-import re
+import math
 import time
-import logging
-from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Union
 
+# Schnellstart: json, re, platform, subprocess, hashlib, datetime, logging sowie alle
+# optionalen Pakete (psutil, pynvml, screeninfo, tkinter) werden erst in den Funktionen
+# importiert, die sie tatsächlich benötigen. Das Zeitbudget sichert
+# tests/test_startup_budget.py ab.
+
 # ======================
 # KONFIGURATION
 # ======================
 VERSION = "2.7"
 REPORT_FILE = "IrsanAI_env_report.json"
-BACKUP_DIR = ".IrsanAI/backups/env_detection"
+BACKUP_LABEL = "env_detection"  # Snapshots im Backup-Speicher .IrsanAI/backups/
+BACKUP_KEEP_SNAPSHOTS = 10
 LOG_FILE = ".IrsanAI/logs/env_detection.log"
 DSGVO_CONSENT_FILE = ".IrsanAI/dsgvo_consent.txt"
 MAX_RETRIES = 3
 ANONYMIZATION_SALT = "irsanai_hardware_detection_salt_2023"
 
+# Wurzelverzeichnisse der Kernel-Schnittstellen (für Tests auf Fixture-Bäume umstellbar)
+PROCFS_ROOT = "/proc"
+SYSFS_ROOT = "/sys"
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# ISA-Erweiterungen, die für die Codegenerierung relevant sind
+# (x86: "flags", ARM: "Features" in /proc/cpuinfo)
+RELEVANT_ISA_FLAGS = [
+    "sse2", "sse4_1", "sse4_2", "avx", "avx2", "fma", "bmi2",
+    "avx512f", "avx512bw", "avx512vl", "avx512dq", "avx512_vnni", "avx512_bf16",
+    "amx_tile", "aes", "sha_ni",
+    "neon", "asimd", "asimdhp", "sve", "sve2", "sha2", "crc32"
+]
+
+# Exit-Codes für den Batch-Modus (Flotten-Orchestrierung)
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NO_CONSENT = 3
+
 # ======================
 # LOGGING SETUP
 # ======================
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logger = logging.getLogger("IrsanAI_HW_Detector")
+# Das Logging wird erst durch setup_logging() eingerichtet (z.B. in main()).
+# Beim reinen Import als Bibliothek wird weder ein Verzeichnis noch eine Log-Datei angelegt.
+logger = None
+
+# Ziel der Konsolenausgabe; bei --output - wird auf stderr umgeleitet, damit stdout nur den Bericht enthält
+console_stream = None
+
+
+def setup_logging(log_file: str = LOG_FILE) -> None:
+    """Richtet das Datei-Logging ein und legt das Log-Verzeichnis bei Bedarf an"""
+    global logger
+    import logging
+
+    logger = logging.getLogger("IrsanAI_HW_Detector")
+    logger.setLevel(logging.INFO)
+    try:
+        if os.path.dirname(log_file):
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        handler = logging.FileHandler(log_file, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s',
+                                               datefmt='%Y-%m-%d %H:%M:%S'))
+        logger.addHandler(handler)
+    except OSError as e:
+        logger.addHandler(logging.NullHandler())
+        print(f"[LOG] Log-Datei {log_file} nicht beschreibbar: {str(e)}")
 
 
 def log_and_print(message: str, level: str = "info") -> None:
     """Loggt Nachricht und gibt sie auf der Konsole aus"""
-    print(message)
+    print(message, file=console_stream or sys.stdout)
+    if logger is None:
+        return
     if level == "info":
         logger.info(message)
     elif level == "warning":
@@ -66,19 +105,73 @@ def log_and_print(message: str, level: str = "info") -> None:
         logger.critical(message)
 
 
+_OPTIONAL_MODULES: Dict[str, Any] = {}
+
+# Messpunkte des Laufs (irsanai_instrumentation aus dem Projekt-Root); None, wenn der
+# Detektor ohne das übrige Projekt ausgeführt wird
+instrumentation = None
+
+
+def optional_import(module_name: str) -> Any:
+    """Importiert ein optionales Paket erst bei Bedarf; None, wenn es nicht installiert ist.
+
+    Das Ergebnis (auch ein fehlgeschlagener Import) wird zwischengespeichert, damit
+    jedes Paket höchstens einmal gesucht wird.
+    """
+    if module_name not in _OPTIONAL_MODULES:
+        import importlib
+        try:
+            _OPTIONAL_MODULES[module_name] = importlib.import_module(module_name)
+        except ImportError:
+            _OPTIONAL_MODULES[module_name] = None
+    return _OPTIONAL_MODULES[module_name]
+
+
+def load_instrumentation() -> Any:
+    """Erzeugt die Messpunkte aus irsanai_instrumentation (liegt im Projekt-Root)
+
+    Returns:
+        Instrumentation-Objekt oder None, wenn das Modul nicht verfügbar ist
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.append(project_dir)
+    module = optional_import("irsanai_instrumentation")
+    if module is None:
+        return None
+    return module.Instrumentation("IrsanAI_OS_HW_Detector", VERSION)
+
+
 # ======================
 # SICHERHEITSFUNKTIONEN
 # ======================
-def create_backup() -> str:
-    """Erstellt ein Backup der aktuellen Umgebungsdateien"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{BACKUP_DIR}/env_detection_backup_{timestamp}"
+def create_backup(paths: List[str]) -> str:
+    """Sichert bestehende Berichte im Backup-Speicher (irsanai_backup_store, Projekt-Root)
+
+    Jeder Inhalt liegt dort nur einmal; unveränderte Berichte kosten keinen zusätzlichen Platz.
+
+    Returns:
+        Snapshot-ID oder "", wenn nichts zu sichern war bzw. das Sichern fehlschlug
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.append(project_dir)
+    module = optional_import("irsanai_backup_store")
+    if module is None:
+        log_and_print("[SAFETY] Backup-Speicher nicht verfügbar - bestehende Berichte werden nicht gesichert",
+                      "warning")
+        return ""
 
     try:
-        os.makedirs(BACKUP_DIR, exist_ok=True)
-        # Hier würden bei Bedarf bestehende Reports gesichert
-        log_and_print(f"[SAFETY] Backup erstellt: {backup_path}")
-        return backup_path
+        store = module.BackupStore(os.getcwd())
+        manifest = store.snapshot(BACKUP_LABEL, [path for path in paths if os.path.isfile(path)])
+        if manifest is None:
+            log_and_print("[SAFETY] Kein bestehender Bericht zu sichern")
+            return ""
+        store.gc(keep=BACKUP_KEEP_SNAPSHOTS, label=BACKUP_LABEL)
+        log_and_print(f"[SAFETY] Backup erstellt: {store.store_dir} (Snapshot {manifest['id']}, "
+                      f"neu belegt: {manifest['stats']['new_bytes']} Bytes)")
+        return manifest["id"]
     except Exception as e:
         log_and_print(f"[SAFETY] Backup-Fehler: {str(e)}", "warning")
         return ""
@@ -86,6 +179,8 @@ def create_backup() -> str:
 
 def verify_integrity() -> bool:
     """Überprüft die Integrität des Skripts vor der Ausführung"""
+    import hashlib
+
     try:
         # Einfache Prüfung durch Hash des Skripts (in der Praxis sollte dies sicherer sein)
         script_path = os.path.abspath(__file__)
@@ -139,6 +234,41 @@ def check_execution_environment() -> bool:
 # ======================
 # DATENSCHUTZ & EINWILLIGUNG
 # ======================
+def has_persisted_consent() -> bool:
+    """Prüft, ob in DSGVO_CONSENT_FILE bereits eine Einwilligung gespeichert ist"""
+    try:
+        with open(DSGVO_CONSENT_FILE, 'r') as f:
+            return f.readline().startswith("Einwilligung erteilt am")
+    except OSError:
+        return False
+
+
+def save_dsgvo_consent(source: str = "interaktiv") -> None:
+    """Speichert die Einwilligung mit Zeitstempel in DSGVO_CONSENT_FILE"""
+    from datetime import datetime
+
+    if os.path.dirname(DSGVO_CONSENT_FILE):
+        os.makedirs(os.path.dirname(DSGVO_CONSENT_FILE), exist_ok=True)
+    with open(DSGVO_CONSENT_FILE, 'w') as f:
+        f.write(f"Einwilligung erteilt am {datetime.now().isoformat()}\n")
+        f.write("Skriptversion: " + VERSION + "\n")
+        f.write("Quelle: " + source)
+
+
+def get_batch_consent(consent_flag: bool) -> bool:
+    """Einwilligung ohne Rückfrage: per --consent oder aus einer gespeicherten Einwilligung"""
+    if consent_flag:
+        save_dsgvo_consent("--consent (Batch-Modus)")
+        log_and_print("[DSGVO] Einwilligung per --consent erteilt und gespeichert.", "info")
+        return True
+    if has_persisted_consent():
+        log_and_print(f"[DSGVO] Gespeicherte Einwilligung aus {DSGVO_CONSENT_FILE} verwendet.", "info")
+        return True
+    log_and_print(f"[DSGVO] Batch-Modus ohne Einwilligung: --consent angeben oder "
+                  f"{DSGVO_CONSENT_FILE} einmalig interaktiv anlegen.", "error")
+    return False
+
+
 def get_dsgvo_consent() -> bool:
     """Holt die DSGVO-Einwilligung des Nutzers"""
     log_and_print("\n" + "=" * 60)
@@ -148,9 +278,10 @@ def get_dsgvo_consent() -> bool:
     log_and_print("die für die Generierung kompatiblen Codes erforderlich sind.")
     log_and_print("\nERFASSTE DATEN:")
     log_and_print("- Betriebssystem (Name, Version)")
-    log_and_print("- CPU (Typ, Anzahl Kerne, Taktrate)")
-    log_and_print("- RAM (Gesamtgröße)")
+    log_and_print("- CPU (Typ, Anzahl Kerne, Taktrate, Topologie, Caches, Befehlssatz)")
+    log_and_print("- RAM (Gesamtgröße, verfügbarer Speicher, Swap, Container-Grenzen)")
     log_and_print("- GPU (Modell, Treiberversion - anonymisiert)")
+    log_and_print("- Datenträger des Projektordners (Dateisystem, SSD/HDD, freier Platz)")
     log_and_print("- Bildschirmauflösung")
     log_and_print("- Python-Version")
     log_and_print("\nNICHT ERFASSTE DATEN:")
@@ -167,10 +298,7 @@ def get_dsgvo_consent() -> bool:
         consent = input("\nEinwilligung erteilen? (ja/nein): ").strip().lower()
         if consent in ['ja', 'j', 'yes', 'y']:
             # Speichere Einwilligung mit Zeitstempel
-            os.makedirs(os.path.dirname(DSGVO_CONSENT_FILE), exist_ok=True)
-            with open(DSGVO_CONSENT_FILE, 'w') as f:
-                f.write(f"Einwilligung erteilt am {datetime.now().isoformat()}\n")
-                f.write("Skriptversion: " + VERSION)
+            save_dsgvo_consent()
             log_and_print("[DSGVO] Einwilligung wurde gespeichert.", "info")
             return True
         elif consent in ['nein', 'n', 'no']:
@@ -185,6 +313,9 @@ def get_dsgvo_consent() -> bool:
 # ======================
 def detect_os_info() -> Dict[str, str]:
     """Erkennt Betriebssystem-Informationen mit mehreren Methoden"""
+    import platform
+    import subprocess
+
     results = {}
 
     # Methode 1: Plattform-Modul (primär)
@@ -244,8 +375,290 @@ def detect_os_info() -> Dict[str, str]:
     return os_info
 
 
+# ======================
+# CPU-TOPOLOGIE & CGROUPS (LINUX)
+# ======================
+def read_sysfs_value(path: str) -> Optional[str]:
+    """Liest einen einzelnen Wert aus /sys oder /proc (None, falls nicht lesbar)"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def parse_cpu_list(cpu_list: str) -> List[int]:
+    """Parst Kernel-CPU-Listen wie '0-3,8,10-11' in eine Liste von CPU-Nummern"""
+    cpus = []
+    for part in cpu_list.strip().split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def parse_cache_size(size_str: str) -> int:
+    """Parst sysfs-Cachegrößen wie '32K' oder '8M' in Bytes"""
+    size_str = size_str.strip().upper()
+    multipliers = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if size_str and size_str[-1] in multipliers and size_str[:-1].isdigit():
+        return int(size_str[:-1]) * multipliers[size_str[-1]]
+    return int(size_str) if size_str.isdigit() else 0
+
+
+def parse_cpuinfo(cpuinfo: str) -> Dict[str, Any]:
+    """Wertet /proc/cpuinfo in einem einzigen Durchlauf aus (Modell, Sockel, Kerne, ISA-Flags)"""
+    model = None
+    flags: List[str] = []
+    packages = set()
+    cores = set()
+    logical_cpus = 0
+    physical_id = "0"
+
+    for line in cpuinfo.splitlines():
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        if key == 'processor':
+            logical_cpus += 1
+            physical_id = "0"
+        elif key == 'physical id':
+            physical_id = value.strip()
+            packages.add(physical_id)
+        elif key == 'core id':
+            cores.add((physical_id, value.strip()))
+        elif model is None and key in ('model name', 'Model', 'cpu model', 'Processor'):
+            model = value.strip()
+        elif not flags and key in ('flags', 'Features'):
+            # Flags sind auf allen Kernen identisch - nur der erste Block wird zerlegt
+            flags = value.split()
+
+    return {
+        'model': model,
+        'logical_cpus': logical_cpus,
+        'sockets': len(packages) or (1 if logical_cpus else 0),
+        'physical_cores': len(cores) or None,
+        'flags': flags
+    }
+
+
+def summarize_isa_flags(flags: List[str]) -> Dict[str, Any]:
+    """Reduziert die ISA-Flags auf die relevanten Erweiterungen und leitet die SIMD-Breite ab"""
+    flag_set = set(flags)
+    present = [flag for flag in RELEVANT_ISA_FLAGS if flag in flag_set]
+
+    if 'avx512f' in flag_set:
+        vector_width_bits = 512
+    elif 'avx2' in flag_set or 'avx' in flag_set:
+        vector_width_bits = 256
+    elif flag_set & {'sse2', 'neon', 'asimd'}:
+        vector_width_bits = 128
+    else:
+        vector_width_bits = None
+
+    return {
+        'extensions': present,
+        'has_avx2': 'avx2' in flag_set,
+        'has_avx512': 'avx512f' in flag_set,
+        'has_neon': bool(flag_set & {'neon', 'asimd'}),
+        'has_sve': 'sve' in flag_set,
+        'vector_width_bits': vector_width_bits
+    }
+
+
+def detect_cpu_caches(sysfs_root: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Liest L1/L2/L3-Cachegrößen aus /sys/devices/system/cpu/cpu*/cache"""
+    cpu_root = os.path.join(sysfs_root or SYSFS_ROOT, "devices", "system", "cpu")
+    caches: Dict[str, Dict[str, Any]] = {}
+    # Pro Cache-Index merken, welche CPUs bereits durch eine geteilte Instanz abgedeckt sind,
+    # damit jede Cache-Instanz nur einmal gelesen wird
+    covered: Dict[str, set] = {}
+
+    try:
+        cpu_dirs = [entry for entry in os.listdir(cpu_root) if entry.startswith('cpu') and entry[3:].isdigit()]
+    except OSError:
+        return caches
+
+    for cpu_dir in sorted(cpu_dirs, key=lambda name: int(name[3:])):
+        cpu_num = int(cpu_dir[3:])
+        cache_dir = os.path.join(cpu_root, cpu_dir, "cache")
+        try:
+            indices = [entry for entry in os.listdir(cache_dir) if entry.startswith('index')]
+        except OSError:
+            continue
+
+        for index in indices:
+            if cpu_num in covered.get(index, ()):
+                continue
+            index_dir = os.path.join(cache_dir, index)
+            level = read_sysfs_value(os.path.join(index_dir, "level"))
+            cache_type = read_sysfs_value(os.path.join(index_dir, "type")) or "Unified"
+            size = read_sysfs_value(os.path.join(index_dir, "size"))
+            shared = read_sysfs_value(os.path.join(index_dir, "shared_cpu_list")) or str(cpu_num)
+            line_size = read_sysfs_value(os.path.join(index_dir, "coherency_line_size"))
+            if not level or not size:
+                continue
+
+            shared_cpus = parse_cpu_list(shared)
+            covered.setdefault(index, set()).update(shared_cpus)
+
+            suffix = {'Data': 'd', 'Instruction': 'i'}.get(cache_type, '')
+            name = f"L{level}{suffix}"
+            entry = caches.setdefault(name, {
+                'size_bytes': parse_cache_size(size),
+                'line_size_bytes': int(line_size) if line_size and line_size.isdigit() else None,
+                'shared_by_cpus': len(shared_cpus),
+                'instances': 0
+            })
+            entry['instances'] += 1
+
+    for entry in caches.values():
+        entry['total_bytes'] = entry['size_bytes'] * entry['instances']
+
+    return caches
+
+
+def detect_numa_nodes(sysfs_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Ermittelt NUMA-Knoten und deren CPUs aus /sys/devices/system/node"""
+    node_root = os.path.join(sysfs_root or SYSFS_ROOT, "devices", "system", "node")
+    nodes = []
+    try:
+        entries = [entry for entry in os.listdir(node_root) if entry.startswith('node') and entry[4:].isdigit()]
+    except OSError:
+        return nodes
+
+    for entry in sorted(entries, key=lambda name: int(name[4:])):
+        cpulist = read_sysfs_value(os.path.join(node_root, entry, "cpulist")) or ""
+        nodes.append({
+            'node': int(entry[4:]),
+            'cpus': cpulist,
+            'cpu_count': len(parse_cpu_list(cpulist)) if cpulist else 0
+        })
+    return nodes
+
+
+def get_cgroup_dirs(controller: str) -> List[Tuple[str, int]]:
+    """Liefert mögliche cgroup-Verzeichnisse (Pfad, Version) des eigenen Prozesses für einen Controller"""
+    candidates: List[Tuple[str, int]] = []
+    content = read_sysfs_value(os.path.join(PROCFS_ROOT, "self", "cgroup")) or ""
+
+    for line in content.splitlines():
+        parts = line.split(':', 2)
+        if len(parts) != 3:
+            continue
+        hierarchy, controllers, path = parts
+        path = path.lstrip('/')
+        if hierarchy == '0' and controllers == '':
+            # cgroup v2 (unified) - im Hybrid-Modus unter /sys/fs/cgroup/unified eingehängt
+            for base in (CGROUP_ROOT, os.path.join(CGROUP_ROOT, "unified")):
+                candidates.append((os.path.join(base, path), 2))
+                candidates.append((base, 2))
+        elif controller in controllers.split(','):
+            for base in (os.path.join(CGROUP_ROOT, controllers), os.path.join(CGROUP_ROOT, controller)):
+                candidates.append((os.path.join(base, path), 1))
+                candidates.append((base, 1))
+
+    if not candidates:
+        candidates = [(CGROUP_ROOT, 2), (os.path.join(CGROUP_ROOT, controller), 1)]
+
+    # Duplikate entfernen, Reihenfolge beibehalten
+    seen = set()
+    result = []
+    for directory, version in candidates:
+        directory = os.path.normpath(directory)
+        if directory not in seen and os.path.isdir(directory):
+            seen.add(directory)
+            result.append((directory, version))
+    return result
+
+
+def detect_cgroup_cpu_limit() -> Dict[str, Any]:
+    """Liest das CPU-Kontingent der cgroup (v2: cpu.max, v1: cpu.cfs_quota_us/cpu.cfs_period_us)"""
+    limit = {
+        'cgroup_version': None,
+        'quota_us': None,
+        'period_us': None,
+        'limit_cores': None
+    }
+
+    for directory, version in get_cgroup_dirs('cpu'):
+        if version == 2:
+            value = read_sysfs_value(os.path.join(directory, "cpu.max"))
+            if not value:
+                continue
+            quota, _, period = value.partition(' ')
+            limit['cgroup_version'] = 2
+            limit['period_us'] = int(period) if period.isdigit() else 100000
+            limit['quota_us'] = int(quota) if quota.isdigit() else None
+        else:
+            quota = read_sysfs_value(os.path.join(directory, "cpu.cfs_quota_us"))
+            period = read_sysfs_value(os.path.join(directory, "cpu.cfs_period_us"))
+            if quota is None or not period:
+                continue
+            limit['cgroup_version'] = 1
+            limit['period_us'] = int(period)
+            limit['quota_us'] = int(quota) if int(quota) > 0 else None
+
+        if limit['quota_us'] and limit['period_us']:
+            limit['limit_cores'] = round(limit['quota_us'] / limit['period_us'], 2)
+        break
+
+    return limit
+
+
+def detect_cpu_topology(parsed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Erstellt das strukturierte Topologie-Profil (Sockel, NUMA, SMT, Caches, ISA, cgroup-Kontingent)"""
+    parsed = parsed or {}
+
+    try:
+        affinity_cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        affinity_cpus = os.cpu_count() or 1
+
+    topology = {
+        'source': 'linux_sysfs' if sys.platform.startswith('linux') else 'generic',
+        'sockets': parsed.get('sockets') or None,
+        'physical_cores': parsed.get('physical_cores'),
+        'logical_cpus': parsed.get('logical_cpus') or os.cpu_count() or 1,
+        'threads_per_core': None,
+        'numa_nodes': [],
+        'caches': {},
+        'isa': summarize_isa_flags(parsed.get('flags', [])),
+        'cgroup_cpu': {},
+        'affinity_cpus': affinity_cpus,
+        'effective_cpus': affinity_cpus
+    }
+
+    if sys.platform.startswith('linux'):
+        siblings = read_sysfs_value(
+            os.path.join(SYSFS_ROOT, "devices", "system", "cpu", "cpu0", "topology", "thread_siblings_list"))
+        if siblings:
+            topology['threads_per_core'] = len(parse_cpu_list(siblings))
+        elif topology['physical_cores']:
+            topology['threads_per_core'] = max(1, topology['logical_cpus'] // topology['physical_cores'])
+
+        topology['numa_nodes'] = detect_numa_nodes()
+        topology['caches'] = detect_cpu_caches()
+        topology['cgroup_cpu'] = detect_cgroup_cpu_limit()
+
+        # Effektive CPUs: Affinitätsmaske und cgroup-Kontingent begrenzen gemeinsam
+        limit_cores = topology['cgroup_cpu'].get('limit_cores')
+        if limit_cores:
+            topology['effective_cpus'] = max(1, min(affinity_cpus, math.ceil(limit_cores)))
+
+    return topology
+
+
 def detect_cpu_info() -> Dict[str, Any]:
     """Erkennt CPU-Informationen mit mehreren Methoden"""
+    import subprocess
+
     results = {}
 
     # Methode 1: Plattform-Modul
@@ -254,18 +667,7 @@ def detect_cpu_info() -> Dict[str, Any]:
     except Exception as e:
         log_and_print(f"[CPU] os.cpu_count Fehler: {str(e)}", "warning")
 
-    # Methode 2: psutil (wenn verfügbar)
-    try:
-        import psutil
-        results['psutil_physical_cores'] = psutil.cpu_count(logical=False)
-        results['psutil_logical_cores'] = psutil.cpu_count(logical=True)
-        results['psutil_freq'] = psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
-    except ImportError:
-        log_and_print("[CPU] psutil nicht installiert - überspringe diese Methode", "info")
-    except Exception as e:
-        log_and_print(f"[CPU] psutil Fehler: {str(e)}", "warning")
-
-    # Methode 3: Systembefehle
+    # Methode 2: Systembefehle bzw. /proc
     try:
         if sys.platform.startswith('win'):
             output = subprocess.check_output(
@@ -290,6 +692,19 @@ def detect_cpu_info() -> Dict[str, Any]:
     except Exception as e:
         log_and_print(f"[CPU] Systembefehl Fehler: {str(e)}", "warning")
 
+    # Methode 3: psutil - unter Linux nur, wenn /proc/cpuinfo nicht lesbar ist
+    if not results.get('linux_cpuinfo'):
+        psutil = optional_import('psutil')
+        if psutil is None:
+            log_and_print("[CPU] psutil nicht installiert - überspringe diese Methode", "info")
+        else:
+            try:
+                results['psutil_physical_cores'] = psutil.cpu_count(logical=False)
+                results['psutil_logical_cores'] = psutil.cpu_count(logical=True)
+                results['psutil_freq'] = psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
+            except Exception as e:
+                log_and_print(f"[CPU] psutil Fehler: {str(e)}", "warning")
+
     # Konsolidierung der Ergebnisse
     cpu_info = {
         'physical_cores': results.get('psutil_physical_cores') or results.get('win_cpu_info_cores') or 1,
@@ -302,6 +717,7 @@ def detect_cpu_info() -> Dict[str, Any]:
     if results.get('psutil_freq') and results['psutil_freq'].get('max'):
         cpu_info['max_frequency_mhz'] = results['psutil_freq']['max']
     elif sys.platform.startswith('win') and 'MaxClockSpeed' in results.get('win_cpu_info', ''):
+        import re
         match = re.search(r'MaxClockSpeed\s*=\s*(\d+)', results['win_cpu_info'])
         if match:
             cpu_info['max_frequency_mhz'] = int(match.group(1))
@@ -310,16 +726,33 @@ def detect_cpu_info() -> Dict[str, Any]:
         if len(lines) >= 5:
             cpu_info['max_frequency_mhz'] = int(lines[4]) / 1000000  # Hz zu MHz
 
+    elif sys.platform.startswith('linux'):
+        max_freq_khz = read_sysfs_value(
+            os.path.join(SYSFS_ROOT, "devices", "system", "cpu", "cpu0", "cpufreq", "cpuinfo_max_freq"))
+        if max_freq_khz and max_freq_khz.isdigit():
+            cpu_info['max_frequency_mhz'] = int(max_freq_khz) // 1000
+        cur_freq_khz = read_sysfs_value(
+            os.path.join(SYSFS_ROOT, "devices", "system", "cpu", "cpu0", "cpufreq", "scaling_cur_freq"))
+        if cur_freq_khz and cur_freq_khz.isdigit():
+            cpu_info['current_frequency_mhz'] = int(cur_freq_khz) // 1000
+
+    # Topologie: /proc/cpuinfo wird nur einmal gelesen und in einem Durchlauf ausgewertet
+    parsed_cpuinfo = parse_cpuinfo(results['linux_cpuinfo']) if results.get('linux_cpuinfo') else {}
+    topology = detect_cpu_topology(parsed_cpuinfo)
+    cpu_info['topology'] = topology
+    cpu_info['effective_cpus'] = topology['effective_cpus']
+    if not results.get('psutil_physical_cores') and topology.get('physical_cores'):
+        cpu_info['physical_cores'] = topology['physical_cores']
+
     # Modell extrahieren
     if results.get('psutil_freq') and results['psutil_freq'].get('current'):
         cpu_info['current_frequency_mhz'] = results['psutil_freq']['current']
     if 'machdep.cpu.brand_string' in results.get('mac_cpu_info', ''):
         cpu_info['model'] = results['mac_cpu_info'].split('\n')[0].strip()
-    elif 'model name' in results.get('linux_cpuinfo', ''):
-        match = re.search(r'model name\s*:\s*(.+)', results['linux_cpuinfo'])
-        if match:
-            cpu_info['model'] = match.group(1).strip()
+    elif parsed_cpuinfo.get('model'):
+        cpu_info['model'] = parsed_cpuinfo['model']
     elif 'Name' in results.get('win_cpu_info', ''):
+        import re
         match = re.search(r'Name\s*=\s*(.+)', results['win_cpu_info'])
         if match:
             cpu_info['model'] = match.group(1).strip()
@@ -327,22 +760,123 @@ def detect_cpu_info() -> Dict[str, Any]:
     return cpu_info
 
 
-def detect_memory_info() -> Dict[str, int]:
-    """Erkennt Speicher-Informationen mit mehreren Methoden"""
-    results = {}
+# Werte ab dieser Größe gelten bei cgroup v1 als "unbegrenzt" (PAGE_COUNTER_MAX)
+CGROUP_UNLIMITED_THRESHOLD = 1 << 60
+
+
+def parse_meminfo(meminfo: str) -> Dict[str, int]:
+    """Wertet /proc/meminfo bzw. nodeN/meminfo in einem Durchlauf aus (Werte in Bytes)"""
+    values = {}
+    for line in meminfo.splitlines():
+        key, sep, rest = line.partition(':')
+        if not sep:
+            continue
+        parts = rest.split()
+        if not parts or not parts[0].isdigit():
+            continue
+        value = int(parts[0])
+        if len(parts) > 1 and parts[1] == 'kB':
+            value *= 1024
+        # NUMA-Varianten ("Node 0 MemTotal") auf den eigentlichen Schlüssel reduzieren
+        values[key.split()[-1]] = value
+    return values
+
+
+def read_cgroup_bytes(path: str) -> Optional[int]:
+    """Liest einen cgroup-Speicherwert; 'max' bzw. v1-Maximalwerte werden als None (unbegrenzt) geliefert"""
+    value = read_sysfs_value(path)
+    if value is None or not value.isdigit():
+        return None
+    number = int(value)
+    return number if number < CGROUP_UNLIMITED_THRESHOLD else None
+
+
+def detect_cgroup_memory_limits() -> Dict[str, Any]:
+    """Liest die Speichergrenzen der cgroup (v2: memory.max/high/current, v1: memory.limit_in_bytes usw.)"""
+    limits = {
+        'cgroup_version': None,
+        'max_bytes': None,
+        'high_bytes': None,
+        'current_bytes': None,
+        'swap_max_bytes': None,
+        'inactive_file_bytes': None
+    }
+
+    for directory, version in get_cgroup_dirs('memory'):
+        if version == 2:
+            if not os.path.exists(os.path.join(directory, "memory.current")):
+                continue
+            limits['max_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.max"))
+            limits['high_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.high"))
+            limits['current_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.current"))
+            limits['swap_max_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.swap.max"))
+            inactive_key = 'inactive_file'
+        else:
+            if not os.path.exists(os.path.join(directory, "memory.usage_in_bytes")):
+                continue
+            limits['max_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.limit_in_bytes"))
+            limits['high_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.soft_limit_in_bytes"))
+            limits['current_bytes'] = read_cgroup_bytes(os.path.join(directory, "memory.usage_in_bytes"))
+            memsw = read_cgroup_bytes(os.path.join(directory, "memory.memsw.limit_in_bytes"))
+            if memsw is not None and limits['max_bytes'] is not None:
+                limits['swap_max_bytes'] = max(0, memsw - limits['max_bytes'])
+            inactive_key = 'total_inactive_file'
+
+        limits['cgroup_version'] = version
+        # Inaktiver Page-Cache ist zurückforderbar und zählt nicht als belegt
+        for line in (read_sysfs_value(os.path.join(directory, "memory.stat")) or "").splitlines():
+            key, _, value = line.partition(' ')
+            if key == inactive_key and value.isdigit():
+                limits['inactive_file_bytes'] = int(value)
+                break
+        break
+
+    return limits
+
+
+def detect_hugepage_info(meminfo: Dict[str, int]) -> Dict[str, Any]:
+    """Fasst die Hugepage-Konfiguration zusammen (statische Hugepages und Transparent Hugepages)"""
+    thp_mode = None
+    thp_setting = read_sysfs_value(os.path.join(SYSFS_ROOT, "kernel", "mm", "transparent_hugepage", "enabled"))
+    if thp_setting:
+        # Aktiver Modus steht in eckigen Klammern, z.B. "always [madvise] never"
+        thp_mode = thp_setting.split('[', 1)[1].split(']', 1)[0] if '[' in thp_setting else thp_setting
+
+    return {
+        'total': meminfo.get('HugePages_Total', 0),
+        'free': meminfo.get('HugePages_Free', 0),
+        'page_size_kb': meminfo.get('Hugepagesize', 0) // 1024,
+        'transparent_hugepages': thp_mode
+    }
 
-    # Methode 1: psutil (wenn verfügbar)
+
+def detect_numa_memory(sysfs_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Liest den Speicher pro NUMA-Knoten aus /sys/devices/system/node/node*/meminfo"""
+    node_root = os.path.join(sysfs_root or SYSFS_ROOT, "devices", "system", "node")
+    nodes = []
     try:
-        import psutil
-        virtual_mem = psutil.virtual_memory()
-        results['psutil_total'] = virtual_mem.total
-        results['psutil_available'] = virtual_mem.available
-    except ImportError:
-        log_and_print("[MEMORY] psutil nicht installiert - überspringe diese Methode", "info")
-    except Exception as e:
-        log_and_print(f"[MEMORY] psutil Fehler: {str(e)}", "warning")
+        entries = [entry for entry in os.listdir(node_root) if entry.startswith('node') and entry[4:].isdigit()]
+    except OSError:
+        return nodes
+
+    for entry in sorted(entries, key=lambda name: int(name[4:])):
+        node_meminfo = parse_meminfo(read_sysfs_value(os.path.join(node_root, entry, "meminfo")) or "")
+        nodes.append({
+            'node': int(entry[4:]),
+            'total_mb': node_meminfo.get('MemTotal', 0) // (1024 * 1024),
+            'free_mb': node_meminfo.get('MemFree', 0) // (1024 * 1024)
+        })
+    return nodes
+
+
+def detect_memory_info() -> Dict[str, Any]:
+    """Erkennt Speicher-Informationen mit mehreren Methoden"""
+    import re
+    import subprocess
 
-    # Methode 2: Systembefehle
+    results = {}
+
+    # Methode 1: Systembefehle bzw. /proc
     try:
         if sys.platform.startswith('win'):
             output = subprocess.check_output(
@@ -365,11 +899,25 @@ def detect_memory_info() -> Dict[str, int]:
     except Exception as e:
         log_and_print(f"[MEMORY] Systembefehl Fehler: {str(e)}", "warning")
 
+    # Methode 2: psutil - unter Linux nur, wenn /proc/meminfo nicht lesbar ist
+    if not results.get('linux_meminfo'):
+        psutil = optional_import('psutil')
+        if psutil is None:
+            log_and_print("[MEMORY] psutil nicht installiert - überspringe diese Methode", "info")
+        else:
+            try:
+                virtual_mem = psutil.virtual_memory()
+                results['psutil_total'] = virtual_mem.total
+                results['psutil_available'] = virtual_mem.available
+            except Exception as e:
+                log_and_print(f"[MEMORY] psutil Fehler: {str(e)}", "warning")
+
     # Konsolidierung der Ergebnisse
     memory_info = {
         'total_mb': 0,
         'available_mb': 0
     }
+    linux_meminfo = parse_meminfo(results.get('linux_meminfo', ''))
 
     # Gesamtspeicher extrahieren
     if results.get('psutil_total'):
@@ -384,11 +932,8 @@ def detect_memory_info() -> Dict[str, int]:
         if match:
             # Wert ist in Bytes, umrechnen in MB
             memory_info['total_mb'] = int(match.group(1)) // (1024 * 1024)
-    elif sys.platform.startswith('linux') and 'MemTotal' in results.get('linux_meminfo', ''):
-        match = re.search(r'MemTotal:\s*(\d+)', results['linux_meminfo'])
-        if match:
-            # Wert ist in KB, umrechnen in MB
-            memory_info['total_mb'] = int(match.group(1)) // 1024
+    elif linux_meminfo.get('MemTotal'):
+        memory_info['total_mb'] = linux_meminfo['MemTotal'] // (1024 * 1024)
 
     # Verfügbare Speicher extrahieren
     if results.get('psutil_available'):
@@ -398,39 +943,444 @@ def detect_memory_info() -> Dict[str, int]:
         if match:
             # Wert ist in KB, umrechnen in MB
             memory_info['available_mb'] = int(match.group(1)) // 1024
+    elif 'MemAvailable' in linux_meminfo:
+        memory_info['available_mb'] = linux_meminfo['MemAvailable'] // (1024 * 1024)
+    elif linux_meminfo:
+        # Kernel < 3.14 ohne MemAvailable: freie Seiten plus Page-Cache als Näherung
+        memory_info['available_mb'] = (linux_meminfo.get('MemFree', 0) +
+                                       linux_meminfo.get('Cached', 0)) // (1024 * 1024)
+
+    # Effektiv nutzbarer Speicher: ohne cgroup-Grenzen entspricht er dem Host-Wert
+    memory_info['effective_total_mb'] = memory_info['total_mb']
+    memory_info['effective_available_mb'] = memory_info['available_mb']
+    memory_info['effective_source'] = 'host'
+
+    if sys.platform.startswith('linux'):
+        if linux_meminfo:
+            memory_info['swap_total_mb'] = linux_meminfo.get('SwapTotal', 0) // (1024 * 1024)
+            memory_info['swap_free_mb'] = linux_meminfo.get('SwapFree', 0) // (1024 * 1024)
+            memory_info['hugepages'] = detect_hugepage_info(linux_meminfo)
+        memory_info['numa_nodes'] = detect_numa_memory()
+
+        cgroup = detect_cgroup_memory_limits()
+        memory_info['cgroup'] = cgroup
+
+        # Die strengere der beiden Grenzen (max = OOM, high = Drosselung) ist maßgeblich
+        limits = [value for value in (cgroup['max_bytes'], cgroup['high_bytes']) if value]
+        if limits:
+            limit_bytes = min(limits)
+            used_bytes = max(0, (cgroup['current_bytes'] or 0) - (cgroup['inactive_file_bytes'] or 0))
+            cgroup_available_mb = max(0, limit_bytes - used_bytes) // (1024 * 1024)
+            limit_mb = limit_bytes // (1024 * 1024)
+
+            if not memory_info['total_mb'] or limit_mb < memory_info['total_mb']:
+                memory_info['effective_total_mb'] = limit_mb
+                memory_info['effective_source'] = 'cgroup'
+            if not memory_info['available_mb'] or cgroup_available_mb < memory_info['available_mb']:
+                memory_info['effective_available_mb'] = cgroup_available_mb
+                memory_info['effective_source'] = 'cgroup'
 
     return memory_info
 
 
-def detect_gpu_info() -> List[Dict[str, str]]:
-    """Erkennt GPU-Informationen mit mehreren Methoden (anonymisiert)"""
-    results = []
+# Dateisysteme ohne eigenes Blockgerät
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "sshfs", "fuse.sshfs", "9p", "ceph",
+                       "glusterfs", "fuse.glusterfs", "lustre", "afs", "virtiofs"}
+MEMORY_FILESYSTEMS = {"tmpfs", "ramfs"}
+
+
+def _unescape_mount_path(path: str) -> str:
+    """mountinfo kodiert Leerzeichen, Tabs, Zeilenumbrüche und Backslashes oktal (\\040 usw.)"""
+    if '\\' not in path:
+        return path
+    return (path.replace('\\040', ' ').replace('\\011', '\t')
+            .replace('\\012', '\n').replace('\\134', '\\'))
+
+
+def parse_mountinfo(mountinfo: str) -> List[Dict[str, str]]:
+    """Wertet /proc/self/mountinfo aus (ein Eintrag pro Mount, Reihenfolge wie im Kernel)"""
+    mounts = []
+    for line in mountinfo.splitlines():
+        # Aufbau: ID Eltern-ID major:minor Wurzel Mountpunkt Optionen [optionale Felder...] - Typ Quelle Superblock-Optionen
+        left, separator, right = line.partition(' - ')
+        if not separator:
+            continue
+        left_fields = left.split()
+        right_fields = right.split()
+        if len(left_fields) < 6 or len(right_fields) < 2:
+            continue
+        mounts.append({
+            'device': left_fields[2],
+            'mount_point': _unescape_mount_path(left_fields[4]),
+            'mount_options': left_fields[5],
+            'fstype': right_fields[0],
+            'source': right_fields[1],
+            'super_options': right_fields[2] if len(right_fields) > 2 else ''
+        })
+    return mounts
+
+
+def find_mount(mounts: List[Dict[str, str]], path: str) -> Optional[Dict[str, str]]:
+    """Mount mit dem längsten passenden Mountpunkt; bei Überlagerung gewinnt der spätere Eintrag"""
+    best = None
+    for mount in mounts:
+        mount_point = mount['mount_point']
+        if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+            if best is None or len(mount_point) >= len(best['mount_point']):
+                best = mount
+    return best
+
+
+def detect_block_queue(device: str, sysfs_root: Optional[str] = None) -> Dict[str, Any]:
+    """Eigenschaften des Blockgeräts major:minor aus /sys/dev/block (Partition -> ganze Platte)"""
+    root = sysfs_root or SYSFS_ROOT
+    device_dir = os.path.realpath(os.path.join(root, "dev", "block", device))
+    if not os.path.isdir(device_dir):
+        return {}
+    # Partitionen haben keine eigene queue/, die Einstellungen stehen an der Platte
+    disk_dir = os.path.dirname(device_dir) if os.path.exists(os.path.join(device_dir, "partition")) else device_dir
+    queue_dir = os.path.join(disk_dir, "queue")
+
+    def queue_int(name: str) -> Optional[int]:
+        value = read_sysfs_value(os.path.join(queue_dir, name))
+        return int(value) if value and value.isdigit() else None
+
+    scheduler = read_sysfs_value(os.path.join(queue_dir, "scheduler"))
+    if scheduler and '[' in scheduler:
+        # Aktiver Scheduler steht in eckigen Klammern, z.B. "[mq-deadline] kyber none"
+        scheduler = scheduler.split('[', 1)[1].split(']', 1)[0]
+
+    disk_name = os.path.basename(disk_dir)
+    rotational = queue_int("rotational")
+    if rotational == 1:
+        device_type = "hdd"
+    elif disk_name.startswith("nvme"):
+        device_type = "nvme"
+    elif rotational == 0:
+        device_type = "ssd"
+    else:
+        device_type = "unknown"
+
+    return {
+        'disk': disk_name,
+        'device_type': device_type,
+        'rotational': None if rotational is None else bool(rotational),
+        'scheduler': scheduler,
+        'nr_requests': queue_int("nr_requests"),
+        'read_ahead_kb': queue_int("read_ahead_kb"),
+        'logical_block_size': queue_int("logical_block_size"),
+        'physical_block_size': queue_int("physical_block_size"),
+        'max_sectors_kb': queue_int("max_sectors_kb")
+    }
+
+
+def detect_filesystem_usage(path: str) -> Dict[str, Any]:
+    """Freier Platz und Inodes über statvfs (Windows: nur Platz über shutil.disk_usage)"""
+    try:
+        if hasattr(os, 'statvfs'):
+            stats = os.statvfs(path)
+            return {
+                'total_mb': stats.f_blocks * stats.f_frsize // (1024 * 1024),
+                'free_mb': stats.f_bavail * stats.f_frsize // (1024 * 1024),
+                'block_size': stats.f_frsize,
+                'inodes_total': stats.f_files,
+                'inodes_free': stats.f_favail
+            }
+        import shutil
+        usage = shutil.disk_usage(path)
+        return {
+            'total_mb': usage.total // (1024 * 1024),
+            'free_mb': usage.free // (1024 * 1024),
+            'block_size': None,
+            'inodes_total': None,
+            'inodes_free': None
+        }
+    except OSError as e:
+        log_and_print(f"[STORAGE] Speicherplatz für {mask_personal_data(path)} nicht lesbar: {str(e)}", "warning")
+        return {}
+
+
+def detect_storage_info(path: Optional[str] = None, procfs_root: Optional[str] = None,
+                        sysfs_root: Optional[str] = None) -> Dict[str, Any]:
+    """Erkennt Dateisystem und Datenträger des Projektverzeichnisses sowie Shared-Memory/tmpfs
+
+    Args:
+        path: Zu untersuchendes Verzeichnis (Standard: aktuelles Arbeitsverzeichnis = Projekt-Root)
+        procfs_root / sysfs_root: Alternative Wurzeln für Fixture-Bäume
+    """
+    project_path = os.path.realpath(path or os.getcwd())
+    storage_info = {
+        'project_filesystem': {
+            'fstype': 'Unknown',
+            'mount_point': None,
+            'mount_options': [],
+            'device_type': 'unknown'
+        },
+        'project_usage': detect_filesystem_usage(project_path),
+        'dev_shm': {'available': False},
+        'tmp_is_tmpfs': False,
+        'tmpfs_mounts': 0
+    }
 
-    # Methode 1: pynvml für NVIDIA GPUs (wenn verfügbar)
+    mountinfo = None
+    try:
+        with open(os.path.join(procfs_root or PROCFS_ROOT, "self", "mountinfo"), 'r') as f:
+            mountinfo = f.read()
+    except OSError:
+        pass
+    if mountinfo is None:
+        # Nicht-Linux: nur Speicherplatz, /dev/shm ggf. trotzdem vorhanden (z.B. BSD)
+        storage_info['dev_shm']['available'] = os.path.isdir("/dev/shm")
+        return storage_info
+
+    mounts = parse_mountinfo(mountinfo)
+    mount = find_mount(mounts, project_path)
+    if mount:
+        filesystem = storage_info['project_filesystem']
+        filesystem['fstype'] = mount['fstype']
+        filesystem['mount_point'] = mask_personal_data(mount['mount_point'])
+        filesystem['mount_options'] = mount['mount_options'].split(',')
+        filesystem['read_only'] = 'ro' in filesystem['mount_options']
+        filesystem['noatime'] = 'noatime' in filesystem['mount_options']
+
+        if mount['fstype'] in MEMORY_FILESYSTEMS:
+            filesystem['device_type'] = 'memory'
+        elif mount['fstype'] in NETWORK_FILESYSTEMS:
+            filesystem['device_type'] = 'network'
+        elif mount['fstype'] == 'overlay':
+            # Container-Overlay: Das Schreib-Layer liegt auf dem Datenträger des Hosts und ist hier nicht sichtbar
+            filesystem['device_type'] = 'overlay'
+        elif not mount['device'].startswith('0:'):
+            block = detect_block_queue(mount['device'], sysfs_root)
+            if block:
+                filesystem['device_type'] = block.pop('device_type')
+                filesystem['block_device'] = block
+
+    tmpfs_mounts = [entry for entry in mounts if entry['fstype'] in MEMORY_FILESYSTEMS]
+    storage_info['tmpfs_mounts'] = len(tmpfs_mounts)
+    storage_info['tmp_is_tmpfs'] = any(entry['mount_point'] == '/tmp' for entry in tmpfs_mounts)
+
+    shm = next((entry for entry in reversed(tmpfs_mounts) if entry['mount_point'] == '/dev/shm'), None)
+    if shm:
+        usage = detect_filesystem_usage(shm['mount_point'])
+        storage_info['dev_shm'] = {
+            'available': True,
+            'size_mb': usage.get('total_mb'),
+            'free_mb': usage.get('free_mb')
+        }
+
+    return storage_info
+
+
+# PCI-Klasse 0x03xxxx = Display Controller (0x0300 VGA, 0x0302 3D, 0x0380 sonstige)
+PCI_DISPLAY_CLASS_PREFIX = "0x03"
+# Flags in /sys/bus/pci/devices/*/resource (IORESOURCE_MEM, IORESOURCE_PREFETCH)
+PCI_RESOURCE_MEM = 0x200
+PCI_RESOURCE_PREFETCH = 0x2000
+GPU_VENDOR_NAMES = {
+    "0x10de": "NVIDIA", "0x1002": "AMD", "0x8086": "Intel", "0x1a03": "ASPEED",
+    "0x15ad": "VMware", "0x1234": "QEMU", "0x1af4": "virtio", "0x1414": "Microsoft",
+    "0x5143": "Qualcomm", "0x13b5": "ARM"
+}
+
+
+def _nvml_text(value: Any) -> str:
+    """NVML liefert je nach pynvml-Version bytes oder str"""
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+def normalize_pci_address(address: str) -> str:
+    """Vereinheitlicht PCI-Adressen (NVML: 00000000:01:00.0, sysfs: 0000:01:00.0)"""
+    parts = address.strip().lower().split(':')
+    if len(parts) != 3:
+        return address.strip().lower()
+    domain, bus, slot = parts
+    try:
+        return f"{int(domain, 16):04x}:{bus}:{slot}"
+    except ValueError:
+        return address.strip().lower()
+
+
+def probe_nvml_gpus() -> List[Dict[str, Any]]:
+    """NVIDIA-GPUs über NVML: eine Initialisierung, jede Eigenschaft genau einmal abgefragt"""
+    pynvml = optional_import('pynvml')
+    if pynvml is None:
+        log_and_print("[GPU] pynvml nicht installiert - NVIDIA GPU-Erkennung übersprungen", "info")
+        return []
     try:
-        import pynvml
         pynvml.nvmlInit()
-        device_count = pynvml.nvmlDeviceGetCount()
+    except Exception as e:
+        log_and_print(f"[GPU] pynvml Fehler: {str(e)}", "warning")
+        return []
 
-        for i in range(device_count):
+    results = []
+    try:
+        # Gerätunabhängige Werte nur einmal abfragen
+        driver_version = _nvml_text(pynvml.nvmlSystemGetDriverVersion())
+        for i in range(pynvml.nvmlDeviceGetCount()):
             handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-            info = {
-                'name': pynvml.nvmlDeviceGetName(handle).decode('utf-8') if isinstance(pynvml.nvmlDeviceGetName(handle),
-                                                                                       bytes) else pynvml.nvmlDeviceGetName(
-                    handle),
-                'driver_version': pynvml.nvmlSystemGetDriverVersion().decode('utf-8') if isinstance(
-                    pynvml.nvmlSystemGetDriverVersion(), bytes) else pynvml.nvmlSystemGetDriverVersion(),
+            try:
+                serial = _nvml_text(pynvml.nvmlDeviceGetSerial(handle))
+            except Exception:
+                # Consumer-Karten liefern keine Seriennummer
+                serial = _nvml_text(pynvml.nvmlDeviceGetUUID(handle))
+            try:
+                pci_address = normalize_pci_address(_nvml_text(pynvml.nvmlDeviceGetPciInfo(handle).busId))
+            except Exception:
+                pci_address = None
+            results.append({
+                'name': _nvml_text(pynvml.nvmlDeviceGetName(handle)),
+                'vendor': 'NVIDIA',
+                'driver_version': driver_version,
                 'memory_total': pynvml.nvmlDeviceGetMemoryInfo(handle).total,
-                'anonymized_id': anonymize_hardware_id(f"nvidia_{i}_{pynvml.nvmlDeviceGetSerial(handle)}")
-            }
-            results.append(info)
-        pynvml.nvmlShutdown()
-    except ImportError:
-        log_and_print("[GPU] pynvml nicht installiert - NVIDIA GPU-Erkennung übersprungen", "info")
+                'memory_source': 'nvml',
+                'source': 'nvml',
+                'pci_address': pci_address,
+                'anonymized_id': anonymize_hardware_id(f"nvidia_{i}_{serial}")
+            })
     except Exception as e:
         log_and_print(f"[GPU] pynvml Fehler: {str(e)}", "warning")
+    finally:
+        try:
+            pynvml.nvmlShutdown()
+        except Exception:
+            pass
+    return results
+
+
+def read_pci_bar_sizes(resource_path: str) -> List[Tuple[int, int]]:
+    """Liest die BARs eines PCI-Geräts als Liste (Größe in Bytes, Flags); nur Speicher-BARs"""
+    bars = []
+    try:
+        with open(resource_path, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 3:
+                    continue
+                start, end, flags = (int(part, 16) for part in parts)
+                if end > start and flags & PCI_RESOURCE_MEM:
+                    bars.append((end - start + 1, flags))
+    except (OSError, ValueError):
+        pass
+    return bars
+
+
+def probe_sysfs_gpus(sysfs_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """GPUs über /sys/class/drm/card*/device (Linux, ohne externe Programme)
+
+    Grafikspeicher: mem_info_vram_total (amdgpu), sonst die größte prefetchable
+    Speicher-BAR als Untergrenze (bei Resizable BAR entspricht sie dem vollen VRAM).
+    """
+    root = sysfs_root or SYSFS_ROOT
+    drm_root = os.path.join(root, "class", "drm")
+    try:
+        cards = sorted((entry for entry in os.listdir(drm_root) if entry.startswith('card') and entry[4:].isdigit()),
+                       key=lambda entry: int(entry[4:]))
+    except OSError:
+        return []
+
+    results = []
+    seen_devices = set()
+    for card in cards:
+        device_dir = os.path.join(drm_root, card, "device")
+        pci_class = read_sysfs_value(os.path.join(device_dir, "class"))
+        vendor_id = read_sysfs_value(os.path.join(device_dir, "vendor"))
+        device_id = read_sysfs_value(os.path.join(device_dir, "device"))
+        if not vendor_id or not (pci_class or "").startswith(PCI_DISPLAY_CLASS_PREFIX):
+            continue  # z.B. simpledrm/efifb ohne PCI-Gerät
+        pci_address = normalize_pci_address(os.path.basename(os.path.realpath(device_dir)))
+        if pci_address in seen_devices:
+            continue
+        seen_devices.add(pci_address)
+
+        driver_link = os.path.join(device_dir, "driver")
+        driver = os.path.basename(os.path.realpath(driver_link)) if os.path.exists(driver_link) else None
+        module_version = read_sysfs_value(os.path.join(root, "module", driver, "version")) if driver else None
+
+        vram = read_sysfs_value(os.path.join(device_dir, "mem_info_vram_total"))
+        if vram and vram.isdigit() and int(vram) > 0:
+            memory_total, memory_source = int(vram), 'mem_info_vram_total'
+        else:
+            prefetchable = [size for size, flags in read_pci_bar_sizes(os.path.join(device_dir, "resource"))
+                            if flags & PCI_RESOURCE_PREFETCH]
+            memory_total, memory_source = (max(prefetchable), 'pci_bar') if prefetchable else (0, 'unknown')
+
+        vendor = GPU_VENDOR_NAMES.get(vendor_id.lower(), vendor_id)
+        product = read_sysfs_value(os.path.join(device_dir, "product_name"))
+        results.append({
+            'name': product or f"{vendor} GPU [{vendor_id[2:]}:{(device_id or '0x0000')[2:]}]",
+            'vendor': vendor,
+            'driver_version': f"{driver} {module_version}" if driver and module_version else (driver or 'Unknown'),
+            'memory_total': memory_total,
+            'memory_source': memory_source,
+            'source': 'sysfs',
+            'pci_address': pci_address,
+            'anonymized_id': anonymize_hardware_id(f"linux_{vendor_id}_{device_id}_{pci_address}")
+        })
+    return results
+
+
+def probe_lspci_gpus() -> List[Dict[str, Any]]:
+    """Letzter Ausweg unter Linux ohne lesbares sysfs: Textausgabe von lspci"""
+    import subprocess
+
+    results = []
+    try:
+        output = subprocess.check_output(['lspci', '-vnn'], text=True, stderr=subprocess.DEVNULL)
+    except Exception as e:
+        log_and_print(f"[GPU] lspci Fehler: {str(e)}", "warning")
+        return results
+
+    gpu_sections = []
+    current_section = []
+    for line in output.split('\n'):
+        if 'VGA compatible controller' in line or '3D controller' in line:
+            if current_section:
+                gpu_sections.append(current_section)
+            current_section = [line]
+        elif current_section and line.strip():
+            current_section.append(line)
+    if current_section:
+        gpu_sections.append(current_section)
+
+    for section in gpu_sections:
+        gpu_info = {}
+        for line in section:
+            if 'VGA compatible controller' in line or '3D controller' in line:
+                parts = line.split(':', 2)
+                if len(parts) > 2:
+                    gpu_info['name'] = parts[2].split('[', 1)[0].strip()
+            elif 'Kernel driver in use:' in line:
+                gpu_info['driver'] = line.split(':', 1)[1].strip()
+
+        if 'name' in gpu_info:
+            results.append({
+                'name': gpu_info['name'],
+                'driver_version': gpu_info.get('driver', 'Unknown'),
+                'memory_total': 0,  # lspci liefert keine einfache Gesamtspeicherangabe
+                'memory_source': 'unknown',
+                'source': 'lspci',
+                'anonymized_id': anonymize_hardware_id(
+                    f"linux_{gpu_info['name']}_{gpu_info.get('driver', 'unknown')}")
+            })
+    return results
 
-    # Methode 2: Systembefehle für alle Plattformen
+
+def detect_gpu_info(sysfs_root: Optional[str] = None, procfs_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Erkennt GPU-Informationen mit mehreren Methoden (anonymisiert)
+
+    Reihenfolge unter Linux: NVML (nur bei geladenem NVIDIA-Treiber), dann sysfs für alle
+    übrigen Karten, lspci nur, wenn sysfs gar nichts liefert.
+    """
+    import subprocess
+
+    results = []
+
+    # Methode 1: pynvml für NVIDIA GPUs (wenn verfügbar) - unter Linux nur bei geladenem NVIDIA-Treiber
+    if not sys.platform.startswith('linux') or os.path.exists(os.path.join(procfs_root or PROCFS_ROOT, "driver", "nvidia")):
+        results.extend(probe_nvml_gpus())
+
+    # Methode 2: Systemschnittstellen bzw. -befehle für alle Plattformen
     try:
         if sys.platform.startswith('win'):
             output = subprocess.check_output(
@@ -484,50 +1434,19 @@ def detect_gpu_info() -> List[Dict[str, str]]:
                     'anonymized_id': anonymize_hardware_id(f"mac_{current_gpu['name']}")
                 })
         elif sys.platform.startswith('linux'):
-            try:
-                # Versuche lspci für GPU-Informationen
-                output = subprocess.check_output(['lspci', '-vnn'], text=True, stderr=subprocess.DEVNULL)
-                gpu_sections = []
-                current_section = []
-
-                for line in output.split('\n'):
-                    if 'VGA compatible controller' in line or '3D controller' in line:
-                        if current_section:
-                            gpu_sections.append(current_section)
-                        current_section = [line]
-                    elif current_section and line.strip():
-                        current_section.append(line)
-
-                if current_section:
-                    gpu_sections.append(current_section)
-
-                for section in gpu_sections:
-                    gpu_info = {}
-                    for line in section:
-                        if 'VGA compatible controller' in line or '3D controller' in line:
-                            parts = line.split(':', 2)
-                            if len(parts) > 1:
-                                gpu_info['name'] = parts[2].split('[', 1)[0].strip()
-                        elif 'Kernel driver in use:' in line:
-                            gpu_info['driver'] = line.split(':', 1)[1].strip()
-                        elif 'Memory at' in line:
-                            match = re.search(r'Memory at ([0-9a-fA-F]+)\)', line)
-                            if match:
-                                gpu_info['memory_start'] = match.group(1)
-
-                    if 'name' in gpu_info:
-                        results.append({
-                            'name': gpu_info['name'],
-                            'driver_version': gpu_info.get('driver', 'Unknown'),
-                            'memory_total': 0,  # Linux liefert hier keine einfache Gesamtspeicherangabe
-                            'anonymized_id': anonymize_hardware_id(
-                                f"linux_{gpu_info['name']}_{gpu_info.get('driver', 'unknown')}")
-                        })
-            except Exception as e:
-                log_and_print(f"[GPU] lspci Fehler: {str(e)}", "warning")
+            # Bereits per NVML erfasste Karten nicht doppelt aufnehmen
+            nvml_devices = {gpu.get('pci_address') for gpu in results}
+            sysfs_gpus = probe_sysfs_gpus(sysfs_root)
+            results.extend(gpu for gpu in sysfs_gpus if gpu['pci_address'] not in nvml_devices)
+            if not results and not sysfs_gpus:
+                results.extend(probe_lspci_gpus())
     except Exception as e:
         log_and_print(f"[GPU] Systembefehl Fehler: {str(e)}", "warning")
 
+    # Die PCI-Adresse dient nur dem Abgleich der Quellen und gelangt nicht in den Bericht
+    for gpu in results:
+        gpu.pop('pci_address', None)
+
     # Fallback, wenn keine GPU erkannt wurde
     if not results:
         results.append({
@@ -555,15 +1474,43 @@ def parse_memory_size(memory_str: str) -> int:
 
 def anonymize_hardware_id(raw_id: str) -> str:
     """Anonymisiert eine Hardware-ID durch Hashing mit Salt"""
+    import hashlib
+
     combined = f"{raw_id}{ANONYMIZATION_SALT}".encode('utf-8')
     return hashlib.sha256(combined).hexdigest()[:16]  # Nur ersten 16 Zeichen für Kürze
 
 
+def detect_machine_id() -> str:
+    """Anonymisierte, über Läufe stabile Kennung der Maschine (für die Flotten-Auswertung)
+
+    Quelle ist die systemd/D-Bus machine-id bzw. unter Windows die MachineGuid; nur als
+    letzter Ausweg Hostname und Architektur. Die Rohwerte verlassen die Funktion nie.
+    """
+    raw_id = None
+    if sys.platform.startswith('win'):
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as key:
+                raw_id = winreg.QueryValueEx(key, "MachineGuid")[0]
+        except Exception:
+            pass
+    else:
+        for path in ("/etc/machine-id", "/var/lib/dbus/machine-id"):
+            raw_id = read_sysfs_value(path)
+            if raw_id:
+                break
+    if not raw_id:
+        import platform
+        raw_id = f"{platform.node()}_{platform.machine()}"
+    return anonymize_hardware_id(f"machine_{raw_id}")
+
+
 # NEUE FUNKTION: PERSONENBEZOGENE DATEN MASKIEREN
 def mask_personal_data(path: str) -> str:
     """Maskiert personenbezogene Daten im Pfad"""
     if os.name == 'nt':
         # Windows: Maskiere Benutzernamen in C:\Users\*
+        import re
         return re.sub(r'(C:\\Users\\)[^\\]+(\\)', r'\1%username%\2', path)
     elif os.name == 'posix':
         # Linux/macOS: Maskiere Home-Verzeichnis
@@ -573,41 +1520,56 @@ def mask_personal_data(path: str) -> str:
 
 
 def detect_screen_resolution() -> Dict[str, int]:
-    """Erkennt Bildschirmauflösung mit mehreren Methoden"""
+    """Erkennt Bildschirmauflösung mit mehreren Methoden
+
+    Die Methoden werden der Reihe nach nur so lange versucht, bis eine davon eine
+    Auflösung liefert - teure Importe (tkinter) und Prozessaufrufe entfallen damit meist.
+    """
+    import re
+    import subprocess
+
     results = {}
 
     # Methode 1: screeninfo (wenn verfügbar)
-    try:
-        from screeninfo import get_monitors
-        monitors = get_monitors()
-        if monitors:
-            primary = monitors[0]
-            results['screeninfo'] = {
-                'width': primary.width,
-                'height': primary.height,
-                'is_primary': primary.is_primary
-            }
-    except ImportError:
+    screeninfo = optional_import('screeninfo')
+    if screeninfo is None:
         log_and_print("[SCREEN] screeninfo nicht installiert - überspringe diese Methode", "info")
-    except Exception as e:
-        log_and_print(f"[SCREEN] screeninfo Fehler: {str(e)}", "warning")
-
-    # Methode 2: tkinter (immer verfügbar)
-    try:
-        import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()  # Verstecke das Hauptfenster
-        results['tkinter'] = {
-            'width': root.winfo_screenwidth(),
-            'height': root.winfo_screenheight()
-        }
-        root.destroy()
-    except Exception as e:
-        log_and_print(f"[SCREEN] tkinter Fehler: {str(e)}", "warning")
+    else:
+        try:
+            monitors = screeninfo.get_monitors()
+            if monitors:
+                primary = monitors[0]
+                results['screeninfo'] = {
+                    'width': primary.width,
+                    'height': primary.height,
+                    'is_primary': primary.is_primary
+                }
+        except Exception as e:
+            log_and_print(f"[SCREEN] screeninfo Fehler: {str(e)}", "warning")
+
+    # Ohne Display (z.B. SSH, Container) kann unter Linux weder tkinter noch xrandr etwas liefern
+    display_available = not sys.platform.startswith('linux') or bool(
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+    # Methode 2: tkinter (Standardbibliothek, aber teuer im Import)
+    if not results and display_available:
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()  # Verstecke das Hauptfenster
+            results['tkinter'] = {
+                'width': root.winfo_screenwidth(),
+                'height': root.winfo_screenheight()
+            }
+            root.destroy()
+        except Exception as e:
+            log_and_print(f"[SCREEN] tkinter Fehler: {str(e)}", "warning")
 
     # Methode 3: Systembefehle
     try:
-        if sys.platform.startswith('win'):
+        if results or not display_available:
+            pass
+        elif sys.platform.startswith('win'):
             # Windows PowerShell-Befehl für Auflösung
             output = subprocess.check_output(
                 'powershell (Get-WmiObject -Class Win32_VideoController).CurrentHorizontalResolution,(Get-WmiObject -Class Win32_VideoController).CurrentVerticalResolution',
@@ -680,6 +1642,8 @@ def detect_screen_resolution() -> Dict[str, int]:
 
 def detect_python_environment() -> Dict[str, Any]:
     """Erkennt Python-Umgebungsinformationen"""
+    import platform
+
     return {
         'version': platform.python_version(),
         'implementation': platform.python_implementation(),
@@ -690,11 +1654,135 @@ def detect_python_environment() -> Dict[str, Any]:
     }
 
 
+# ======================
+# TUNING-HINWEISE
+# ======================
+TUNING_VERSION = "1.2"
+PROCESS_MEMORY_MB = 256  # Angenommener Speicherbedarf je Worker-Prozess
+KIB = 1024
+MIB = 1024 * 1024
+
+
+def derive_tuning_hints(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Leitet konkrete Performance-Parameter aus dem erkannten Profil ab
+
+    Die Werte sind bewusst konservativ und werden von project_scanner.py,
+    scanning_environment.py und github_repo_preparer.py über irsanai_tuning.py
+    automatisch übernommen. Fehlende Abschnitte führen zu Standardwerten.
+    Die Berichte bleiben JSON-Dokumente, weil scan_diff und llm_payload_builder sie als
+    Ganzes lesen; bei knappem Speicher entfällt nur die Einrückung.
+    """
+    cpu_info = report.get('cpu_info', {})
+    memory_info = report.get('memory_info', {})
+    filesystem = report.get('storage_info', {}).get('project_filesystem', {})
+
+    cpus = max(1, int(cpu_info.get('effective_cpus') or cpu_info.get('logical_cores') or os.cpu_count() or 1))
+    available_mb = memory_info.get('effective_available_mb') or memory_info.get('available_mb') or 0
+    device_type = filesystem.get('device_type', 'unknown')
+    read_ahead_kb = filesystem.get('block_device', {}).get('read_ahead_kb')
+    memory_constrained = 0 < available_mb < 2048
+
+    # Prozesse: ein Worker je effektiver CPU, begrenzt durch den verfügbaren Speicher
+    process_pool = cpus
+    if available_mb:
+        process_pool = max(1, min(process_pool, available_mb // PROCESS_MEMORY_MB))
+    scaling = report.get('performance_profile', {}).get('benchmarks', {}).get('multiprocess_scaling', {})
+    measured_speedup = scaling.get('speedup', {}).get('mean') if isinstance(scaling, dict) else None
+    if measured_speedup:
+        # Gemessene Skalierung schlägt die Kernzahl (z.B. SMT, Drosselung, Nachbarn auf dem Host)
+        process_pool = max(1, min(process_pool, round(measured_speedup)))
+
+    # Threads für I/O: rotierende Platten vertragen kaum parallele Zugriffe, Netzwerk-FS viele
+    if device_type == 'hdd':
+        thread_pool = min(4, cpus)
+    elif device_type == 'network':
+        thread_pool = min(32, cpus * 8)
+    else:
+        thread_pool = min(32, cpus * 4)
+
+    # Lesepuffer: an Read-Ahead des Geräts orientiert, bei knappem Speicher klein
+    if memory_constrained:
+        hash_buffer = 64 * KIB
+    elif device_type in ('nvme', 'ssd', 'memory'):
+        hash_buffer = 1 * MIB
+    else:
+        hash_buffer = 256 * KIB
+    if read_ahead_kb:
+        hash_buffer = max(64 * KIB, min(hash_buffer, read_ahead_kb * KIB * 4))
+
+    # mmap lohnt sich nur für lokale Dateisysteme; über Netzwerk drohen SIGBUS und schlechte Latenz
+    use_mmap = device_type not in ('network', 'unknown') and sys.maxsize > 2 ** 32
+
+    # Speicherbudget für die Sortierblöcke beim Vergleich der Datei-Snapshots (project_scanner)
+    max_index_mb = max(64, min(4096, available_mb // 10)) if available_mb else 256
+
+    return {
+        "tuning_version": TUNING_VERSION,
+        "basis": {
+            "effective_cpus": cpus,
+            "effective_available_mb": available_mb or None,
+            "device_type": device_type,
+            "measured_speedup": measured_speedup
+        },
+        "thread_pool_size": thread_pool,
+        "process_pool_size": process_pool,
+        "hash_buffer_bytes": hash_buffer,
+        "use_mmap": use_mmap,
+        "mmap_min_bytes": 4 * MIB,
+        "max_in_memory_index_mb": max_index_mb,
+        "json_indent": None if memory_constrained else 2,
+        # Preview aus den Kopfbytes (Obergrenze in Bytes, unabhängig von der Dateigröße)
+        "preview_bytes": 500
+    }
+
+
 # ======================
 # REPORT-ERSTELLUNG
 # ======================
-def generate_env_report() -> Dict[str, Any]:
-    """Generiert den vollständigen Umgebungsbericht"""
+def detect_system_metrics() -> Dict[str, Any]:
+    """Erfasst Zeitpunkt und Uptime des Systems"""
+    return {
+        "current_time": time.time(),
+        "system_uptime": get_system_uptime()
+    }
+
+
+# Registry der Berichtsabschnitte: Name -> (Schlüssel im Bericht, Erkennungsfunktion).
+# Die Reihenfolge entspricht der Reihenfolge im Bericht.
+REPORT_SECTIONS: Dict[str, Tuple[str, Any]] = {
+    "os": ("os_info", detect_os_info),
+    "cpu": ("cpu_info", detect_cpu_info),
+    "memory": ("memory_info", detect_memory_info),
+    "gpu": ("gpu_info", detect_gpu_info),
+    "storage": ("storage_info", detect_storage_info),
+    "screen": ("screen_info", detect_screen_resolution),
+    "python": ("python_env", detect_python_environment),
+    "system": ("system_metrics", detect_system_metrics),
+}
+
+
+def parse_sections(value: Optional[str]) -> List[str]:
+    """Wandelt eine kommagetrennte Abschnittsliste in gültige Registry-Namen um"""
+    if not value or value.strip() == "all":
+        return list(REPORT_SECTIONS)
+    sections = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in sections if name not in REPORT_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unbekannte Abschnitte: {', '.join(unknown)} "
+                         f"(gültig: {', '.join(REPORT_SECTIONS)})")
+    # Registry-Reihenfolge beibehalten, Duplikate entfernen
+    return [name for name in REPORT_SECTIONS if name in sections]
+
+
+def generate_env_report(sections: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Generiert den Umgebungsbericht
+
+    Args:
+        sections: Namen aus REPORT_SECTIONS; None erzeugt den vollständigen Bericht.
+            Nicht angeforderte Abschnitte werden weder erkannt noch importiert.
+    """
+    from datetime import datetime
+
     log_and_print("[REPORT] Erstelle Umgebungsbericht...")
 
     # Sichere Projekt-Root durch Maskierung
@@ -704,17 +1792,19 @@ def generate_env_report() -> Dict[str, Any]:
         "status": "success",
         "timestamp": datetime.now().isoformat(),
         "detector_version": VERSION,
+        "anonymized_id": detect_machine_id(),
         "safe_project_root": safe_project_root,  # NICHT das echte Projekt-Root!
-        "os_info": detect_os_info(),
-        "cpu_info": detect_cpu_info(),
-        "memory_info": detect_memory_info(),
-        "gpu_info": detect_gpu_info(),
-        "screen_info": detect_screen_resolution(),
-        "python_env": detect_python_environment(),
-        "system_metrics": {
-            "current_time": time.time(),
-            "system_uptime": get_system_uptime()
-        },
+    }
+    selected = sections if sections is not None else list(REPORT_SECTIONS)
+    for name in selected:
+        key, detector = REPORT_SECTIONS[name]
+        started = time.perf_counter()
+        report[key] = detector()
+        if instrumentation is not None:
+            instrumentation.add_time(f"section_{name}", time.perf_counter() - started)
+    report["report_sections"] = selected
+
+    report.update({
         "privacy": {
             "dsgvo_consent_given": True,
             "anonymization_salt_used": ANONYMIZATION_SALT[:8] + "...",
@@ -724,7 +1814,7 @@ def generate_env_report() -> Dict[str, Any]:
             "running_in_sandbox": False,
             "executed_with_elevated_privileges": check_elevated_privileges()
         }
-    }
+    })
 
     return report
 
@@ -736,8 +1826,14 @@ def get_system_uptime() -> Optional[float]:
             # Windows: Nutzung von GetTickCount64
             import ctypes
             return ctypes.windll.kernel32.GetTickCount64() / 1000.0
-        elif sys.platform.startswith('darwin') or sys.platform.startswith('linux'):
-            # macOS/Linux: Nutzung von sysctl oder /proc/uptime
+        elif sys.platform.startswith('linux'):
+            # Linux: /proc/uptime, erster Wert = Sekunden seit dem Start
+            with open(os.path.join(PROCFS_ROOT, "uptime"), 'r') as f:
+                return float(f.read().split()[0])
+        elif sys.platform.startswith('darwin'):
+            # macOS: Nutzung von sysctl
+            import re
+            import subprocess
             output = subprocess.check_output(['sysctl', '-n', 'kern.boottime'], text=True)
             match = re.search(r'sec = (\d+)', output)
             if match:
@@ -763,8 +1859,110 @@ def check_elevated_privileges() -> bool:
 # ======================
 # HAUPTFUNKTION
 # ======================
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> Any:
+    """Wertet die Kommandozeilenoptionen des Detektors aus"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IrsanAI OS & Hardware Detection System")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Kurze Mikro-Benchmarks ausführen und als performance_profile speichern")
+    parser.add_argument("--benchmark-budget", type=float, default=10.0, metavar="SEKUNDEN",
+                        help="Maximale Gesamtdauer des Benchmark-Schritts (Standard: 10)")
+    parser.add_argument("--sample", action="store_true",
+                        help="Systemlast kontinuierlich messen und als resource_sampling speichern")
+    parser.add_argument("--sample-interval", type=float, default=1.0, metavar="SEKUNDEN",
+                        help="Abstand zwischen zwei Messpunkten (Standard: 1)")
+    parser.add_argument("--sample-duration", type=float, default=30.0, metavar="SEKUNDEN",
+                        help="Gesamtdauer der Messung, 0 = bis Strg+C (Standard: 30)")
+    parser.add_argument("--sample-capacity", type=int, default=3600, metavar="ANZAHL",
+                        help="Größe des Ringpuffers in Messpunkten (Standard: 3600)")
+    parser.add_argument("--sections", default=None, metavar="LISTE",
+                        help=f"Nur diese Abschnitte erkennen, kommagetrennt ({','.join(REPORT_SECTIONS)}; "
+                             f"Standard: alle)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Nicht-interaktiver Modus für Flotten-Läufe: keine Rückfrage, keine Zusammenfassung; "
+                             f"Einwilligung aus {DSGVO_CONSENT_FILE} oder per --consent")
+    parser.add_argument("--consent", action="store_true",
+                        help="DSGVO-Einwilligung ohne Rückfrage erteilen (wird gespeichert)")
+    parser.add_argument("--output", default=REPORT_FILE, metavar="PFAD",
+                        help=f"Zieldatei des Berichts, '-' für stdout (Standard: {REPORT_FILE})")
+    parser.add_argument("--humanity-index", action="store_true",
+                        help="Humanity Index aus Scan-Historie und LLM-Feedback berechnen und "
+                             "mit report_metadata in den Bericht aufnehmen")
+    parser.add_argument("--profile", default=None, metavar="PFAD",
+                        help="Lauf mit cProfile profilieren und pstats-Daten nach PFAD schreiben "
+                             "(Zusammenfassung in PFAD.txt)")
+    args = parser.parse_args(argv)
+    try:
+        args.sections = parse_sections(args.sections)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def run_benchmark_stage(env_report: Dict[str, Any], time_budget: float) -> Dict[str, Any]:
+    """Führt den optionalen Benchmark-Schritt aus (Modul wird erst bei Bedarf geladen)"""
+    from IrsanAI_HW_Benchmark import run_benchmarks
+
+    log_and_print(f"\n[BENCHMARK] Starte Mikro-Benchmarks (Budget: {time_budget:.1f}s)...")
+    profile = run_benchmarks(
+        time_budget=time_budget,
+        project_dir=os.getcwd(),
+        max_workers=env_report.get('cpu_info', {}).get('effective_cpus'),
+        memory_limit_mb=env_report.get('memory_info', {}).get('effective_available_mb')
+    )
+    log_and_print(f"[BENCHMARK] Abgeschlossen in {profile['elapsed_seconds']}s"
+                  + (f" (übersprungen: {', '.join(profile['skipped'])})" if profile['skipped'] else ""))
+    return profile
+
+
+def run_sampling_stage(interval: float, duration: float, capacity: int) -> Dict[str, Any]:
+    """Führt den optionalen Sampling-Modus aus (Modul wird erst bei Bedarf geladen)"""
+    from IrsanAI_HW_Sampler import ResourceSampler
+
+    log_and_print(f"\n[SAMPLE] Messe Systemlast alle {interval}s "
+                  + (f"für {duration:.0f}s..." if duration > 0 else "bis Strg+C..."))
+    sampler = ResourceSampler(interval=interval, capacity=capacity)
+    sampler.run(duration)
+    summary = sampler.summary()
+    log_and_print(f"[SAMPLE] {summary['samples']} Messpunkte erfasst, Eigenverbrauch: "
+                  f"{summary['self_overhead']['cpu_percent_of_one_core']}% eines Kerns")
+    return summary
+
+
+def timed_stage(name: str) -> Any:
+    """Stufen-Timer der Messpunkte; ohne irsanai_instrumentation ein leerer Kontext"""
+    if instrumentation is None:
+        import contextlib
+        return contextlib.nullcontext()
+    return instrumentation.stage(name)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Einstiegspunkt: Optionen auswerten, Erkennung ggf. unter cProfile ausführen"""
+    args = parse_arguments(argv)
+
+
+    global instrumentation
+    instrumentation = load_instrumentation()
+    if instrumentation is None:
+        if args.profile:
+            print("[PROFILE] irsanai_instrumentation nicht gefunden - Lauf ohne Profiling", file=sys.stderr)
+        run_detection(args)
+        return
+    instrumentation.profile_file = args.profile
+    optional_import("irsanai_instrumentation").profile_call(args.profile, run_detection, args)
+
+
+def run_detection(args: Any):
     """Hauptausführung des Skripts"""
+    global console_stream
+    to_stdout = args.output == "-"
+    if to_stdout:
+        console_stream = sys.stderr
+
+    setup_logging()
+
     log_and_print("=" * 60)
     log_and_print("IrsanAI OS & HARDWARE DETECTION SYSTEM v2.7")
     log_and_print("=" * 60)
@@ -772,42 +1970,112 @@ def main():
     # Sicherheitschecks
     if not verify_integrity():
         log_and_print("[SECURITY] Skript-Integritätsprüfung fehlgeschlagen! Abbruch.", "critical")
-        sys.exit(1)
+        sys.exit(EXIT_ERROR)
 
     if not check_execution_environment():
         log_and_print("[SECURITY] Ausführung in unsicherer Umgebung erkannt! Abbruch.", "critical")
-        sys.exit(1)
+        sys.exit(EXIT_ERROR)
 
     # DSGVO-Einwilligung
-    if not get_dsgvo_consent():
+    if args.batch or args.consent:
+        consent_given = get_batch_consent(args.consent)
+    else:
+        consent_given = get_dsgvo_consent()
+    if not consent_given:
         log_and_print("[DSGVO] Abbruch aufgrund fehlender Einwilligung.", "info")
-        sys.exit(0)
+        sys.exit(EXIT_NO_CONSENT if args.batch else EXIT_OK)
 
-    # Erstelle Backup
-    backup_path = create_backup()
+    # Sichere bestehende Berichte, bevor sie überschrieben werden
+    backup_id = create_backup([] if to_stdout else [args.output])
 
     # Generiere Bericht
     try:
         log_and_print("\n[DETECTION] Starte Hardware- und OS-Erkennung...")
-        env_report = generate_env_report()
+        env_report = generate_env_report(args.sections)
+
+        if args.benchmark:
+            with timed_stage("benchmark"):
+                env_report['performance_profile'] = run_benchmark_stage(env_report, args.benchmark_budget)
+
+        if args.sample:
+            with timed_stage("sampling"):
+                env_report['resource_sampling'] = run_sampling_stage(
+                    args.sample_interval, args.sample_duration, args.sample_capacity)
+
+        # Tuning-Hinweise zuletzt, damit Benchmark-Ergebnisse einfließen können
+        with timed_stage("tuning"):
+            env_report['tuning'] = derive_tuning_hints(env_report)
+
+        if args.humanity_index:
+            with timed_stage("humanity_index"):
+                lrp_report = generate_environment_report(environment_data=env_report)
+            env_report['report_metadata'] = lrp_report['report_metadata']
+            env_report['humanity_index'] = lrp_report['humanity_index']
+
+        # Stufenzeiten bis hierher (die Serialisierung selbst steht im Log)
+        if instrumentation is not None:
+            env_report['performance'] = instrumentation.snapshot()
 
         # Speichere Bericht
-        os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
-        with open(REPORT_FILE, 'w') as f:
-            json.dump(env_report, f, indent=2)
+        import json
+        with timed_stage("report_serialization"):
+            if to_stdout:
+                json.dump(env_report, sys.stdout, indent=2)
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+            else:
+                if os.path.dirname(args.output):
+                    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+                # Erst vollständig schreiben, dann umbenennen: parallele Sammler sehen nie halbe Berichte
+                temp_path = f"{args.output}.tmp{os.getpid()}"
+                with open(temp_path, 'w') as f:
+                    json.dump(env_report, f, indent=2)
+                os.replace(temp_path, args.output)
+        if to_stdout:
+            log_and_print("\n[REPORT] Erfolgreich! Umgebungsbericht auf stdout ausgegeben")
+        else:
+            log_and_print(f"\n[REPORT] Erfolgreich! Umgebungsbericht gespeichert in: {args.output}")
+        if instrumentation is not None:
+            log_and_print(f"[REPORT] Laufzeit je Stufe: {instrumentation.stage_summary()}")
+        if backup_id:
+            log_and_print(f"[REPORT] Vorheriger Bericht gesichert in Snapshot: {backup_id}")
 
-        log_and_print(f"\n[REPORT] Erfolgreich! Umgebungsbericht gespeichert in: {REPORT_FILE}")
-        log_and_print(f"[REPORT] Backup erstellt in: {backup_path}")
+        if args.batch:
+            sys.exit(EXIT_OK)
 
         # Zusammenfassung anzeigen
         log_and_print("\n" + "=" * 60)
         log_and_print("SYSTEM-ZUSAMMENFASSUNG")
         log_and_print("=" * 60)
-        log_and_print(f"Betriebssystem: {env_report['os_info']['details']['full_version']}")
-        log_and_print(f"CPU: {env_report['cpu_info']['logical_cores']} Kerne ({env_report['cpu_info']['model']})")
-        log_and_print(f"RAM: {env_report['memory_info']['total_mb']} MB")
-        log_and_print(f"Bildschirm: {env_report['screen_info']['width']}x{env_report['screen_info']['height']}")
-        log_and_print(f"Python: {env_report['python_env']['version']} ({env_report['python_env']['implementation']})")
+        if 'os_info' in env_report:
+            log_and_print(f"Betriebssystem: {env_report['os_info']['details']['full_version']}")
+        if 'cpu_info' in env_report:
+            log_and_print(f"CPU: {env_report['cpu_info']['logical_cores']} Kerne ({env_report['cpu_info']['model']})")
+        if 'memory_info' in env_report:
+            log_and_print(f"RAM: {env_report['memory_info']['total_mb']} MB "
+                          f"(effektiv nutzbar: {env_report['memory_info']['effective_available_mb']} MB)")
+        if 'screen_info' in env_report:
+            log_and_print(f"Bildschirm: {env_report['screen_info']['width']}x{env_report['screen_info']['height']}")
+        if 'storage_info' in env_report:
+            filesystem = env_report['storage_info']['project_filesystem']
+            log_and_print(f"Datenträger: {filesystem['fstype']} ({filesystem['device_type']}), "
+                          f"frei: {env_report['storage_info']['project_usage'].get('free_mb', '?')} MB")
+        if 'python_env' in env_report:
+            log_and_print(f"Python: {env_report['python_env']['version']} "
+                          f"({env_report['python_env']['implementation']})")
+        if 'performance_profile' in env_report:
+            benchmarks = env_report['performance_profile']['benchmarks']
+            for name in ('python_loop', 'memory_copy', 'sha256_hashing', 'disk_sequential_write'):
+                result = benchmarks.get(name, {})
+                if result.get('mean') is not None:
+                    log_and_print(f"Benchmark {name}: {result['mean']} {result['unit']} (95%-KI: {result['ci95']})")
+        if 'humanity_index' in env_report:
+            log_and_print(f"Humanity Index: {env_report['humanity_index']['score']} "
+                          f"({env_report['humanity_index']['basis']['scans_in_window']} Scans im Fenster)")
+        tuning = env_report['tuning']
+        log_and_print(f"Tuning: {tuning['thread_pool_size']} Threads, {tuning['process_pool_size']} Prozesse, "
+                      f"Hash-Puffer {tuning['hash_buffer_bytes'] // 1024} KB, mmap: "
+                      f"{'ja' if tuning['use_mmap'] else 'nein'}")
         log_and_print("=" * 60)
         log_and_print("Der nächste Schritt: Kopiere IrsanAI_env_report.json in dein Online-LLM,")
         log_and_print("um IrsanAI_project-run.py für deine spezifische Hardware zu generieren.")
@@ -816,13 +2084,20 @@ def main():
     except Exception as e:
         log_and_print(f"[ERROR] Unvorhergesehener Fehler: {str(e)}", "critical")
         log_and_print("[ERROR] Bitte sende den Log-File an support@irsanai.example für Analyse.", "critical")
-        sys.exit(1)
+        sys.exit(EXIT_ERROR)
 def calculate_humanity_index(report: Dict[str, Any]) -> Dict[str, Any]:
-    """Berechnet den Humanity Index basierend auf der Interaktionsqualität"""
-    # Metriken basierend auf Interaktionsmustern
-    human_input_quality = 0.95  # Wird in der Praxis dynamisch berechnet
-    ai_refinement_level = 0.89  # Wird in der Praxis dynamisch berechnet
-    collaboration_depth = 0.93  # Wird in der Praxis dynamisch berechnet
+    """Berechnet den Humanity Index basierend auf der Interaktionsqualität
+
+    Die Kennzahlen stammen aus Scan-Historie und LLM-Feedback des Projekts
+    (IrsanAI_Humanity_Index.py, inkrementell mit Cache); ohne Historie sind sie neutral.
+    """
+    from IrsanAI_Humanity_Index import compute_humanity_metrics
+
+    result = compute_humanity_metrics()
+    metrics = result["metrics"]
+    human_input_quality = metrics["human_input_quality"]
+    ai_refinement_level = metrics["ai_refinement_level"]
+    collaboration_depth = metrics["collaboration_depth"]
 
     score = (human_input_quality * 0.4 +
              ai_refinement_level * 0.3 +
@@ -836,6 +2111,7 @@ def calculate_humanity_index(report: Dict[str, Any]) -> Dict[str, Any]:
             "ai_refinement_level": round(ai_refinement_level, 2),
             "collaboration_depth": round(collaboration_depth, 2)
         },
+        "basis": result["basis"],
         "recommendation": get_recommendation(score)
     }
 
@@ -857,19 +2133,33 @@ def get_recommendation(score: float) -> str:
     else:
         return "Überprüfen Sie die Kommunikation - mehr menschliche Beteiligung könnte die Ergebnisse verbessern."
 
-def generate_environment_report() -> Dict[str, Any]:
-    """Generiert einen vollständigen Systembericht mit Humanity Index"""
+def generate_environment_report(sections: Optional[List[str]] = None,
+                                environment_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Generiert einen vollständigen Systembericht mit Humanity Index
+
+    Args:
+        sections: Abschnitte für generate_env_report (nur ohne environment_data)
+        environment_data: Bereits erstellter Umgebungsbericht, der nicht neu erkannt werden soll
+    """
+    import hashlib
+    import platform
+    from datetime import datetime
+
+    if environment_data is None:
+        environment_data = generate_env_report(sections)
+    timestamp = datetime.now().isoformat()
+
     report = {
         "report_metadata": {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "protocol_version": "IrsanAI-LRP v1.2",
             "report_type": "hardware_environment",
             "security_hash": hashlib.sha256(
-                f"{datetime.now().isoformat()}_{platform.node()}".encode()
+                f"{timestamp}_{platform.node()}".encode()
             ).hexdigest()[:16]
         },
-        "environment_data": get_hardware_info(),
-        "humanity_index": calculate_humanity_index({})  # Leeres Dict für Demo
+        "environment_data": environment_data,
+        "humanity_index": calculate_humanity_index(environment_data)
     }
     return report
 
@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IrsanAI_Patch_Engine.py
+Version: 1.0
+Beschreibung: Wendet ein LRP-Update (Patch-Manifest) auf beliebig viele Zieldateien an -
+              parallel, mit Hash-Prüfung und Alles-oder-nichts-Semantik
+
+Manifest (JSON):
+    {
+      "manifest_version": 1,
+      "label": "minor_update_v2.2.1b",          # Name der Snapshots im Backup-Speicher
+      "targets": [
+        {"files": ["IrsanAI_project-run.py"],   # und/oder "glob": "generated/**/*.py"
+         "verification_hash": "sha256:...",     # optional, gilt für jede Datei des Eintrags
+         "patches": [{"search_pattern": "...", "replacement": "...",
+                      "max_occurrences": 1, "min_occurrences": 1, "flags": ["DOTALL"],
+                      "anchor": {"function": "validate_environment"}}]}
+      ]
+    }
+
+Anker begrenzen die Regex-Auswertung auf kleine Fenster der Datei, die per str.find
+gefunden werden (Laufzeit linear in der Dateigröße, auch für ".*?" mit DOTALL):
+    {"function": "name"}                  Rumpf jeder Funktion/Methode "def name(" (bis zur
+                                          ersten Zeile mit gleicher oder geringerer Einrückung)
+    {"marker": "text", "lines": N}        Zeile mit dem Marker und die N folgenden Zeilen
+Ohne Anker prüft ein Vorfilter die festen Textteile des Musters (z.B. "# SCHUTZSCHALTER"):
+fehlt einer, ist das Ergebnis ohne Regex-Lauf "0 Treffer" ("prefilter": false schaltet ihn ab).
+
+Ablauf:
+1. Vorbereiten (ab PARALLEL_MIN_FILES Dateien in einem Prozess-Pool): jeder Worker kompiliert
+   die Muster einmal, liest jede Datei blockweise und prüft dabei den SHA-256, wendet jedes
+   Muster mit einem subn-Durchlauf je Fenster an und schreibt das Ergebnis in eine temporäre
+   Datei neben dem Ziel (fsync, Rechte des Originals)
+2. Schlägt eine Datei fehl (Hash, Trefferzahl, Lesefehler), werden alle temporären Dateien
+   verworfen - keine Zieldatei wurde verändert
+3. Übernehmen: je Datei os.replace der temporären Datei; das Original bleibt bis zum Ende
+   als Hardlink erhalten, sodass bei einem Fehler alle bereits ersetzten Dateien
+   zurückgesetzt werden
+4. Backup: Snapshot der Originale im Backup-Speicher (irsanai_backup_store) per Hardlink,
+   erst danach werden die Originale entfernt; schlägt das Backup fehl, wird zurückgesetzt
+
+Unterbefehle:
+    python IrsanAI_Patch_Engine.py apply manifest.json [--dry-run] [--workers N]
+    python IrsanAI_Patch_Engine.py benchmark [--size-mb 4]   # Regex ohne/mit Vorfilter/Anker
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+MANIFEST_VERSION = 1
+READ_CHUNK_BYTES = 1024 * 1024
+PARALLEL_MIN_FILES = 16  # darunter lohnt der Start eines Prozess-Pools nicht
+TASK_CHUNK_SIZE = 32  # Dateien je Auftrag an einen Worker
+TEMP_SUFFIX = ".irsanai_patch_tmp"
+ORIGINAL_SUFFIX = ".irsanai_patch_orig"
+DEFAULT_FLAGS = ("DOTALL",)  # wie bisher in IrsanAI_Minor_Update.py
+DEFAULT_BACKUP_KEEP = 5
+MIN_LITERAL_LENGTH = 3  # kürzere feste Textteile lohnen keinen Vorfilter
+REGEX_META = ".^$*+?{}[]|()"
+QUANTIFIERS = "*+?{"
+BENCHMARK_SIZE_MB = 4
+BENCHMARK_CANDIDATES = 50  # Methoden gleichen Namens im Fall "candidates_without_terminator"
+BENCHMARK_REPEAT_LIMIT_S = 1.0  # langsamere Messungen werden nicht wiederholt
+REGEX_FLAGS = {
+    "DOTALL": re.DOTALL,
+    "MULTILINE": re.MULTILINE,
+    "IGNORECASE": re.IGNORECASE,
+    "VERBOSE": re.VERBOSE,
+}
+
+# Kompilierte Patch-Sätze je Prozess (in den Workern über _init_worker gesetzt)
+_PATCH_SETS: List[List[Dict[str, Any]]] = []
+_DRY_RUN = False
+
+
+def log(message: str) -> None:
+    print(f"[PATCH] {message}")
+
+
+# ======================
+# MANIFEST
+# ======================
+def compile_patch(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Kompiliert eine Patch-Anweisung (ValueError bei ungültigem Muster oder Flag)"""
+    flags = 0
+    for name in spec.get("flags", DEFAULT_FLAGS):
+        if name not in REGEX_FLAGS:
+            raise ValueError(f"Unbekanntes Regex-Flag: {name}")
+        flags |= REGEX_FLAGS[name]
+    try:
+        regex = re.compile(spec["search_pattern"], flags)
+    except re.error as e:
+        raise ValueError(f"Ungültiges Muster {spec['search_pattern']!r}: {str(e)}")
+    anchor = spec.get("anchor")
+    if anchor is not None and not (anchor.get("function") or anchor.get("marker")):
+        raise ValueError(f"Anker benötigt 'function' oder 'marker': {anchor}")
+    # regex.flags enthält auch Inline-Flags wie "(?i)" oder "(?x)"
+    use_prefilter = spec.get("prefilter", True) and not regex.flags & (re.IGNORECASE | re.VERBOSE)
+    return {
+        "pattern": spec["search_pattern"],
+        "regex": regex,
+        "replacement": spec["replacement"],
+        "min_occurrences": int(spec.get("min_occurrences", 1)),
+        "max_occurrences": int(spec.get("max_occurrences", 1)),
+        "anchor": anchor,
+        "literals": required_literals(spec["search_pattern"]) if use_prefilter else [],
+    }
+
+
+# ======================
+# ANKER UND VORFILTER
+# ======================
+def required_literals(pattern: str) -> List[str]:
+    """Feste Textteile, die in jedem Treffer vorkommen müssen
+
+    Ausgewertet wird nur die oberste Ebene des Musters: Gruppen, Zeichenklassen und
+    Escape-Klassen (\\s, \\d, ...) beenden einen Textteil, ein Quantor entfernt das Zeichen
+    davor. Muster mit Alternativen ("|") liefern keine Textteile.
+    """
+    if "|" in pattern.replace("\\|", ""):
+        return []
+    literals = []
+    current: List[str] = []
+    depth = 0
+    index = 0
+
+    def flush() -> None:
+        if len(current) >= MIN_LITERAL_LENGTH:
+            literals.append("".join(current))
+        current.clear()
+
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern):
+            escaped = pattern[index + 1]
+            index += 2
+            if depth == 0 and not escaped.isalnum():
+                literal = escaped
+            else:
+                flush()
+                continue
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            index = len(pattern) if end == -1 else end + 1
+            flush()
+            continue
+        elif char == "(":
+            depth += 1
+            index += 1
+            flush()
+            continue
+        elif char == ")":
+            depth -= 1
+            index += 1
+            continue
+        elif char == "{":
+            end = pattern.find("}", index)
+            index = len(pattern) if end == -1 else end + 1
+            flush()
+            continue
+        elif char in REGEX_META or depth > 0:
+            index += 1
+            flush()
+            continue
+        else:
+            literal = char
+            index += 1
+        if index < len(pattern) and pattern[index] in QUANTIFIERS:
+            flush()  # das Zeichen ist optional bzw. wiederholt
+            continue
+        current.append(literal)
+    flush()
+    return literals
+
+
+def _line_start(text: str, position: int) -> int:
+    return text.rfind("\n", 0, position) + 1
+
+
+def _line_end(text: str, position: int) -> int:
+    end = text.find("\n", position)
+    return len(text) if end == -1 else end + 1
+
+
+def function_windows(text: str, name: str) -> List[Tuple[int, int]]:
+    """Fenster über jede Funktion/Methode "def name(" bis zum Ende ihres Rumpfs
+
+    Das Ende ist die erste folgende Zeile (außer Leer- und Kommentarzeilen) mit gleicher
+    oder geringerer Einrückung; mehrzeilige Zeichenketten am Zeilenanfang werden dabei
+    nicht erkannt. Eine innere Funktion gleichen Namens liegt im Fenster der äußeren und
+    erhält kein eigenes (sonst würde ihr Bereich doppelt ersetzt).
+    """
+    windows = []
+    needle = f"def {name}("
+    position = text.find(needle)
+    while position != -1:
+        start = _line_start(text, position)
+        prefix = text[start:position]
+        if prefix.strip() in ("", "async"):
+            indent = len(prefix) - len(prefix.lstrip(" \t"))
+            end = _line_end(text, position)
+            while end < len(text):
+                line_end = _line_end(text, end)
+                line = text[end:line_end]
+                content = line.lstrip(" \t")
+                if content.strip() and not content.startswith("#") and len(line) - len(content) <= indent:
+                    break
+                end = line_end
+            if windows and start < windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(end, windows[-1][1]))
+            else:
+                windows.append((start, end))
+        position = text.find(needle, position + len(needle))
+    return windows
+
+
+def marker_windows(text: str, marker: str, lines: int) -> List[Tuple[int, int]]:
+    """Fenster über jede Zeile mit marker und die lines folgenden Zeilen (überlappende verschmelzen)"""
+    windows: List[Tuple[int, int]] = []
+    position = text.find(marker)
+    while position != -1:
+        start = _line_start(text, position)
+        end = _line_end(text, position)
+        for _ in range(lines):
+            if end >= len(text):
+                break
+            end = _line_end(text, end)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(end, windows[-1][1]))
+        else:
+            windows.append((start, end))
+        position = text.find(marker, max(position + len(marker), start + 1))
+    return windows
+
+
+def find_windows(text: str, anchor: Optional[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """Auszuwertende Bereiche der Datei; ohne Anker die ganze Datei"""
+    if not anchor:
+        return [(0, len(text))]
+    if anchor.get("function"):
+        return function_windows(text, anchor["function"])
+    return marker_windows(text, anchor["marker"], int(anchor.get("lines", 0)))
+
+
+def apply_patch(content: str, patch: Dict[str, Any]) -> Tuple[str, int]:
+    """Wendet eine kompilierte Anweisung an: ein subn-Durchlauf je Fenster, höchstens max_occurrences + 1 Treffer
+
+    Returns:
+        (neuer Inhalt, Anzahl Ersetzungen)
+    """
+    budget = patch["max_occurrences"] + 1
+    total = 0
+    parts = []
+    last = len(content)
+    # Von hinten nach vorn, damit die Positionen der übrigen Fenster gültig bleiben
+    for start, end in reversed(find_windows(content, patch["anchor"])):
+        window = content[start:end]
+        if any(literal not in window for literal in patch["literals"]):
+            continue
+        replaced, count = patch["regex"].subn(patch["replacement"], window, count=budget - total)
+        if count:
+            parts.append(content[end:last])
+            parts.append(replaced)
+            last = start
+            total += count
+            if total >= budget:
+                break
+    if not total:
+        return content, 0
+    parts.append(content[:last])
+    return "".join(reversed(parts)), total
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Liest und prüft ein Patch-Manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    validate_manifest(manifest)
+    return manifest
+
+
+def validate_manifest(manifest: Dict[str, Any]) -> None:
+    """ValueError, wenn das Manifest unvollständig ist oder ein Muster nicht kompiliert"""
+    if manifest.get("manifest_version", MANIFEST_VERSION) != MANIFEST_VERSION:
+        raise ValueError(f"Nicht unterstützte Manifest-Version: {manifest.get('manifest_version')}")
+    targets = manifest.get("targets")
+    if not targets:
+        raise ValueError("Manifest enthält keine Ziele ('targets')")
+    for index, target in enumerate(targets):
+        if not target.get("files") and not target.get("glob"):
+            raise ValueError(f"Ziel {index}: 'files' oder 'glob' erforderlich")
+        if not target.get("patches"):
+            raise ValueError(f"Ziel {index}: keine Patch-Anweisungen ('patches')")
+        for spec in target["patches"]:
+            compile_patch(spec)
+
+
+def expand_targets(manifest: Dict[str, Any], root: str) -> List[Tuple[str, int, Optional[str]]]:
+    """Aufträge (Pfad relativ zu root, Index des Patch-Satzes, erwarteter SHA-256)
+
+    Raises:
+        ValueError: eine Datei fehlt, liegt außerhalb von root oder gehört zu mehreren Zielen
+    """
+    root = os.path.abspath(root)
+    tasks = []
+    owner: Dict[str, int] = {}
+    for index, target in enumerate(manifest["targets"]):
+        paths = list(target.get("files", []))
+        if target.get("glob"):
+            matches = glob.glob(os.path.join(root, target["glob"]), recursive=True)
+            paths.extend(os.path.relpath(path, root) for path in sorted(matches) if os.path.isfile(path))
+        expected = target.get("verification_hash")
+        expected = expected.split(":", 1)[-1].lower() if expected else None
+        for rel_path in paths:
+            rel_path = rel_path.replace("\\", "/")
+            path = os.path.abspath(os.path.join(root, rel_path))
+            if os.path.commonpath([root, path]) != root:
+                raise ValueError(f"Pfad liegt nicht unter {root}: {rel_path}")
+            if rel_path in owner:
+                if owner[rel_path] == index:
+                    continue
+                raise ValueError(f"Datei gehört zu mehreren Zielen ({owner[rel_path]} und {index}): {rel_path}")
+            if not os.path.isfile(path):
+                raise ValueError(f"Zieldatei nicht gefunden: {rel_path}")
+            owner[rel_path] = index
+            tasks.append((path, index, expected))
+    return tasks
+
+
+# ======================
+# VORBEREITEN (WORKER)
+# ======================
+def _init_worker(patch_specs: List[List[Dict[str, Any]]], dry_run: bool) -> None:
+    """Kompiliert alle Patch-Sätze einmal je Prozess"""
+    global _PATCH_SETS, _DRY_RUN
+    _PATCH_SETS = [[compile_patch(spec) for spec in specs] for specs in patch_specs]
+    _DRY_RUN = dry_run
+
+
+def read_verified(path: str, expected: Optional[str]) -> Tuple[bytes, str]:
+    """Liest die Datei blockweise und berechnet dabei den SHA-256
+
+    Raises:
+        ValueError: der Hash weicht von expected ab
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+            chunks.append(chunk)
+    file_hash = digest.hexdigest()
+    if expected and file_hash != expected:
+        raise ValueError(f"Datei-Hash stimmt nicht überein! Erwartet: sha256:{expected}, Gefunden: {file_hash} "
+                         f"- möglicherweise wurden bereits Änderungen vorgenommen")
+    return b"".join(chunks), file_hash
+
+
+def write_temp(path: str, data: bytes) -> str:
+    """Schreibt data neben path (fsync, Rechte des Originals); liefert den temporären Pfad"""
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}{TEMP_SUFFIX}")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+    return temp_path
+
+
+def prepare_file(task: Tuple[str, int, Optional[str]]) -> Dict[str, Any]:
+    """Wendet den Patch-Satz auf eine Datei an, ohne das Ziel zu verändern
+
+    Returns:
+        {"path", "status" ("ready"|"unchanged"|"failed"), "temp", "sha256_before",
+         "sha256_after", "replacements", "error"}
+    """
+    path, set_index, expected = task
+    result: Dict[str, Any] = {"path": path, "status": "failed", "temp": None, "sha256_before": None,
+                              "sha256_after": None, "replacements": [], "error": None}
+    try:
+        data, result["sha256_before"] = read_verified(path, expected)
+        content = data.decode('utf-8')
+        for patch in _PATCH_SETS[set_index]:
+            content, count = apply_patch(content, patch)
+            if count < patch["min_occurrences"] or count > patch["max_occurrences"]:
+                raise ValueError(f"Keine Übereinstimmung für Pattern gefunden oder zu viele Vorkommen "
+                                 f"({count}/{patch['max_occurrences']}): {patch['pattern']}")
+            result["replacements"].append(count)
+        new_data = content.encode('utf-8')
+        if new_data == data:
+            result["status"] = "unchanged"
+            return result
+        result["sha256_after"] = hashlib.sha256(new_data).hexdigest()
+        if not _DRY_RUN:
+            result["temp"] = write_temp(path, new_data)
+        result["status"] = "ready"
+    except (OSError, ValueError, UnicodeDecodeError, re.error) as e:
+        result["error"] = str(e)
+    return result
+
+
+def default_workers() -> int:
+    """Prozesse für das Vorbereiten: process_pool_size aus den Tuning-Hinweisen, sonst alle Kerne"""
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.append(project_dir)
+    try:
+        from irsanai_tuning import find_env_report, load_tuning_hints
+    except ImportError:
+        return os.cpu_count() or 1
+    if find_env_report() is None:
+        return os.cpu_count() or 1
+    return load_tuning_hints()["process_pool_size"]
+
+
+def prepare_all(tasks: List[Tuple[str, int, Optional[str]]], patch_specs: List[List[Dict[str, Any]]],
+                workers: int, dry_run: bool) -> List[Dict[str, Any]]:
+    """Bereitet alle Dateien vor (parallel ab PARALLEL_MIN_FILES Dateien)"""
+    if workers > 1 and len(tasks) >= PARALLEL_MIN_FILES:
+        chunksize = max(1, min(TASK_CHUNK_SIZE, len(tasks) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(patch_specs, dry_run)) as executor:
+            return list(executor.map(prepare_file, tasks, chunksize=chunksize))
+    _init_worker(patch_specs, dry_run)
+    return [prepare_file(task) for task in tasks]
+
+
+# ======================
+# ÜBERNEHMEN
+# ======================
+def discard_temps(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        if result.get("temp"):
+            try:
+                os.remove(result["temp"])
+            except OSError:
+                pass
+            result["temp"] = None
+
+
+def load_backup_store(root: str) -> Any:
+    """Backup-Speicher aus irsanai_backup_store (Projekt-Root); None, wenn das Modul fehlt"""
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.append(project_dir)
+    try:
+        from irsanai_backup_store import BackupStore
+    except ImportError:
+        return None
+    return BackupStore(root)
+
+
+def rollback(replaced: List[Tuple[str, str]]) -> None:
+    """Setzt ersetzte Zieldateien auf ihre Originale zurück (umgekehrte Reihenfolge)"""
+    for path, original in reversed(replaced):
+        try:
+            if os.path.lexists(path) and os.path.samefile(original, path):
+                os.remove(original)  # noch nicht ersetzt; rename zwischen Hardlinks wäre wirkungslos
+            else:
+                os.replace(original, path)
+        except OSError as undo_error:
+            log(f"FEHLER: Rücknahme fehlgeschlagen für {path}: {str(undo_error)}")
+
+
+def commit(ready: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Ersetzt alle Zieldateien; die Originale bleiben bis finalize() unter zweitem Namen erhalten
+
+    Returns:
+        (Zieldatei, Original) je ersetzter Datei
+
+    Raises:
+        OSError: nach erfolgter Rücknahme
+    """
+    replaced: List[Tuple[str, str]] = []
+    try:
+        for result in ready:
+            path = result["path"]
+            original = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}{ORIGINAL_SUFFIX}")
+            try:
+                os.link(path, original)
+            except FileExistsError:
+                os.replace(path, original)  # Rest eines abgebrochenen Laufs
+            except OSError:
+                os.rename(path, original)  # ohne Hardlinks: kurz ohne Zieldatei
+            replaced.append((path, original))
+            os.replace(result["temp"], path)
+            result["temp"] = None
+    except OSError:
+        rollback(replaced)
+        discard_temps(ready)
+        raise
+    return replaced
+
+
+def finalize(replaced: List[Tuple[str, str]]) -> None:
+    """Entfernt die Originale und macht die Verzeichniseinträge dauerhaft"""
+    directories = set()
+    for path, original in replaced:
+        try:
+            os.remove(original)
+        except OSError:
+            pass
+        directories.add(os.path.dirname(path))
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def apply_manifest(manifest: Dict[str, Any], root: str = ".", workers: Optional[int] = None,
+                   dry_run: bool = False, backup: bool = True) -> Dict[str, Any]:
+    """Wendet ein Patch-Manifest auf alle Ziele unter root an (alles oder nichts)
+
+    Returns:
+        Zusammenfassung {"files", "changed", "unchanged", "replacements", "failed", "committed",
+        "rolled_back", "snapshot", "seconds"}
+    """
+    start = time.perf_counter()
+    validate_manifest(manifest)
+    root = os.path.abspath(root)
+    summary: Dict[str, Any] = {"files": 0, "changed": 0, "unchanged": 0, "replacements": 0, "failed": [],
+                               "committed": False, "rolled_back": False, "snapshot": None, "seconds": 0.0}
+    try:
+        tasks = expand_targets(manifest, root)
+    except ValueError as e:
+        summary["failed"].append({"path": None, "error": str(e)})
+        return summary
+
+    patch_specs = [target["patches"] for target in manifest["targets"]]
+    results = prepare_all(tasks, patch_specs, workers or default_workers(), dry_run)
+    summary["files"] = len(results)
+    summary["failed"] = [{"path": os.path.relpath(result["path"], root), "error": result["error"]}
+                         for result in results if result["status"] == "failed"]
+    ready = [result for result in results if result["status"] == "ready"]
+    summary["changed"] = len(ready)
+    summary["unchanged"] = sum(1 for result in results if result["status"] == "unchanged")
+    summary["replacements"] = sum(sum(result["replacements"]) for result in results)
+
+    if summary["failed"] or dry_run or not ready:
+        discard_temps(results)
+        summary["committed"] = not summary["failed"] and not dry_run
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        return summary
+
+    try:
+        replaced = commit(ready)
+    except OSError as e:
+        summary["rolled_back"] = True
+        summary["failed"].append({"path": None, "error": f"Übernehmen fehlgeschlagen: {str(e)}"})
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        return summary
+
+    store = load_backup_store(root) if backup else None
+    if store is not None:
+        label = manifest.get("label", "patch")
+        try:
+            # Die Originale werden gleich entfernt: Hardlinks in den Speicher kosten keinen Platz
+            snapshot = store.snapshot(label, {os.path.relpath(path, root): original
+                                              for path, original in replaced}, detach=True)
+            store.gc(keep=manifest.get("backup_keep", DEFAULT_BACKUP_KEEP), label=label)
+        except OSError as e:
+            rollback(replaced)
+            summary["rolled_back"] = True
+            summary["failed"].append({"path": None, "error": f"Backup fehlgeschlagen: {str(e)}"})
+            summary["seconds"] = round(time.perf_counter() - start, 3)
+            return summary
+        summary["snapshot"] = snapshot and snapshot["id"]
+
+    finalize(replaced)
+    summary["committed"] = True
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def print_summary(summary: Dict[str, Any], dry_run: bool = False) -> None:
+    for failure in summary["failed"][:20]:
+        log(f"FEHLER: {failure['path'] or 'Manifest'}: {failure['error']}")
+    if len(summary["failed"]) > 20:
+        log(f"... und {len(summary['failed']) - 20} weitere Fehler")
+    if summary["failed"]:
+        log("ABBRUCH - keine Datei wurde verändert" + (" (Rücknahme durchgeführt)" if summary["rolled_back"] else ""))
+        return
+    verb = "würden geändert" if dry_run else "geändert"
+    log(f"{summary['changed']} von {summary['files']} Dateien {verb}, {summary['unchanged']} unverändert, "
+        f"{summary['replacements']} Ersetzungen in {summary['seconds']} s")
+    if summary["snapshot"]:
+        log(f"Backup: Snapshot {summary['snapshot']} (wiederherstellen mit "
+            f"python irsanai_backup_store.py restore {summary['snapshot']})")
+
+
+# ======================
+# BENCHMARK
+# ======================
+BENCHMARK_PATCH = {
+    "search_pattern": r"def validate_environment\(\):\s+.*?# SCHUTZSCHALTER",
+    "replacement": "def validate_environment():\n    check_hardware_compatibility()\n    # SCHUTZSCHALTER",
+    "max_occurrences": 1,
+    "min_occurrences": 0,
+}
+BENCHMARK_MODES = {
+    "regex": {"prefilter": False},  # bisheriges Verhalten: ganze Datei, kein Vorfilter
+    "prefilter": {},
+    "anchored": {"anchor": {"function": "validate_environment"}},
+}
+
+
+def _filler(index: int) -> str:
+    return (f"def helper_{index}(value):\n"
+            f"    \"\"\"Hilfsfunktion {index}\"\"\"\n"
+            f"    result = value * {index % 97 + 2}\n"
+            f"    return result\n\n\n")
+
+
+def build_benchmark_source(size_mb: float, case: str, candidates: int = BENCHMARK_CANDIDATES) -> str:
+    """Synthetische Python-Quelle von etwa size_mb MB
+
+    Fälle:
+        match:                          Zielfunktion in der Mitte, Marker vorhanden
+        missing_terminator:             Zielfunktion ohne Marker, der Marker steht erst am Dateiende
+        candidates_without_terminator:  viele Methoden validate_environment, nirgends ein Marker
+    """
+    target_bytes = int(size_mb * 1024 * 1024)
+    fillers = []
+    length = 0
+    while length < target_bytes:
+        fillers.append(_filler(len(fillers)))
+        length += len(fillers[-1])
+
+    target = "def validate_environment():\n    load_config()\n    # SCHUTZSCHALTER\n    return True\n\n\n"
+    if case == "match":
+        fillers.insert(len(fillers) // 2, target)
+    elif case == "missing_terminator":
+        fillers.insert(len(fillers) // 2, target.replace("    # SCHUTZSCHALTER\n", ""))
+        fillers.append("def shutdown():\n    # SCHUTZSCHALTER\n    pass\n")
+    else:
+        method = "class Check{0}:\n    def validate_environment():\n        return {0}\n\n\n"
+        step = max(1, len(fillers) // candidates)
+        for number, position in enumerate(range(len(fillers) - step, -1, -step)[:candidates]):
+            fillers.insert(position, method.format(number))
+    return "".join(fillers)
+
+
+def run_benchmark(size_mb: float = BENCHMARK_SIZE_MB, candidates: int = BENCHMARK_CANDIDATES,
+                  repeat: int = 3) -> List[Dict[str, Any]]:
+    """Misst apply_patch je Fall und Modus (beste von repeat Wiederholungen)"""
+    results = []
+    for case in ("match", "missing_terminator", "candidates_without_terminator"):
+        source = build_benchmark_source(size_mb, case, candidates)
+        megabytes = len(source.encode('utf-8')) / (1024 * 1024)
+        for mode, options in BENCHMARK_MODES.items():
+            patch = compile_patch({**BENCHMARK_PATCH, **options})
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                _, count = apply_patch(source, patch)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+                if elapsed > BENCHMARK_REPEAT_LIMIT_S:
+                    break
+            results.append({"case": case, "mode": mode, "size_mb": round(megabytes, 2),
+                            "seconds": round(best, 6), "mb_per_s": round(megabytes / best, 1) if best else None,
+                            "replacements": count})
+    return results
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def command_apply(args: Any) -> int:
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        log(f"FEHLER: Manifest ungültig: {str(e)}")
+        return 1
+
+    summary = apply_manifest(manifest, args.root, args.workers, args.dry_run, not args.no_backup)
+    print_summary(summary, args.dry_run)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 1 if summary["failed"] else 0
+
+
+def command_benchmark(args: Any) -> int:
+    results = run_benchmark(args.size_mb, args.candidates, args.repeat)
+    print(f"{'Fall':<31} {'Modus':<10} {'MB':>6} {'Sekunden':>10} {'MB/s':>10} {'Treffer':>8}")
+    for result in results:
+        print(f"{result['case']:<31} {result['mode']:<10} {result['size_mb']:>6} {result['seconds']:>10} "
+              f"{result['mb_per_s'] or '-':>10} {result['replacements']:>8}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"version": VERSION, "results": results}, f, indent=2)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IrsanAI Patch-Engine für LRP-Updates über viele Dateien")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    apply = subparsers.add_parser("apply", help="Patch-Manifest anwenden")
+    apply.add_argument("manifest", help="Patch-Manifest (JSON)")
+    apply.add_argument("--root", default=".", help="Verzeichnis, auf das sich die Pfade beziehen (Standard: .)")
+    apply.add_argument("--workers", type=int, default=None,
+                       help="Prozesse zum Vorbereiten (Standard: Tuning-Hinweise bzw. alle Kerne)")
+    apply.add_argument("--dry-run", action="store_true", help="Nur prüfen und zählen, nichts schreiben")
+    apply.add_argument("--no-backup", action="store_true",
+                       help="Originale nicht im Backup-Speicher (.IrsanAI/backups/) sichern")
+    apply.add_argument("--output", help="Zusammenfassung als JSON in diese Datei schreiben")
+
+    benchmark = subparsers.add_parser("benchmark", help="Regex ohne/mit Vorfilter und Anker auf großen Quellen messen")
+    benchmark.add_argument("--size-mb", type=float, default=BENCHMARK_SIZE_MB)
+    benchmark.add_argument("--candidates", type=int, default=BENCHMARK_CANDIDATES,
+                           help="Methoden validate_environment im Fall candidates_without_terminator")
+    benchmark.add_argument("--repeat", type=int, default=3)
+    benchmark.add_argument("--output", help="Ergebnisse als JSON in diese Datei schreiben")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "benchmark":
+        return command_benchmark(args)
+    return command_apply(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_backup_store.py
+Version: 1.0
+Beschreibung: Inhaltsadressierter Backup-Speicher unter .IrsanAI/backups/ für Patches und Aufräumläufe.
+
+Aufbau:
+    .IrsanAI/backups/objects/ab/cdef...     ein Blob je eindeutigem Inhalt (SHA-256), schreibgeschützt
+    .IrsanAI/backups/snapshots/<id>.json    Manifest: relativer Pfad -> Hash, Größe, Rechte
+
+- Jeder Inhalt wird nur einmal gespeichert; wiederholte Sicherungen unveränderter Dateien
+  kosten nur das Manifest (und ist auch dieses identisch mit dem letzten seines Labels,
+  wird gar nichts geschrieben).
+- Blobs entstehen per Reflink (Copy-on-Write, z.B. Btrfs/XFS), sonst per Kopie. Dateien,
+  die der Aufrufer unmittelbar danach entfernt (detach=True), werden fest verlinkt (Hardlink):
+  das spart das Kopieren, die Daten bleiben aber nach dem Entfernen der Quelle im Speicher.
+  stats["new_bytes"] zählt daher jeden neu angelegten Blob, gleich wie er entstanden ist.
+- Wiederherstellen schreibt je Datei eine temporäre Kopie (wieder per Reflink, wo möglich)
+  und ersetzt das Ziel atomar mit os.replace. Arbeitsdateien teilen sich nie einen Inode
+  mit einem Blob, damit Änderungen am Projekt den Speicher nicht verfälschen.
+- gc() behält je Label die letzten Snapshots und löscht alle Blobs ohne Verweis.
+
+Verwendung:
+    store = BackupStore(project_root)
+    manifest = store.snapshot("minor_update", ["IrsanAI_project-run.py"])
+    store.restore(manifest["id"])
+    store.gc(keep=5)
+
+Kommandozeile: python irsanai_backup_store.py list | restore ID [PFAD ...] | gc [--keep N]
+"""
+
+import os
+import sys
+import json
+import stat
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+
+# ======================
+# KONFIGURATION
+# ======================
+BACKUP_STORE_VERSION = 1
+BACKUP_DIR = os.path.join(".IrsanAI", "backups")  # relativ zum Projekt-Root
+OBJECTS_DIR = "objects"
+SNAPSHOTS_DIR = "snapshots"
+DEFAULT_KEEP_SNAPSHOTS = 10  # je Label behaltene Snapshots bei gc()
+HASH_BUFFER_BYTES = 1024 * 1024
+BLOB_MODE = 0o444
+FICLONE = 0x40049409  # ioctl für Reflinks unter Linux (Btrfs, XFS, bcachefs, ...)
+
+
+# ======================
+# DATEIOPERATIONEN
+# ======================
+def file_sha256(path: str) -> str:
+    """SHA-256 einer Datei, blockweise in einen wiederverwendeten Puffer gelesen"""
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_BUFFER_BYTES)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            length = f.readinto(buffer)
+            if not length:
+                break
+            digest.update(view[:length])
+    return digest.hexdigest()
+
+
+def reflink_file(source: str, target: str) -> bool:
+    """Legt target als Copy-on-Write-Klon von source an; False, wenn das Dateisystem es nicht kann"""
+    try:
+        import fcntl
+    except ImportError:
+        return False  # Windows
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        return False
+
+
+def _remove_readonly(path: str) -> None:
+    """Entfernt eine Datei auch mit Schreibschutz (unter Windows nötig)"""
+    try:
+        os.remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.remove(path)
+
+
+# ======================
+# BACKUP-SPEICHER
+# ======================
+class BackupStore:
+    """Inhaltsadressierter Speicher mit Snapshot-Manifesten"""
+
+    def __init__(self, project_root: str, store_dir: Optional[str] = None):
+        self.project_root = os.path.abspath(project_root)
+        self.store_dir = os.path.abspath(store_dir or os.path.join(self.project_root, BACKUP_DIR))
+        self.objects_dir = os.path.join(self.store_dir, OBJECTS_DIR)
+        self.snapshots_dir = os.path.join(self.store_dir, SNAPSHOTS_DIR)
+        self.can_reflink = True  # nach dem ersten Fehlschlag nicht erneut versuchen
+
+    def blob_path(self, file_hash: str) -> str:
+        return os.path.join(self.objects_dir, file_hash[:2], file_hash[2:])
+
+    def project_path(self, rel_path: str) -> str:
+        """Absoluter Pfad unterhalb des Projekt-Roots
+
+        Raises:
+            ValueError: der Pfad zeigt aus dem Projekt heraus
+        """
+        path = os.path.abspath(os.path.join(self.project_root, rel_path))
+        if os.path.commonpath([self.project_root, path]) != self.project_root or path == self.project_root:
+            raise ValueError(f"Pfad liegt nicht im Projekt: {rel_path}")
+        return path
+
+    def _rel_path(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.project_root).replace("\\", "/")
+
+    def _clone(self, source: str, target: str) -> str:
+        """Kopiert source nach target (Reflink, sonst Kopie); liefert das Verfahren"""
+        if self.can_reflink:
+            if reflink_file(source, target):
+                return "reflink"
+            self.can_reflink = False
+        shutil.copyfile(source, target)
+        return "copy"
+
+    def _store_blob(self, source: str, file_hash: str, detach: bool) -> Tuple[str, bool]:
+        """Legt den Blob zu file_hash an, falls er fehlt
+
+        Returns:
+            (Verfahren, neu angelegt); Verfahren "existing", wenn der Inhalt schon gespeichert war
+        """
+        blob = self.blob_path(file_hash)
+        if os.path.exists(blob):
+            return "existing", False
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        if detach:
+            try:
+                os.link(source, blob)
+                os.chmod(blob, BLOB_MODE)
+                return "hardlink", True
+            except FileExistsError:
+                return "existing", False
+            except OSError:
+                pass  # anderes Dateisystem oder keine Hardlinks: kopieren
+        temp_path = f"{blob}.tmp{os.getpid()}"
+        method = self._clone(source, temp_path)
+        os.chmod(temp_path, BLOB_MODE)
+        os.replace(temp_path, blob)
+        return method, True
+
+    def _collect(self, files: Union[Iterable[str], Dict[str, str]]) -> List[Tuple[str, str]]:
+        """(Manifest-Pfad, tatsächlicher Ort) je Eintrag; Verzeichnisse werden vollständig aufgenommen"""
+        if isinstance(files, dict):
+            pairs = [(rel_path.replace("\\", "/"), source) for rel_path, source in files.items()]
+        else:
+            pairs = []
+            for path in files:
+                source = path if os.path.isabs(path) else os.path.join(self.project_root, path)
+                pairs.append((self._rel_path(source), source))
+
+        collected = []
+        for rel_path, source in pairs:
+            if not os.path.lexists(source):
+                continue
+            collected.append((rel_path, source))
+            if os.path.isdir(source) and not os.path.islink(source):
+                for dirpath, dirnames, filenames in os.walk(source):
+                    dirnames.sort()
+                    for name in dirnames + sorted(filenames):
+                        full_path = os.path.join(dirpath, name)
+                        sub_path = os.path.relpath(full_path, source).replace("\\", "/")
+                        collected.append((f"{rel_path}/{sub_path}", full_path))
+        return collected
+
+    def snapshot(self, label: str, files: Union[Iterable[str], Dict[str, str]],
+                 detach: bool = False) -> Optional[Dict[str, Any]]:
+        """Sichert Dateien und Verzeichnisse als Snapshot
+
+        Args:
+            label: Herkunft des Snapshots (z.B. "minor_update"); gc() behält je Label die letzten
+            files: Pfade (relativ zum Projekt-Root oder absolut) oder {Manifest-Pfad: tatsächlicher Ort},
+                   z.B. für Dateien, die bereits in einen Papierkorb verschoben wurden
+            detach: die Quellen werden unmittelbar danach entfernt - Hardlinks statt Kopien erlaubt
+
+        Returns:
+            Manifest oder None, wenn keine der Dateien existiert. Schlägt das Sichern fehl,
+            werden die in diesem Aufruf angelegten Blobs wieder entfernt und der Fehler weitergegeben.
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        stats = {"files": 0, "bytes": 0, "new_bytes": 0, "new_blobs": 0, "reflink": 0, "hardlink": 0, "copy": 0,
+                 "existing": 0}
+        created_blobs: List[str] = []
+        try:
+            for rel_path, source in self._collect(files):
+                info = os.lstat(source)
+                mode = stat.S_IMODE(info.st_mode)
+                if stat.S_ISLNK(info.st_mode):
+                    entries[rel_path] = {"type": "symlink", "target": os.readlink(source)}
+                elif stat.S_ISDIR(info.st_mode):
+                    entries[rel_path] = {"type": "dir", "mode": mode}
+                elif stat.S_ISREG(info.st_mode):
+                    file_hash = file_sha256(source)
+                    method, created = self._store_blob(source, file_hash, detach)
+                    if created:
+                        created_blobs.append(self.blob_path(file_hash))
+                        # Auch Hardlink- und Reflink-Blobs behalten die Daten, sobald die Quelle
+                        # entfernt bzw. geändert wird
+                        stats["new_bytes"] += info.st_size
+                        stats["new_blobs"] += 1
+                    stats[method] += 1
+                    stats["files"] += 1
+                    stats["bytes"] += info.st_size
+                    entries[rel_path] = {"type": "file", "hash": file_hash, "size": info.st_size, "mode": mode}
+        except BaseException:
+            for blob in created_blobs:
+                try:
+                    _remove_readonly(blob)
+                except OSError:
+                    pass
+            raise
+
+        if not entries:
+            return None
+
+        content_hash = hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()
+        latest = self.list_snapshots(label)
+        if latest and latest[-1].get("content_hash") == content_hash:
+            return latest[-1]  # unverändert seit dem letzten Snapshot dieses Labels
+
+        now = datetime.now()
+        manifest = {
+            "manifest_version": BACKUP_STORE_VERSION,
+            "id": f"{now.strftime('%Y%m%d_%H%M%S_%f')}_{label}",
+            "label": label,
+            "created": now.isoformat(),
+            "content_hash": content_hash,
+            "stats": stats,
+            "files": entries,
+        }
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        manifest_path = os.path.join(self.snapshots_dir, f"{manifest['id']}.json")
+        temp_path = f"{manifest_path}.tmp{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(temp_path, manifest_path)
+        return manifest
+
+    def load_manifest(self, snapshot_id: str) -> Dict[str, Any]:
+        """Lädt ein Manifest (FileNotFoundError, wenn es den Snapshot nicht gibt)"""
+        with open(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_snapshots(self, label: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Alle (bzw. die zu label gehörenden) Manifeste, älteste zuerst"""
+        try:
+            names = sorted(name for name in os.listdir(self.snapshots_dir) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+        manifests = []
+        for name in names:
+            try:
+                manifest = self.load_manifest(name[:-len(".json")])
+            except (OSError, ValueError):
+                continue
+            if label is None or manifest.get("label") == label:
+                manifests.append(manifest)
+        return manifests
+
+    def restore(self, snapshot_id: str, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """Stellt einen Snapshot (oder nur die angegebenen Pfade samt Inhalt) wieder her
+
+        Vor dem ersten Schreibzugriff wird geprüft, dass alle benötigten Blobs vorhanden sind.
+
+        Returns:
+            wiederhergestellte Pfade (relativ zum Projekt-Root)
+        """
+        manifest = self.load_manifest(snapshot_id)
+        entries = manifest["files"]
+        if paths is not None:
+            wanted = [path.replace("\\", "/").rstrip("/") for path in paths]
+            entries = {rel_path: entry for rel_path, entry in entries.items()
+                       if any(rel_path == path or rel_path.startswith(path + "/") for path in wanted)}
+
+        for rel_path, entry in entries.items():
+            self.project_path(rel_path)
+            if entry["type"] == "file" and not os.path.exists(self.blob_path(entry["hash"])):
+                raise FileNotFoundError(f"Blob fehlt für {rel_path}: {entry['hash']}")
+
+        restored = []
+        for rel_path in sorted(entries):  # Verzeichnisse vor ihrem Inhalt
+            entry = entries[rel_path]
+            target = self.project_path(rel_path)
+            if entry["type"] == "dir":
+                os.makedirs(target, exist_ok=True)
+                os.chmod(target, entry["mode"])
+                restored.append(rel_path)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            temp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.irsanai_restore")
+            if entry["type"] == "symlink":
+                os.symlink(entry["target"], temp_path)
+            else:
+                self._clone(self.blob_path(entry["hash"]), temp_path)
+                os.chmod(temp_path, entry["mode"])
+            os.replace(temp_path, target)
+            restored.append(rel_path)
+        return restored
+
+    def gc(self, keep: int = DEFAULT_KEEP_SNAPSHOTS, label: Optional[str] = None) -> Dict[str, int]:
+        """Löscht alte Snapshots (je Label bleiben die letzten keep) und alle Blobs ohne Verweis
+
+        Args:
+            keep: Anzahl behaltener Snapshots je Label
+            label: nur Snapshots dieses Labels ausdünnen (Blobs werden immer global bereinigt)
+
+        Returns:
+            {"snapshots", "blobs", "bytes"}: entfernte Snapshots, entfernte Blobs, freigegebene Bytes
+        """
+        result = {"snapshots": 0, "blobs": 0, "bytes": 0}
+        by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for manifest in self.list_snapshots():
+            by_label.setdefault(manifest.get("label", ""), []).append(manifest)
+
+        referenced = set()
+        for manifest_label, manifests in by_label.items():
+            expired = manifests[:-keep] if keep > 0 else manifests
+            if label is not None and manifest_label != label:
+                expired = []
+            for manifest in expired:
+                os.remove(os.path.join(self.snapshots_dir, f"{manifest['id']}.json"))
+                result["snapshots"] += 1
+            for manifest in manifests[len(expired):]:
+                referenced.update(entry["hash"] for entry in manifest["files"].values() if entry["type"] == "file")
+
+        if not os.path.isdir(self.objects_dir):
+            return result
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if prefix + name in referenced:
+                    continue
+                blob = os.path.join(prefix_dir, name)
+                info = os.lstat(blob)
+                _remove_readonly(blob)
+                result["blobs"] += 1
+                # Ein Hardlink mit weiteren Verweisen gibt keinen Platz frei
+                result["bytes"] += info.st_size if info.st_nlink <= 1 else 0
+            if not os.listdir(prefix_dir):
+                os.rmdir(prefix_dir)
+        return result
+
+
+# ======================
+# KOMMANDOZEILE
+# ======================
+def main(argv: Optional[List[str]] = None) -> int:
+    """Snapshots auflisten, wiederherstellen oder aufräumen (im aktuellen Projektverzeichnis)"""
+    parser = argparse.ArgumentParser(description="IrsanAI Backup-Speicher (.IrsanAI/backups/)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="Snapshots auflisten")
+    list_parser.add_argument("--label", default=None)
+    restore_parser = subparsers.add_parser("restore", help="Snapshot wiederherstellen")
+    restore_parser.add_argument("snapshot_id")
+    restore_parser.add_argument("paths", nargs="*", help="nur diese Pfade (Standard: alle)")
+    gc_parser = subparsers.add_parser("gc", help="alte Snapshots und Blobs ohne Verweis löschen")
+    gc_parser.add_argument("--keep", type=int, default=DEFAULT_KEEP_SNAPSHOTS,
+                           help=f"behaltene Snapshots je Label (Standard: {DEFAULT_KEEP_SNAPSHOTS})")
+    gc_parser.add_argument("--label", default=None)
+    args = parser.parse_args(argv)
+
+    store = BackupStore(os.getcwd())
+    if args.command == "list":
+        for manifest in store.list_snapshots(args.label):
+            stats = manifest.get("stats", {})
+            print(f"{manifest['id']}  {manifest['label']:<20} {stats.get('files', 0):>6} Dateien "
+                  f"{stats.get('bytes', 0):>12} Bytes (neu belegt: {stats.get('new_bytes', 0)})")
+    elif args.command == "restore":
+        try:
+            restored = store.restore(args.snapshot_id, args.paths or None)
+        except (OSError, ValueError) as e:
+            print(f"[BACKUP] Wiederherstellung fehlgeschlagen: {str(e)}", file=sys.stderr)
+            return 1
+        print(f"[BACKUP] {len(restored)} Einträge aus {args.snapshot_id} wiederhergestellt")
+    else:
+        result = store.gc(args.keep, args.label)
+        print(f"[BACKUP] Entfernt: {result['snapshots']} Snapshots, {result['blobs']} Blobs "
+              f"({result['bytes']} Bytes freigegeben)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
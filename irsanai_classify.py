@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_classify.py
+Version: 1.0
+Beschreibung: Inhaltsbasierte Text/Binär-Klassifikation für die Scanner.
+
+classify_head() wertet nur die Kopfbytes aus, die ohnehin gelesen werden (erster Hash-Block
+in project_scanner.py bzw. Preview-Puffer in den GitHub-Scannern) - ohne zusätzliche I/O:
+1. Byte Order Mark (UTF-8/16/32)        -> Text mit bekannter Kodierung
+2. Magic Numbers (PNG, ZIP, ELF, ...)   -> Binär mit Format und MIME-Familie
+3. NUL-Byte bzw. viele Steuerzeichen    -> Binär ("data")
+4. gültiges UTF-8 (bzw. reines ASCII)   -> Text; sonst 8-Bit-Text (cp1252/latin-1)
+
+FingerprintCache merkt sich Hash und Klassifikation je Datei unter ihrem Fingerprint
+(Größe, Änderungszeit, Inode). Unveränderte Dateien werden beim nächsten Scan gar
+nicht mehr gelesen.
+"""
+
+import os
+import json
+import codecs
+from typing import Dict, Any, List, Optional, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+CLASSIFIER_VERSION = 2
+SNIFF_BYTES = 8192  # ausgewertete Kopfbytes
+MIN_SNIFF_BYTES = 512  # Mindestgröße des Preview-Puffers, damit auch kurze Previews klassifizieren
+CONTROL_RATIO_LIMIT = 0.10  # Anteil Steuerzeichen, ab dem Inhalt ohne NUL als binär gilt
+CLASSIFY_BATCH_SIZE = 64  # Dateien je Auftrag an den Thread-Pool
+
+# Steuerzeichen, die in Textdateien nicht vorkommen (Tab, Zeilenumbruch, FF und ESC sind erlaubt)
+CONTROL_BYTES = bytes(set(range(0x20)) - {0x09, 0x0A, 0x0C, 0x0D, 0x1B}) + b"\x7f"
+
+BYTE_ORDER_MARKS: List[Tuple[bytes, str]] = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),  # vor UTF-16-LE prüfen (gleicher Anfang)
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+# (Offset, Signatur, Format, MIME-Familie); Signaturen aus druckbarem ASCII ("ID3", "BZh", ...)
+# gelten nur zusammen mit Binärspuren im Kopf (siehe _looks_binary), damit Text nicht fehlklassifiziert
+MAGIC_SIGNATURES: List[Tuple[int, bytes, str, str]] = [
+    (0, b"\x89PNG\r\n\x1a\n", "png", "image"),
+    (0, b"\xff\xd8\xff", "jpeg", "image"),
+    (0, b"GIF87a", "gif", "image"),
+    (0, b"GIF89a", "gif", "image"),
+    (0, b"II*\x00", "tiff", "image"),
+    (0, b"MM\x00*", "tiff", "image"),
+    (0, b"\x00\x00\x01\x00", "ico", "image"),
+    (0, b"%PDF-", "pdf", "application"),
+    (0, b"PK\x03\x04", "zip", "archive"),
+    (0, b"PK\x05\x06", "zip", "archive"),
+    (0, b"\x1f\x8b\x08", "gzip", "archive"),
+    (0, b"BZh", "bzip2", "archive"),
+    (0, b"\xfd7zXZ\x00", "xz", "archive"),
+    (0, b"7z\xbc\xaf\x27\x1c", "7z", "archive"),
+    (0, b"Rar!\x1a\x07", "rar", "archive"),
+    (257, b"ustar", "tar", "archive"),
+    (0, b"\x7fELF", "elf", "application"),
+    (0, b"\xca\xfe\xba\xbe", "java-class", "application"),
+    (0, b"\xcf\xfa\xed\xfe", "mach-o", "application"),
+    (0, b"\x00asm", "wasm", "application"),
+    (0, b"SQLite format 3\x00", "sqlite", "application"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "ole2", "application"),
+    (0, b"OggS", "ogg", "audio"),
+    (0, b"fLaC", "flac", "audio"),
+    (0, b"ID3", "mp3", "audio"),
+    (4, b"ftyp", "mp4", "video"),
+    (0, b"\x1a\x45\xdf\xa3", "matroska", "video"),
+    (0, b"wOFF", "woff", "font"),
+    (0, b"wOF2", "woff2", "font"),
+    (0, b"OTTO", "otf", "font"),
+    (0, b"\x00\x01\x00\x00\x00", "ttf", "font"),
+]
+PRINTABLE_SIGNATURES = {signature for _, signature, _, _ in MAGIC_SIGNATURES
+                        if all(0x20 <= byte < 0x7f for byte in signature)}
+RIFF_FORMATS = {b"WEBP": ("webp", "image"), b"WAVE": ("wav", "audio"), b"AVI ": ("avi", "video")}
+
+# Ergebnis für Dateien, deren Kopf nicht gelesen werden konnte
+UNREADABLE_CLASSIFICATION: Dict[str, Any] = {"is_binary": False, "encoding": None, "mime_family": "unknown",
+                                             "format": "unreadable"}
+
+
+# ======================
+# KLASSIFIKATION
+# ======================
+def _result(is_binary: bool, encoding: Optional[str], mime_family: str, file_format: str) -> Dict[str, Any]:
+    return {"is_binary": is_binary, "encoding": encoding, "mime_family": mime_family, "format": file_format}
+
+
+def _is_utf8(head: bytes, file_size: int) -> bool:
+    try:
+        # final=False, solange head nicht die ganze Datei ist: ein am Ende angeschnittenes
+        # Zeichen ist dann kein Fehler
+        codecs.utf_8_decode(head, "strict", len(head) >= file_size)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _looks_binary(head: bytes, file_size: int) -> bool:
+    """Binärspuren für Signaturen aus druckbarem ASCII: NUL, Steuerzeichen oder ungültiges UTF-8"""
+    if len(head.translate(None, CONTROL_BYTES)) < len(head):
+        return True
+    return not head.isascii() and not _is_utf8(head, file_size)
+
+
+def classify_head(head: bytes, file_size: int) -> Dict[str, Any]:
+    """Klassifiziert eine Datei anhand ihrer Kopfbytes
+
+    Args:
+        head: die ersten Bytes der Datei (bytes, bytearray oder memoryview)
+        file_size: Dateigröße; zeigt an, ob head die ganze Datei ist
+
+    Returns:
+        {"is_binary", "encoding", "mime_family", "format"}
+    """
+    head = bytes(head[:SNIFF_BYTES])
+    if not head:
+        return _result(False, "ascii", "text", "empty")
+
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(bom):
+            return _result(False, encoding, "text", "text")
+
+    for offset, signature, file_format, mime_family in MAGIC_SIGNATURES:
+        if head.startswith(signature, offset):
+            if signature in PRINTABLE_SIGNATURES and not _looks_binary(head, file_size):
+                continue
+            return _result(True, None, mime_family, file_format)
+    if head.startswith(b"RIFF") and head[8:12] in RIFF_FORMATS:
+        file_format, mime_family = RIFF_FORMATS[head[8:12]]
+        return _result(True, None, mime_family, file_format)
+
+    if b"\x00" in head:
+        return _result(True, None, "application", "data")
+
+    if head.isascii():
+        encoding = "ascii"
+    elif _is_utf8(head, file_size):
+        encoding = "utf-8"
+    else:
+        encoding = "8bit"  # Altkodierung (cp1252/latin-1) oder Binärdaten ohne NUL
+
+    controls = len(head) - len(head.translate(None, CONTROL_BYTES))
+    if controls > len(head) * CONTROL_RATIO_LIMIT:
+        return _result(True, None, "application", "data")
+    return _result(False, encoding, "text", "text")
+
+
+# ======================
+# FINGERPRINT-CACHE
+# ======================
+def file_fingerprint(stat: os.stat_result) -> List[int]:
+    """Fingerprint einer Datei ohne Lesezugriff (wie git/rsync: Größe und Änderungszeit)"""
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+class FingerprintCache:
+    """Hash und Klassifikation je Datei, gültig solange der Fingerprint übereinstimmt
+
+    Einträge: relativer Pfad -> [Fingerprint, Hash, Klassifikation]. Beim Speichern fallen
+    Dateien heraus, die in diesem Lauf nicht mehr vorkamen.
+    """
+
+    def __init__(self, cache_file: Optional[str]):
+        self.cache_file = cache_file
+        self.entries: Dict[str, List[Any]] = {}
+        self.seen: Dict[str, List[Any]] = {}
+        self.hits = 0
+        if cache_file:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("classifier_version") == CLASSIFIER_VERSION:
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def lookup(self, key: str, fingerprint: List[int]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        entry = self.entries.get(key)
+        if entry and entry[0] == fingerprint:
+            self.seen[key] = entry
+            self.hits += 1
+            return entry[1], entry[2]
+        return None
+
+    def store(self, key: str, fingerprint: List[int], file_hash: str, classification: Dict[str, Any]) -> None:
+        if file_hash == "ERROR_HASHING":
+            return  # Lesefehler nicht festschreiben
+        self.seen[key] = [fingerprint, file_hash, classification]
+
+    def save(self) -> None:
+        if not self.cache_file:
+            return
+        try:
+            temp_path = f"{self.cache_file}.tmp{os.getpid()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"classifier_version": CLASSIFIER_VERSION, "files": self.seen}, f,
+                          separators=(',', ':'))
+            os.replace(temp_path, self.cache_file)
+        except OSError:
+            pass  # Ohne Cache wird beim nächsten Lauf neu gelesen
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_decoding.py
+Version: 1.0
+Beschreibung: Gemeinsamer Text-Decoder für die Prüfungen der Scanner.
+
+Jede Datei wird genau einmal als Bytes gelesen und dann in fester Reihenfolge dekodiert:
+1. Byte Order Mark (UTF-8/16/32)        -> zugehöriger Codec
+2. UTF-8, inkrementell geprüft          -> bricht beim ersten ungültigen Byte ab
+3. cp1252                               -> typische Windows-Altdateien
+4. latin-1                              -> kann nicht fehlschlagen (jedes Byte ist ein Zeichen)
+
+Ein bekannter Kodierungshinweis (z.B. aus der Klassifikation in irsanai_classify.py oder
+einem früheren Lauf) wird nach der BOM-Prüfung zuerst versucht. Text und Kodierung werden
+je Datei-Fingerprint zwischengespeichert: dieselbe unveränderte Datei wird nur einmal
+geöffnet und dekodiert.
+"""
+
+import os
+import codecs
+from typing import Dict, List, Optional, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+DECODE_CHUNK_BYTES = 64 * 1024  # Blockgröße der inkrementellen UTF-8-Prüfung
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+BYTE_ORDER_MARKS: List[Tuple[bytes, str]] = [
+    (codecs.BOM_UTF32_LE, "utf-32"),  # vor UTF-16-LE prüfen (gleicher Anfang)
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Kodierungsangaben der Klassifikation, die keinen eigenen Dekodierversuch lohnen
+# (BOM-Kodierungen erkennt detect_bom ohnehin)
+UNSPECIFIC_HINTS = (None, "8bit", "ascii", "utf-8-sig", "utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be")
+
+
+# ======================
+# DEKODIERUNG
+# ======================
+def detect_bom(data: bytes) -> Optional[str]:
+    """Codec zur Byte Order Mark am Dateianfang (die Codecs entfernen die BOM selbst)"""
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+def decode_utf8(data: bytes) -> Optional[str]:
+    """Dekodiert blockweise als UTF-8; None beim ersten ungültigen Byte"""
+    decoder = codecs.getincrementaldecoder("utf-8")("strict")
+    view = memoryview(data)
+    parts = []
+    try:
+        for start in range(0, len(data), DECODE_CHUNK_BYTES):
+            parts.append(decoder.decode(view[start:start + DECODE_CHUNK_BYTES]))
+        parts.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
+        return None
+    return "".join(parts)
+
+
+def decode_bytes(data: bytes, hint: Optional[str] = None) -> Tuple[str, str]:
+    """Dekodiert data deterministisch (BOM, Hinweis, UTF-8, cp1252, latin-1)
+
+    Returns:
+        (Text, verwendete Kodierung)
+    """
+    bom_encoding = detect_bom(data)
+    if bom_encoding:
+        try:
+            return data.decode(bom_encoding), bom_encoding
+        except UnicodeDecodeError:
+            pass
+
+    if hint not in UNSPECIFIC_HINTS:
+        try:
+            return data.decode(hint), hint
+        except (UnicodeDecodeError, LookupError):
+            pass  # Hinweis passt nicht (mehr): reguläre Erkennung
+
+    text = decode_utf8(data)
+    if text is not None:
+        return text, "utf-8"
+
+    legacy, last_resort = FALLBACK_ENCODINGS
+    try:
+        return data.decode(legacy), legacy
+    except UnicodeDecodeError:
+        return data.decode(last_resort), last_resort
+
+
+# ======================
+# DATEIEN
+# ======================
+class TextDecoder:
+    """Liest und dekodiert Textdateien, zwischengespeichert je Pfad und Fingerprint"""
+
+    def __init__(self):
+        self.cache: Dict[str, Tuple[Tuple[int, int, int], str, str]] = {}
+
+    def read(self, path: str, hint: Optional[str] = None) -> Tuple[str, str, int]:
+        """Liest und dekodiert die Datei; OSError wird an den Aufrufer weitergegeben
+
+        Returns:
+            (Text, Kodierung, gelesene Bytes); aus dem Zwischenspeicher 0 gelesene Bytes
+        """
+        stat = os.stat(path)
+        fingerprint = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        cached = self.cache.get(path)
+        if cached and cached[0] == fingerprint:
+            return cached[1], cached[2], 0
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        text, encoding = decode_bytes(data, hint)
+        self.cache[path] = (fingerprint, text, encoding)
+        return text, encoding, len(data)
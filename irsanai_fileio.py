@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_fileio.py
+Version: 1.0
+Beschreibung: Schnelle Dateizugriffe für die Scanner.
+
+PreviewExtractor erzeugt den content_preview eines Berichts aus den Kopfbytes einer Datei:
+- gelesen werden nur die ersten preview_bytes Bytes, mit einem einzigen read in einen
+  wiederverwendeten Puffer (os.readv bzw. FileIO.readinto) - keine neue Bytes-Kopie je Datei
+- derselbe Kopf wird mit irsanai_classify.classify_head klassifiziert (Text/Binär,
+  Kodierung, MIME-Familie); Binärdateien erhalten keinen Preview
+- dekodiert wird nur der behaltene Teil mit der erkannten Kodierung (UTF-8/16/32 ohne BOM,
+  Altdateien als cp1252), abgeschnitten an einer Zeichen- bzw. Code-Einheiten-Grenze
+- die Obergrenze gilt in Bytes, nicht in Zeichen; die Kosten je Datei sind damit
+  unabhängig von der Dateigröße
+"""
+
+import os
+from typing import Dict, Any, Tuple
+
+from irsanai_classify import classify_head, MIN_SNIFF_BYTES
+
+# ======================
+# KONFIGURATION
+# ======================
+O_BINARY = getattr(os, "O_BINARY", 0)  # nur unter Windows gesetzt
+HAS_READV = hasattr(os, "readv")
+TRUNCATION_MARK = "..."
+
+# Kodierung aus classify_head -> (Codec, Länge der BOM, Bytes je Code-Einheit); "8bit" steht
+# für Altdateien (wie in irsanai_decoding zuerst cp1252), alles Übrige wird als UTF-8 gelesen
+PREVIEW_CODECS: Dict[str, Tuple[str, int, int]] = {
+    "8bit": ("cp1252", 0, 1),
+    "utf-8-sig": ("utf-8", 3, 1),
+    "utf-16-le": ("utf-16-le", 2, 2),
+    "utf-16-be": ("utf-16-be", 2, 2),
+    "utf-32-le": ("utf-32-le", 4, 4),
+    "utf-32-be": ("utf-32-be", 4, 4),
+}
+UTF8_CODEC = ("utf-8", 0, 1)
+
+
+def utf8_boundary(buffer: bytearray, length: int) -> int:
+    """Länge ohne ein am Ende angeschnittenes UTF-8-Zeichen"""
+    start = length
+    # Höchstens 3 Folgebytes (10xxxxxx) zurück bis zum Startbyte des letzten Zeichens
+    while start > 0 and length - start < 3 and (buffer[start - 1] & 0xC0) == 0x80:
+        start -= 1
+    if start == 0:
+        return length
+    lead = buffer[start - 1]
+    if lead < 0xC0:
+        return length  # ASCII oder ungültige Folge: nichts zu reparieren
+    needed = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return length if length - (start - 1) >= needed else start - 1
+
+
+class PreviewExtractor:
+    """Liest Kopfbytes in einen wiederverwendeten Puffer und baut daraus den Preview
+
+    Ein Extraktor gehört zu genau einem Thread (der Puffer wird bei jedem Aufruf überschrieben).
+    """
+
+    def __init__(self, preview_bytes: int):
+        self.preview_bytes = preview_bytes
+        # Mindestens MIN_SNIFF_BYTES lesen, damit auch bei kurzem Preview klassifiziert werden kann
+        self.buffer = bytearray(max(preview_bytes, MIN_SNIFF_BYTES))
+        self.view = memoryview(self.buffer)
+
+    def read_head(self, path: str) -> int:
+        """Liest bis zur Puffergröße vom Dateianfang in den Puffer
+
+        Returns:
+            Anzahl der gelesenen Bytes
+        """
+        if HAS_READV:
+            fd = os.open(path, os.O_RDONLY | O_BINARY)
+            try:
+                return os.readv(fd, [self.view])
+            finally:
+                os.close(fd)
+        with open(path, 'rb', buffering=0) as f:
+            return f.readinto(self.view) or 0
+
+    def extract(self, path: str, file_size: int) -> Tuple[str, int, Dict[str, Any]]:
+        """Erzeugt Preview und Klassifikation einer Datei
+
+        Args:
+            path: Dateipfad
+            file_size: bereits bekannte Dateigröße (spart ein stat)
+
+        Returns:
+            (Preview, gelesene Bytes, Klassifikation); Binärdateien und leere Dateien liefern "".
+        """
+        length = self.read_head(path) if file_size > 0 else 0
+        classification = classify_head(self.view[:length], file_size)
+        if classification["is_binary"] or self.preview_bytes <= 0 or length == 0:
+            return "", length, classification
+
+        kept = min(length, self.preview_bytes)
+        codec, start, unit = PREVIEW_CODECS.get(classification["encoding"], UTF8_CODEC)
+        start = min(start, kept)
+        if kept >= file_size:
+            cut = kept
+        elif codec == "utf-8":
+            cut = utf8_boundary(self.buffer, kept)
+        else:
+            # Ganze Code-Einheiten; ein abgeschnittenes Surrogat-Paar entfernt 'ignore'
+            cut = start + (kept - start) // unit * unit
+        preview = str(self.view[start:cut], codec, 'ignore').replace('\n', ' ').strip()
+        if file_size > kept:
+            preview += TRUNCATION_MARK
+        return preview, length, classification
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_gitignore.py
+Version: 1.0
+Beschreibung: Liest eine .gitignore einmal in einen normalisierten Regelsatz ein.
+
+Unterstützt die Git-Semantik der Wurzel-.gitignore:
+- Kommentare (#) und Leerzeilen entfallen, "\\#" und "\\!" stehen für das Zeichen selbst
+- "!muster" hebt eine vorherige Regel wieder auf (die letzte passende Regel gewinnt)
+- "muster/" gilt nur für Verzeichnisse
+- ein "/" am Anfang oder in der Mitte verankert das Muster an der Wurzel, sonst gilt
+  es für den Namen auf jeder Ebene
+- "*", "?", "[...]" und "**" wie in Git; ist ein Verzeichnis ignoriert, ist es auch sein Inhalt
+
+Verwendung:
+    rules = parse_gitignore(text)
+    rules.match("build/out.o")             # wird der Pfad ignoriert?
+    rules.covers("*.log")                   # deckt die Datei den Pflichteintrag ab?
+    rules.missing(["*.log", ".idea/"])      # Pflichteinträge ohne Abdeckung
+
+Ohne Negationen werden Literale über Mengen und alle Platzhalter-Muster über einen einzigen
+kompilierten regulären Ausdruck geprüft; mit Negationen in Dateireihenfolge.
+Verschachtelte .gitignore-Dateien in Unterverzeichnissen werden nicht ausgewertet.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from irsanai_decoding import TextDecoder
+
+# ======================
+# KONFIGURATION
+# ======================
+GITIGNORE_FILE = ".gitignore"
+WILDCARD_CHARS = "*?["
+PROBE_NAME = "irsanai_probe"  # Platzhalter beim Prüfen der Abdeckung (für "*" und "**")
+MAX_PROBE_PATHS = 64  # mehr Kombinationen aus Zeichenklassen gelten als nicht prüfbar
+CHAR_CLASS = re.compile(r"\[(!?)((?:\\.|[^\]])[^\]]*)\]")
+
+
+class GitignoreRule(NamedTuple):
+    pattern: str  # normalisiert, ohne "!" und abschließendes "/"
+    negate: bool
+    dir_only: bool
+    anchored: bool
+    regex: Pattern
+
+
+# ======================
+# PARSER
+# ======================
+def _translate(pattern: str) -> str:
+    """Übersetzt ein Git-Muster (ohne führendes/abschließendes "/") in einen regulären Ausdruck"""
+    result = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("/**", index) and index + 3 == length:
+            result.append("/.*")
+            index += 3
+        elif pattern.startswith("**", index):
+            result.append(".*")
+            index += 2
+        elif char == "*":
+            result.append("[^/]*")
+            index += 1
+        elif char == "?":
+            result.append("[^/]")
+            index += 1
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                result.append(re.escape(char))
+                index += 1
+                continue
+            content = pattern[index + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            result.append("[" + content.replace("\\", "\\\\") + "]")
+            index = end + 1
+        elif char == "\\" and index + 1 < length:
+            result.append(re.escape(pattern[index + 1]))
+            index += 2
+        else:
+            result.append(re.escape(char))
+            index += 1
+    return "".join(result)
+
+
+def parse_rule(line: str) -> Optional[GitignoreRule]:
+    """Wandelt eine Zeile der .gitignore in eine Regel um (None für Kommentare/Leerzeilen)"""
+    line = line.rstrip("\r\n")
+    # Abschließende Leerzeichen zählen nur, wenn sie maskiert sind
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    body = _translate(line)
+    regex = re.compile(("^" if anchored else "^(?:.*/)?") + body + "$")
+    return GitignoreRule(line, negate, dir_only, anchored, regex)
+
+
+def normalize_entry(rule: GitignoreRule) -> str:
+    """Vergleichbare Schreibweise einer Regel (für Mengenvergleiche)"""
+    entry = ("/" if rule.anchored and "/" not in rule.pattern else "") + rule.pattern
+    return ("!" if rule.negate else "") + entry + ("/" if rule.dir_only else "")
+
+
+def _normalize_path(path: str) -> str:
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.strip("/")
+
+
+class GitignoreRules:
+    """Normalisierter, einmal kompilierter Regelsatz einer .gitignore"""
+
+    def __init__(self, rules: List[GitignoreRule]):
+        self.rules = rules
+        self.entries: Set[str] = {normalize_entry(rule) for rule in rules}
+        self.has_negation = any(rule.negate for rule in rules)
+        self._dir_cache: Dict[str, bool] = {}
+
+        # Schnellpfad ohne Negationen: Literale als Mengen, Platzhalter als ein Ausdruck
+        self._names: Set[str] = set()  # unverankert, Dateien und Verzeichnisse
+        self._dir_names: Set[str] = set()  # unverankert, nur Verzeichnisse
+        self._paths: Set[str] = set()
+        self._dir_paths: Set[str] = set()
+        file_patterns: List[str] = []
+        dir_patterns: List[str] = []
+        for rule in rules:
+            if rule.negate:
+                continue
+            if not any(char in rule.pattern for char in WILDCARD_CHARS) and "\\" not in rule.pattern:
+                target = (self._dir_paths if rule.dir_only else self._paths) if rule.anchored \
+                    else (self._dir_names if rule.dir_only else self._names)
+                target.add(rule.pattern)
+                continue
+            dir_patterns.append(rule.regex.pattern)
+            if not rule.dir_only:
+                file_patterns.append(rule.regex.pattern)
+        self._file_regex = re.compile("|".join(file_patterns)) if file_patterns else None
+        self._dir_regex = re.compile("|".join(dir_patterns)) if dir_patterns else None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _match_single(self, path: str, is_dir: bool) -> bool:
+        """Prüft nur den Pfad selbst (ohne übergeordnete Verzeichnisse)"""
+        if not self.has_negation:
+            name = path.rsplit("/", 1)[-1]
+            if name in self._names or path in self._paths:
+                return True
+            if is_dir and (name in self._dir_names or path in self._dir_paths):
+                return True
+            regex = self._dir_regex if is_dir else self._file_regex
+            return bool(regex and regex.match(path))
+
+        ignored = False
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(path):
+                ignored = not rule.negate
+        return ignored
+
+    def _match_dir(self, path: str) -> bool:
+        cached = self._dir_cache.get(path)
+        if cached is None:
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            cached = self._dir_cache[path] = (bool(parent) and self._match_dir(parent)) or \
+                self._match_single(path, True)
+        return cached
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Wird der relative Pfad (bzw. eines seiner übergeordneten Verzeichnisse) ignoriert?"""
+        path = _normalize_path(path)
+        if not path:
+            return False
+        if is_dir:
+            return self._match_dir(path)
+        parent = path.rsplit("/", 1)[0] if "/" in path else ""
+        return (bool(parent) and self._match_dir(parent)) or self._match_single(path, False)
+
+    def covers(self, entry: str) -> bool:
+        """Deckt der Regelsatz den Pflichteintrag entry (in .gitignore-Schreibweise) ab?
+
+        Zuerst per Mengenvergleich der normalisierten Schreibweise, sonst semantisch: alle
+        Beispielpfade, die entry ignorieren würde, müssen auch hier ignoriert werden
+        (z.B. deckt "*.log" den Eintrag "debug.log" ab, "**/.idea/" den Eintrag ".idea/").
+        Zeichenklassen werden Zeichen für Zeichen geprüft ("*.py[cod]" braucht .pyc, .pyo und
+        .pyd); negierte oder zu große Klassen gelten nur bei gleicher Schreibweise als abgedeckt.
+        """
+        rule = parse_rule(entry)
+        if rule is None:
+            return True
+        if normalize_entry(rule) in self.entries:
+            return True
+        paths = _probe_paths(rule)
+        return bool(paths) and all(self.match(path, rule.dir_only) for path in paths)
+
+    def missing(self, entries: Iterable[str]) -> List[str]:
+        """Pflichteinträge, die der Regelsatz nicht abdeckt (in der gegebenen Reihenfolge)"""
+        return [entry for entry in entries if not self.covers(entry)]
+
+
+def _class_chars(content: str) -> List[str]:
+    """Zeichen einer (nicht negierten) Zeichenklasse, Bereiche wie "a-c" aufgelöst"""
+    chars: List[str] = []
+    index = 0
+    while index < len(content):
+        char = content[index]
+        if char == "\\" and index + 1 < len(content):
+            index += 1
+            char = content[index]
+        if index + 2 < len(content) and content[index + 1] == "-":
+            chars.extend(chr(code) for code in range(ord(char), ord(content[index + 2]) + 1))
+            index += 3
+        else:
+            chars.append(char)
+            index += 1
+    return sorted(set(chars))
+
+
+def _probe_paths(rule: GitignoreRule) -> Tuple[str, ...]:
+    """Beispielpfade, die von rule erfasst werden (Platzhalter durch konkrete Namen ersetzt)
+
+    Je Zeichen einer Zeichenklasse ein eigener Pfad; leer, wenn die Klassen nicht aufzählbar
+    sind (negiert oder mehr als MAX_PROBE_PATHS Kombinationen).
+    """
+    example = rule.pattern.replace("**/", "").replace("/**", "/" + PROBE_NAME).replace("**", PROBE_NAME)
+    examples = [""]
+    position = 0
+    for match in CHAR_CLASS.finditer(example):
+        if match.group(1):
+            return ()
+        literal = example[position:match.start()]
+        examples = [prefix + literal + char for prefix in examples for char in _class_chars(match.group(2))]
+        if len(examples) > MAX_PROBE_PATHS:
+            return ()
+        position = match.end()
+    examples = [(prefix + example[position:]).replace("*", PROBE_NAME).replace("?", "x").replace("\\", "")
+                for prefix in examples]
+    if rule.anchored:
+        return tuple(examples)
+    # Unverankerte Muster gelten auf jeder Ebene: Wurzel und ein Unterverzeichnis prüfen
+    return tuple(examples) + tuple(f"{PROBE_NAME}_dir/{path}" for path in examples)
+
+
+def parse_gitignore(text: str) -> GitignoreRules:
+    """Zerlegt den Inhalt einer .gitignore in einen Regelsatz"""
+    rules = []
+    for line in text.splitlines():
+        rule = parse_rule(line)
+        if rule is not None:
+            rules.append(rule)
+    return GitignoreRules(rules)
+
+
+def load_gitignore(root_dir: str, decoder: Optional[TextDecoder] = None) -> Optional[GitignoreRules]:
+    """Liest die .gitignore im Wurzelverzeichnis (None, wenn sie fehlt oder unlesbar ist)
+
+    Mit dem gemeinsamen decoder des Aufrufers wird die Datei nicht erneut gelesen.
+    """
+    try:
+        text, _, _ = (decoder or TextDecoder()).read(os.path.join(root_dir, GITIGNORE_FILE))
+    except OSError:
+        return None
+    return parse_gitignore(text)
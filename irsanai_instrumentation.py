@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_instrumentation.py
+Version: 1.0
+Beschreibung: Gemeinsame Messpunkte für project_scanner.py, scanning_environment.py,
+              github_repo_preparer.py und IrsanAI_OS_HW_Detector.py:
+              Stufen-Timer, Zähler und optionales Profiling mit cProfile/pstats (--profile).
+
+Die Stufenzeiten und Zähler landen im Abschnitt "performance" der Berichte und damit
+auch in der Scan-Historie, sodass Regressionen zwischen Versionen sichtbar werden.
+
+Hinweise zur Auswertung:
+- Stufen dürfen verschachtelt sein (z.B. ist "ignore_matching" Teil von "walk").
+- "syscalls" zählt die Dateisystem-Aufrufe der Werkzeuge (listdir/stat/open/read/close)
+  auf Python-Ebene; Aufrufe des Interpreters selbst sind nicht enthalten.
+- Die Serialisierung eines Berichts kann naturgemäß nicht im selben Bericht stehen; sie
+  erscheint im Log bzw. in der Scan-Historie.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+# ======================
+# KONFIGURATION
+# ======================
+INSTRUMENTATION_VERSION = 1
+PROFILE_TOP_FUNCTIONS = 30  # Anzahl der Funktionen in der Text-Zusammenfassung des Profils
+
+# Einheitliche Stufennamen, damit Berichte verschiedener Werkzeuge vergleichbar bleiben
+STAGE_WALK = "walk"
+STAGE_IGNORE = "ignore_matching"
+STAGE_HASHING = "hashing"
+STAGE_PREVIEW = "content_preview"
+STAGE_RULES = "rule_evaluation"
+STAGE_SERIALIZATION = "report_serialization"
+
+COUNTER_FILES = "files"
+COUNTER_BYTES_READ = "bytes_read"
+COUNTER_REGEX = "regex_evaluations"
+COUNTER_SYSCALLS = "syscalls"
+COUNTER_CACHE_HITS = "cache_hits"  # Dateien, deren Ergebnis aus einem Cache statt von der Platte kam
+
+
+# ======================
+# MESSPUNKTE
+# ======================
+class Instrumentation:
+    """Sammelt Stufenzeiten und Zähler eines Laufs
+
+    Zähler sind threadsicher (Hashing läuft im Thread-Pool); Stufen werden nur aus dem
+    Haupt-Thread gemessen.
+    """
+
+    def __init__(self, tool: str, tool_version: str):
+        self.tool = tool
+        self.tool_version = tool_version
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}  # Name -> [Sekunden, Aufrufe]
+        self.counters: Dict[str, int] = {}
+        self.profile_file: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Misst die Dauer des Blocks und addiert sie zur Stufe name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        """Dekorator: jeder Aufruf der Funktion zählt zur Stufe name"""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_time(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = [0.0, 0]
+        entry[0] += seconds
+        entry[1] += calls
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_many(self, amounts: Dict[str, int]) -> None:
+        """Erhöht mehrere Zähler mit einer einzigen Sperre (für Worker-Threads)"""
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Stand der Messung für den Abschnitt "performance" eines Berichts"""
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "instrumentation_version": INSTRUMENTATION_VERSION,
+            "tool": self.tool,
+            "tool_version": self.tool_version,
+            "elapsed_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": {name: {"seconds": round(seconds, 6), "calls": calls}
+                       for name, (seconds, calls) in self.stages.items()},
+            "counters": counters,
+            # Nur der Dateiname: der Pfad könnte den Benutzernamen enthalten
+            "profile_file": os.path.basename(self.profile_file) if self.profile_file else None
+        }
+
+    def stage_summary(self) -> str:
+        """Einzeilige Übersicht der Stufen für die Konsolenausgabe"""
+        return ", ".join(f"{name} {seconds:.3f}s" for name, (seconds, _) in self.stages.items())
+
+
+# ======================
+# PROFILING
+# ======================
+def write_profile(profiler: Any, profile_file: str) -> None:
+    """Schreibt die pstats-Rohdaten nach profile_file und eine Text-Zusammenfassung daneben
+
+    Die Rohdaten lassen sich mit "python -m pstats <datei>" oder snakeviz weiter auswerten.
+    """
+    import io
+    import pstats
+
+    if os.path.dirname(profile_file):
+        os.makedirs(os.path.dirname(profile_file), exist_ok=True)
+    profiler.dump_stats(profile_file)
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    with open(f"{profile_file}.txt", 'w', encoding='utf-8') as f:
+        f.write(summary.getvalue())
+
+
+def profile_call(profile_file: Optional[str], func: Callable, *args, **kwargs) -> Any:
+    """Ruft func auf; mit profile_file unter cProfile (auch bei sys.exit oder Ausnahmen)"""
+    if not profile_file:
+        return func(*args, **kwargs)
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        write_profile(profiler, profile_file)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_logging.py
+Version: 1.0
+Beschreibung: Logging-Pipeline für die Scanner: Level-Filter, verzögerte Formatierung,
+              Ausgabe über QueueHandler/QueueListener in einem Hintergrund-Thread,
+              optional als strukturiertes JSON (eine Zeile je Eintrag), sowie ein
+              ratenbegrenzter Fortschrittsbericht statt einer Zeile pro Datei.
+
+Verwendung:
+    logger = logging.getLogger("IrsanAI_Project_Scanner")
+    listener = setup_logging(logger, level="info", log_format="text")
+    logger.debug("PRÜFE DATEI: %s", rel_path)   # wird erst formatiert, wenn aktiv
+    ...
+    shutdown_logging(listener)                  # schreibt die Warteschlange leer
+"""
+
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime
+from typing import Dict, Any, Optional, List, TextIO
+
+# ======================
+# KONFIGURATION
+# ======================
+SUCCESS = 25  # zwischen INFO und WARNING; für Erfolgsmeldungen der Scanner
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "success": SUCCESS,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL
+}
+LOG_FORMATS = ("text", "json")
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+PROGRESS_INTERVAL = 0.25  # Sekunden zwischen zwei Statuszeilen im Terminal
+PROGRESS_LOG_INTERVAL = 5.0  # Sekunden zwischen zwei Fortschritts-Logeinträgen ohne Terminal
+
+_active_listeners: List[logging.handlers.QueueListener] = []
+
+
+# ======================
+# FORMATIERUNG
+# ======================
+class JsonFormatter(logging.Formatter):
+    """Eine JSON-Zeile je Eintrag; Zusatzfelder über extra={"fields": {...}}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def create_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+
+# ======================
+# PIPELINE
+# ======================
+def setup_logging(logger: logging.Logger, level: str = "info", log_format: str = "text",
+                  log_file: Optional[str] = None, stream: Optional[TextIO] = None
+                  ) -> logging.handlers.QueueListener:
+    """Richtet die Pipeline ein: Logger -> QueueHandler -> QueueListener -> Konsole/Datei
+
+    Der aufrufende Thread legt nur den Eintrag in die Warteschlange; Formatierung und
+    Terminal-/Datei-I/O erledigt der Hintergrund-Thread des Listeners.
+
+    Returns:
+        Den gestarteten Listener (für shutdown_logging)
+    """
+    formatter = create_formatter(log_format)
+    handlers: List[logging.Handler] = []
+
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(formatter)
+    handlers.append(console)
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(LEVELS[level])
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=False)
+    listener.start()
+    _active_listeners.append(listener)
+    # Sicherheitsnetz bei sys.exit(): Warteschlange trotzdem leerschreiben
+    atexit.register(shutdown_logging, listener)
+    return listener
+
+
+def shutdown_logging(listener: Optional[logging.handlers.QueueListener]) -> None:
+    """Stoppt den Listener, nachdem alle wartenden Einträge ausgegeben wurden"""
+    if listener not in _active_listeners:
+        return
+    _active_listeners.remove(listener)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+
+
+# ======================
+# FORTSCHRITT
+# ======================
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class ProgressReporter:
+    """Ratenbegrenzte Statuszeile (Dateien/s, MB/s, ETA) statt einer Zeile pro Datei
+
+    Im Terminal wird eine einzelne Zeile auf stderr überschrieben; ohne Terminal (CI, Umleitung)
+    geht höchstens alle PROGRESS_LOG_INTERVAL Sekunden ein Logeintrag raus. Zum Abschluss
+    folgt immer ein Logeintrag mit den Endwerten. Die ETA erscheint nur, wenn die
+    Gesamtmenge bekannt ist.
+    """
+
+    def __init__(self, label: str, logger: logging.Logger, total_files: Optional[int] = None,
+                 total_bytes: Optional[int] = None, enabled: bool = True,
+                 stream: Optional[TextIO] = None):
+        self.label = label
+        self.logger = logger
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.enabled = enabled
+        self.stream = stream or sys.stderr
+        self.interactive = enabled and self.stream.isatty()
+        self.interval = PROGRESS_INTERVAL if self.interactive else PROGRESS_LOG_INTERVAL
+        self.files = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.next_report = self.started + self.interval
+        self.line_length = 0
+
+    def update(self, files: int = 1, size: int = 0) -> None:
+        self.files += files
+        self.bytes += size
+        if self.enabled:
+            now = time.monotonic()
+            if now >= self.next_report:
+                self.next_report = now + self.interval
+                self._report(now)
+
+    def status(self, now: Optional[float] = None) -> Dict[str, Any]:
+        elapsed = max((now or time.monotonic()) - self.started, 1e-9)
+        status = {
+            "files": self.files,
+            "files_per_second": round(self.files / elapsed, 1),
+            "mb_per_second": round(self.bytes / elapsed / (1024 * 1024), 2),
+            "elapsed_seconds": round(elapsed, 2),
+            "eta_seconds": None
+        }
+        # ETA bevorzugt nach Bytes (Hashing), sonst nach Dateien
+        if self.total_bytes and self.bytes:
+            status["eta_seconds"] = round(elapsed * (self.total_bytes - self.bytes) / self.bytes, 1)
+        elif self.total_files and self.files:
+            status["eta_seconds"] = round(elapsed * (self.total_files - self.files) / self.files, 1)
+        return status
+
+    def _describe(self, status: Dict[str, Any]) -> str:
+        files = f"{status['files']}/{self.total_files}" if self.total_files else str(status['files'])
+        text = (f"{self.label}: {files} Dateien, {status['files_per_second']:.0f} Dateien/s, "
+                f"{status['mb_per_second']:.1f} MB/s")
+        if status["eta_seconds"] is not None:
+            text += f", ETA {_format_duration(max(status['eta_seconds'], 0.0))}"
+        return text
+
+    def _report(self, now: float) -> None:
+        status = self.status(now)
+        text = self._describe(status)
+        if self.interactive:
+            padding = " " * max(0, self.line_length - len(text))
+            self.stream.write(f"\r{text}{padding}")
+            self.stream.flush()
+            self.line_length = len(text)
+        else:
+            self.logger.info(text, extra={"fields": {"progress": self.label, **status}})
+
+    def finish(self) -> Dict[str, Any]:
+        """Schließt die Statuszeile ab und liefert die Endwerte"""
+        status = self.status()
+        if self.interactive and self.line_length:
+            self.stream.write("\r" + " " * self.line_length + "\r")
+            self.stream.flush()
+        if self.enabled:
+            self.logger.info(self._describe(status), extra={"fields": {"progress": self.label, **status}})
+        return status
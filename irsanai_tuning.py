@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+irsanai_tuning.py
+Version: 1.0
+Beschreibung: Liest die Tuning-Hinweise ("tuning"-Abschnitt) aus IrsanAI_env_report.json,
+              damit die Scanner ihre Performance-Parameter selbst an die Hardware anpassen.
+
+Suchreihenfolge für den Umgebungsbericht:
+1. Umgebungsvariable IRSANAI_ENV_REPORT (Pfad zur Berichtsdatei)
+2. IrsanAI_env_report.json im Projekt-Root
+3. IrsanAI_env_report.json im Ordner irsanai-system/ des Projekts
+
+Fehlt der Bericht oder der Abschnitt, gelten die konservativen DEFAULT_TUNING-Werte.
+Unbekannte Schlüssel und Werte mit falschem Typ werden ignoriert.
+"""
+
+import os
+import json
+from typing import Dict, Any, Optional
+
+# ======================
+# KONFIGURATION
+# ======================
+ENV_REPORT_FILE = "IrsanAI_env_report.json"
+ENV_REPORT_VARIABLE = "IRSANAI_ENV_REPORT"
+SEARCH_SUBDIRS = ("", "irsanai-system")
+
+DEFAULT_TUNING: Dict[str, Any] = {
+    "thread_pool_size": min(8, os.cpu_count() or 1),
+    "process_pool_size": 1,
+    "hash_buffer_bytes": 64 * 1024,
+    "use_mmap": False,
+    "mmap_min_bytes": 4 * 1024 * 1024,
+    "max_in_memory_index_mb": 256,
+    "json_indent": 2,
+    "preview_bytes": 500
+}
+
+# Grenzen, damit ein veralteter oder fremder Bericht keine unsinnigen Werte erzwingt
+VALUE_LIMITS = {
+    "thread_pool_size": (1, 64),
+    "process_pool_size": (1, 256),
+    "hash_buffer_bytes": (4096, 16 * 1024 * 1024),
+    "mmap_min_bytes": (0, 1 << 40),
+    "max_in_memory_index_mb": (16, 1 << 20),
+    "preview_bytes": (0, 1024 * 1024)
+}
+
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def find_env_report(project_root: Optional[str] = None) -> Optional[str]:
+    """Ermittelt den Pfad des Umgebungsberichts oder None"""
+    configured = os.environ.get(ENV_REPORT_VARIABLE)
+    if configured:
+        return configured if os.path.isfile(configured) else None
+    root = project_root or os.getcwd()
+    for subdir in SEARCH_SUBDIRS:
+        candidate = os.path.join(root, subdir, ENV_REPORT_FILE)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _validated(key: str, value: Any) -> bool:
+    """Prüft Typ und Wertebereich eines Hinweises gegen den Standardwert"""
+    default = DEFAULT_TUNING[key]
+    if key == "json_indent":
+        return value is None or (isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 8)
+    if isinstance(default, bool):
+        return isinstance(value, bool)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return False
+    low, high = VALUE_LIMITS.get(key, (0, float("inf")))
+    return low <= value <= high
+
+
+def load_tuning_hints(project_root: Optional[str] = None) -> Dict[str, Any]:
+    """Liefert die zusammengeführten Tuning-Hinweise (Bericht über DEFAULT_TUNING)
+
+    Das Ergebnis enthält zusätzlich "source" (Pfad des Berichts oder "defaults") und
+    wird je Berichtspfad zwischengespeichert.
+    """
+    report_path = find_env_report(project_root)
+    cache_key = report_path or "defaults"
+    if cache_key in _cache:
+        return dict(_cache[cache_key])
+
+    hints = dict(DEFAULT_TUNING)
+    hints["source"] = "defaults"
+    if report_path:
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                tuning = json.load(f).get("tuning") or {}
+            for key, value in tuning.items():
+                if key in DEFAULT_TUNING and _validated(key, value):
+                    hints[key] = value
+            if tuning:
+                hints["source"] = report_path
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    _cache[cache_key] = hints
+    return dict(hints)
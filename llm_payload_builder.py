@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+llm_payload_builder.py
+Version: 1.0
+Beschreibung: Erzeugt aus dem aktuellen Scan eine kompakte Nutzlast für das LLM - nur die
+              Änderungen seit dem zuletzt bestätigten Stand, begrenzt auf ein Byte-/Token-Budget.
+
+Ablauf:
+1. Bestätigung: Liegt in .IrsanAI/Feedback/online_feedback.json ein neueres Feedback
+   (metadata.timestamp) vor als beim letzten Versand, gilt der damals gesendete Scan
+   (llm_pending.json) als bestätigt und wird zur Basis (llm_baseline.json).
+2. Inhalt: mit Basis die Änderungen gegenüber dem aktuellen Scan (scan_diff.py, als Datenstrom),
+   ohne Basis (oder mit --full) alle Dateien und offenen Befunde.
+3. Rangfolge: Validierungsänderungen zuerst, dann Dateien nach der Priorisierung des Scanners
+   (files_to_analyze_first: Feedback-Empfehlungen bzw. Hauptdateien), dann kritische
+   Dateitypen, dann Pfad. Gehalten werden nur so viele Kandidaten, wie in das Budget passen.
+4. Budget: die längste Präfix-Liste, deren serialisierte Nutzlast höchstens --max-bytes
+   (bzw. --max-tokens x BYTES_PER_TOKEN) Bytes groß ist; der Rest wird als "omitted" gezählt.
+
+Die Nutzlast ist deterministisch (gleiche Scans und gleiches Feedback ergeben dieselben Bytes,
+keine Erzeugungszeit). --compact schreibt ohne Leerraum, mit Kurzschlüsseln und einer
+Legende der verwendeten Abkürzungen.
+
+Verwendung:
+    python llm_payload_builder.py                        # -> .IrsanAI/Reports/llm_payload.json
+    python llm_payload_builder.py --compact --max-tokens 4000 --output -
+    python llm_payload_builder.py --full --dry-run       # ohne Basis, Zustand unverändert
+"""
+
+import os
+import sys
+import json
+import heapq
+import shutil
+import argparse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scan_diff import (
+    diff_scans, read_snapshot, resolve_source, rotate_report, snapshot_path, CHANGE_TYPES
+)
+from project_scanner import (
+    load_feedback, recommended_files, file_priority, CRITICAL_EXTENSIONS, REPORT_DIR, CURRENT_SCAN_FILE
+)
+
+# ======================
+# KONFIGURATION
+# ======================
+PAYLOAD_VERSION = "1.0"
+PAYLOAD_FILE = os.path.join(REPORT_DIR, "llm_payload.json")
+STATE_FILE = os.path.join(REPORT_DIR, "llm_payload_state.json")
+PENDING_SCAN_FILE = os.path.join(REPORT_DIR, "llm_pending.json")  # zuletzt gesendeter Scan
+BASELINE_SCAN_FILE = os.path.join(REPORT_DIR, "llm_baseline.json")  # vom LLM bestätigter Scan
+
+BYTES_PER_TOKEN = 4  # grobe Näherung für Text und JSON
+DEFAULT_MAX_TOKENS = 8000
+MIN_ITEM_BYTES = 16  # kein serialisierter Eintrag ist kleiner (begrenzt die gehaltenen Kandidaten)
+NO_PRIORITY = 1 << 30
+
+VALIDATION_CHANGES = ("validation", "check", "critical_file")
+
+# Kurzschlüssel für --compact (nur verwendete Abkürzungen landen in der Legende)
+KEY_ALIASES = {
+    "payload_version": "v", "mode": "m", "scan": "s", "baseline": "b", "timestamp": "ts",
+    "scanner_version": "sv", "total_files": "nf", "total_directories": "nd",
+    "feedback_timestamp": "fts", "validation": "val", "critical_missing": "cm", "summary": "sum",
+    "items": "i", "omitted": "o", "questions": "q", "change": "c", "path": "p", "hash": "h",
+    "size": "sz", "old_hash": "oh", "new_hash": "nh", "old_size": "osz", "new_size": "nsz",
+    "from": "fr", "to": "to", "category": "cat", "status": "st", "file": "f", "severity": "sev",
+    "description": "d", "suggestion": "sug", "check": "chk", "old": "ov", "new": "nv",
+    "old_exists": "oe", "new_exists": "ne",
+}
+DATA_KEYS = ("validation", "summary")  # deren Schlüssel sind Daten (Prüfungen, Änderungsarten) und bleiben
+CHANGE_ALIASES = {
+    "added": "+", "removed": "-", "modified": "~", "moved": ">", "file": "=",
+    "validation": "v", "check": "c", "critical_file": "k",
+}
+
+Item = Dict[str, Any]
+
+
+def log(message: str) -> None:
+    """Statusmeldungen gehen nach stderr, damit stdout die Nutzlast aufnehmen kann"""
+    print(message, file=sys.stderr)
+
+
+# ======================
+# ZUSTAND (GESENDET / BESTÄTIGT)
+# ======================
+def load_state() -> Dict[str, Any]:
+    if not os.path.exists(STATE_FILE):
+        return {}
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, Any]) -> None:
+    temp_path = f"{STATE_FILE}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, STATE_FILE)
+
+
+def feedback_timestamp(feedback: Dict[str, Any]) -> Optional[str]:
+    return feedback.get("metadata", {}).get("timestamp")
+
+
+def acknowledge(state: Dict[str, Any], feedback_ts: Optional[str], dry_run: bool) -> Optional[str]:
+    """Macht den gesendeten Scan zur Basis, wenn seitdem neues Feedback eingegangen ist
+
+    Returns:
+        Report der Basis (None ohne bestätigten Stand); mit dry_run wird nichts verschoben
+    """
+    pending = state.get("pending")
+    if pending and feedback_ts and feedback_ts != pending.get("feedback_timestamp") \
+            and os.path.exists(snapshot_path(PENDING_SCAN_FILE)):
+        if dry_run:
+            return PENDING_SCAN_FILE
+        rotate_report(PENDING_SCAN_FILE, BASELINE_SCAN_FILE)
+        state["baseline"] = {"scan_timestamp": pending.get("scan_timestamp"), "feedback_timestamp": feedback_ts}
+        state.pop("pending")
+        log(f"[PAYLOAD] Feedback vom {feedback_ts} bestätigt den Scan vom {pending.get('scan_timestamp')}")
+    if state.get("baseline") and os.path.exists(snapshot_path(BASELINE_SCAN_FILE)):
+        return BASELINE_SCAN_FILE
+    return None
+
+
+def remember_sent(state: Dict[str, Any], report: Dict[str, Any], feedback_ts: Optional[str]) -> None:
+    """Bewahrt den gesendeten Scan auf; er wird mit dem nächsten Feedback zur Basis"""
+    for source, target in ((CURRENT_SCAN_FILE, PENDING_SCAN_FILE),
+                           (snapshot_path(CURRENT_SCAN_FILE), snapshot_path(PENDING_SCAN_FILE))):
+        shutil.copyfile(source, f"{target}.tmp")
+        os.replace(f"{target}.tmp", target)
+    state["pending"] = {"scan_timestamp": report["scan_metadata"]["timestamp"], "feedback_timestamp": feedback_ts}
+    save_state(state)
+
+
+# ======================
+# INHALT UND RANGFOLGE
+# ======================
+def full_items(report: Dict[str, Any], current_snapshot: str) -> Iterator[Item]:
+    """Ohne Basis: alle offenen Befunde und alle Dateien des Scans"""
+    for category, issues in sorted(report["project_structure"]["validation_results"].items()):
+        for issue in issues:
+            yield {"change": "validation", "category": category, "status": "open", "file": issue.get("file", ""),
+                   "severity": issue.get("severity", ""), "description": issue.get("description", ""),
+                   "suggestion": issue.get("suggestion", "")}
+    _, records = read_snapshot(current_snapshot)
+    for record in records:
+        yield {"change": "file", **record}
+
+
+def make_rank_key(recommended: Optional[List[str]]) -> Callable[[Item], Tuple]:
+    """Sortierschlüssel der Einträge (siehe Modulbeschreibung, Schritt 3)"""
+    def rank_key(item: Item) -> Tuple:
+        if item["change"] in VALIDATION_CHANGES:
+            return (0, 0, 0, item["change"], item.get("category", ""), item.get("file", item.get("path", "")),
+                    item.get("description", item.get("check", "")))
+        path = item.get("to") or item["path"]
+        priority = file_priority(path, recommended)
+        extension = os.path.splitext(path)[1].lower()
+        return (1, NO_PRIORITY if priority is None else priority,
+                0 if extension in CRITICAL_EXTENSIONS else 1, path, item["change"], "", "")
+    return rank_key
+
+
+def count_items(items: Iterable[Item], summary: Dict[str, int]) -> Iterator[Item]:
+    for item in items:
+        summary[item["change"]] = summary.get(item["change"], 0) + 1
+        yield item
+
+
+# ======================
+# SERIALISIERUNG UND BUDGET
+# ======================
+def compact_value(value: Any, used_keys: Dict[str, str], used_changes: Dict[str, str]) -> Any:
+    """Ersetzt bekannte Schlüssel (und Änderungsarten) rekursiv durch ihre Abkürzung"""
+    if isinstance(value, list):
+        return [compact_value(entry, used_keys, used_changes) for entry in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, entry in value.items():
+        alias = KEY_ALIASES.get(key, key)
+        if alias != key:
+            used_keys[alias] = key
+        if key == "change" and entry in CHANGE_ALIASES:
+            used_changes[CHANGE_ALIASES[entry]] = entry
+            entry = CHANGE_ALIASES[entry]
+        result[alias] = entry if key in DATA_KEYS else compact_value(entry, used_keys, used_changes)
+    return result
+
+
+def serialize(payload: Dict[str, Any], compact: bool) -> bytes:
+    if not compact:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+    used_keys: Dict[str, str] = {}
+    used_changes: Dict[str, str] = {}
+    body = compact_value(payload, used_keys, used_changes)
+    body["legend"] = {"keys": dict(sorted(used_keys.items())), "change": dict(sorted(used_changes.items()))}
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def fit_budget(build: Callable[[int], Dict[str, Any]], candidates: int, max_bytes: int,
+               compact: bool) -> Tuple[bytes, int]:
+    """Größte Anzahl Einträge, mit der die serialisierte Nutzlast ins Budget passt (binäre Suche)
+
+    Returns:
+        (serialisierte Nutzlast, Anzahl enthaltener Einträge); passt selbst die leere Liste nicht,
+        wird sie trotzdem geliefert
+    """
+    low, high = 0, candidates
+    best = serialize(build(0), compact)
+    while low < high:
+        middle = (low + high + 1) // 2
+        data = serialize(build(middle), compact)
+        if len(data) <= max_bytes:
+            low, best = middle, data
+        else:
+            high = middle - 1
+    return best, low
+
+
+# ======================
+# NUTZLAST
+# ======================
+def build_payload(max_bytes: int, compact: bool = False, full: bool = False,
+                  dry_run: bool = False) -> Tuple[bytes, Dict[str, Any]]:
+    """Erzeugt die Nutzlast zum aktuellen Scan
+
+    Returns:
+        (serialisierte Nutzlast, Kennzahlen für die Ausgabe)
+    """
+    report_path, current_snapshot = resolve_source(CURRENT_SCAN_FILE)
+    if report_path is None:
+        raise FileNotFoundError(f"Kein aktueller Scan ({CURRENT_SCAN_FILE}) - zuerst project_scanner.py ausführen")
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    feedback = load_feedback()
+    feedback_ts = feedback_timestamp(feedback)
+    state = load_state()
+    # Bestätigung auch mit --full fortschreiben, sonst ginge der gesendete Stand verloren
+    baseline = acknowledge(state, feedback_ts, dry_run)
+    if full:
+        baseline = None
+
+    summary: Dict[str, int] = {}
+    if baseline:
+        stats: Dict[str, int] = {}
+        items = count_items(diff_scans(baseline, CURRENT_SCAN_FILE, stats), summary)
+    else:
+        items = count_items(full_items(report, current_snapshot), summary)
+
+    # Nur die Kandidaten halten, die überhaupt ins Budget passen können
+    limit = max_bytes // MIN_ITEM_BYTES + 1
+    candidates = heapq.nsmallest(limit, items, key=make_rank_key(recommended_files(feedback)))
+    total = sum(summary.values())
+    if baseline:
+        summary = {change: summary.get(change, 0) for change in CHANGE_TYPES}
+        summary["unchanged"] = stats.get("unchanged", 0)
+
+    metadata = report["scan_metadata"]
+    baseline_info = None
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            baseline_info = {"timestamp": json.load(f)["scan_metadata"]["timestamp"],
+                             "feedback_timestamp": feedback_ts}
+
+    def build(count: int) -> Dict[str, Any]:
+        return {
+            "payload_version": PAYLOAD_VERSION,
+            "mode": "delta" if baseline else "full",
+            "scan": {key: metadata[key] for key in
+                     ("timestamp", "scanner_version", "total_files", "total_directories")},
+            "baseline": baseline_info,
+            "validation": metadata["detailed_validation"],
+            "critical_missing": [item["path"] for item in report["project_structure"]["critical_file_status"]
+                                 if not item["exists"]],
+            "summary": summary,
+            "items": candidates[:count],
+            "omitted": total - count,
+            "questions": report["analysis_request"]["questions_for_llm"],
+        }
+
+    data, included = fit_budget(build, len(candidates), max_bytes, compact)
+    if not dry_run:
+        remember_sent(state, report, feedback_ts)
+    return data, {"mode": "delta" if baseline else "full", "included": included, "total": total,
+                  "bytes": len(data)}
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Kompakte LLM-Nutzlast aus dem aktuellen IrsanAI-Scan")
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument("--max-bytes", type=int, default=None, help="Budget in Bytes")
+    budget.add_argument("--max-tokens", type=int, default=None,
+                        help=f"Budget in Tokens (ca. {BYTES_PER_TOKEN} Bytes je Token, "
+                             f"Standard: {DEFAULT_MAX_TOKENS})")
+    parser.add_argument("--compact", action="store_true",
+                        help="Ohne Leerraum, mit Kurzschlüsseln und Legende")
+    parser.add_argument("--full", action="store_true",
+                        help="Alle Dateien statt nur der Änderungen seit dem bestätigten Stand")
+    parser.add_argument("--output", default=PAYLOAD_FILE, help="Zieldatei oder '-' für stdout")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Gesendeten/bestätigten Stand nicht fortschreiben")
+    args = parser.parse_args(argv)
+
+    max_bytes = args.max_bytes if args.max_bytes is not None \
+        else (args.max_tokens or DEFAULT_MAX_TOKENS) * BYTES_PER_TOKEN
+    try:
+        data, info = build_payload(max_bytes, args.compact, args.full, args.dry_run)
+    except (OSError, ValueError, KeyError) as e:
+        log(f"[PAYLOAD] Fehler: {e}")
+        return 2
+
+    if args.output == "-":
+        sys.stdout.buffer.write(data + b"\n")
+        sys.stdout.flush()
+    else:
+        with open(args.output, 'wb') as f:
+            f.write(data + b"\n")
+    log(f"[PAYLOAD] {info['mode']}: {info['included']} von {info['total']} Einträgen, "
+        f"{info['bytes']} Bytes (ca. {info['bytes'] // BYTES_PER_TOKEN} Tokens, Budget {max_bytes} Bytes)"
+        + ("" if args.output == "-" else f" -> {args.output}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
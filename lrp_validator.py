@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lrp_validator.py
+Version: 1.0
+Beschreibung: Validiert IrsanAI-LRP-Dokumente und LLM-Antworten nach LRP v1.2 - einzeln,
+              als Stapel (Verzeichnisse) oder als Datenstrom (NDJSON auf stdin)
+
+Prüfungen (lrp-protocol/LRP_v1.2_Core_Specification.md):
+- LRP-Dokumente: dieselben Prüfungen und Punktabzüge wie validateLRP() in
+  web-tool/environment_report_validator.js (Compliance-Score, konform ab 80 Punkten), dazu
+  - Kopfzeile: Titel "# IrsanAI-LRP v..." bzw. "IrsanAI-LRP v1.2 | Unique-Key: ... | Contributor: ..."
+  - Unique-Key: Format ENC(<8 Hex-Zeichen>, AES-256), passend zur Endung der task_id
+  - PRE-Selector: alle fünf Schritte aus Abschnitt 3.4 (fehlende Schritte 1-4 als Warnung)
+- LLM-Antworten: dieselben Prüfungen wie validateLLMResponse() (alle Fehler statt nur des ersten)
+- beide: DSGVO-Regel 001 - unmaskierte Benutzerpfade, E-Mail-Adressen, IP- und MAC-Adressen.
+  Ein Fund macht das Dokument ungültig; ausgegeben werden nur Kategorie und Zeile, nie die Daten.
+
+Alle Muster sind beim Import kompiliert (einmal je Prozess). Ab PARALLEL_MIN_DOCUMENTS
+Dokumenten prüft ein Prozess-Pool; Dateien werden erst im Worker gelesen. Ausgabe: eine
+JSON-Zeile (NDJSON) je Dokument in Eingabereihenfolge.
+
+Verwendung:
+    python lrp_validator.py dokumente/                       # rekursiv *.md, *.txt
+    python lrp_validator.py antworten/ --mode response --output ergebnisse.ndjson
+    cat dokumente.ndjson | python lrp_validator.py -         # {"id": ..., "text": ..., "kind": ...}
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from irsanai_decoding import decode_bytes
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+PROTOCOL_VERSION = "1.2"
+COMPLIANCE_THRESHOLD = 80
+DOCUMENT_SUFFIXES = (".md", ".txt")
+PARALLEL_MIN_DOCUMENTS = 32  # darunter lohnt der Start eines Prozess-Pools nicht
+BATCH_DOCUMENTS = 64  # Dokumente je Auftrag an einen Worker
+MAX_DOCUMENT_BYTES = 4 * 1024 * 1024  # größere Dateien sind keine LRP-Dokumente
+
+# Feste Textprüfungen aus validateLRP(): (Prüfung, Text, Punktabzug, Meldung)
+LRP_TEXT_CHECKS: List[Tuple[str, str, int, str]] = [
+    ("metadata", "## METADATEN (MASCHINENLESBAR)", 30, "Metadaten-Block fehlt"),
+    ("user_request", "## USER-REQUEST (AUTOMATISCH GENERIERT)", 20, "User-Request-Block fehlt"),
+    ("final_instruction", "5. **ABSCHLIESSENDE SYSTEMANWEISUNG (NICHT IGNORIERBAR)**", 20,
+     "Fehlende abschließende Systemanweisung"),
+    ("language", "ANTWORTE AUF DEUTSCH", 10, "Fehlende Sprachvorgabe"),
+    ("yes_confirmation", 'NACH "JA"-BESTÄTIGUNG AUF WEG 2', 15, "Fehlende Anweisung für 'JA'-Bestätigung"),
+    ("detector_only", "GENERIERE NUR DEN OS/HW-DETEKTOR", 15, "Fehlende Detektor-Generierungsanweisung"),
+]
+YAML_PENALTY = 25
+PROTOCOL_VERSION_PENALTY = 15
+TASK_ID_PENALTY = 10
+
+YAML_BLOCK = re.compile(r"```yaml\n(.*?)\n```", re.DOTALL)
+TITLE_LINE = re.compile(r"^#\s+.*?IrsanAI-LRP v(\d+(?:\.\d+)*)", re.MULTILINE)
+HEADER_LINE = re.compile(r"IrsanAI-LRP v(\d+(?:\.\d+)*)\s*\|\s*Unique-Key:\s*(.*?)\s*\|\s*Contributor:\s*(\S.*)")
+UNIQUE_KEY = re.compile(r"ENC\(([0-9a-f]{8}), AES-256\)")
+TASK_ID = re.compile(r"^task_id:\s*\"?([\w-]+)\"?\s*$", re.MULTILINE)
+TASK_ID_KEY = re.compile(r"_([0-9a-f]{8})$")
+PRE_SELECTOR_STEPS: List[Tuple[int, re.Pattern]] = [
+    (number, re.compile(r"^(?:#{1,6}\s*)?" + str(number) + r"\.\s*(?:\*\*)?" + re.escape(title), re.MULTILINE))
+    for number, title in [
+        (1, "SELBSTREFLEKTIERENDE INTENT-ANALYSE"),
+        (2, "SYSTEMISCHES ENTSCHEIDUNGSMUSTER"),
+        (3, "BEGRÜNDUNG DER ENTSCHEIDUNG"),
+        (4, "EXPLIZITE BENUTZERBESTÄTIGUNG"),
+        (5, "ABSCHLIESSENDE SYSTEMANWEISUNG"),
+    ]
+]
+
+# Prüfungen aus validateLLMResponse()
+RESPONSE_REQUIRED = ("Ich verstehe:", "MEINE META-ERKENNTNIS", "Ist das korrekt? (JA/NEIN)")
+RESPONSE_FINAL_PRODUCT = ("Dashboard", "Maßnahmenkatalog", "Endprodukt", "komplettes System")
+
+# DSGVO-Regel 001: (Kategorie, Muster); Platzhalter wie %username% oder <name> sind erlaubt
+PERSONAL_DATA_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("user_path", re.compile(r"[A-Za-z]:(?:\\{1,2}|/)Users(?:\\{1,2}|/)(?!%username%|<|Public\b|Default\b)[^\\/\s%<]+")),
+    ("user_path", re.compile(r"/(?:home|Users)/(?!%username%|<|Shared\b)[A-Za-z0-9._-]+")),
+    ("email", re.compile(r"\b[\w.+-]+@(?![\w-]+\.(?:example|invalid|test)\b)[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}\b")),
+    # Nicht Teil einer längeren Punktfolge (v1.2.3.4, 10.0.19045.1): kein Wortzeichen/Punkt davor,
+    # kein ".Ziffer" danach
+    ("ip_address", re.compile(r"(?<![\w.])(?!127\.0\.0\.1\b|0\.0\.0\.0\b)(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}"
+                              r"(?:25[0-5]|2[0-4]\d|1?\d?\d)\b(?!\.\d)")),
+    ("mac_address", re.compile(r"\b[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}\b|\b[0-9A-Fa-f]{2}(?:-[0-9A-Fa-f]{2}){5}\b")),
+]
+
+# Versions- und Build-Angaben vor einer Punktfolge ("Version 1.2.3.4", "Build: 10.0.0.1") sind keine IP-Adressen
+VERSION_CONTEXT = re.compile(r"\b(?:version|ver\.?|build|release|rev\.?)\s*[:=]?\s*$", re.IGNORECASE)
+VERSION_CONTEXT_CHARS = 16
+
+
+def log(message: str) -> None:
+    """Statusmeldungen gehen nach stderr, damit stdout nur die Ergebnisse enthält"""
+    print(message, file=sys.stderr)
+
+
+# ======================
+# PRÜFUNGEN
+# ======================
+def _issue(check: str, message: str, **details: Any) -> Dict[str, Any]:
+    return {"check": check, "message": message, **details}
+
+
+def find_personal_data(text: str) -> List[Dict[str, Any]]:
+    """DSGVO-Regel 001: Funde mit Kategorie und Zeile (ohne die Daten selbst)"""
+    findings = []
+    for category, pattern in PERSONAL_DATA_PATTERNS:
+        for match in pattern.finditer(text):
+            if category == "ip_address" and VERSION_CONTEXT.search(
+                    text, max(0, match.start() - VERSION_CONTEXT_CHARS), match.start()):
+                continue
+            line = text.count("\n", 0, match.start()) + 1
+            findings.append(_issue("dsgvo", f"Personenbezogene Daten ({category}) in Zeile {line}",
+                                   category=category, line=line))
+    findings.sort(key=lambda finding: finding["line"])
+    return findings
+
+
+def check_header(text: str, yaml_content: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Kopfzeile und Unique-Key; liefert (Fehler, Warnungen)"""
+    errors: List[Dict[str, Any]] = []
+    warnings: List[Dict[str, Any]] = []
+    header = HEADER_LINE.search(text)
+    title = TITLE_LINE.search(text)
+    if header is None and title is None:
+        warnings.append(_issue("header", "Kopfzeile 'IrsanAI-LRP v...' fehlt"))
+    version = header.group(1) if header else title.group(1) if title else None
+    if version is not None and version != PROTOCOL_VERSION:
+        warnings.append(_issue("header", f"Kopfzeile nennt LRP v{version} statt v{PROTOCOL_VERSION}"))
+
+    if header is None:
+        return errors, warnings
+    key = UNIQUE_KEY.fullmatch(header.group(2))
+    if key is None:
+        errors.append(_issue("unique_key", "Unique-Key hat nicht das Format ENC(<8 Hex-Zeichen>, AES-256)"))
+        return errors, warnings
+    task_id = TASK_ID.search(yaml_content or "")
+    task_key = TASK_ID_KEY.search(task_id.group(1)) if task_id else None
+    if task_key and task_key.group(1) != key.group(1):
+        errors.append(_issue("unique_key", "Unique-Key passt nicht zur task_id"))
+    return errors, warnings
+
+
+def validate_lrp(text: str) -> Dict[str, Any]:
+    """Prüft ein LRP-Dokument (validateLRP() plus Kopfzeile, Unique-Key, PRE-Selector, DSGVO)
+
+    Returns:
+        {"kind", "valid", "score", "errors", "warnings"}; gültig ab COMPLIANCE_THRESHOLD
+        Punkten ohne Fehler aus Kopfzeilen- oder DSGVO-Prüfung
+    """
+    text = text.replace("\r\n", "\n")
+    errors: List[Dict[str, Any]] = []
+    score = 100
+
+    def penalize(check: str, penalty: int, message: str) -> None:
+        nonlocal score
+        errors.append(_issue(check, message, penalty=penalty))
+        score -= penalty
+
+    # Reihenfolge wie in validateLRP()
+    metadata_check = LRP_TEXT_CHECKS[0]
+    if metadata_check[1] not in text:
+        penalize(metadata_check[0], metadata_check[2], metadata_check[3])
+
+    yaml_match = YAML_BLOCK.search(text)
+    yaml_content = yaml_match.group(1) if yaml_match else None
+    if yaml_content is None:
+        penalize("yaml", YAML_PENALTY, "Ungültiges YAML-Format")
+    else:
+        if f'protocol_version: "{PROTOCOL_VERSION}"' not in yaml_content:
+            penalize("protocol_version", PROTOCOL_VERSION_PENALTY, "Falsche Protokollversion")
+        if "task_id:" not in yaml_content:
+            penalize("task_id", TASK_ID_PENALTY, "task_id fehlt")
+
+    for check, needle, penalty, message in LRP_TEXT_CHECKS[1:]:
+        if needle not in text:
+            penalize(check, penalty, message)
+
+    header_errors, warnings = check_header(text, yaml_content)
+    missing_steps = [number for number, pattern in PRE_SELECTOR_STEPS[:-1] if not pattern.search(text)]
+    if missing_steps:
+        warnings.append(_issue("pre_selector", "PRE-Selector unvollständig, es fehlen Schritt(e) "
+                               + ", ".join(str(number) for number in missing_steps), missing_steps=missing_steps))
+    dsgvo = find_personal_data(text)
+
+    score = max(0, score)
+    return {
+        "kind": "lrp",
+        "valid": score >= COMPLIANCE_THRESHOLD and not header_errors and not dsgvo,
+        "score": score,
+        "errors": errors + header_errors + dsgvo,
+        "warnings": warnings,
+    }
+
+
+def validate_llm_response(text: str) -> Dict[str, Any]:
+    """Prüft eine LLM-Antwort (validateLLMResponse() plus DSGVO-Regel 001)
+
+    Returns:
+        {"kind", "valid", "score" (immer None), "errors", "warnings"}
+    """
+    errors = []
+    if not all(needle in text for needle in RESPONSE_REQUIRED):
+        errors.append(_issue("pre_selector", "LLM hat PRE-Selector-Anweisung nicht befolgt - Kettenabbruchgefahr!"))
+    if "Weg 2" in text:
+        if "OS/HW-Erkennung" not in text:
+            errors.append(_issue("decision", "LLM hat Weg 2 gewählt, aber OS/HW-Erkennung nicht erwähnt!"))
+        if "JA" in text and any(needle in text for needle in RESPONSE_FINAL_PRODUCT):
+            errors.append(_issue("detector_only", "LLM hat bei Weg 2 bereits Endprodukt generiert - Protokollbruch!"))
+    errors.extend(find_personal_data(text))
+    return {"kind": "response", "valid": not errors, "score": None, "errors": errors, "warnings": []}
+
+
+def detect_kind(text: str) -> str:
+    """LRP-Dokument, wenn Metadaten-Block oder LRP-Titel vorhanden sind, sonst LLM-Antwort"""
+    if "## METADATEN" in text or TITLE_LINE.search(text[:4096]):
+        return "lrp"
+    return "response"
+
+
+def validate_text(text: str, mode: str = "auto") -> Dict[str, Any]:
+    kind = detect_kind(text) if mode == "auto" else mode
+    return validate_lrp(text) if kind == "lrp" else validate_llm_response(text)
+
+
+# ======================
+# EINGABEN
+# ======================
+def validate_item(item: Tuple[str, str, Optional[str], Optional[str]]) -> Dict[str, Any]:
+    """Ein Dokument: ("file", Pfad, None, Modus) oder ("text", ID, Text, Modus)"""
+    source, identifier, text, mode = item
+    try:
+        if source == "file":
+            if os.path.getsize(identifier) > MAX_DOCUMENT_BYTES:
+                raise ValueError(f"Datei größer als {MAX_DOCUMENT_BYTES} Bytes")
+            with open(identifier, 'rb') as f:
+                text, _ = decode_bytes(f.read())
+        if not isinstance(text, str):
+            raise ValueError("kein Text (ungültige NDJSON-Zeile oder Feld 'text' fehlt)")
+        result = validate_text(text, mode or "auto")
+    except (OSError, ValueError) as e:
+        result = {"kind": None, "valid": False, "score": None,
+                  "errors": [_issue("input", f"Dokument nicht lesbar: {str(e)}")], "warnings": []}
+    return {"id": identifier, **result}
+
+
+def validate_batch(items: List[Tuple[str, str, Optional[str], Optional[str]]]) -> List[Dict[str, Any]]:
+    """Ein Auftrag an den Prozess-Pool"""
+    return [validate_item(item) for item in items]
+
+
+def iter_paths(paths: Iterable[str], mode: str) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+    """Dateien direkt, Verzeichnisse rekursiv (DOCUMENT_SUFFIXES, sortiert)"""
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.lower().endswith(DOCUMENT_SUFFIXES):
+                        yield "file", os.path.join(dirpath, name), None, mode
+        else:
+            yield "file", path, None, mode
+
+
+def iter_stream(stream: Iterable[str], mode: str) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+    """NDJSON: je Zeile {"id", "text", "kind"} oder eine JSON-Zeichenkette"""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield "text", f"stdin:{number}", None, mode  # führt zu einem Eingabefehler im Ergebnis
+            continue
+        if isinstance(record, str):
+            yield "text", f"stdin:{number}", record, mode
+        else:
+            kind = record.get("kind") if record.get("kind") in ("lrp", "response") else mode
+            yield "text", str(record.get("id", f"stdin:{number}")), record.get("text"), kind
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_all(items: Iterable[Tuple[str, str, Optional[str], Optional[str]]],
+                 workers: int) -> Iterator[Dict[str, Any]]:
+    """Prüft alle Dokumente in Eingabereihenfolge; ab PARALLEL_MIN_DOCUMENTS im Prozess-Pool
+
+    Es sind höchstens 2 * workers Aufträge gleichzeitig unterwegs, damit auch ein
+    unbegrenzter Datenstrom mit konstantem Speicher geprüft wird.
+    """
+    batches = _batches(items, BATCH_DOCUMENTS)
+    first = next(batches, None)
+    if first is None:
+        return
+    if workers <= 1 or len(first) < PARALLEL_MIN_DOCUMENTS:
+        yield from validate_batch(first)
+        for batch in batches:
+            yield from validate_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = [executor.submit(validate_batch, first)]
+        for batch in batches:
+            pending.append(executor.submit(validate_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="IrsanAI-LRP v1.2 Validator für Dokumente und LLM-Antworten")
+    parser.add_argument("sources", nargs="+",
+                        help="Dateien, Verzeichnisse (rekursiv *.md, *.txt) oder '-' für NDJSON auf stdin")
+    parser.add_argument("--mode", choices=("auto", "lrp", "response"), default="auto",
+                        help="Art der Dokumente (Standard: je Dokument erkennen)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Prozesse für die Prüfung (Standard: alle Kerne)")
+    parser.add_argument("--output", help="Ergebnisse (NDJSON) in diese Datei schreiben statt auf stdout")
+    args = parser.parse_args(argv)
+
+    def items() -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        for source in args.sources:
+            if source == "-":
+                yield from iter_stream(sys.stdin, args.mode)
+            else:
+                yield from iter_paths([source], args.mode)
+
+    start = time.perf_counter()
+    total = valid = 0
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for result in validate_all(items(), args.workers):
+            total += 1
+            valid += result["valid"]
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    log(f"[LRP] {total} Dokumente geprüft, {valid} gültig, {total - valid} ungültig "
+        f"in {time.perf_counter() - start:.2f} s")
+    return 0 if valid == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
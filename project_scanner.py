@@ -14,13 +14,34 @@ Sicherheit: 100%
 
 import os
 import json
+import argparse
 import hashlib
 import datetime
+import time
 import re
+import logging
 import platform
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
+from irsanai_tuning import load_tuning_hints, DEFAULT_TUNING
+from irsanai_classify import (
+    classify_head, file_fingerprint, FingerprintCache, SNIFF_BYTES, CLASSIFY_BATCH_SIZE, UNREADABLE_CLASSIFICATION
+)
+from irsanai_decoding import TextDecoder
+from irsanai_gitignore import GitignoreRules, parse_gitignore, GITIGNORE_FILE
+from irsanai_logging import setup_logging, shutdown_logging, ProgressReporter, LEVELS, LOG_FORMATS
+from scan_diff import (
+    write_snapshot, rotate_report, snapshot_path, diff_to_file, format_summary, chunk_records_for,
+    PREVIOUS_SCAN_NAME, DIFF_FILE_NAME
+)
+from irsanai_instrumentation import (
+    Instrumentation, profile_call, STAGE_WALK, STAGE_IGNORE, STAGE_HASHING, STAGE_RULES,
+    STAGE_SERIALIZATION, COUNTER_FILES, COUNTER_BYTES_READ, COUNTER_REGEX, COUNTER_SYSCALLS, COUNTER_CACHE_HITS
+)
+
 # ======================
 # KONFIGURATION
 # ======================
@@ -31,6 +52,35 @@ FEEDBACK_DIR = os.path.join(PROJECT_ROOT, ".IrsanAI", "Feedback")
 FEEDBACK_FILE = os.path.join(FEEDBACK_DIR, "online_feedback.json")
 CURRENT_SCAN_FILE = os.path.join(REPORT_DIR, "current_scan.json")
 SCAN_HISTORY_FILE = os.path.join(REPORT_DIR, "scan_history.json")
+# Vorheriger Scan (samt Datei-Snapshot) und die Änderungen gegenüber dem aktuellen, siehe scan_diff.py
+PREVIOUS_SCAN_FILE = os.path.join(REPORT_DIR, PREVIOUS_SCAN_NAME)
+SCAN_DIFF_FILE = os.path.join(REPORT_DIR, DIFF_FILE_NAME)
+FINGERPRINT_CACHE_FILE = os.path.join(REPORT_DIR, "file_fingerprints.json")
+
+# Performance-Parameter aus dem "tuning"-Abschnitt von IrsanAI_env_report.json; main() lädt sie,
+# bis dahin (z.B. beim bloßen Import) gelten die Standardwerte
+TUNING: Dict[str, Any] = dict(DEFAULT_TUNING)
+
+# Stufenzeiten und Zähler dieses Laufs (Abschnitt "performance" in Report und Scan-Historie)
+INSTRUMENTATION = Instrumentation("project_scanner", SCANNER_VERSION)
+
+# Logging über irsanai_logging (Einrichtung in main()); Fortschritt statt einer Zeile pro Datei
+LOGGER = logging.getLogger("IrsanAI_Project_Scanner")
+PROGRESS_ENABLED = True
+
+# Klassifikation des letzten Scans (relativer Pfad -> Ergebnis von classify_head); Prüfungen
+# lesen Binärdateien darüber gar nicht erst
+FILE_CLASSIFICATION: Dict[str, Dict[str, Any]] = {}
+FINGERPRINT_CACHE_ENABLED = True
+FINGERPRINT_CACHE: Optional[FingerprintCache] = None  # wird nach den Prüfungen gespeichert (Kodierungen)
+
+# Gemeinsamer Decoder der Prüfungen: jede Datei wird einmal gelesen und dekodiert
+TEXT_DECODER = TextDecoder()
+
+# Regelsatz der .gitignore: einmal je Lauf gelesen, genutzt von check_gitignore() und
+# (mit --respect-gitignore) von is_ignored()
+GITIGNORE_RULES: Optional[GitignoreRules] = None
+RESPECT_GITIGNORE = False
 
 # Typische Dateien/Ordner, die NICHT in die Analyse gehören
 # WICHTIG: Alle Muster jetzt platform-unabhängig mit / als Trennzeichen
@@ -62,6 +112,28 @@ CRITICAL_FILES = [
     ("HUMAN-AI_SYNERGY.md", "Human-AI Synergy Dokumentation")
 ]
 
+# Dateitypen, die im Report als kritisch gelten (und bei gleicher Priorität zuerst an das LLM gehen)
+CRITICAL_EXTENSIONS = [".py", ".md", ".json", ".js", ".html"]
+
+# Einträge, die .gitignore abdecken muss (in .gitignore-Schreibweise; geprüft wird die Wirkung,
+# z.B. deckt "**/.idea/" den Eintrag ".idea/" ab)
+REQUIRED_GITIGNORE_ENTRIES = [
+    ".idea/",
+    ".vscode/",
+    "__pycache__/",
+    ".pytest_cache/",
+    "build/",
+    "dist/",
+    ".venv/",
+    "venv/",
+    ".env",
+    "*.log",
+    "*.tmp",
+    "*.swp",
+    ".DS_Store",
+    "Thumbs.db"
+]
+
 
 # ======================
 # HILFSFUNKTIONEN
@@ -81,29 +153,108 @@ def mask_personal_data(path: str) -> str:
     return path
 
 
-def is_ignored(path: str) -> bool:
-    """Prüft, ob der Pfad in den Ignorierungsregeln enthalten ist"""
+@INSTRUMENTATION.timed(STAGE_IGNORE)
+def is_ignored(path: str, is_dir: bool = False) -> bool:
+    """Prüft, ob der Pfad in den Ignorierungsregeln (bzw. mit --respect-gitignore in .gitignore) enthalten ist"""
     path = normalize_path(path)
     rel_path = normalize_path(os.path.relpath(path, PROJECT_ROOT))
 
-    for pattern in IGNORE_PATTERNS:
+    for evaluated, pattern in enumerate(IGNORE_PATTERNS, 1):
         if re.search(pattern, rel_path):
+            INSTRUMENTATION.count(COUNTER_REGEX, evaluated)
             return True
+    INSTRUMENTATION.count(COUNTER_REGEX, len(IGNORE_PATTERNS))
+    if RESPECT_GITIGNORE:
+        try:
+            return load_gitignore_rules().match(rel_path, is_dir)
+        except OSError:
+            return False
     return False
 
 
-def get_file_hash(file_path: str) -> str:
-    """Erzeugt einen SHA-256-Hash der Datei für Identifikation"""
-    if not os.path.isfile(file_path):
-        return ""
+def hash_and_classify(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Erzeugt SHA-256-Hash und Klassifikation der Datei in einem einzigen Lesedurchgang
+
+    Der erste gelesene Block dient zugleich als Kopf für classify_head().
+    """
     sha256_hash = hashlib.sha256()
+    classification = None
+    reads = 1  # mmap bzw. abschließender leerer read()
     try:
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()[:16]
+            file_size = os.fstat(f.fileno()).st_size
+            if TUNING["use_mmap"] and file_size >= TUNING["mmap_min_bytes"]:
+                import mmap
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    classification = classify_head(mapped[:SNIFF_BYTES], file_size)
+                    sha256_hash.update(mapped)
+            else:
+                buffer_size = TUNING["hash_buffer_bytes"]
+                for byte_block in iter(lambda: f.read(buffer_size), b""):
+                    if classification is None:
+                        classification = classify_head(byte_block, file_size)
+                    sha256_hash.update(byte_block)
+                    reads += 1
+        # open, fstat und close zusätzlich zu den Lesezugriffen
+        INSTRUMENTATION.count_many({COUNTER_BYTES_READ: file_size, COUNTER_SYSCALLS: 3 + reads})
+        return sha256_hash.hexdigest()[:16], classification or classify_head(b"", 0)
     except Exception:
-        return "ERROR_HASHING"
+        return "ERROR_HASHING", UNREADABLE_CLASSIFICATION
+
+
+def hash_and_classify_batch(paths: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Ein Auftrag an den Thread-Pool: mehrere Dateien, damit kleine Dateien nicht je einzeln eingereicht werden"""
+    return [hash_and_classify(path) for path in paths]
+
+
+def read_decoded_file(file_path: str) -> Tuple[str, Optional[str]]:
+    """Liest eine Textdatei über TEXT_DECODER (BOM, UTF-8, cp1252, latin-1) und zählt den Zugriff
+
+    Als binär klassifizierte Dateien werden nicht gelesen (Ergebnis: leerer Text, keine Kodierung).
+    Eine Altkodierung wird in die Klassifikation übernommen und mit dem Fingerprint-Cache
+    gespeichert, sodass der nächste Lauf direkt mit ihr dekodiert.
+
+    Returns:
+        (Text, erkannte Kodierung)
+    """
+    rel_path = normalize_path(os.path.relpath(file_path, PROJECT_ROOT))
+    classification = FILE_CLASSIFICATION.get(rel_path, {})
+    if classification.get("is_binary"):
+        LOGGER.debug("ÜBERSPRINGE BINÄRDATEI: %s", rel_path)
+        return "", None
+
+    text, encoding, bytes_read = TEXT_DECODER.read(file_path, classification.get("encoding"))
+    # stat; beim tatsächlichen Lesen zusätzlich open, fstat, read und close
+    INSTRUMENTATION.count_many({COUNTER_BYTES_READ: bytes_read, COUNTER_SYSCALLS: 5 if bytes_read else 1})
+    if classification.get("encoding") == "8bit":
+        classification["encoding"] = encoding
+    return text, encoding
+
+
+def read_text_file(file_path: str) -> str:
+    """Liest eine Textdatei (siehe read_decoded_file) und liefert nur den Text"""
+    return read_decoded_file(file_path)[0]
+
+
+def load_gitignore_rules() -> GitignoreRules:
+    """Liest und kompiliert .gitignore einmal je Lauf (fehlt die Datei: leerer Regelsatz)
+
+    Raises:
+        OSError: .gitignore ist vorhanden, aber nicht lesbar
+    """
+    global GITIGNORE_RULES
+    if GITIGNORE_RULES is None:
+        gitignore_path = os.path.join(PROJECT_ROOT, GITIGNORE_FILE)
+        text = ""
+        if os.path.exists(gitignore_path):
+            try:
+                text, encoding = read_decoded_file(gitignore_path)
+                log_and_print(f"Datei {GITIGNORE_FILE} erfolgreich mit {encoding} gelesen", "debug")
+            except OSError:
+                GITIGNORE_RULES = parse_gitignore("")  # nicht bei jedem Pfad erneut versuchen
+                raise
+        GITIGNORE_RULES = parse_gitignore(text)
+    return GITIGNORE_RULES
 
 
 def create_dirs():
@@ -195,30 +346,28 @@ def check_web_ui(structure_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     # 1. Prüfe web-tool/README.md auf PowerShell-Befehle
     readme_path = os.path.join(PROJECT_ROOT, "web-tool", "README.md")
     if os.path.exists(readme_path):
-        with open(readme_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if "powershell" in content.lower() or "rm -force" in content.lower():
-                issues.append({
-                    "type": "web_ui_issue",
-                    "file": "web-tool/README.md",
-                    "severity": "high",
-                    "description": "PowerShell-Befehle in README.md gefunden",
-                    "suggestion": "Ersetze die README.md mit der korrigierten Version"
-                })
+        content = read_text_file(readme_path)
+        if "powershell" in content.lower() or "rm -force" in content.lower():
+            issues.append({
+                "type": "web_ui_issue",
+                "file": "web-tool/README.md",
+                "severity": "high",
+                "description": "PowerShell-Befehle in README.md gefunden",
+                "suggestion": "Ersetze die README.md mit der korrigierten Version"
+            })
 
     # 2. Prüfe, ob web-tool/index.html korrekt funktioniert
     index_path = os.path.join(PROJECT_ROOT, "web-tool", "index.html")
     if os.path.exists(index_path):
-        with open(index_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if not content.strip().startswith("<!DOCTYPE html>"):
-                issues.append({
-                    "type": "web_ui_issue",
-                    "file": "web-tool/index.html",
-                    "severity": "medium",
-                    "description": "index.html ist keine valide HTML-Datei",
-                    "suggestion": "Ersetze index.html mit der korrigierten Version"
-                })
+        content = read_text_file(index_path)
+        if not content.strip().startswith("<!DOCTYPE html>"):
+            issues.append({
+                "type": "web_ui_issue",
+                "file": "web-tool/index.html",
+                "severity": "medium",
+                "description": "index.html ist keine valide HTML-Datei",
+                "suggestion": "Ersetze index.html mit der korrigierten Version"
+            })
 
     return issues
 
@@ -230,30 +379,28 @@ def check_humanity_index(structure_data: Dict[str, Any]) -> List[Dict[str, Any]]
     # 1. Prüfe, ob Humanity Index in IrsanAI_OS_HW_Detector.py implementiert ist
     detector_path = os.path.join(PROJECT_ROOT, "irsanai-system", "IrsanAI_OS_HW_Detector.py")
     if os.path.exists(detector_path):
-        with open(detector_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if "humanity_index" not in content.lower():
-                issues.append({
-                    "type": "humanity_index_missing",
-                    "file": "irsanai-system/IrsanAI_OS_HW_Detector.py",
-                    "severity": "high",
-                    "description": "Humanity Index nicht in Detektor implementiert",
-                    "suggestion": "Füge Humanity Index-Berechnung hinzu"
-                })
+        content = read_text_file(detector_path)
+        if "humanity_index" not in content.lower():
+            issues.append({
+                "type": "humanity_index_missing",
+                "file": "irsanai-system/IrsanAI_OS_HW_Detector.py",
+                "severity": "high",
+                "description": "Humanity Index nicht in Detektor implementiert",
+                "suggestion": "Füge Humanity Index-Berechnung hinzu"
+            })
 
     # 2. Prüfe, ob HUMAN-AI_SYNERGY.md vorhanden und korrekt formatiert ist
     synergy_path = os.path.join(PROJECT_ROOT, "HUMAN-AI_SYNERGY.md")
     if os.path.exists(synergy_path):
-        with open(synergy_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if "humanity index" not in content.lower():
-                issues.append({
-                    "type": "humanity_index_missing",
-                    "file": "HUMAN-AI_SYNERGY.md",
-                    "severity": "medium",
-                    "description": "Humanity Index nicht in Synergy-Dokumentation erwähnt",
-                    "suggestion": "Füge Humanity Index-Abschnitt hinzu"
-                })
+        content = read_text_file(synergy_path)
+        if "humanity index" not in content.lower():
+            issues.append({
+                "type": "humanity_index_missing",
+                "file": "HUMAN-AI_SYNERGY.md",
+                "severity": "medium",
+                "description": "Humanity Index nicht in Synergy-Dokumentation erwähnt",
+                "suggestion": "Füge Humanity Index-Abschnitt hinzu"
+            })
 
     return issues
 
@@ -273,68 +420,28 @@ def check_gitignore() -> List[Dict[str, Any]]:
         })
         return issues
 
-    # Versuche, die Datei mit verschiedenen Kodierungen zu öffnen
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    gitignore_content = None
+    # Einmal lesen und in einen Regelsatz übersetzen; geprüft wird die Wirkung der Einträge
+    # (Kommentare zählen nicht, "*.log" deckt ".log"-Dateien auf jeder Ebene ab)
+    try:
+        rules = load_gitignore_rules()
+    except OSError as e:
+        issues.append({
+            "type": "gitignore_encoding_error",
+            "file": ".gitignore",
+            "severity": "high",
+            "description": f"Kann .gitignore nicht lesen: {str(e)}",
+            "suggestion": "Prüfe die Zugriffsrechte der .gitignore-Datei"
+        })
+        return issues
 
-    for encoding in encodings:
-        try:
-            with open(gitignore_path, 'r', encoding=encoding) as f:
-                gitignore_content = f.read()
-            log_and_print(f"Datei erfolgreich mit {encoding} geöffnet", "debug")
-            break  # Erfolgreich geöffnet, Schleife verlassen
-        except UnicodeDecodeError:
-            continue  # Mit nächster Kodierung versuchen
-        except Exception as e:
-            log_and_print(f"Fehler beim Öffnen mit {encoding}: {str(e)}", "debug")
-            continue
-
-    # Wenn alle Kodierungsversuche fehlschlagen
-    if gitignore_content is None:
-        try:
-            # Versuche es ohne explizite Kodierung (nutzt Systemstandard)
-            with open(gitignore_path, 'r') as f:
-                gitignore_content = f.read()
-            log_and_print("Datei erfolgreich mit Systemstandard-Kodierung geöffnet", "info")
-        except Exception as e:
-            issues.append({
-                "type": "gitignore_encoding_error",
-                "file": ".gitignore",
-                "severity": "high",
-                "description": f"Kann .gitignore nicht mit unterstützten Kodierungen lesen: {str(e)}",
-                "suggestion": "Speichere .gitignore im UTF-8-Format ohne BOM"
-            })
-            return issues
-
-    # Standard-Regeln, die in .gitignore sein sollten
-    required_patterns = [
-        r'\.idea\/',
-        r'\.vscode\/',
-        r'__pycache__\/',
-        r'\.pytest_cache\/',
-        r'build\/',
-        r'dist\/',
-        r'\.venv\/',
-        r'venv\/',
-        r'\.env',
-        r'\.log$',
-        r'\.tmp$',
-        r'\.swp$',
-        r'\.DS_Store$',
-        r'Thumbs\.db$'
-    ]
-
-    for pattern in required_patterns:
-        # Normalisiere das Muster für die Suche
-        normalized_pattern = pattern.replace(r'\/', r'/').replace(r'\.', r'.')
-        if not re.search(normalized_pattern, gitignore_content):
-            issues.append({
-                "type": "gitignore_incomplete",
-                "file": ".gitignore",
-                "severity": "medium",
-                "description": f"Fehlender Eintrag in .gitignore: {pattern}",
-                "suggestion": f"Füge '{pattern}' zu .gitignore hinzu"
-            })
+    for entry in rules.missing(REQUIRED_GITIGNORE_ENTRIES):
+        issues.append({
+            "type": "gitignore_incomplete",
+            "file": ".gitignore",
+            "severity": "medium",
+            "description": f"Fehlender Eintrag in .gitignore: {entry}",
+            "suggestion": f"Füge '{entry}' zu .gitignore hinzu"
+        })
 
     return issues
 
@@ -346,25 +453,26 @@ def check_pre_selector(structure_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     # 1. Prüfe, ob PRE-Selector System in der Spezifikation dokumentiert ist
     spec_path = os.path.join(PROJECT_ROOT, "lrp-protocol", "LRP_v1.2_Core_Specification.md")
     if os.path.exists(spec_path):
-        with open(spec_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            if "PRE-Selector System" not in content:
-                issues.append({
-                    "type": "pre_selector_missing",
-                    "file": "lrp-protocol/LRP_v1.2_Core_Specification.md",
-                    "severity": "high",
-                    "description": "PRE-Selector System nicht in Spezifikation dokumentiert",
-                    "suggestion": "Füge PRE-Selector System-Abschnitt zur Spezifikation hinzu"
-                })
+        content = read_text_file(spec_path)
+        if "PRE-Selector System" not in content:
+            issues.append({
+                "type": "pre_selector_missing",
+                "file": "lrp-protocol/LRP_v1.2_Core_Specification.md",
+                "severity": "high",
+                "description": "PRE-Selector System nicht in Spezifikation dokumentiert",
+                "suggestion": "Füge PRE-Selector System-Abschnitt zur Spezifikation hinzu"
+            })
 
     return issues
 
 
 def log_and_print(message: str, level: str = "info"):
-    """Loggt Nachrichten konsistent mit Zeitstempel"""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    prefix = f"[{timestamp}] [{level.upper()}]"
-    print(f"{prefix} {message}")
+    """Loggt Nachrichten konsistent mit Zeitstempel (Level-Filter und Ausgabe: irsanai_logging)
+
+    In Schleifen über Dateien stattdessen LOGGER.debug("...%s", wert) verwenden: dann wird
+    die Nachricht nur formatiert, wenn das Level auch ausgegeben wird.
+    """
+    LOGGER.log(LEVELS[level], message)
 
 
 # ======================
@@ -372,33 +480,38 @@ def log_and_print(message: str, level: str = "info"):
 # ======================
 def scan_project_structure() -> Dict[str, Any]:
     """Schritt 1 & 2: Analysiert die Projektstruktur rekursiv"""
+    global FINGERPRINT_CACHE
     log_and_print("Starte Projektstruktur-Analyse", "info")
 
     total_files = 0
     total_dirs = 0
     file_list = []
     dir_list = []
+    hash_jobs = []  # (Dateiinfo, Pfad, Fingerprint)
     file_types = {}
 
-    # Verzeichnisstruktur erfassen
+    # Verzeichnisstruktur erfassen (Ignorier-Prüfung wird zusätzlich als eigene Stufe gemessen)
+    walk_started = time.perf_counter()
+    progress = ProgressReporter("Durchlauf", LOGGER, enabled=PROGRESS_ENABLED)
     for root, dirs, files in os.walk(PROJECT_ROOT):
         # Normiere den aktuellen Pfad
         root = normalize_path(root)
+        INSTRUMENTATION.count(COUNTER_SYSCALLS)  # ein scandir() je Verzeichnis
 
         # Ignorierte Verzeichnisse entfernen
         dirs_to_keep = []
         for d in dirs:
             dir_path = normalize_path(os.path.join(root, d))
-            if not is_ignored(dir_path):
+            if not is_ignored(dir_path, is_dir=True):
                 dirs_to_keep.append(d)
             else:
-                log_and_print(f"IGNORIERE VERZEICHNIS: {dir_path}", "debug")
+                LOGGER.debug("IGNORIERE VERZEICHNIS: %s", dir_path)
         dirs[:] = dirs_to_keep
 
         # Verzeichnisse zählen
         for dir_name in dirs:
             dir_path = normalize_path(os.path.join(root, dir_name))
-            if not is_ignored(dir_path):
+            if not is_ignored(dir_path, is_dir=True):
                 total_dirs += 1
                 rel_path = normalize_path(os.path.relpath(dir_path, PROJECT_ROOT))
                 dir_list.append({
@@ -412,10 +525,10 @@ def scan_project_structure() -> Dict[str, Any]:
 
             # Protokolliere den zu prüfenden Pfad
             rel_path = normalize_path(os.path.relpath(file_path, PROJECT_ROOT))
-            log_and_print(f"PRÜFE DATEI: {rel_path}", "debug")
+            LOGGER.debug("PRÜFE DATEI: %s", rel_path)
 
             if is_ignored(file_path):
-                log_and_print(f"IGNORIERE DATEI: {rel_path}", "debug")
+                LOGGER.debug("IGNORIERE DATEI: %s", rel_path)
                 continue
 
             total_files += 1
@@ -425,23 +538,77 @@ def scan_project_structure() -> Dict[str, Any]:
             # Dateityp zählen
             file_types[ext] = file_types.get(ext, 0) + 1
 
-            # Dateiinformationen sammeln
+            # Dateiinformationen sammeln (Hash und Klassifikation folgen gesammelt nach dem Durchlauf)
             try:
-                file_size = os.path.getsize(file_path)
-                file_hash = get_file_hash(file_path)
-                is_binary = not file_name.endswith(('.txt', '.md', '.json', '.py', '.html', '.js', '.css'))
+                file_stat = os.stat(file_path)
+                INSTRUMENTATION.count(COUNTER_SYSCALLS)
+                file_size = file_stat.st_size
 
-                file_list.append({
+                file_info = {
                     "path": mask_personal_data(rel_path),
                     "name": file_name,
                     "extension": ext,
                     "size_bytes": file_size,
-                    "is_binary": is_binary,
-                    "hash": file_hash
-                })
+                    "is_binary": False,
+                    "encoding": None,
+                    "mime_family": None,
+                    "hash": ""
+                }
+                file_list.append(file_info)
+                # Nur reguläre Dateien lesen (eine FIFO würde das Hashing blockieren)
+                if stat.S_ISREG(file_stat.st_mode):
+                    hash_jobs.append((file_info, file_path, file_fingerprint(file_stat)))
+                progress.update(1, file_size)
             except Exception as e:
                 log_and_print(f"Fehler beim Scannen von {file_path}: {str(e)}", "warning")
 
+    progress.finish()
+    INSTRUMENTATION.add_time(STAGE_WALK, time.perf_counter() - walk_started)
+    INSTRUMENTATION.count(COUNTER_FILES, total_files)
+
+    # Hash und Klassifikation: unveränderte Dateien aus dem Fingerprint-Cache, der Rest in einem
+    # Lesedurchgang je Datei, gebündelt im Thread-Pool (hashlib gibt den GIL frei)
+    with INSTRUMENTATION.stage(STAGE_HASHING):
+        fingerprint_cache = FINGERPRINT_CACHE = FingerprintCache(
+            FINGERPRINT_CACHE_FILE if FINGERPRINT_CACHE_ENABLED else None)
+        FILE_CLASSIFICATION.clear()
+        pending = []
+        for file_info, path, fingerprint in hash_jobs:
+            cached = fingerprint_cache.lookup(file_info["path"], fingerprint)
+            if cached is None:
+                pending.append((file_info, path, fingerprint))
+            else:
+                file_info["hash"], classification = cached
+                file_info.update(is_binary=classification["is_binary"], encoding=classification["encoding"],
+                                 mime_family=classification["mime_family"])
+                FILE_CLASSIFICATION[file_info["path"]] = classification
+        INSTRUMENTATION.count(COUNTER_CACHE_HITS, fingerprint_cache.hits)
+
+        progress = ProgressReporter("Hashing", LOGGER, total_files=len(pending),
+                                    total_bytes=sum(file_info["size_bytes"] for file_info, _, _ in pending),
+                                    enabled=PROGRESS_ENABLED)
+        workers = TUNING["thread_pool_size"]
+        # Bündel klein genug halten, dass auch kleine Projekte alle Threads auslasten
+        batch_size = max(1, min(CLASSIFY_BATCH_SIZE, len(pending) // (workers * 4)))
+        batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 and len(batches) > 1 else None
+        try:
+            batch_paths = [[path for _, path, _ in batch] for batch in batches]
+            results = executor.map(hash_and_classify_batch, batch_paths) if executor \
+                else map(hash_and_classify_batch, batch_paths)
+            for batch, batch_results in zip(batches, results):
+                for (file_info, _, fingerprint), (file_hash, classification) in zip(batch, batch_results):
+                    file_info["hash"] = file_hash
+                    file_info.update(is_binary=classification["is_binary"], encoding=classification["encoding"],
+                                     mime_family=classification["mime_family"])
+                    FILE_CLASSIFICATION[file_info["path"]] = classification
+                    fingerprint_cache.store(file_info["path"], fingerprint, file_hash, classification)
+                progress.update(len(batch), sum(file_info["size_bytes"] for file_info, _, _ in batch))
+        finally:
+            if executor:
+                executor.shutdown()
+        progress.finish()
+
     # Ergebnisse zusammenfassen
     return {
         "project_root": mask_personal_data(PROJECT_ROOT),
@@ -453,6 +620,40 @@ def scan_project_structure() -> Dict[str, Any]:
     }
 
 
+def recommended_files(feedback: Dict[str, Any]) -> Optional[List[str]]:
+    """Vom LLM empfohlene Dateien (normalisiert); None, wenn das Feedback keine Empfehlung enthält"""
+    if "critical_files" not in feedback.get("recommendations", {}):
+        return None
+    return [normalize_path(path) for path in feedback["recommendations"]["critical_files"]]
+
+
+def file_priority(path: str, recommended: Optional[List[str]]) -> Optional[int]:
+    """Rang einer Datei für die Analyse (kleiner = früher); None für nicht priorisierte Dateien
+
+    Mit Feedback zählt die Position in den Empfehlungen, sonst gelten alle Hauptdateien gleich.
+    """
+    path = normalize_path(path)
+    if recommended is not None:
+        # Wenn Feedback vorhanden, priorisiere die empfohlenen Dateien
+        return recommended.index(path) if path in recommended else None
+    # Standardpriorisierung: README.md, dann Haupt-Protokolldateien
+    if "README.md" in path or "LRP_v1.2_Core_Specification.md" in path or "IrsanAI_OS_HW_Detector.py" in path \
+            or ("index.html" in path and "web-tool" in path) or "HUMAN-AI_SYNERGY.md" in path:
+        return 0
+    return None
+
+
+def prioritize_files(files: List[Dict[str, Any]], feedback: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Priorisierte Dateien in Analyse-Reihenfolge (gleicher Rang: Reihenfolge des Scans)"""
+    recommended = recommended_files(feedback)
+    ranked = []
+    for index, file in enumerate(files):
+        priority = file_priority(file["path"], recommended)
+        if priority is not None:
+            ranked.append((priority, index, file))
+    return [file for _, _, file in sorted(ranked, key=lambda entry: entry[:2])]
+
+
 def generate_scan_report(structure_data: Dict[str, Any]) -> Dict[str, Any]:
     """Schritt 3: Erzeugt den maschinenlesbaren Report"""
     log_and_print("Generiere Scan-Report für LLM", "info")
@@ -460,28 +661,29 @@ def generate_scan_report(structure_data: Dict[str, Any]) -> Dict[str, Any]:
     # Feedback vom vorherigen LLM-Durchlauf laden
     feedback = load_feedback()
 
-    # EXTRA PRÜFUNG: Überprüfe explizit die kritischen Dateien
-    critical_file_status = verify_critical_files(structure_data)
+    with INSTRUMENTATION.stage(STAGE_RULES):
+        # EXTRA PRÜFUNG: Überprüfe explizit die kritischen Dateien
+        critical_file_status = verify_critical_files(structure_data)
 
-    # DSGVO-Konformitätsprüfung
-    dsgvo_issues = check_dsgvo_compliance(structure_data)
+        # DSGVO-Konformitätsprüfung
+        dsgvo_issues = check_dsgvo_compliance(structure_data)
 
-    # Web-UI-Validierung
-    web_ui_issues = check_web_ui(structure_data)
+        # Web-UI-Validierung
+        web_ui_issues = check_web_ui(structure_data)
 
-    # Humanity Index-Prüfung
-    humanity_index_issues = check_humanity_index(structure_data)
+        # Humanity Index-Prüfung
+        humanity_index_issues = check_humanity_index(structure_data)
 
-    # .gitignore-Prüfung
-    gitignore_issues = check_gitignore()
+        # .gitignore-Prüfung
+        gitignore_issues = check_gitignore()
 
-    # PRE-Selector System-Prüfung
-    pre_selector_issues = check_pre_selector(structure_data)
+        # PRE-Selector System-Prüfung
+        pre_selector_issues = check_pre_selector(structure_data)
 
     # Analyse der Dateitypen
     critical_files = []
     for file_ext, count in structure_data["file_types"].items():
-        if file_ext in [".py", ".md", ".json", ".js", ".html"]:
+        if file_ext in CRITICAL_EXTENSIONS:
             critical_files.append({
                 "extension": file_ext,
                 "count": count,
@@ -489,26 +691,7 @@ def generate_scan_report(structure_data: Dict[str, Any]) -> Dict[str, Any]:
             })
 
     # Entscheidung, welche Dateien zuerst analysiert werden sollen
-    files_to_analyze_first = []
-    if "critical_files" in feedback.get("recommendations", {}):
-        # Wenn Feedback vorhanden, priorisiere die empfohlenen Dateien
-        for file_path in feedback["recommendations"]["critical_files"]:
-            for file in structure_data["files"]:
-                if normalize_path(file["path"]) == normalize_path(file_path):
-                    files_to_analyze_first.append(file)
-    else:
-        # Standardpriorisierung: README.md, dann Haupt-Protokolldateien
-        for file in structure_data["files"]:
-            if "README.md" in file["path"]:
-                files_to_analyze_first.append(file)
-            elif "LRP_v1.2_Core_Specification.md" in file["path"]:
-                files_to_analyze_first.append(file)
-            elif "IrsanAI_OS_HW_Detector.py" in file["path"]:
-                files_to_analyze_first.append(file)
-            elif "index.html" in file["path"] and "web-tool" in file["path"]:
-                files_to_analyze_first.append(file)
-            elif "HUMAN-AI_SYNERGY.md" in file["path"]:
-                files_to_analyze_first.append(file)
+    files_to_analyze_first = prioritize_files(structure_data["files"], feedback)
 
     # Report-Struktur erstellen
     report = {
@@ -525,7 +708,9 @@ def generate_scan_report(structure_data: Dict[str, Any]) -> Dict[str, Any]:
                 "humanity_index_implemented": len(humanity_index_issues) == 0,
                 "gitignore_complete": len(gitignore_issues) == 0,
                 "pre_selector_documented": len(pre_selector_issues) == 0
-            }
+            },
+            # Stufenzeiten bis einschließlich Regelprüfung (Serialisierung steht in der Scan-Historie)
+            "performance": INSTRUMENTATION.snapshot()
         },
         "project_structure": {
             "file_types": structure_data["file_types"],
@@ -571,11 +756,38 @@ def generate_scan_report(structure_data: Dict[str, Any]) -> Dict[str, Any]:
     return report
 
 
-def save_scan_report(report: Dict[str, Any]):
+def save_file_snapshot(files: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """Schreibt den Datei-Snapshot zum aktuellen Report und vergleicht ihn mit dem vorherigen Scan
+
+    Die Ausgaben des Scanners selbst (REPORT_DIR) ändern sich bei jedem Lauf und bleiben außen vor.
+
+    Returns:
+        Zusammenfassung der Änderungen (None ohne vorherigen Snapshot)
+    """
+    report_prefix = normalize_path(os.path.relpath(REPORT_DIR, PROJECT_ROOT)) + "/"
+    write_snapshot(snapshot_path(CURRENT_SCAN_FILE),
+                   [{"path": f["path"], "hash": f["hash"], "size": f["size_bytes"]}
+                    for f in files if not f["path"].startswith(report_prefix)],
+                   meta={"scanner_version": SCANNER_VERSION})
+    if not os.path.exists(snapshot_path(PREVIOUS_SCAN_FILE)):
+        return None
+    try:
+        # Sortierblöcke nach dem Speicherbudget der Tuning-Hinweise, größere Mengen über Temp-Dateien
+        return diff_to_file(PREVIOUS_SCAN_FILE, CURRENT_SCAN_FILE, SCAN_DIFF_FILE,
+                            chunk_records=chunk_records_for(TUNING["max_in_memory_index_mb"]))
+    except (OSError, ValueError) as e:
+        log_and_print(f"Vergleich mit dem vorherigen Scan fehlgeschlagen: {str(e)}", "warning")
+        return None
+
+
+def save_scan_report(report: Dict[str, Any], files: List[Dict[str, Any]]):
     """Speichert den Report in der richtigen Struktur"""
-    # Aktuellen Scan speichern
-    with open(CURRENT_SCAN_FILE, 'w') as f:
-        json.dump(report, f, indent=2)
+    # Aktuellen Scan speichern, den letzten als Vergleichsbasis aufbewahren
+    with INSTRUMENTATION.stage(STAGE_SERIALIZATION):
+        rotate_report(CURRENT_SCAN_FILE, PREVIOUS_SCAN_FILE)
+        with open(CURRENT_SCAN_FILE, 'w') as f:
+            json.dump(report, f, indent=TUNING["json_indent"])
+        changes = save_file_snapshot(files)
 
     # Scan-Historie aktualisieren
     history = []
@@ -588,28 +800,74 @@ def save_scan_report(report: Dict[str, Any]):
 
     history.append({
         "timestamp": report["scan_metadata"]["timestamp"],
+        "scanner_version": SCANNER_VERSION,
         "file_count": report["scan_metadata"]["total_files"],
         "critical_files": len(report["analysis_request"]["files_to_analyze_first"]),
         "critical_file_status": report["project_structure"]["critical_file_status"],
+        "feedback_timestamp": report["feedback_context"]["feedback_timestamp"],
         "validation_summary": {
             "dsgvo_ok": report["scan_metadata"]["detailed_validation"]["dsgvo_compliance"],
             "web_ui_ok": report["scan_metadata"]["detailed_validation"]["web_ui_valid"],
             "humanity_index_ok": report["scan_metadata"]["detailed_validation"]["humanity_index_implemented"],
             "gitignore_ok": report["scan_metadata"]["detailed_validation"]["gitignore_complete"],
             "pre_selector_ok": report["scan_metadata"]["detailed_validation"]["pre_selector_documented"]
-        }
+        },
+        # Änderungen gegenüber dem vorherigen Scan (Details in scan_diff.ndjson)
+        "changes": changes,
+        # Vollständige Messung inkl. Serialisierung des aktuellen Reports (Regressionsverlauf)
+        "performance": INSTRUMENTATION.snapshot()
     })
 
     with open(SCAN_HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
+        json.dump(history, f, indent=TUNING["json_indent"])
 
     log_and_print(f"Scan-Report gespeichert in: {CURRENT_SCAN_FILE}", "success")
+    if changes is not None:
+        log_and_print(f"Änderungen seit dem letzten Scan: {format_summary(changes)} ({SCAN_DIFF_FILE})", "info")
 
 
 # ======================
 # HAUPTFUNKTION
 # ======================
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Wertet die Kommandozeilenoptionen des Scanners aus"""
+    parser = argparse.ArgumentParser(description="IrsanAI Project Scanner")
+    parser.add_argument("--profile", default=None, metavar="PFAD",
+                        help="Lauf mit cProfile profilieren und pstats-Daten nach PFAD schreiben "
+                             "(Zusammenfassung in PFAD.txt)")
+    parser.add_argument("--log-level", choices=list(LEVELS), default="info",
+                        help="Mindest-Level der Ausgabe; 'debug' zeigt jede geprüfte Datei (Standard: info)")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text",
+                        help="'json' schreibt eine JSON-Zeile je Eintrag (Standard: text)")
+    parser.add_argument("--log-file", default=None, metavar="PFAD",
+                        help="Einträge zusätzlich in diese Datei schreiben")
+    parser.add_argument("--no-progress", action="store_true",
+                        help="Keine Fortschrittsanzeige während Durchlauf und Hashing")
+    parser.add_argument("--respect-gitignore", action="store_true",
+                        help="Zusätzlich alle von .gitignore erfassten Pfade überspringen")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Fingerprint-Cache nicht verwenden: alle Dateien neu hashen und klassifizieren")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Einstiegspunkt: Optionen auswerten, Logging einrichten, Scan ggf. unter cProfile ausführen"""
+    global PROGRESS_ENABLED, FINGERPRINT_CACHE_ENABLED, RESPECT_GITIGNORE, TUNING
+    args = parse_arguments(argv)
+    TUNING = load_tuning_hints(PROJECT_ROOT)
+    listener = setup_logging(LOGGER, level=args.log_level, log_format=args.log_format, log_file=args.log_file)
+    # Bei Debug-Ausgabe pro Datei würde sich die Statuszeile mit den Logzeilen vermischen
+    PROGRESS_ENABLED = not args.no_progress and args.log_level != "debug"
+    FINGERPRINT_CACHE_ENABLED = not args.no_cache
+    RESPECT_GITIGNORE = args.respect_gitignore
+    INSTRUMENTATION.profile_file = args.profile
+    try:
+        profile_call(args.profile, run_scanner)
+    finally:
+        shutdown_logging(listener)
+
+
+def run_scanner():
     """Hauptausführung des Scanners"""
     log_and_print("=" * 60, "info")
     log_and_print("IRSANAI PROJECT SCANNER v2.4 - ROBUST GEGEN KODIERUNGSFEHLER", "info")
@@ -625,8 +883,10 @@ def main():
     # 3. Report generieren
     report = generate_scan_report(structure_data)
 
-    # 4. Report speichern
-    save_scan_report(report)
+    # 4. Report speichern (Fingerprint-Cache erst jetzt: die Prüfungen haben Kodierungen nachgetragen)
+    save_scan_report(report, structure_data["files"])
+    if FINGERPRINT_CACHE:
+        FINGERPRINT_CACHE.save()
 
     # 5. EXTRA PRÜFUNG: Zeige kritische Dateistatus explizit an
     log_and_print("\n" + "=" * 60, "info")
@@ -677,12 +937,13 @@ def main():
     log_and_print(f"Gesamtdateien: {structure_data['total_files']}", "info")
     log_and_print(f"Gesamtverzeichnisse: {structure_data['total_directories']}", "info")
     log_and_print(f"Priorisierte Dateien: {len(report['analysis_request']['files_to_analyze_first'])}", "info")
+    log_and_print(f"Laufzeit je Stufe: {INSTRUMENTATION.stage_summary()}", "info")
     log_and_print(f"Report gespeichert in: {CURRENT_SCAN_FILE}", "success")
     log_and_print("\nNÄCHSTE SCHRITTE:", "info")
-    log_and_print("1. Öffne die Datei .IrsanAI/Reports/current_scan.json", "info")
-    log_and_print("2. Kopiere den gesamten Inhalt in den Chat mit dem LLM", "info")
+    log_and_print("1. Führe 'python llm_payload_builder.py' aus (nur Änderungen seit dem letzten Feedback)", "info")
+    log_and_print("2. Kopiere den Inhalt von .IrsanAI/Reports/llm_payload.json in den Chat mit dem LLM", "info")
     log_and_print("3. Warte auf die online_feedback.json vom LLM", "info")
-    log_and_print("4. Speichere diese im .IrsanAI/Feedback/ Ordner", "info")
+    log_and_print("4. Speichere diese im .IrsanAI/Feedback/ Ordner (bestätigt den gesendeten Stand)", "info")
     log_and_print("5. Führe den Scanner erneut aus, um das Feedback zu nutzen", "info")
     log_and_print("=" * 60, "info")
 
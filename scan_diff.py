@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scan_diff.py
+Version: 1.0
+Beschreibung: Vergleicht zwei Scans des Project Scanners - Dateien und Validierungsergebnisse.
+
+Zu jedem Report X.json schreibt project_scanner.py einen Datei-Snapshot X.files.ndjson:
+eine Kopfzeile, danach eine JSON-Zeile {"path", "hash", "size"} je Datei, sortiert nach dem
+normalisierten Pfad. Vor jedem Scan wird der letzte Stand als previous_scan.json (samt
+Snapshot) aufbewahrt.
+
+Der Vergleich läuft als Datenstrom und hält keinen der beiden Snapshots vollständig im Speicher:
+1. Merge-Join beider Snapshots nach Pfad       -> geändert (gleicher Pfad, anderer Hash)
+2. nur alt / nur neu: extern nach (Hash, Pfad) sortiert (Blöcke von SORT_CHUNK_RECORDS
+   Einträgen, Überlauf in temporäre Dateien) und nach Hash zusammengeführt
+                                               -> verschoben (gleicher Hash), sonst
+                                                  entfernt bzw. hinzugefügt
+3. Validierungsergebnisse der beiden Reports   -> neue/behobene Befunde, geänderte
+                                                  Prüfergebnisse und kritische Dateien
+
+Dateien ohne Hash (nicht lesbar, keine reguläre Datei) gelten nie als verschoben. Wurde eine
+Datei verschoben und zugleich geändert, erscheint sie als entfernt und hinzugefügt.
+
+Ausgabe: eine JSON-Zeile (NDJSON) je Änderung, zuletzt {"summary": {...}}. Geänderte Dateien
+folgen in Pfad-Reihenfolge, Verschiebungen, Entfernungen und Hinzufügungen nach Hash.
+
+Verwendung:
+    python scan_diff.py                                   # previous_scan.json -> current_scan.json
+    python scan_diff.py alt.json neu.json                 # zwei Reports (mit Snapshots daneben)
+    python scan_diff.py alt.files.ndjson neu.files.ndjson --summary-only
+Exit-Code wie bei diff: 0 ohne Änderungen, 1 mit Änderungen, 2 bei Fehlern.
+"""
+
+import os
+import sys
+import json
+import heapq
+import argparse
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".files.ndjson"
+REPORT_DIR = os.path.join(".IrsanAI", "Reports")
+CURRENT_SCAN_NAME = "current_scan.json"
+PREVIOUS_SCAN_NAME = "previous_scan.json"
+DIFF_FILE_NAME = "scan_diff.ndjson"
+SORT_CHUNK_RECORDS = 100000  # Einträge je Sortierblock im Speicher (größere Mengen laufen über Temp-Dateien)
+RECORD_MEMORY_BYTES = 512  # Grober Speicherbedarf eines Eintrags (dict mit Pfad, Hash, Größe)
+
+CHANGE_TYPES = ("added", "removed", "modified", "moved", "validation", "check", "critical_file")
+
+Record = Dict[str, Any]
+
+
+def log(message: str) -> None:
+    """Statusmeldungen gehen nach stderr, damit stdout nur die Änderungen enthält"""
+    print(message, file=sys.stderr)
+
+
+# ======================
+# SNAPSHOTS
+# ======================
+def normalize_record_path(path: str) -> str:
+    """Einheitlicher Schlüssel: "/" als Trenner, ohne führendes "./" und ohne Rand-"/\""""
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.strip("/")
+
+
+def snapshot_path(report_path: str) -> str:
+    """Datei-Snapshot zu einem Report (X.json -> X.files.ndjson)"""
+    base = report_path[:-len(".json")] if report_path.endswith(".json") else report_path
+    return base + SNAPSHOT_SUFFIX
+
+
+def report_path_for(snapshot: str) -> str:
+    """Report zu einem Datei-Snapshot (X.files.ndjson -> X.json)"""
+    base = snapshot[:-len(SNAPSHOT_SUFFIX)] if snapshot.endswith(SNAPSHOT_SUFFIX) else snapshot
+    return base + ".json"
+
+
+def _path_key(record: Record) -> str:
+    return record["path"]
+
+
+def _hash_key(record: Record) -> Tuple[str, str]:
+    return record["hash"], record["path"]
+
+
+class ExternalSorter:
+    """Sortiert beliebig viele Einträge mit etwa chunk_records Einträgen im Speicher
+
+    Volle Blöcke werden sortiert als NDJSON in temp_dir ausgelagert und beim Lesen per
+    heapq.merge zusammengeführt; kleine Mengen bleiben vollständig im Speicher.
+    """
+
+    def __init__(self, key: Callable[[Record], Any], temp_dir: Optional[str] = None,
+                 chunk_records: int = SORT_CHUNK_RECORDS):
+        self.key = key
+        self.temp_dir = temp_dir
+        self.chunk_records = max(1, chunk_records)
+        self.buffer: List[Record] = []
+        self.chunks: List[str] = []
+        self.count = 0
+
+    def add(self, record: Record) -> None:
+        self.buffer.append(record)
+        self.count += 1
+        if len(self.buffer) > self.chunk_records:
+            self._spill()
+
+    def extend(self, records: Iterable[Record]) -> "ExternalSorter":
+        for record in records:
+            self.add(record)
+        return self
+
+    def _spill(self) -> None:
+        self.buffer.sort(key=self.key)
+        fd, path = tempfile.mkstemp(prefix="irsanai_sort_", suffix=".ndjson", dir=self.temp_dir)
+        self.chunks.append(path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for record in self.buffer:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.buffer = []
+
+    @staticmethod
+    def _read_chunk(path: str) -> Iterator[Record]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def __iter__(self) -> Iterator[Record]:
+        """Liefert alle Einträge sortiert; ausgelagerte Blöcke werden danach gelöscht"""
+        self.buffer.sort(key=self.key)
+        if not self.chunks:
+            yield from self.buffer
+            return
+        try:
+            yield from heapq.merge(*(self._read_chunk(path) for path in self.chunks), iter(self.buffer),
+                                   key=self.key)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for path in self.chunks:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.chunks = []
+        self.buffer = []
+
+
+def chunk_records_for(max_memory_mb: int) -> int:
+    """Sortierblockgröße für ein Speicherbudget in MB (diff_files sortiert zwei Mengen gleichzeitig)"""
+    return max(1000, max_memory_mb * 1024 * 1024 // (2 * RECORD_MEMORY_BYTES))
+
+
+def make_record(path: str, file_hash: str, size: int) -> Record:
+    return {"path": normalize_record_path(path), "hash": file_hash or "", "size": size}
+
+
+def write_snapshot(path: str, records: Iterable[Record], meta: Optional[Dict[str, Any]] = None,
+                   temp_dir: Optional[str] = None) -> int:
+    """Schreibt die Einträge nach Pfad sortiert als Snapshot (Temp-Datei + os.replace)
+
+    Eine Liste liegt ohnehin im Speicher und wird dort sortiert, andere Datenströme extern.
+
+    Returns:
+        Anzahl der geschriebenen Einträge
+    """
+    chunk_records = max(SORT_CHUNK_RECORDS, len(records)) if isinstance(records, list) else SORT_CHUNK_RECORDS
+    sorter = ExternalSorter(_path_key, temp_dir or os.path.dirname(os.path.abspath(path)), chunk_records)
+    sorter.extend(make_record(record["path"], record.get("hash", ""), record.get("size", 0))
+                  for record in records)
+    header = {"snapshot_version": SNAPSHOT_VERSION, "sorted_by": "path", **(meta or {})}
+    temp_path = f"{path}.tmp"
+    written = 0
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for record in _unique_paths(sorter, path):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                written += 1
+        os.replace(temp_path, path)
+    except BaseException:
+        sorter.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written
+
+
+def rotate_report(report_path: str, previous_path: str) -> bool:
+    """Bewahrt den letzten Report samt Snapshot unter previous_path auf
+
+    Returns:
+        True, wenn ein Report vorhanden war
+    """
+    if not os.path.exists(report_path):
+        return False
+    os.replace(report_path, previous_path)
+    if os.path.exists(snapshot_path(report_path)):
+        os.replace(snapshot_path(report_path), snapshot_path(previous_path))
+    elif os.path.exists(snapshot_path(previous_path)):
+        os.remove(snapshot_path(previous_path))  # älterer Snapshot gehört nicht zu diesem Report
+    return True
+
+
+def read_snapshot(path: str, temp_dir: Optional[str] = None) -> Tuple[Dict[str, Any], Iterator[Record]]:
+    """Öffnet einen Snapshot
+
+    Returns:
+        (Kopfzeile, Einträge nach Pfad sortiert); unsortierte Snapshots (ohne "sorted_by")
+        werden extern sortiert, ein Pfad-Rücksprung in einem sortierten Snapshot ist ein ValueError.
+    """
+    f = open(path, 'r', encoding='utf-8')
+    first = f.readline()
+    header = json.loads(first) if first.strip() else {}
+    if "snapshot_version" not in header:
+        # Kopfzeile fehlt: die erste Zeile ist bereits ein Eintrag
+        f.seek(0)
+        header = {}
+
+    def records() -> Iterator[Record]:
+        with f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield make_record(record["path"], record.get("hash", ""), record.get("size", 0))
+
+    if header.get("sorted_by") == "path":
+        return header, _unique_paths(records(), path, strict=True)
+    sorter = ExternalSorter(_path_key, temp_dir).extend(records())
+    return header, _unique_paths(sorter, path)
+
+
+def _unique_paths(records: Iterable[Record], source: str, strict: bool = False) -> Iterator[Record]:
+    """Prüft die Pfad-Reihenfolge und verwirft doppelte Pfade (der erste Eintrag gilt)"""
+    previous = None
+    for record in records:
+        if previous is not None and record["path"] <= previous:
+            if record["path"] < previous or strict:
+                raise ValueError(f"{source}: Snapshot nicht nach Pfad sortiert bei '{record['path']}'")
+            continue
+        previous = record["path"]
+        yield record
+
+
+def resolve_source(source: str) -> Tuple[Optional[str], str]:
+    """Report und Snapshot zu einer Angabe (Report X.json oder Snapshot X.files.ndjson)
+
+    Returns:
+        (Report-Pfad oder None, Snapshot-Pfad); ein fehlender Snapshot ist ein FileNotFoundError
+    """
+    if source.endswith(".ndjson"):
+        report, snapshot = report_path_for(source), source
+    else:
+        report, snapshot = source, snapshot_path(source)
+    if not os.path.exists(snapshot):
+        raise FileNotFoundError(f"Kein Datei-Snapshot zu {source} ({snapshot}) - "
+                                f"mit der aktuellen Version von project_scanner.py neu scannen")
+    return (report if os.path.exists(report) else None), snapshot
+
+
+# ======================
+# VERGLEICH
+# ======================
+def diff_files(old_records: Iterable[Record], new_records: Iterable[Record], stats: Dict[str, int],
+               temp_dir: Optional[str] = None, chunk_records: int = SORT_CHUNK_RECORDS) -> Iterator[Record]:
+    """Vergleicht zwei nach Pfad sortierte Datenströme von Einträgen
+
+    stats erhält die Anzahl unveränderter Dateien ("unchanged").
+    """
+    removed = ExternalSorter(_hash_key, temp_dir, chunk_records)
+    added = ExternalSorter(_hash_key, temp_dir, chunk_records)
+    stats.setdefault("unchanged", 0)
+    try:
+        # 1. Merge-Join nach Pfad
+        old_iter, new_iter = iter(old_records), iter(new_records)
+        old, new = next(old_iter, None), next(new_iter, None)
+        while old is not None or new is not None:
+            if new is None or (old is not None and old["path"] < new["path"]):
+                removed.add(old)
+                old = next(old_iter, None)
+            elif old is None or new["path"] < old["path"]:
+                added.add(new)
+                new = next(new_iter, None)
+            else:
+                if old["hash"] == new["hash"] and old["size"] == new["size"]:
+                    stats["unchanged"] += 1
+                else:
+                    yield {"change": "modified", "path": new["path"], "old_hash": old["hash"],
+                           "new_hash": new["hash"], "old_size": old["size"], "new_size": new["size"]}
+                old, new = next(old_iter, None), next(new_iter, None)
+
+        # 2. Nur alt / nur neu nach Hash zusammenführen: gleicher Hash -> verschoben
+        removed_iter, added_iter = iter(removed), iter(added)
+        gone, fresh = next(removed_iter, None), next(added_iter, None)
+        while gone is not None or fresh is not None:
+            if gone is not None and fresh is not None and gone["hash"] and gone["hash"] == fresh["hash"]:
+                # Innerhalb eines Hashes paarweise in Pfad-Reihenfolge
+                yield {"change": "moved", "from": gone["path"], "to": fresh["path"],
+                       "hash": fresh["hash"], "size": fresh["size"]}
+                gone, fresh = next(removed_iter, None), next(added_iter, None)
+            elif fresh is None or (gone is not None and _hash_key(gone) < _hash_key(fresh)):
+                yield {"change": "removed", **gone}
+                gone = next(removed_iter, None)
+            else:
+                yield {"change": "added", **fresh}
+                fresh = next(added_iter, None)
+    finally:
+        removed.close()
+        added.close()
+
+
+def _issue_key(issue: Dict[str, Any]) -> Tuple[str, str]:
+    return issue.get("file", ""), issue.get("description", "")
+
+
+def diff_validation(old_report: Dict[str, Any], new_report: Dict[str, Any]) -> Iterator[Record]:
+    """Änderungen der Validierung: Befunde je Kategorie, Prüfergebnisse, kritische Dateien"""
+    old_checks = old_report.get("scan_metadata", {}).get("detailed_validation", {})
+    new_checks = new_report.get("scan_metadata", {}).get("detailed_validation", {})
+    for check in sorted(set(old_checks) | set(new_checks)):
+        if old_checks.get(check) != new_checks.get(check):
+            yield {"change": "check", "check": check, "old": old_checks.get(check), "new": new_checks.get(check)}
+
+    old_results = old_report.get("project_structure", {}).get("validation_results", {})
+    new_results = new_report.get("project_structure", {}).get("validation_results", {})
+    for category in sorted(set(old_results) | set(new_results)):
+        old_issues = {_issue_key(issue): issue for issue in old_results.get(category, [])}
+        new_issues = {_issue_key(issue): issue for issue in new_results.get(category, [])}
+        for key in sorted(set(old_issues) | set(new_issues)):
+            if key in old_issues and key in new_issues:
+                continue
+            issue = new_issues.get(key) or old_issues[key]
+            yield {"change": "validation", "category": category,
+                   "status": "new" if key in new_issues else "resolved",
+                   "file": issue.get("file", ""), "severity": issue.get("severity", ""),
+                   "description": issue.get("description", "")}
+
+    old_status = {item["path"]: item.get("exists") for item in
+                  old_report.get("project_structure", {}).get("critical_file_status", [])}
+    new_status = {item["path"]: item.get("exists") for item in
+                  new_report.get("project_structure", {}).get("critical_file_status", [])}
+    for path in sorted(set(old_status) | set(new_status)):
+        if old_status.get(path) != new_status.get(path):
+            yield {"change": "critical_file", "path": path,
+                   "old_exists": old_status.get(path), "new_exists": new_status.get(path)}
+
+
+def _load_report(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_scans(old_source: str, new_source: str, stats: Dict[str, int], temp_dir: Optional[str] = None,
+               chunk_records: int = SORT_CHUNK_RECORDS) -> Iterator[Record]:
+    """Alle Änderungen zwischen zwei Scans (Reports oder Snapshots)
+
+    Validierungsänderungen gibt es nur, wenn zu beiden Snapshots der Report vorliegt.
+    """
+    old_report_path, old_snapshot = resolve_source(old_source)
+    new_report_path, new_snapshot = resolve_source(new_source)
+    _, old_records = read_snapshot(old_snapshot, temp_dir)
+    _, new_records = read_snapshot(new_snapshot, temp_dir)
+    yield from diff_files(old_records, new_records, stats, temp_dir, chunk_records)
+
+    old_report, new_report = _load_report(old_report_path), _load_report(new_report_path)
+    if old_report is not None and new_report is not None:
+        yield from diff_validation(old_report, new_report)
+
+
+def write_diff(changes: Iterable[Record], output: Optional[TextIO], stats: Dict[str, int]) -> Dict[str, int]:
+    """Schreibt die Änderungen als NDJSON (output=None: nur zählen) und zuletzt die Zusammenfassung
+
+    Returns:
+        Zusammenfassung: Anzahl je Änderungsart und unveränderte Dateien
+    """
+    summary = {change: 0 for change in CHANGE_TYPES}
+    for change in changes:
+        summary[change["change"]] += 1
+        if output is not None:
+            output.write(json.dumps(change, ensure_ascii=False) + "\n")
+    summary["unchanged"] = stats.get("unchanged", 0)
+    if output is not None:
+        output.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+    return summary
+
+
+def diff_to_file(old_source: str, new_source: str, output_path: str,
+                 temp_dir: Optional[str] = None, chunk_records: int = SORT_CHUNK_RECORDS) -> Dict[str, int]:
+    """Vergleicht zwei Scans und schreibt das Ergebnis nach output_path (Temp-Datei + os.replace)"""
+    stats: Dict[str, int] = {}
+    temp_path = f"{output_path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            summary = write_diff(diff_scans(old_source, new_source, stats, temp_dir, chunk_records), f, stats)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return summary
+
+
+def format_summary(summary: Dict[str, int]) -> str:
+    return (f"{summary['added']} hinzugefügt, {summary['removed']} entfernt, {summary['modified']} geändert, "
+            f"{summary['moved']} verschoben, {summary['unchanged']} unverändert; Validierung: "
+            f"{summary['validation']} Befunde, {summary['check']} Prüfergebnisse, "
+            f"{summary['critical_file']} kritische Dateien")
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vergleicht zwei Scans des IrsanAI Project Scanners")
+    parser.add_argument("old", nargs="?", default=os.path.join(REPORT_DIR, PREVIOUS_SCAN_NAME),
+                        help="Älterer Scan: Report (.json) oder Datei-Snapshot (.files.ndjson) "
+                             "(Standard: previous_scan.json)")
+    parser.add_argument("new", nargs="?", default=os.path.join(REPORT_DIR, CURRENT_SCAN_NAME),
+                        help="Neuerer Scan (Standard: current_scan.json)")
+    parser.add_argument("--output", help="Änderungen (NDJSON) in diese Datei schreiben statt auf stdout")
+    parser.add_argument("--summary-only", action="store_true", help="Nur die Zusammenfassung ausgeben")
+    parser.add_argument("--temp-dir", default=None, help="Verzeichnis für ausgelagerte Sortierblöcke")
+    parser.add_argument("--chunk-records", type=int, default=SORT_CHUNK_RECORDS,
+                        help=f"Einträge je Sortierblock im Speicher (Standard: {SORT_CHUNK_RECORDS})")
+    args = parser.parse_args(argv)
+
+    stats: Dict[str, int] = {}
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        changes = diff_scans(args.old, args.new, stats, args.temp_dir, args.chunk_records)
+        summary = write_diff(changes, None if args.summary_only else output, stats)
+        if args.summary_only:
+            output.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+    except (OSError, ValueError) as e:
+        log(f"[DIFF] Fehler: {e}")
+        return 2
+    finally:
+        if args.output:
+            output.close()
+    log(f"[DIFF] {format_summary(summary)}")
+    return 1 if any(summary[change] for change in CHANGE_TYPES) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
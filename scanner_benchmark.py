@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+scanner_benchmark.py
+Version: 1.0
+Beschreibung: Reproduzierbare Benchmarks für die Scanner auf synthetischen Projektbäumen.
+
+Unterbefehle:
+- generate: erzeugt einen deterministischen Projektbaum (gleicher Seed = gleicher Baum)
+- run:      erzeugt die Bäume der gewählten Fälle und misst je Ziel Laufzeit, Spitzen-RSS,
+            Dateien/s und MB/s; Ergebnis als JSON-Datei
+- compare:  vergleicht zwei Ergebnisdateien und meldet Regressionen (Exit-Code 1); bewertet wird
+            die schnellste Messung je Ziel, und nur wenn sich die Messbereiche nicht überlappen
+
+Gemessene Ziele:
+- project_scanner.scan_project_structure
+- project_scanner.generate_scan_report (Report-Erzeugung auf dem Scan-Ergebnis)
+- scanning_environment.analyze_project_structure
+- github_repo_preparer.analyze_project_structure
+
+Jede Messung läuft in einem eigenen Python-Prozess, damit Spitzen-RSS, Importzustand und
+Caches der Ziele sich nicht gegenseitig beeinflussen.
+
+Beispiele:
+    python scanner_benchmark.py run --cases small,medium --output bench_before.json
+    python scanner_benchmark.py run --output bench_after.json
+    python scanner_benchmark.py compare bench_before.json bench_after.json --threshold 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+# ======================
+# KONFIGURATION
+# ======================
+VERSION = "1.0"
+RESULTS_VERSION = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_FILE = "IrsanAI_benchmark_results.json"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10  # 10 % langsamer bzw. mehr Speicher gilt als Regression
+MIN_SIGNIFICANT_SECONDS = 0.25  # kürzere Messungen schwanken von Lauf zu Lauf um 50 % und mehr
+
+# Größenverteilungen (Log-Normal in Bytes): (mu, sigma, Obergrenze)
+SIZE_PROFILES: Dict[str, Tuple[float, float, int]] = {
+    "small": (7.0, 1.0, 256 * 1024),  # Median ~1 KB
+    "mixed": (8.5, 1.8, 8 * 1024 * 1024),  # Median ~5 KB, lange Verteilungsspitze
+    "large": (13.0, 1.0, 64 * 1024 * 1024)  # Median ~440 KB
+}
+
+# Verzeichnisse aus den IGNORE_PATTERNS der Scanner (scanning_environment und
+# github_repo_preparer prüfen mit re.match und erkennen sie nur auf oberster Ebene)
+IGNORED_DIRECTORIES = ["__pycache__", "build", "dist", ".venv", ".pytest_cache"]
+TEXT_EXTENSIONS = [".py", ".md", ".json", ".js", ".html", ".txt", ".css"]
+BINARY_EXTENSIONS = [".png", ".bin", ".so", ".zip"]
+BINARY_HEADERS = {".png": b"\x89PNG\r\n\x1a\n", ".zip": b"PK\x03\x04"}
+
+# Standardfälle für "run": Name -> Parameter für generate_tree
+BENCHMARK_CASES: Dict[str, Dict[str, Any]] = {
+    "small": {"files": 500, "depth": 3, "size_profile": "small", "ignored_ratio": 0.1, "binary_ratio": 0.1},
+    "medium": {"files": 5000, "depth": 5, "size_profile": "mixed", "ignored_ratio": 0.2, "binary_ratio": 0.2},
+    "deep": {"files": 2000, "depth": 12, "size_profile": "small", "ignored_ratio": 0.1, "binary_ratio": 0.1},
+    "ignored_heavy": {"files": 3000, "depth": 4, "size_profile": "small", "ignored_ratio": 0.6, "binary_ratio": 0.1},
+    "binary_heavy": {"files": 2000, "depth": 4, "size_profile": "mixed", "ignored_ratio": 0.1, "binary_ratio": 0.7},
+    "large_files": {"files": 200, "depth": 2, "size_profile": "large", "ignored_ratio": 0.0, "binary_ratio": 0.3}
+}
+
+# Ziel -> (Modul, Beschreibung)
+BENCHMARK_TARGETS: Dict[str, Tuple[str, str]] = {
+    "project_scanner.scan": ("project_scanner", "scan_project_structure()"),
+    "project_scanner.report": ("project_scanner", "generate_scan_report() auf dem Scan-Ergebnis"),
+    "scanning_environment.analyze": ("scanning_environment", "analyze_project_structure()"),
+    "github_repo_preparer.analyze": ("github_repo_preparer", "analyze_project_structure()")
+}
+
+
+def log_and_print(message: str) -> None:
+    """Fortschrittsmeldungen auf stderr, damit stdout frei für Ergebnisse bleibt"""
+    print(message, file=sys.stderr)
+
+
+# ======================
+# BAUM-GENERATOR
+# ======================
+def _file_size(rng: random.Random, size_profile: str) -> int:
+    mu, sigma, limit = SIZE_PROFILES[size_profile]
+    return max(1, min(limit, int(rng.lognormvariate(mu, sigma))))
+
+
+def _text_content(rng: random.Random, extension: str, size: int) -> bytes:
+    """Textinhalt passender Art; wiederholte Zeilen halten die Erzeugung schnell"""
+    if extension == ".json":
+        line = '  {"id": %d, "name": "entry_%d", "enabled": true},\n'
+    elif extension in (".py", ".js"):
+        line = "value_%d = compute(%d)  # synthetische Zeile\n"
+    elif extension in (".html", ".css"):
+        line = "<div class=\"item-%d\">Eintrag %d</div>\n"
+    else:
+        line = "Zeile %d des synthetischen Dokuments mit Umlauten äöü (%d)\n"
+    seed = rng.randrange(1 << 20)
+    block = "".join(line % (seed + i, i) for i in range(64)).encode('utf-8')
+    repeats = size // len(block) + 1
+    return (block * repeats)[:size]
+
+
+def _binary_content(rng: random.Random, extension: str, size: int) -> bytes:
+    header = BINARY_HEADERS.get(extension, b"")
+    body = rng.randbytes(max(0, size - len(header)))
+    return (header + body)[:size]
+
+
+def generate_tree(target_dir: str, files: int, depth: int, size_profile: str = "mixed",
+                  ignored_ratio: float = 0.1, binary_ratio: float = 0.2, seed: int = 42,
+                  branching: int = 4) -> Dict[str, Any]:
+    """Erzeugt einen deterministischen Projektbaum
+
+    Args:
+        target_dir: Zielverzeichnis (wird angelegt; vorhandener Inhalt bleibt unberührt)
+        files: Gesamtzahl der Dateien
+        depth: maximale Verzeichnistiefe
+        size_profile: Schlüssel aus SIZE_PROFILES
+        ignored_ratio: Anteil der Dateien unterhalb ignorierter Verzeichnisse (__pycache__, build, ...)
+        binary_ratio: Anteil binärer Dateien
+        seed: Startwert des Zufallsgenerators
+        branching: Anzahl der Unterverzeichnisse je Ebene
+
+    Returns:
+        Kennzahlen des Baums (Dateien, Bytes, ignorierte/binäre Dateien, Verzeichnisse)
+    """
+    if size_profile not in SIZE_PROFILES:
+        raise ValueError(f"Unbekanntes Größenprofil: {size_profile} (gültig: {', '.join(SIZE_PROFILES)})")
+    rng = random.Random(seed)
+    stats = {"files": 0, "bytes": 0, "ignored_files": 0, "binary_files": 0, "directories": 0}
+    created_dirs = set()
+
+    for index in range(files):
+        level = rng.randint(0, depth)
+        parts = [f"pkg_{rng.randrange(branching)}" for _ in range(level)]
+        ignored = rng.random() < ignored_ratio
+        if ignored:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(IGNORED_DIRECTORIES))
+        binary = rng.random() < binary_ratio
+        extension = rng.choice(BINARY_EXTENSIONS if binary else TEXT_EXTENSIONS)
+        size = _file_size(rng, size_profile)
+
+        directory = os.path.join(target_dir, *parts)
+        if directory not in created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            created_dirs.add(directory)
+        content = _binary_content(rng, extension, size) if binary else _text_content(rng, extension, size)
+        with open(os.path.join(directory, f"file_{index:06d}{extension}"), 'wb') as f:
+            f.write(content)
+
+        stats["files"] += 1
+        stats["bytes"] += size
+        stats["ignored_files"] += ignored
+        stats["binary_files"] += binary
+
+    stats["directories"] = len({d for path in created_dirs for d in _parents(path, target_dir)})
+    return stats
+
+
+def _parents(path: str, root: str) -> List[str]:
+    """Alle Verzeichnisse zwischen root (exklusiv) und path (inklusiv)"""
+    parents = []
+    while path != root and path.startswith(root):
+        parents.append(path)
+        path = os.path.dirname(path)
+    return parents
+
+
+# ======================
+# MESSUNG (WORKER-PROZESS)
+# ======================
+def peak_rss_mb() -> Optional[float]:
+    """Spitzen-RSS des aktuellen Prozesses in MB (None, wenn nicht ermittelbar)"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: Bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_worker(target: str, tree: str) -> Dict[str, Any]:
+    """Führt ein Ziel einmal im aktuellen Prozess aus und misst es
+
+    project_scanner ermittelt PROJECT_ROOT beim Import aus dem Arbeitsverzeichnis; der
+    Aufrufer startet den Worker daher mit cwd=tree. Die Konsolenausgaben der Ziele werden
+    verworfen, stdout enthält nur das Ergebnis.
+    """
+    import contextlib
+    import importlib
+
+    module_name = BENCHMARK_TARGETS[target][0]
+    sys.path.insert(0, SCRIPT_DIR)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        import_started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_seconds = time.perf_counter() - import_started
+        rss_before = peak_rss_mb()
+
+        if target == "project_scanner.report":
+            structure_data = module.scan_project_structure()
+            started = time.perf_counter()
+            module.generate_scan_report(structure_data)
+        elif target == "project_scanner.scan":
+            started = time.perf_counter()
+            module.scan_project_structure()
+        else:
+            started = time.perf_counter()
+            module.analyze_project_structure(os.path.abspath(tree))
+        wall_seconds = time.perf_counter() - started
+
+    return {
+        "wall_seconds": wall_seconds,
+        "import_seconds": round(import_seconds, 6),
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_after_import_mb": rss_before
+    }
+
+
+def measure_target(target: str, tree: str, repeat: int, scratch_dir: str) -> Dict[str, Any]:
+    """Misst ein Ziel repeat-mal in frischen Prozessen; Kennzahl ist der Median
+
+    Die GitHub-Scanner legen beim Import eine Log-Datei im Arbeitsverzeichnis an; sie
+    laufen daher in scratch_dir, damit der Baum für alle Ziele identisch bleibt.
+    """
+    cwd = tree if BENCHMARK_TARGETS[target][0] == "project_scanner" else scratch_dir
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "_worker", "--target", target, "--tree", tree],
+            cwd=cwd, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+        )
+        if result.returncode != 0:
+            last_line = (result.stderr.strip().splitlines() or ["unbekannter Fehler"])[-1]
+            return {"error": last_line}
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    walls = sorted(run["wall_seconds"] for run in runs)
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "wall_seconds": round(walls[len(walls) // 2], 6),
+        "wall_seconds_min": round(walls[0], 6),
+        "wall_seconds_runs": [round(value, 6) for value in walls],
+        "peak_rss_mb": max(rss) if rss else None,
+        "rss_after_import_mb": runs[0]["rss_after_import_mb"],
+        "import_seconds": runs[0]["import_seconds"]
+    }
+
+
+# ======================
+# UNTERBEFEHLE
+# ======================
+def command_generate(args: argparse.Namespace) -> int:
+    stats = generate_tree(args.output, args.files, args.depth, args.size_profile,
+                          args.ignored_ratio, args.binary_ratio, args.seed)
+    log_and_print(f"[GENERATE] {stats['files']} Dateien ({stats['bytes'] / (1024 * 1024):.1f} MB, "
+                  f"{stats['ignored_files']} ignoriert, {stats['binary_files']} binär) in {args.output}")
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+def command_run(args: argparse.Namespace) -> int:
+    case_names = parse_list(args.cases, BENCHMARK_CASES, "Fälle")
+    targets = parse_list(args.targets, BENCHMARK_TARGETS, "Ziele")
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="irsanai_bench_")
+    scratch_dir = os.path.join(work_dir, "_cwd")
+    os.makedirs(scratch_dir, exist_ok=True)
+    results = {
+        "results_version": RESULTS_VERSION,
+        "benchmark_version": VERSION,
+        "created": datetime.now().isoformat(),
+        "system": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "cases": {}
+    }
+
+    try:
+        for case_name in case_names:
+            params = BENCHMARK_CASES[case_name]
+            tree = os.path.join(work_dir, case_name)
+            if os.path.exists(tree):
+                shutil.rmtree(tree)
+            stats = generate_tree(tree, seed=args.seed, **params)
+            log_and_print(f"[RUN] Fall '{case_name}': {stats['files']} Dateien, "
+                          f"{stats['bytes'] / (1024 * 1024):.1f} MB")
+
+            case_results = {}
+            for target in targets:
+                measurement = measure_target(target, tree, args.repeat, scratch_dir)
+                if "error" not in measurement:
+                    # Durchsatz bezogen auf den gesamten Baum (inkl. ignorierter Dateien)
+                    wall = max(measurement["wall_seconds"], 1e-9)
+                    measurement["files_per_second"] = round(stats["files"] / wall, 1)
+                    measurement["mb_per_second"] = round(stats["bytes"] / (1024 * 1024) / wall, 2)
+                    log_and_print(f"  {target}: {measurement['wall_seconds']:.3f}s, "
+                                  f"{measurement['files_per_second']:.0f} Dateien/s, "
+                                  f"Spitzen-RSS {measurement['peak_rss_mb']} MB")
+                else:
+                    log_and_print(f"  {target}: FEHLER {measurement['error']}")
+                case_results[target] = measurement
+            results["cases"][case_name] = {"tree": dict(params, seed=args.seed), "stats": stats,
+                                           "results": case_results}
+    finally:
+        if not args.keep_trees and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    log_and_print(f"[RUN] Ergebnisse gespeichert in: {args.output}")
+    return 0
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float) -> List[Dict[str, Any]]:
+    """Vergleicht zwei Ergebnisdateien je Fall und Ziel
+
+    Verglichen wird die schnellste Messung (am wenigsten von Störungen betroffen). Eine
+    Zeit-Regression liegt nur vor, wenn sie die Schwelle überschreitet, die Messungen lang
+    genug sind und sich die Bereiche der Einzelmessungen nicht überlappen.
+
+    Returns:
+        Eine Zeile je gemeinsamer Messung mit Verhältnissen und Regressions-Flag
+    """
+    rows = []
+    for case_name, case in current.get("cases", {}).items():
+        base_case = baseline.get("cases", {}).get(case_name)
+        if not base_case:
+            continue
+        for target, result in case["results"].items():
+            base = base_case["results"].get(target)
+            if not base or "error" in base or "error" in result:
+                continue
+            base_runs = base.get("wall_seconds_runs") or [base["wall_seconds"]]
+            current_runs = result.get("wall_seconds_runs") or [result["wall_seconds"]]
+            base_seconds = base.get("wall_seconds_min", min(base_runs))
+            current_seconds = result.get("wall_seconds_min", min(current_runs))
+            time_ratio = current_seconds / max(base_seconds, 1e-9)
+            rss_ratio = None
+            if base.get("peak_rss_mb") and result.get("peak_rss_mb"):
+                rss_ratio = result["peak_rss_mb"] / base["peak_rss_mb"]
+            # Sehr kurze Messungen schwanken stärker als jede Schwelle
+            significant = max(base_seconds, current_seconds) >= MIN_SIGNIFICANT_SECONDS
+            separated = current_seconds > max(base_runs)
+            rows.append({
+                "case": case_name,
+                "target": target,
+                "baseline_seconds": base_seconds,
+                "current_seconds": current_seconds,
+                "time_ratio": round(time_ratio, 3),
+                "rss_ratio": round(rss_ratio, 3) if rss_ratio is not None else None,
+                "significant": significant,
+                "time_regression": significant and separated and time_ratio > 1 + threshold,
+                "rss_regression": rss_ratio is not None and rss_ratio > 1 + threshold
+            })
+    return rows
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    if baseline.get("system") != current.get("system"):
+        log_and_print("[COMPARE] Hinweis: Ergebnisse stammen von unterschiedlichen Systemen")
+    rows = compare_results(baseline, current, args.threshold)
+    regressions = [row for row in rows if row["time_regression"] or row["rss_regression"]]
+
+    print(f"{'Fall':<16} {'Ziel':<30} {'Min. Basis':>10} {'Min. Akt.':>12} {'Zeit':>7} {'RSS':>7}")
+    for row in rows:
+        flag = "  REGRESSION" if row in regressions else ("" if row["significant"] else "  (zu kurz)")
+        rss = f"{row['rss_ratio']:.2f}x" if row["rss_ratio"] is not None else "-"
+        print(f"{row['case']:<16} {row['target']:<30} {row['baseline_seconds']:>10.3f} "
+              f"{row['current_seconds']:>12.3f} {row['time_ratio']:>6.2f}x {rss:>7}{flag}")
+    log_and_print(f"[COMPARE] {len(rows)} Messungen verglichen, {len(regressions)} Regression(en) "
+                  f"(Schwelle {args.threshold:.0%}, Zeiten unter {MIN_SIGNIFICANT_SECONDS}s werden nicht bewertet)")
+    return 1 if regressions else 0
+
+
+# ======================
+# HAUPTFUNKTION
+# ======================
+def parse_list(value: Optional[str], registry: Dict[str, Any], label: str) -> List[str]:
+    """Kommagetrennte Auswahl aus einer Registry; None/"all" = alle"""
+    if not value or value == "all":
+        return list(registry)
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        raise SystemExit(f"Unbekannte {label}: {', '.join(unknown)} (gültig: {', '.join(registry)})")
+    return names
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="IrsanAI Scanner-Benchmarks auf synthetischen Projektbäumen")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Deterministischen Projektbaum erzeugen")
+    generate.add_argument("--output", required=True, metavar="VERZEICHNIS")
+    generate.add_argument("--files", type=int, default=1000)
+    generate.add_argument("--depth", type=int, default=4)
+    generate.add_argument("--size-profile", choices=list(SIZE_PROFILES), default="mixed")
+    generate.add_argument("--ignored-ratio", type=float, default=0.1)
+    generate.add_argument("--binary-ratio", type=float, default=0.2)
+    generate.add_argument("--seed", type=int, default=42)
+
+    run = subparsers.add_parser("run", help="Fälle erzeugen und alle Ziele messen")
+    run.add_argument("--cases", default=None, metavar="LISTE",
+                     help=f"Kommagetrennt aus {', '.join(BENCHMARK_CASES)} (Standard: alle)")
+    run.add_argument("--targets", default=None, metavar="LISTE",
+                     help=f"Kommagetrennt aus {', '.join(BENCHMARK_TARGETS)} (Standard: alle)")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                     help=f"Messungen je Ziel; Kennzahl ist der Median, compare nutzt die schnellste "
+                          f"(Standard: {DEFAULT_REPEAT})")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--output", default=DEFAULT_RESULTS_FILE, metavar="PFAD")
+    run.add_argument("--work-dir", default=None, metavar="VERZEICHNIS",
+                     help="Bäume hier anlegen und behalten (Standard: temporär, wird gelöscht)")
+    run.add_argument("--keep-trees", action="store_true", help="Temporäre Bäume nicht löschen")
+
+    compare = subparsers.add_parser("compare", help="Zwei Ergebnisdateien vergleichen")
+    compare.add_argument("baseline", metavar="BASIS")
+    compare.add_argument("current", metavar="AKTUELL")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help=f"Zulässige relative Verschlechterung (Standard: {DEFAULT_THRESHOLD})")
+
+    worker = subparsers.add_parser("_worker")
+    worker.add_argument("--target", required=True, choices=list(BENCHMARK_TARGETS))
+    worker.add_argument("--tree", required=True)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "repeat", 1) < 1:
+        parser.error("--repeat muss mindestens 1 sein")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    if args.command == "_worker":
+        print(json.dumps(run_worker(args.target, args.tree)))
+        return 0
+    if args.command == "generate":
+        return command_generate(args)
+    if args.command == "run":
+        return command_run(args)
+    return command_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
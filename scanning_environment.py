@@ -21,10 +21,21 @@ import os
 import sys
 import json
 import re
+import time
+import argparse
 import logging
 import hashlib  # HIER IST DER FEHLENDE IMPORT!
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
+
+from irsanai_tuning import load_tuning_hints, DEFAULT_TUNING
+from irsanai_fileio import PreviewExtractor
+from irsanai_classify import UNREADABLE_CLASSIFICATION
+from irsanai_gitignore import load_gitignore
+from irsanai_instrumentation import (
+    Instrumentation, profile_call, STAGE_WALK, STAGE_IGNORE, STAGE_HASHING, STAGE_PREVIEW, STAGE_RULES,
+    STAGE_SERIALIZATION, COUNTER_FILES, COUNTER_BYTES_READ, COUNTER_REGEX, COUNTER_SYSCALLS
+)
 
 # ======================
 # KONFIGURATION
@@ -32,6 +43,11 @@ from typing import Dict, Any, List, Tuple
 VERSION = "1.0"
 SCAN_REPORT_FILE = "IrsanAI_project_scan_report.json"
 LOG_FILE = "IrsanAI_scanner.log"
+# Performance-Parameter aus dem "tuning"-Abschnitt von IrsanAI_env_report.json; main() lädt sie,
+# bis dahin (z.B. beim bloßen Import) gelten die Standardwerte
+TUNING: Dict[str, Any] = dict(DEFAULT_TUNING)
+# Stufenzeiten und Zähler dieses Laufs (Abschnitt "performance" im Report)
+INSTRUMENTATION = Instrumentation("scanning_environment", VERSION)
 ANONYMIZATION_SALT = "irsanai_scanner_salt_2023"
 
 # ======================
@@ -74,6 +90,7 @@ def mask_personal_data(path: str) -> str:
     return path
 
 
+@INSTRUMENTATION.timed(STAGE_HASHING)
 def anonymize_path(path: str) -> str:
     """Anonymisiert einen Pfad durch Hashing mit Salt"""
     combined = f"{path}{ANONYMIZATION_SALT}".encode('utf-8')
@@ -83,8 +100,13 @@ def anonymize_path(path: str) -> str:
 # ======================
 # UMGEBUNGSANALYSE
 # ======================
-def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
-    """Analysiert die Projektstruktur und erstellt einen Report"""
+def analyze_project_structure(root_dir: str, respect_gitignore: bool = False) -> Dict[str, Any]:
+    """Analysiert die Projektstruktur und erstellt einen Report
+
+    Args:
+        root_dir: Projektwurzel
+        respect_gitignore: von .gitignore erfasste Pfade zusätzlich als ignoriert zählen
+    """
     log_and_print(f"[SCAN] Analysiere Projektstruktur: {root_dir}")
 
     # Maskiere den Projekt-Root für den Report
@@ -180,6 +202,14 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
         r'^lrp-protocol\/.*'
     ]
 
+    # Einträge, die .gitignore abdecken muss (in .gitignore-Schreibweise)
+    REQUIRED_GITIGNORE_ENTRIES = [
+        "*.pyc", "__pycache__/", ".idea/", ".venv/",
+        "*.log", "*.tmp", "*.bak", "*.backup", "*.old", ".DS_Store"
+    ]
+    # .gitignore einmal je Lauf einlesen (rule_005 und --respect-gitignore)
+    gitignore_rules = load_gitignore(root_dir)
+
     # IrsanAI-spezifische Regeln für die Bewertung
     IRSANAI_RULES = [
         {
@@ -199,11 +229,9 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             "name": "Korrekte .gitignore",
             "description": ".gitignore sollte kritische Einträge enthalten",
             "pattern": r'^\.gitignore$',
-            "check_func": lambda path, is_dir, content: not is_dir and all(
-                pattern in content for pattern in [
-                    "*.pyc", "__pycache__", ".idea", ".venv",
-                    "*.log", "*.tmp", "*.bak", "*.backup", "*.old", ".DS_Store"
-                ]
+            # Geprüft wird die Wirkung des einmal eingelesenen Regelsatzes (Kommentare zählen nicht)
+            "check_func": lambda path, is_dir, content: not is_dir and (
+                    gitignore_rules is None or not gitignore_rules.missing(REQUIRED_GITIGNORE_ENTRIES)
             ),
             "severity": "error",
             "recommendation": "Erweitere .gitignore mit kritischen Einträgen"
@@ -213,18 +241,35 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             "name": "Keine IDE-spezifischen Dateien",
             "description": "Keine IDE-spezifischen Dateien im Repository",
             "pattern": r'.*',
-            "check_func": lambda path, is_dir, content: not any(
-                re.match(pattern, path) for pattern in IGNORE_PATTERNS
-            ),
+            "check_func": lambda path, is_dir, content: not is_ignored(path),
             "severity": "error",
             "recommendation": "Entferne IDE-spezifische Dateien"
         }
     ]
 
+    @INSTRUMENTATION.timed(STAGE_IGNORE)
+    def is_ignored(rel_path: str) -> bool:
+        """Prüft einen relativen Pfad gegen IGNORE_PATTERNS"""
+        for evaluated, pattern in enumerate(IGNORE_PATTERNS, 1):
+            if re.match(pattern, rel_path):
+                INSTRUMENTATION.count(COUNTER_REGEX, evaluated)
+                return True
+        INSTRUMENTATION.count(COUNTER_REGEX, len(IGNORE_PATTERNS))
+        return False
+
+    def is_excluded(rel_path: str, is_dir: bool) -> bool:
+        """Ausschluss im Durchlauf: IGNORE_PATTERNS, mit respect_gitignore zusätzlich .gitignore"""
+        if is_ignored(rel_path):
+            return True
+        return bool(respect_gitignore and gitignore_rules and gitignore_rules.match(rel_path, is_dir))
+
     directory_structure = {}
     file_analysis = {}
+    preview_extractor = PreviewExtractor(TUNING["preview_bytes"])
 
+    walk_started = time.perf_counter()
     for dirpath, dirnames, filenames in os.walk(root_dir):
+        INSTRUMENTATION.count(COUNTER_SYSCALLS)  # ein scandir() je Verzeichnis
         # Berechne relativen Pfad für die Struktur
         rel_path = os.path.relpath(dirpath, root_dir)
         if rel_path == ".":
@@ -236,11 +281,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             rel_dir_path = os.path.join(rel_path, dirname) if rel_path else dirname
 
             # Prüfe auf Ignorierung
-            ignore = False
-            for pattern in IGNORE_PATTERNS:
-                if re.match(pattern, rel_dir_path):
-                    ignore = True
-                    break
+            ignore = is_excluded(rel_dir_path, True)
 
             if not ignore:
                 # Füge zum Verzeichnisbaum hinzu
@@ -259,11 +300,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
             rel_file_path = os.path.join(rel_path, filename) if rel_path else filename
 
             # Prüfe auf Ignorierung
-            ignore = False
-            for pattern in IGNORE_PATTERNS:
-                if re.match(pattern, rel_file_path):
-                    ignore = True
-                    break
+            ignore = is_excluded(rel_file_path, False)
 
             if not ignore:
                 # Zähle Dateitypen
@@ -274,29 +311,34 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 # Analysiere Dateiinhalt
                 try:
                     file_size = os.path.getsize(full_path)
+                    INSTRUMENTATION.count(COUNTER_SYSCALLS)
                     anonymized_id = anonymize_path(full_path)
 
-                    # Nur kleine Dateien analysieren, um Performance zu gewährleisten
-                    content_preview = ""
-                    if file_size < 10000:  # Nur Dateien < 10KB
-                        try:
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read(500)  # Nur die ersten 500 Zeichen
-                                content_preview = content.replace('\n', ' ').strip()
-                                if len(content) > 500:
-                                    content_preview += "..."
-                        except:
-                            pass
+                    # Preview und Klassifikation aus denselben Kopfbytes: konstante Kosten je Datei
+                    preview_started = time.perf_counter()
+                    try:
+                        content_preview, head_bytes, classification = preview_extractor.extract(full_path, file_size)
+                        # open, read und close
+                        INSTRUMENTATION.count_many({COUNTER_BYTES_READ: head_bytes,
+                                                    COUNTER_SYSCALLS: 3 if head_bytes else 0})
+                    except OSError:
+                        content_preview, classification = "", UNREADABLE_CLASSIFICATION
+                    INSTRUMENTATION.add_time(STAGE_PREVIEW, time.perf_counter() - preview_started)
 
                     file_analysis[rel_file_path] = {
                         "type": "Unbekannt",
                         "size": file_size,
                         "anonymized_id": anonymized_id,
-                        "content_preview": content_preview
+                        "content_preview": content_preview,
+                        "is_binary": classification["is_binary"],
+                        "encoding": classification["encoding"],
+                        "mime_family": classification["mime_family"]
                     }
 
-                    # Bestimme Dateityp basierend auf Inhalt
-                    if filename.endswith('.py'):
+                    # Bestimme Dateityp basierend auf Inhalt (Binärdateien nach erkanntem Format)
+                    if classification["is_binary"]:
+                        file_analysis[rel_file_path]["type"] = f"Binär ({classification['format']})"
+                    elif filename.endswith('.py'):
                         file_analysis[rel_file_path]["type"] = "Python"
                     elif filename.endswith('.md'):
                         file_analysis[rel_file_path]["type"] = "Markdown"
@@ -306,7 +348,7 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                         file_analysis[rel_file_path]["type"] = "HTML"
                     elif filename.endswith('.js'):
                         file_analysis[rel_file_path]["type"] = "JavaScript"
-                    elif filename.endswith('.txt'):
+                    elif filename.endswith('.txt') or classification["format"] == "text":
                         file_analysis[rel_file_path]["type"] = "Text"
                 except Exception as e:
                     log_and_print(f"[SCAN] Fehler bei Dateianalyse {rel_file_path}: {str(e)}", "warning")
@@ -314,8 +356,11 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 ignored_files += 1
 
     total_directories = sum(1 for _, dirnames, _ in os.walk(root_dir) for _ in dirnames)
+    INSTRUMENTATION.add_time(STAGE_WALK, time.perf_counter() - walk_started)
+    INSTRUMENTATION.count(COUNTER_FILES, total_files)
 
     # Prüfe Regeln
+    rules_started = time.perf_counter()
     rule_violations = []
     for rule in IRSANAI_RULES:
         if re.match(rule["pattern"], ""):  # Prüfe auf Root-Verzeichnis
@@ -329,14 +374,21 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                 })
         else:
             for dirpath, _, filenames in os.walk(root_dir):
+                INSTRUMENTATION.count(COUNTER_SYSCALLS)  # ein scandir() je Verzeichnis
                 for filename in filenames:
                     full_path = os.path.join(dirpath, filename)
                     rel_path = os.path.relpath(full_path, root_dir)
 
+                    INSTRUMENTATION.count(COUNTER_REGEX)
                     if re.match(rule["pattern"], rel_path):
                         try:
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
+                            # Dateiinhalt nur für Regeln lesen, die ihn auswerten; Binärdateien nie
+                            content = ""
+                            if rule.get("needs_content") and not file_analysis.get(rel_path, {}).get("is_binary"):
+                                with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                                    content = f.read()
+                                    INSTRUMENTATION.count_many({COUNTER_BYTES_READ: os.fstat(f.fileno()).st_size,
+                                                                COUNTER_SYSCALLS: 4})
                             if not rule["check_func"](rel_path, False, content):
                                 rule_violations.append({
                                     "rule_id": rule["id"],
@@ -348,6 +400,8 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
                         except:
                             pass
 
+    INSTRUMENTATION.add_time(STAGE_RULES, time.perf_counter() - rules_started)
+
     # Erstelle Recommendations
     recommendations = {
         "gitignore_entries": [".idea/", "IrsanAI_github_optimizer.log"],
@@ -382,7 +436,9 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
         "suspicious_files": suspicious_files,
         "recommendations": recommendations,
         "directory_structure": directory_structure,
-        "file_analysis": file_analysis
+        "file_analysis": file_analysis,
+        # Stufenzeiten und Zähler der Analyse (Serialisierung steht im Log)
+        "performance": INSTRUMENTATION.snapshot()
     }
 
     return report
@@ -391,7 +447,27 @@ def analyze_project_structure(root_dir: str) -> Dict[str, Any]:
 # ======================
 # HAUPTFUNKTION
 # ======================
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Wertet die Kommandozeilenoptionen aus"""
+    parser = argparse.ArgumentParser(description="IrsanAI Project Scanner (GitHub-Vorbereitung)")
+    parser.add_argument("--profile", default=None, metavar="PFAD",
+                        help="Lauf mit cProfile profilieren und pstats-Daten nach PFAD schreiben "
+                             "(Zusammenfassung in PFAD.txt)")
+    parser.add_argument("--respect-gitignore", action="store_true",
+                        help="Von .gitignore erfasste Pfade zusätzlich als ignoriert zählen")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Einstiegspunkt: Optionen auswerten, Lauf ggf. unter cProfile ausführen"""
+    global TUNING
+    args = parse_arguments(argv)
+    TUNING = load_tuning_hints()
+    INSTRUMENTATION.profile_file = args.profile
+    profile_call(args.profile, run_scanner, args.respect_gitignore)
+
+
+def run_scanner(respect_gitignore: bool = False):
     """Hauptausführung des Skripts"""
     log_and_print("=" * 60)
     log_and_print("IrsanAI PROJECT SCANNER v1.0")
@@ -403,11 +479,12 @@ def main():
     try:
         # Analysiere Projektstruktur
         log_and_print(f"[SCAN] Starte Analyse des Projekts: {project_root}")
-        report = analyze_project_structure(project_root)
+        report = analyze_project_structure(project_root, respect_gitignore)
 
         # Speichere Report
-        with open(SCAN_REPORT_FILE, 'w') as f:
-            json.dump(report, f, indent=2)
+        with INSTRUMENTATION.stage(STAGE_SERIALIZATION):
+            with open(SCAN_REPORT_FILE, 'w') as f:
+                json.dump(report, f, indent=TUNING["json_indent"])
 
         log_and_print(f"\n[REPORT] Erfolgreich! Scan-Report gespeichert in: {SCAN_REPORT_FILE}")
 
@@ -419,6 +496,7 @@ def main():
         log_and_print(f"Gesamtverzeichnisse: {report['total_directories']}")
         log_and_print(f"Ignorierte Dateien: {report['ignored_files']}")
         log_and_print(f"Ignorierte Verzeichnisse: {report['ignored_directories']}")
+        log_and_print(f"Laufzeit je Stufe: {INSTRUMENTATION.stage_summary()}")
 
         if report['recommendations']['rule_violations']:
             log_and_print("\nGEFUNDENE REGELVERSTÖSSE:")
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""Gemeinsame Einstellungen der Tests: Root-Skripte und irsanai-system importierbar machen"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYSTEM_DIR = os.path.join(REPO_ROOT, "irsanai-system")
+
+for path in (REPO_ROOT, SYSTEM_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
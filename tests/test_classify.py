@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Text/Binär-Klassifikation aus den Kopfbytes (irsanai_classify.classify_head)"""
+
+import bz2
+import codecs
+
+import pytest
+
+from irsanai_classify import classify_head
+
+
+def _classify(head, file_size=None):
+    return classify_head(head, len(head) if file_size is None else file_size)
+
+
+@pytest.mark.parametrize("head", [
+    b"ID3 tags are parsed here\n",
+    b"BZh is a prefix\n",
+    b"GIF89a and GIF87a are both supported\n",
+    b"OggS, fLaC and OTTO appear in this README\n",
+    "wOFF/wOF2 Schriften für die Weboberfläche\n".encode("utf-8"),
+])
+def test_printable_signature_in_text_is_text(head):
+    result = _classify(head)
+    assert not result["is_binary"]
+    assert result["format"] == "text"
+
+
+@pytest.mark.parametrize("head, file_format", [
+    (b"ID3\x04\x00\x00\x00\x00\x01\x00", "mp3"),
+    (bz2.compress(b"IrsanAI " * 64), "bzip2"),
+    (b"GIF89a\x10\x00\x10\x00\x80\x00\x00", "gif"),
+    (b"fLaC\x00\x00\x00\x22\x10\x00", "flac"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "png"),
+    (b"\x00\x00\x00\x20ftypisom", "mp4"),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+])
+def test_magic_signatures(head, file_format):
+    result = _classify(head)
+    assert result["is_binary"]
+    assert result["format"] == file_format
+
+
+def test_byte_order_mark_wins():
+    result = _classify(codecs.BOM_UTF16_LE + "Hallo".encode("utf-16-le"))
+    assert (result["is_binary"], result["encoding"]) == (False, "utf-16-le")
+
+
+def test_text_encodings():
+    assert _classify(b"plain ascii\n")["encoding"] == "ascii"
+    assert _classify("Grüße\n".encode("utf-8"))["encoding"] == "utf-8"
+    assert _classify("Grüße\n".encode("cp1252"))["encoding"] == "8bit"
+
+
+def test_truncated_utf8_character_at_end_of_head():
+    head = "Grüß".encode("utf-8")[:-1]
+    assert _classify(head, file_size=len(head) + 100)["encoding"] == "utf-8"
+    assert _classify(head)["encoding"] == "8bit"
+
+
+def test_nul_and_control_bytes_are_binary():
+    assert _classify(b"abc\x00def")["format"] == "data"
+    assert _classify(b"\x01\x02\x03\x04abcdef")["is_binary"]
+
+
+def test_empty_file():
+    assert _classify(b"")["format"] == "empty"
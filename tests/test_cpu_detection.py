@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""CPU-Profil: /proc/cpuinfo, CPU-Listen, Cachegrößen, ISA-Flags und cgroup-Kontingent"""
+
+import IrsanAI_OS_HW_Detector as detector
+
+# Zwei Sockel mit je zwei Kernen und SMT (8 logische CPUs)
+X86_CPUINFO = "".join(
+    f"processor\t: {cpu}\n"
+    f"vendor_id\t: GenuineIntel\n"
+    f"model name\t: Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz\n"
+    f"physical id\t: {cpu // 4}\n"
+    f"core id\t\t: {(cpu // 2) % 2}\n"
+    f"flags\t\t: fpu sse2 avx avx2 fma avx512f avx512bw\n\n"
+    for cpu in range(8)
+)
+
+ARM_CPUINFO = (
+    "processor\t: 0\nBogoMIPS\t: 108.00\nFeatures\t: fp asimd evtstrm aes sha2 crc32\n\n"
+    "processor\t: 1\nBogoMIPS\t: 108.00\nFeatures\t: fp asimd evtstrm aes sha2 crc32\n\n"
+    "Hardware\t: BCM2835\nModel\t\t: Raspberry Pi 4 Model B Rev 1.4\n"
+)
+
+
+def test_parse_cpuinfo_x86_sockets_and_cores():
+    parsed = detector.parse_cpuinfo(X86_CPUINFO)
+    assert parsed['model'] == "Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz"
+    assert (parsed['logical_cpus'], parsed['sockets'], parsed['physical_cores']) == (8, 2, 4)
+    assert parsed['flags'][:3] == ['fpu', 'sse2', 'avx']
+
+
+def test_parse_cpuinfo_arm_without_topology_fields():
+    parsed = detector.parse_cpuinfo(ARM_CPUINFO)
+    assert parsed['model'] == "Raspberry Pi 4 Model B Rev 1.4"
+    assert (parsed['logical_cpus'], parsed['sockets'], parsed['physical_cores']) == (2, 1, None)
+    assert 'asimd' in parsed['flags']
+
+
+def test_parse_cpuinfo_empty():
+    assert detector.parse_cpuinfo("") == {'model': None, 'logical_cpus': 0, 'sockets': 0,
+                                          'physical_cores': None, 'flags': []}
+
+
+def test_parse_cpu_list():
+    assert detector.parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert detector.parse_cpu_list("") == []
+
+
+def test_parse_cache_size():
+    assert detector.parse_cache_size("32K") == 32 * 1024
+    assert detector.parse_cache_size("8M\n") == 8 * 1024 ** 2
+    assert detector.parse_cache_size("512") == 512
+    assert detector.parse_cache_size("unknown") == 0
+
+
+def test_summarize_isa_flags():
+    x86 = detector.summarize_isa_flags(detector.parse_cpuinfo(X86_CPUINFO)['flags'])
+    assert (x86['vector_width_bits'], x86['has_avx512'], x86['has_neon']) == (512, True, False)
+    assert x86['extensions'] == ['sse2', 'avx', 'avx2', 'fma', 'avx512f', 'avx512bw']
+    arm = detector.summarize_isa_flags(detector.parse_cpuinfo(ARM_CPUINFO)['flags'])
+    assert (arm['vector_width_bits'], arm['has_neon']) == (128, True)
+    assert detector.summarize_isa_flags([])['vector_width_bits'] is None
+
+
+def _cgroup_tree(tmp_path, monkeypatch, proc_cgroup, files):
+    proc = tmp_path / "proc"
+    (proc / "self").mkdir(parents=True)
+    (proc / "self" / "cgroup").write_text(proc_cgroup)
+    cgroup = tmp_path / "cgroup"
+    for rel_path, content in files.items():
+        path = cgroup / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    monkeypatch.setattr(detector, "PROCFS_ROOT", str(proc))
+    monkeypatch.setattr(detector, "CGROUP_ROOT", str(cgroup))
+
+
+def test_cgroup_v2_cpu_quota(tmp_path, monkeypatch):
+    _cgroup_tree(tmp_path, monkeypatch, "0::/container\n", {"container/cpu.max": "150000 100000\n"})
+    assert detector.detect_cgroup_cpu_limit() == {'cgroup_version': 2, 'quota_us': 150000,
+                                                  'period_us': 100000, 'limit_cores': 1.5}
+
+
+def test_cgroup_v2_without_quota(tmp_path, monkeypatch):
+    _cgroup_tree(tmp_path, monkeypatch, "0::/\n", {"cpu.max": "max 100000\n"})
+    limit = detector.detect_cgroup_cpu_limit()
+    assert (limit['cgroup_version'], limit['quota_us'], limit['limit_cores']) == (2, None, None)
+
+
+def test_cgroup_v1_cpu_quota(tmp_path, monkeypatch):
+    _cgroup_tree(tmp_path, monkeypatch, "4:cpu,cpuacct:/docker/abc\n",
+                 {"cpu,cpuacct/docker/abc/cpu.cfs_quota_us": "200000\n",
+                  "cpu,cpuacct/docker/abc/cpu.cfs_period_us": "100000\n"})
+    limit = detector.detect_cgroup_cpu_limit()
+    assert (limit['cgroup_version'], limit['limit_cores']) == (1, 2.0)
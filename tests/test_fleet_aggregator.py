@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Abfragen und Teilberichte im Flotten-Index (IrsanAI_Fleet_Aggregator)"""
+
+import json
+
+import pytest
+
+from IrsanAI_Fleet_Aggregator import FleetIndex, parse_query, run_query
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("effective_memory_mb<8192", [("effective_memory_mb", "<", "8192")]),
+    ("gpu_model~RTX, logical_cores>=8", [("gpu_model", "~", "RTX"), ("logical_cores", ">=", "8")]),
+    ("os~linux AND effective_cpus>4", [("os", "~", "linux"), ("effective_cpus", ">", "4")]),
+    ("cpu_model=AMD Ryzen and Threadripper", [("cpu_model", "=", "AMD Ryzen and Threadripper")]),
+    ("cpu_model~Ryzen and Threadripper and effective_cpus>=8",
+     [("cpu_model", "~", "Ryzen and Threadripper"), ("effective_cpus", ">=", "8")]),
+    ("gpu_model~RTX 4080, 4090", [("gpu_model", "~", "RTX 4080, 4090")]),
+    ("cpu_model~'Ryzen, and os=x', os=Linux", [("cpu_model", "~", "Ryzen, and os=x"), ("os", "=", "Linux")]),
+    # Der erste Operator trennt Feld und Wert, bei gleicher Position der längste
+    ("cpu_model~x<y", [("cpu_model", "~", "x<y")]),
+    ("logical_cores<=4", [("logical_cores", "<=", "4")]),
+])
+def test_parse_query(expression, expected):
+    assert parse_query(expression) == expected
+
+
+@pytest.mark.parametrize("expression", ["", "unknown_field=1", "logical_cores~4", "cpu_model"])
+def test_parse_query_rejects(expression):
+    with pytest.raises(ValueError):
+        parse_query(expression)
+
+
+def _report(machine_id, timestamp, **sections):
+    report = {"anonymized_id": machine_id, "timestamp": timestamp}
+    report.update(sections)
+    return json.dumps(report).encode("utf-8")
+
+
+def test_run_query_on_index():
+    index = FleetIndex()
+    index.add_payload("a", _report("a", "2026-01-01T00:00:00", cpu_info={"model": "AMD Ryzen and Threadripper",
+                                                                       "logical_cores": 32}))
+    index.add_payload("b", _report("b", "2026-01-01T00:00:00", cpu_info={"model": "Intel Core i7",
+                                                                       "logical_cores": 8}))
+
+    result = run_query(index, "cpu_model=AMD Ryzen and Threadripper")
+    assert (result["matches"], result["machine_ids"]) == (1, ["a"])
+    assert run_query(index, "logical_cores>=8, cpu_model~intel")["machine_ids"] == ["b"]
+
+
+def test_partial_report_keeps_other_columns():
+    index = FleetIndex()
+    index.add_payload("full", _report("m", "2026-01-01T00:00:00",
+                                      cpu_info={"model": "Intel Core i7", "logical_cores": 8},
+                                      memory_info={"total_mb": 16384},
+                                      gpu_info=[{"name": "RTX 4080", "memory_total": 16 * 1024 ** 3}]))
+    index.add_payload("partial", _report("m", "2026-02-01T00:00:00", report_sections=["os", "cpu"],
+                                         cpu_info={"model": "Intel Core i7", "logical_cores": 16}))
+
+    assert len(index) == 1
+    assert index.numeric["logical_cores"][0] == 16
+    assert index.numeric["total_memory_mb"][0] == 16384
+    assert index.categories["gpu_model"].value(0) == "RTX 4080"
+
+
+def test_older_report_is_ignored():
+    index = FleetIndex()
+    index.add_payload("new", _report("m", "2026-02-01T00:00:00", cpu_info={"logical_cores": 16}))
+    index.add_payload("old", _report("m", "2026-01-01T00:00:00", cpu_info={"logical_cores": 4}))
+    assert index.numeric["logical_cores"][0] == 16
+    assert index.stats["duplicates"] == 1
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Transaktionaler Aktionsplan von github_repo_preparer.execute_plan"""
+
+import errno
+import os
+import shutil
+
+import github_repo_preparer as preparer
+
+
+def _tree(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _listing(root):
+    entries = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                entries[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return entries
+
+
+def test_plan_is_applied(tmp_path):
+    _tree(tmp_path, {"tmp.log": "x", "old.py": "a", ".gitignore": "alt\n"})
+    plan = [
+        {"action": "delete", "path": "tmp.log", "kind": "file", "bytes": 1, "inodes": 1, "reason": "temp"},
+        {"action": "move", "path": "old.py", "target": "src/new.py", "reason": "verschieben"},
+        {"action": "write", "path": ".gitignore", "content": "neu\n", "reason": ".gitignore aktualisiert"},
+    ]
+
+    result = preparer.execute_plan(plan, str(tmp_path), backup=False)
+
+    assert not result["rolled_back"]
+    assert _listing(tmp_path) == {"src/new.py": "a", ".gitignore": "neu\n"}
+    assert result["freed_bytes"] == 1
+
+
+def test_failed_write_is_rolled_back_without_leftovers(tmp_path, monkeypatch):
+    _tree(tmp_path, {"tmp.log": "x", ".gitignore": "alt\n"})
+    plan = [
+        {"action": "delete", "path": "tmp.log", "kind": "file", "bytes": 1, "inodes": 1, "reason": "temp"},
+        {"action": "write", "path": ".gitignore", "content": "neu\n", "reason": ".gitignore aktualisiert"},
+    ]
+
+    def failing_replace(source, target):
+        raise OSError(errno.EIO, "Schreibfehler")
+
+    monkeypatch.setattr(preparer.os, "replace", failing_replace)
+    result = preparer.execute_plan(plan, str(tmp_path), backup=False)
+
+    assert result["rolled_back"]
+    # Auch die temporäre Datei .gitignore.irsanai_tmp und der Papierkorb sind wieder weg
+    assert _listing(tmp_path) == {"tmp.log": "x", ".gitignore": "alt\n"}
+    assert sorted(os.listdir(tmp_path)) == [".gitignore", "tmp.log"]
+
+
+def test_cross_filesystem_move_is_undone_with_shutil(tmp_path, monkeypatch):
+    _tree(tmp_path, {"old.py": "a", ".gitignore": "alt\n"})
+    plan = [
+        {"action": "move", "path": "old.py", "target": "src/new.py", "reason": "verschieben"},
+        {"action": "write", "path": "missing/.gitignore", "content": "neu\n", "reason": "schreiben"},
+    ]
+    real_rename = os.rename
+    moved = []
+
+    def rename(source, target):
+        # Quelle oder Ziel von old.py liegen "auf einem anderen Dateisystem"
+        if os.path.basename(str(source)) in ("old.py", "new.py"):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        real_rename(source, target)
+
+    def move(source, target):
+        moved.append((os.path.basename(str(source)), os.path.basename(str(target))))
+        shutil.copy2(source, target)
+        os.remove(source)
+
+    monkeypatch.setattr(preparer.os, "rename", rename)
+    monkeypatch.setattr(preparer.shutil, "move", move)
+    result = preparer.execute_plan(plan, str(tmp_path), backup=False)
+
+    assert result["rolled_back"]
+    assert moved == [("old.py", "new.py"), ("new.py", "old.py")]
+    assert _listing(tmp_path) == {"old.py": "a", ".gitignore": "alt\n"}
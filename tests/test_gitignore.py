@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Regelsatz einer .gitignore: Git-Semantik von match() und Abdeckung mit covers()"""
+
+import pytest
+
+from irsanai_gitignore import MAX_PROBE_PATHS, parse_gitignore, parse_rule
+
+GITIGNORE = (
+    "# Kommentar\n"
+    "\n"
+    "*.log\n"
+    "build/\n"
+    "/dist\n"
+    "docs/_build\n"
+    "*.py[cod]\n"
+    "**/.idea/\n"
+    "cache/**\n"
+    "\\#notiz\n"
+    "leer\\ \n"
+)
+
+
+@pytest.mark.parametrize("path, is_dir, expected", [
+    ("debug.log", False, True),
+    ("src/deep/debug.log", False, True),
+    ("build", True, True),
+    ("build", False, False),  # "build/" gilt nur für Verzeichnisse
+    ("src/build/out.o", False, True),  # Inhalt eines ignorierten Verzeichnisses
+    ("dist", False, True),
+    ("src/dist", False, False),  # "/dist" ist an der Wurzel verankert
+    ("docs/_build/index.html", False, True),
+    ("src/docs/_build", True, False),  # "/" in der Mitte verankert ebenfalls
+    ("mod.pyc", False, True),
+    ("mod.pyx", False, False),
+    ("a/b/.idea/workspace.xml", False, True),
+    ("cache/x/y", False, True),
+    ("cache", True, False),  # "cache/**" erfasst nur den Inhalt
+    ("#notiz", False, True),
+    ("leer ", False, True),
+    ("./src\\debug.log", False, True),
+    ("readme.md", False, False),
+])
+def test_match(path, is_dir, expected):
+    assert parse_gitignore(GITIGNORE).match(path, is_dir) is expected
+
+
+def test_comments_and_blank_lines_are_skipped():
+    rules = parse_gitignore(GITIGNORE)
+    assert len(rules) == 9
+    assert parse_rule("# nur Kommentar") is None
+    assert parse_rule("   ") is None
+
+
+def test_negation_last_matching_rule_wins():
+    rules = parse_gitignore("*.log\n!keep.log\nlogs/\n!logs/keep.txt\n")
+    assert rules.match("debug.log")
+    assert not rules.match("keep.log")
+    assert not rules.match("sub/keep.log")
+    # Ein ignoriertes Verzeichnis lässt sich nicht durch Negation einer Datei darin aufheben
+    assert rules.match("logs/keep.txt")
+    assert parse_gitignore("!keep.log\n*.log\n").match("keep.log")
+
+
+@pytest.mark.parametrize("path, is_dir", [
+    ("debug.log", False), ("build", True), ("build", False), ("src/dist", False), ("dist", False),
+    ("mod.pyd", False), ("x/.idea", True), ("cache/z", False), ("readme.md", False),
+])
+def test_fast_path_agrees_with_ordered_evaluation(path, is_dir):
+    # Eine Negation, die nichts trifft, erzwingt die Auswertung in Dateireihenfolge
+    plain = parse_gitignore(GITIGNORE)
+    ordered = parse_gitignore(GITIGNORE + "!nichts_passt_hierauf\n")
+    assert not plain.has_negation and ordered.has_negation
+    assert plain.match(path, is_dir) is ordered.match(path, is_dir)
+
+
+def test_character_classes():
+    rules = parse_gitignore("file[0-2].txt\nout[!a].bin\n")
+    assert [rules.match(f"file{n}.txt") for n in range(4)] == [True, True, True, False]
+    assert rules.match("outb.bin") and not rules.match("outa.bin")
+
+
+@pytest.mark.parametrize("entry", [
+    "*.log", "debug.log", "build/", ".idea/", "*.pyc", "*.py[co]", "/dist", "docs/_build", "# Kommentar", "",
+])
+def test_covers(entry):
+    assert parse_gitignore(GITIGNORE).covers(entry)
+
+
+@pytest.mark.parametrize("entry", ["*.tmp", "dist", "build", "*.py[cx]", "node_modules/", "*.[!a]"])
+def test_not_covered(entry):
+    assert not parse_gitignore(GITIGNORE).covers(entry)
+
+
+def test_covers_with_negation():
+    rules = parse_gitignore("*.log\n!important.log\n")
+    assert rules.covers("debug.log")
+    assert not rules.covers("important.log")
+
+
+def test_oversized_character_classes_need_same_spelling():
+    entry = "[a-z][a-z].cache"
+    assert 26 * 26 > MAX_PROBE_PATHS
+    assert not parse_gitignore("*.cache\n").covers(entry)
+    assert parse_gitignore(entry + "\n").covers(entry)
+
+
+def test_missing_keeps_order():
+    rules = parse_gitignore(GITIGNORE)
+    assert rules.missing(["node_modules/", "*.log", ".env", "build/"]) == ["node_modules/", ".env"]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""GPU-Erkennung gegen den Fixture-Baum in tests/fixtures
+
+card0 (amdgpu) liefert mem_info_vram_total, card1 (nvidia) nur eine prefetchable
+BAR, card2 ist ein simpledrm-Framebuffer ohne PCI-Gerät.
+"""
+
+import os
+
+import IrsanAI_OS_HW_Detector as detector
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SYSFS_ROOT = os.path.join(FIXTURE_DIR, "sysfs_gpu")
+PROCFS_ROOT = os.path.join(FIXTURE_DIR, "procfs_gpu")
+
+AMD_ADDRESS = "0000:03:00.0"
+NVIDIA_ADDRESS = "0000:01:00.0"
+
+
+def _sysfs_gpus():
+    return {gpu['pci_address']: gpu for gpu in detector.probe_sysfs_gpus(SYSFS_ROOT)}
+
+
+def test_sysfs_skips_cards_without_pci_device():
+    assert sorted(_sysfs_gpus()) == [NVIDIA_ADDRESS, AMD_ADDRESS]
+
+
+def test_amdgpu_memory_from_mem_info_vram_total():
+    amd = _sysfs_gpus()[AMD_ADDRESS]
+    assert amd['vendor'] == 'AMD'
+    assert (amd['memory_total'], amd['memory_source']) == (17163091968, 'mem_info_vram_total')
+
+
+def test_largest_prefetchable_bar_as_fallback():
+    nvidia = _sysfs_gpus()[NVIDIA_ADDRESS]
+    assert (nvidia['memory_total'], nvidia['memory_source']) == (16 * 1024 ** 3, 'pci_bar')
+    assert nvidia['driver_version'] == 'nvidia 550.54.14'
+
+
+def test_nvml_devices_are_not_reported_twice(monkeypatch):
+    nvml_gpu = {
+        'name': 'NVIDIA GeForce RTX 4080', 'vendor': 'NVIDIA', 'driver_version': '550.54.14',
+        'memory_total': 16376 * 1024 ** 2, 'memory_source': 'nvml', 'source': 'nvml',
+        'pci_address': detector.normalize_pci_address('00000000:01:00.0'),
+        'anonymized_id': 'fixture'
+    }
+    monkeypatch.setattr(detector.sys, 'platform', 'linux')
+    monkeypatch.setattr(detector, 'probe_nvml_gpus', lambda: [dict(nvml_gpu)])
+
+    gpus = detector.detect_gpu_info(SYSFS_ROOT, PROCFS_ROOT)
+
+    assert sorted(gpu['memory_source'] for gpu in gpus) == ['mem_info_vram_total', 'nvml']
+    assert not any('pci_address' in gpu for gpu in gpus)
+
+
+def test_nvml_skipped_without_nvidia_driver(monkeypatch, tmp_path):
+    monkeypatch.setattr(detector.sys, 'platform', 'linux')
+    monkeypatch.setattr(detector, 'probe_nvml_gpus', lambda: [{'pci_address': NVIDIA_ADDRESS}])
+
+    gpus = detector.detect_gpu_info(SYSFS_ROOT, str(tmp_path))
+
+    assert sorted(gpu['memory_source'] for gpu in gpus) == ['mem_info_vram_total', 'pci_bar']
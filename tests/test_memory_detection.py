@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Speicherprofil: /proc/meminfo, NUMA-Knoten und cgroup-Speichergrenzen"""
+
+import IrsanAI_OS_HW_Detector as detector
+
+MEMINFO = (
+    "MemTotal:       16303428 kB\n"
+    "MemFree:         1203344 kB\n"
+    "MemAvailable:    9876544 kB\n"
+    "HugePages_Total:       4\n"
+    "HugePages_Free:        2\n"
+    "Hugepagesize:       2048 kB\n"
+    "DirectMap1G:    unknown\n"
+)
+
+
+def test_parse_meminfo_units():
+    values = detector.parse_meminfo(MEMINFO)
+    assert values['MemTotal'] == 16303428 * 1024
+    assert values['HugePages_Total'] == 4  # Anzahl, keine kB
+    assert 'DirectMap1G' not in values
+
+
+def test_parse_meminfo_numa_node():
+    values = detector.parse_meminfo("Node 1 MemTotal:  8388608 kB\nNode 1 MemFree:   1048576 kB\n")
+    assert values == {'MemTotal': 8 * 1024 ** 3, 'MemFree': 1024 ** 3}
+
+
+def test_hugepage_info(monkeypatch, tmp_path):
+    thp = tmp_path / "kernel" / "mm" / "transparent_hugepage"
+    thp.mkdir(parents=True)
+    (thp / "enabled").write_text("always [madvise] never\n")
+    monkeypatch.setattr(detector, "SYSFS_ROOT", str(tmp_path))
+    assert detector.detect_hugepage_info(detector.parse_meminfo(MEMINFO)) == {
+        'total': 4, 'free': 2, 'page_size_kb': 2048, 'transparent_hugepages': 'madvise'}
+
+
+def test_numa_memory(tmp_path):
+    for node, total_kb in ((1, 4194304), (0, 8388608)):
+        node_dir = tmp_path / "devices" / "system" / "node" / f"node{node}"
+        node_dir.mkdir(parents=True)
+        (node_dir / "meminfo").write_text(f"Node {node} MemTotal: {total_kb} kB\nNode {node} MemFree: 1048576 kB\n")
+    assert detector.detect_numa_memory(str(tmp_path)) == [
+        {'node': 0, 'total_mb': 8192, 'free_mb': 1024}, {'node': 1, 'total_mb': 4096, 'free_mb': 1024}]
+
+
+def _cgroup_tree(tmp_path, monkeypatch, proc_cgroup, files):
+    proc = tmp_path / "proc"
+    (proc / "self").mkdir(parents=True)
+    (proc / "self" / "cgroup").write_text(proc_cgroup)
+    cgroup = tmp_path / "cgroup"
+    for rel_path, content in files.items():
+        path = cgroup / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    monkeypatch.setattr(detector, "PROCFS_ROOT", str(proc))
+    monkeypatch.setattr(detector, "CGROUP_ROOT", str(cgroup))
+
+
+def test_cgroup_v2_memory_limits(tmp_path, monkeypatch):
+    _cgroup_tree(tmp_path, monkeypatch, "0::/app\n", {
+        "app/memory.max": "2147483648\n",
+        "app/memory.high": "max\n",
+        "app/memory.current": "1073741824\n",
+        "app/memory.stat": "anon 536870912\ninactive_file 268435456\n",
+    })
+    limits = detector.detect_cgroup_memory_limits()
+    assert limits['cgroup_version'] == 2
+    assert (limits['max_bytes'], limits['high_bytes']) == (2 * 1024 ** 3, None)
+    assert (limits['current_bytes'], limits['inactive_file_bytes']) == (1024 ** 3, 256 * 1024 ** 2)
+
+
+def test_cgroup_v1_unlimited_memory(tmp_path, monkeypatch):
+    _cgroup_tree(tmp_path, monkeypatch, "9:memory:/\n", {
+        "memory/memory.limit_in_bytes": "9223372036854771712\n",
+        "memory/memory.usage_in_bytes": "1048576\n",
+    })
+    limits = detector.detect_cgroup_memory_limits()
+    assert (limits['cgroup_version'], limits['max_bytes'], limits['current_bytes']) == (1, None, 1048576)
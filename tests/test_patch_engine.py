@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Anker, Vorfilter und Fensterbildung der Patch-Engine sowie die Alles-oder-nichts-Semantik"""
+
+import hashlib
+
+import pytest
+
+from IrsanAI_Patch_Engine import apply_manifest, apply_patch, compile_patch, required_literals
+
+
+# (Anweisung, Eingabe, erwartete Ausgabe, erwartete Ersetzungen)
+WINDOW_CASES = {
+    "verschachtelte Funktion gleichen Namens": (
+        {"search_pattern": r"\d", "replacement": "9", "max_occurrences": 2, "anchor": {"function": "g"}},
+        "def g():\n    def g():\n        a = 1\n    b = 1\n",
+        "def g():\n    def g():\n        a = 9\n    b = 9\n", 2),
+    "Inline-Flag (?i) ohne Vorfilter": (
+        {"search_pattern": r"(?i)schutzschalter", "replacement": "SCHUTZ", "flags": []},
+        "# SCHUTZSCHALTER\n", "# SCHUTZ\n", 1),
+    "Inline-Flag (?x) ohne Vorfilter": (
+        {"search_pattern": r"(?x) abc  def", "replacement": "x", "flags": []},
+        "abcdef\n", "x\n", 1),
+    "Marker-Fenster überlappen": (
+        {"search_pattern": r"\d", "replacement": "9", "max_occurrences": 3,
+         "anchor": {"marker": "# M", "lines": 1}},
+        "# M\na = 1\n# M\nb = 2\nc = 3\n", "# M\na = 9\n# M\nb = 9\nc = 3\n", 2),
+    "Funktionsanker lässt andere Funktionen unberührt": (
+        {"search_pattern": r"return \w+", "replacement": "return None", "anchor": {"function": "f"}},
+        "def e():\n    return a\n\n\ndef f():\n    return b\n",
+        "def e():\n    return a\n\n\ndef f():\n    return None\n", 1),
+}
+
+
+@pytest.mark.parametrize("spec, source, expected, expected_count",
+                         list(WINDOW_CASES.values()), ids=list(WINDOW_CASES))
+def test_apply_patch_windows(spec, source, expected, expected_count):
+    assert apply_patch(source, compile_patch(spec)) == (expected, expected_count)
+
+
+def test_apply_patch_stops_one_past_max_occurrences():
+    patch = compile_patch({"search_pattern": "a", "replacement": "b", "max_occurrences": 2})
+    # max_occurrences + 1 Treffer genügen, um die Anweisung als mehrdeutig zu erkennen
+    assert apply_patch("aaaaa", patch) == ("bbbaa", 3)
+
+
+def test_prefilter_skips_missing_literal():
+    patch = compile_patch({"search_pattern": r"def validate\(\):\s+# SCHUTZSCHALTER", "replacement": "x"})
+    assert patch["literals"] == ["def validate():", "# SCHUTZSCHALTER"]
+    assert apply_patch("def validate():\n    pass\n", patch) == ("def validate():\n    pass\n", 0)
+
+
+def test_required_literals():
+    assert required_literals(r"foo\.bar(baz)+qux") == ["foo.bar", "qux"]
+    assert required_literals(r"ab?cde") == ["cde"]
+    assert required_literals(r"foo|bar") == []
+
+
+def test_compile_patch_rejects_unknown_flag():
+    with pytest.raises(ValueError):
+        compile_patch({"search_pattern": "a", "replacement": "b", "flags": ["UNICORN"]})
+
+
+def _manifest(files, verification_hash=None):
+    target = {"files": files, "patches": [{"search_pattern": "alt", "replacement": "neu"}]}
+    if verification_hash:
+        target["verification_hash"] = verification_hash
+    return {"manifest_version": 1, "label": "test", "targets": [target]}
+
+
+def test_apply_manifest_writes_all_files(tmp_path):
+    for name in ("a.py", "b.py"):
+        (tmp_path / name).write_text("x = 'alt'\n", encoding="utf-8")
+
+    summary = apply_manifest(_manifest(["a.py", "b.py"]), str(tmp_path), workers=1, backup=False)
+
+    assert summary["committed"] and not summary["failed"]
+    assert summary["changed"] == 2
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "x = 'neu'\n"
+
+
+def test_apply_manifest_changes_nothing_on_failure(tmp_path):
+    (tmp_path / "a.py").write_text("x = 'alt'\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("x = 'anders'\n", encoding="utf-8")
+
+    summary = apply_manifest(_manifest(["a.py", "b.py"]), str(tmp_path), workers=1, backup=False)
+
+    assert not summary["committed"]
+    assert [failure["path"] for failure in summary["failed"]] == ["b.py"]
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "x = 'alt'\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.py", "b.py"]
+
+
+def test_apply_manifest_checks_verification_hash(tmp_path):
+    (tmp_path / "a.py").write_text("x = 'alt'\n", encoding="utf-8")
+    wrong = "sha256:" + hashlib.sha256(b"etwas anderes").hexdigest()
+
+    summary = apply_manifest(_manifest(["a.py"], wrong), str(tmp_path), workers=1, backup=False)
+
+    assert not summary["committed"]
+    assert "Hash" in summary["failed"][0]["error"]
+    assert (tmp_path / "a.py").read_text(encoding="utf-8") == "x = 'alt'\n"
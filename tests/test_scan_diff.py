@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Datei-Vergleich zweier Scans (scan_diff): Merge-Join, Verschiebungen und externe Sortierung"""
+
+import json
+import os
+
+import pytest
+
+import scan_diff
+from scan_diff import chunk_records_for, diff_files, make_record, read_snapshot, write_snapshot
+
+
+def _records(entries):
+    return sorted((make_record(path, file_hash, size) for path, file_hash, size in entries),
+                  key=lambda record: record["path"])
+
+
+def _diff(old, new, **kwargs):
+    stats = {}
+    changes = list(diff_files(_records(old), _records(new), stats, **kwargs))
+    return changes, stats
+
+
+def test_added_removed_modified():
+    changes, stats = _diff(
+        [("a.py", "h1", 10), ("b.py", "h2", 20), ("c.py", "h3", 30)],
+        [("a.py", "h1", 10), ("b.py", "h2x", 21), ("d.py", "h4", 40)])
+    assert changes == [
+        {"change": "modified", "path": "b.py", "old_hash": "h2", "new_hash": "h2x", "old_size": 20, "new_size": 21},
+        {"change": "removed", "path": "c.py", "hash": "h3", "size": 30},
+        {"change": "added", "path": "d.py", "hash": "h4", "size": 40},
+    ]
+    assert stats == {"unchanged": 1}
+
+
+def test_size_change_with_same_hash_is_modified():
+    changes, _ = _diff([("a.py", "h1", 10)], [("a.py", "h1", 11)])
+    assert [change["change"] for change in changes] == ["modified"]
+
+
+def test_moved_pairs_within_hash_in_path_order():
+    changes, stats = _diff(
+        [("old/x.py", "same", 5), ("old/y.py", "same", 5), ("keep.py", "k", 1)],
+        [("new/x.py", "same", 5), ("new/y.py", "same", 5), ("new/z.py", "same", 5), ("keep.py", "k", 1)])
+    assert changes == [
+        {"change": "moved", "from": "old/x.py", "to": "new/x.py", "hash": "same", "size": 5},
+        {"change": "moved", "from": "old/y.py", "to": "new/y.py", "hash": "same", "size": 5},
+        {"change": "added", "path": "new/z.py", "hash": "same", "size": 5},
+    ]
+    assert stats == {"unchanged": 1}
+
+
+def test_empty_hash_never_counts_as_move():
+    # Ohne Hash (z.B. nicht lesbare Dateien) lässt sich eine Verschiebung nicht belegen
+    changes, _ = _diff([("a.bin", "", 0)], [("b.bin", "", 0)])
+    assert changes == [{"change": "removed", "path": "a.bin", "hash": "", "size": 0},
+                       {"change": "added", "path": "b.bin", "hash": "", "size": 0}]
+
+
+def test_external_sort_spills_and_cleans_up(tmp_path, monkeypatch):
+    old = [(f"src/{index:03d}.py", f"h{index}", index) for index in range(40)]
+    new = [(f"lib/{index:03d}.py", f"h{index}", index) for index in range(0, 40, 2)] + \
+          [(f"src/{index:03d}.py", f"h{index}", index) for index in range(1, 40, 4)]
+    spills = []
+    real_spill = scan_diff.ExternalSorter._spill
+
+    def counting_spill(self):
+        spills.append(len(self.buffer))
+        real_spill(self)
+
+    in_memory, _ = _diff(old, new)
+    monkeypatch.setattr(scan_diff.ExternalSorter, "_spill", counting_spill)
+    changes, stats = _diff(old, new, temp_dir=str(tmp_path), chunk_records=3)
+
+    assert spills, "mit chunk_records=3 müssen Blöcke ausgelagert werden"
+    assert changes == in_memory
+    assert stats == {"unchanged": 10}
+    counts = {kind: sum(change["change"] == kind for change in changes) for kind in ("moved", "removed")}
+    assert counts == {"moved": 20, "removed": 10}
+    assert os.listdir(tmp_path) == []  # Temp-Blöcke sind wieder gelöscht
+
+
+def test_snapshot_roundtrip_sorts_and_drops_duplicates(tmp_path):
+    path = str(tmp_path / "current_scan.files.ndjson")
+    records = iter([{"path": "./b.py", "hash": "h2", "size": 2}, {"path": "a\\x.py", "hash": None, "size": 1},
+                    {"path": "b.py", "hash": "dup", "size": 9}])
+    assert write_snapshot(path, records, {"root": "/p"}) == 2
+
+    header, entries = read_snapshot(path)
+    assert (header["sorted_by"], header["root"]) == ("path", "/p")
+    assert list(entries) == [{"path": "a/x.py", "hash": "", "size": 1}, {"path": "b.py", "hash": "h2", "size": 2}]
+    assert sorted(os.listdir(tmp_path)) == ["current_scan.files.ndjson"]
+
+
+def test_unsorted_snapshot_without_header_is_sorted(tmp_path):
+    path = tmp_path / "alt.files.ndjson"
+    path.write_text("".join(json.dumps({"path": name, "hash": "h", "size": 1}) + "\n" for name in ("c", "a", "b")),
+                    encoding="utf-8")
+    header, entries = read_snapshot(str(path), str(tmp_path))
+    assert header == {}
+    assert [record["path"] for record in entries] == ["a", "b", "c"]
+
+
+def test_sorted_snapshot_out_of_order_is_rejected(tmp_path):
+    path = tmp_path / "kaputt.files.ndjson"
+    path.write_text(json.dumps({"snapshot_version": 1, "sorted_by": "path"}) + "\n" +
+                    json.dumps({"path": "b", "hash": "h", "size": 1}) + "\n" +
+                    json.dumps({"path": "a", "hash": "h", "size": 1}) + "\n", encoding="utf-8")
+    _, entries = read_snapshot(str(path))
+    with pytest.raises(ValueError):
+        list(entries)
+
+
+def test_chunk_records_for():
+    assert chunk_records_for(512) == 512 * 1024 * 1024 // (2 * scan_diff.RECORD_MEMORY_BYTES)
+    assert chunk_records_for(0) == 1000
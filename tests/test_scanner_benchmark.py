@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Regressionsbewertung von scanner_benchmark.compare und Determinismus des Baumgenerators"""
+
+import os
+
+from scanner_benchmark import compare_results, generate_tree
+
+TARGET = "project_scanner.scan"
+
+
+def _results(runs, rss=20.0):
+    runs = sorted(runs)
+    return {"cases": {"medium": {"results": {TARGET: {
+        "wall_seconds": runs[len(runs) // 2], "wall_seconds_min": runs[0],
+        "wall_seconds_runs": runs, "peak_rss_mb": rss}}}}}
+
+
+def _row(baseline, current, threshold=0.10):
+    rows = compare_results(baseline, current, threshold)
+    assert len(rows) == 1
+    return rows[0]
+
+
+def test_clear_slowdown_is_a_regression():
+    row = _row(_results([1.00, 1.02, 1.05]), _results([1.30, 1.32, 1.40]))
+    assert row["time_regression"]
+    assert row["time_ratio"] == 1.3
+
+
+def test_overlapping_runs_are_noise():
+    row = _row(_results([1.00, 1.10, 1.30]), _results([1.20, 1.25, 1.40]))
+    assert not row["time_regression"]
+
+
+def test_short_runs_are_not_rated():
+    row = _row(_results([0.05, 0.05, 0.05]), _results([0.08, 0.08, 0.09]))
+    assert not row["significant"]
+    assert not row["time_regression"]
+
+
+def test_memory_regression():
+    row = _row(_results([1.0], rss=20.0), _results([1.0], rss=30.0))
+    assert row["rss_regression"] and not row["time_regression"]
+
+
+def _listing(root):
+    entries = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            entries.append((os.path.relpath(path, root), os.path.getsize(path)))
+    return sorted(entries)
+
+
+def test_generate_tree_is_deterministic(tmp_path):
+    first = generate_tree(str(tmp_path / "a"), files=60, depth=3, seed=7)
+    second = generate_tree(str(tmp_path / "b"), files=60, depth=3, seed=7)
+    assert first == second
+    assert _listing(tmp_path / "a") == _listing(tmp_path / "b")
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Zeitbudget für den Schnellstart von IrsanAI_OS_HW_Detector.py
+
+Regressionsschutz: ein neuer Top-Level-Import oder eine teure Erkennung im
+Minimalpfad lässt diese Tests fehlschlagen.
+"""
+
+import os
+import subprocess
+import sys
+
+from conftest import SYSTEM_DIR
+
+MODULE_NAME = "IrsanAI_OS_HW_Detector"
+IMPORT_BUDGET_MS = 40
+MINIMAL_RUN_BUDGET_MS = 400
+MINIMAL_RUN_SECTIONS = "os,cpu"
+
+
+def _run_python(args, pycache_dir):
+    """Frischer Interpreter mit eigenem Bytecode-Cache (gemessen wird der Import, nicht das Kompilieren)"""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(pycache_dir))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run([sys.executable] + args, cwd=SYSTEM_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def test_import_time_within_budget(tmp_path):
+    _run_python(["-c", f"import {MODULE_NAME}"], tmp_path)
+    result = _run_python(["-X", "importtime", "-c", f"import {MODULE_NAME}"], tmp_path)
+    # Kumulierte Mikrosekunden der Zeile dieses Moduls
+    import_us = None
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == MODULE_NAME:
+            import_us = int(parts[1].strip())
+    assert import_us is not None
+    assert import_us / 1000.0 <= IMPORT_BUDGET_MS
+
+
+def test_minimal_run_within_budget(tmp_path):
+    _run_python(["-c", f"import {MODULE_NAME}"], tmp_path)
+    code = (f"import time; start = time.perf_counter(); import {MODULE_NAME} as d; "
+            f"d.generate_env_report(d.parse_sections({MINIMAL_RUN_SECTIONS!r})); "
+            f"print((time.perf_counter() - start) * 1000)")
+    result = _run_python(["-c", code], tmp_path)
+    run_ms = float(result.stdout.strip().splitlines()[-1])
+    assert run_ms <= MINIMAL_RUN_BUDGET_MS
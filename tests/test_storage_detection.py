@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Dateisystem und Datenträger: mountinfo, Mount-Zuordnung und Block-Queue"""
+
+import os
+
+import IrsanAI_OS_HW_Detector as detector
+
+MOUNTINFO = (
+    "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw,errors=remount-ro\n"
+    "25 22 0:23 / /dev/shm rw,nosuid,nodev shared:4 - tmpfs tmpfs rw,size=8126508k\n"
+    "30 22 0:26 / /tmp rw,nosuid,nodev - tmpfs tmpfs rw\n"
+    "40 22 0:45 / /mnt/Eigene\\040Dateien rw,noatime master:7 propagate_from:2 - nfs4 srv:/export rw\n"
+    "41 22 8:1 / /data ro,noatime - xfs /dev/sda1 ro\n"
+    "42 41 0:50 / /data rw - overlay overlay rw,lowerdir=/a\n"
+    "kaputte Zeile ohne Trenner\n"
+)
+
+
+def test_parse_mountinfo():
+    mounts = detector.parse_mountinfo(MOUNTINFO)
+    assert len(mounts) == 6
+    assert mounts[0] == {'device': '259:2', 'mount_point': '/', 'mount_options': 'rw,relatime',
+                         'fstype': 'ext4', 'source': '/dev/nvme0n1p2', 'super_options': 'rw,errors=remount-ro'}
+    # Leerzeichen im Mountpunkt (\040) und mehrere optionale Felder
+    assert mounts[3]['mount_point'] == '/mnt/Eigene Dateien'
+    assert (mounts[3]['fstype'], mounts[3]['source']) == ('nfs4', 'srv:/export')
+
+
+def test_find_mount_longest_prefix_and_later_overlay():
+    mounts = detector.parse_mountinfo(MOUNTINFO)
+    assert detector.find_mount(mounts, '/home/user/project')['fstype'] == 'ext4'
+    assert detector.find_mount(mounts, '/mnt/Eigene Dateien/x')['fstype'] == 'nfs4'
+    assert detector.find_mount(mounts, '/tmpdir')['mount_point'] == '/'
+    # /data ist zweimal eingehängt: der spätere Eintrag verdeckt den früheren
+    assert detector.find_mount(mounts, '/data/set')['fstype'] == 'overlay'
+
+
+def _block_tree(root):
+    """nvme0n1 mit Partition nvme0n1p2 (259:2); die Queue liegt an der ganzen Platte"""
+    disk = root / "devices" / "pci0000:00" / "nvme" / "nvme0n1"
+    partition = disk / "nvme0n1p2"
+    (disk / "queue").mkdir(parents=True)
+    partition.mkdir()
+    (partition / "partition").write_text("2\n")
+    for name, value in (("rotational", "0"), ("scheduler", "[none] mq-deadline"), ("read_ahead_kb", "128"),
+                        ("nr_requests", "1023"), ("logical_block_size", "512"),
+                        ("physical_block_size", "4096"), ("max_sectors_kb", "512")):
+        (disk / "queue" / name).write_text(value + "\n")
+    (root / "dev" / "block").mkdir(parents=True)
+    os.symlink(os.path.relpath(partition, root / "dev" / "block"), root / "dev" / "block" / "259:2")
+
+
+def test_detect_block_queue_of_partition(tmp_path):
+    _block_tree(tmp_path)
+    block = detector.detect_block_queue("259:2", str(tmp_path))
+    assert block == {'disk': 'nvme0n1', 'device_type': 'nvme', 'rotational': False, 'scheduler': 'none',
+                     'nr_requests': 1023, 'read_ahead_kb': 128, 'logical_block_size': 512,
+                     'physical_block_size': 4096, 'max_sectors_kb': 512}
+    assert detector.detect_block_queue("8:1", str(tmp_path)) == {}
+
+
+def test_detect_storage_info_with_fixture_roots(tmp_path):
+    sysfs = tmp_path / "sys"
+    _block_tree(sysfs)
+    project = tmp_path / "project"
+    project.mkdir()
+    proc = tmp_path / "proc"
+    (proc / "self").mkdir(parents=True)
+    (proc / "self" / "mountinfo").write_text(
+        MOUNTINFO + f"50 22 259:2 /home {os.path.realpath(project)} rw,noatime - ext4 /dev/nvme0n1p2 rw\n")
+
+    storage = detector.detect_storage_info(str(project), str(proc), str(sysfs))
+
+    filesystem = storage['project_filesystem']
+    assert (filesystem['fstype'], filesystem['device_type']) == ('ext4', 'nvme')
+    assert filesystem['noatime'] and not filesystem['read_only']
+    assert filesystem['block_device']['read_ahead_kb'] == 128
+    assert (storage['tmpfs_mounts'], storage['tmp_is_tmpfs']) == (2, True)